@@ -9,6 +9,7 @@
 import time
 import logging
 import random
+import pandas as pd
 logging.getLogger().setLevel(logging.INFO)
 
 class BenchmarkAnalyzer:
@@ -28,14 +29,16 @@ class BenchmarkAnalyzer:
 
   # accepts a dict with lambda functions specifying evaluation criteria which must be fullfilled
   # e.g. evaluation_criteria={"success": lambda x: x, "collision" : lambda x : not x}
+  # a criterion that is not callable must equal the value, e.g. {"behavior": "IDM"}
   # scenario_idx_list: a list of scenario ids, return only configs with these scenario ids
   # scenarios_as_in_configs: a list of configs ids, return only configs with scenarios of configs ids in this list
   # returns a list of config indices fullfilling these criteria
   def find_configs(self, criteria=None, scenario_idx_list=None, scenarios_as_in_configs=None, in_configs=None):
-      df_satisfied =  self._data_frame.copy()
+      df_satisfied =  self._data_frame
       if criteria:
         for eval_crit, function in criteria.items():
-            df_satisfied = df_satisfied.loc[df_satisfied[eval_crit].apply(function)]
+            df_satisfied = df_satisfied.loc[
+                BenchmarkAnalyzer._evaluate_criterion(df_satisfied[eval_crit], function)]
       if scenarios_as_in_configs:
             scenario_idx_list = self.get_scenario_ids(scenarios_as_in_configs)
       if in_configs:
@@ -48,6 +51,21 @@ class BenchmarkAnalyzer:
       configs_found = list(df_satisfied["config_idx"].values)
       return configs_found
 
+  @staticmethod
+  def _evaluate_criterion(column, criterion):
+      if not callable(criterion):
+          return column == criterion
+      # criteria such as lambda x: x > 1 are evaluated for the whole column at
+      # once, others such as lambda x: not x for each value
+      try:
+          satisfied = criterion(column)
+          if isinstance(satisfied, pd.Series) and satisfied.dtype == bool and \
+                satisfied.index.equals(column.index):
+              return satisfied
+      except Exception:
+          pass
+      return column.apply(criterion)
+
   def make_scenarios_congruent(self, configs_idx_lists):
       matching_scenarios = set(self.get_scenario_ids(configs_idx_lists[0]))
       for configs_idx_list in configs_idx_lists[1:]:
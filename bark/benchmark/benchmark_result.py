@@ -4,13 +4,17 @@
 # https://opensource.org/licenses/MIT
 
 import os
+import copy
 import pickle
+import numpy as np
 import pandas as pd
 import logging
 import re
 import zipfile
 import math
 
+from bark.benchmark.checkpoint_log import CheckpointLog
+
 logging.basicConfig()
 logging.getLogger().setLevel(logging.INFO)
 
@@ -36,13 +40,57 @@ class BehaviorConfig:
 class BenchmarkConfig:
     def __init__(self, config_idx, behavior_config,
                  scenario, scenario_idx, scenario_set_name,
-                 scenario_set_param_desc=None):
+                 scenario_set_param_desc=None, scenario_generator=None):
         self.config_idx = config_idx
         self.behavior_config = behavior_config
-        self.scenario = scenario
+        self._scenario = scenario
         self.scenario_idx = scenario_idx
         self.scenario_set_name = scenario_set_name
         self.scenario_set_param_desc = scenario_set_param_desc or {}
+        # lazy configs only reference the scenario by its index
+        self.scenario_generator = scenario_generator
+
+    @property
+    def scenario(self):
+        # lazy scenarios are created once on first access
+        if self._scenario is None and self.scenario_generator is not None:
+            self._scenario = self.scenario_generator.get_scenario(self.scenario_idx)
+        return self._scenario
+
+    @scenario.setter
+    def scenario(self, scenario):
+        self._scenario = scenario
+
+    def release_scenario(self):
+        """Drops the cached scenario of lazy configs, it is created again on
+        the next access"""
+        if self.scenario_generator is not None:
+            self._scenario = None
+
+    def __deepcopy__(self, memo):
+        # the scenario generator is shared by all copies
+        if self.scenario_generator is not None:
+            memo[id(self.scenario_generator)] = self.scenario_generator
+        benchmark_config = BenchmarkConfig.__new__(BenchmarkConfig)
+        memo[id(self)] = benchmark_config
+        benchmark_config.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return benchmark_config
+
+    def __getstate__(self):
+        # lazy configs only pickle a reference to their generation, the
+        # scenario is created again when it is accessed after unpickling
+        odict = self.__dict__.copy()
+        if self.scenario_generator is not None:
+            odict['_scenario'] = None
+            odict['scenario_generator'] = self.scenario_generator.get_reference()
+        return odict
+
+    def __setstate__(self, sdict):
+        # configs pickled before scenarios could be referenced lazily
+        if 'scenario' in sdict:
+            sdict['_scenario'] = sdict.pop('scenario')
+        sdict.setdefault('scenario_generator', None)
+        self.__dict__.update(sdict)
 
     def get_info_string_list(self):
         info_strings = ["ConfigIdx: {}".format(self.config_idx),
@@ -74,15 +122,26 @@ class BenchmarkResult:
             self.__data_frame = None
         self.__histories = histories or {}
         self.__file_name = file_name or None
+        # data frames of extended results, concatenated on the next access
+        self.__data_frames_to_concat = []
+        # config_idx -> config and the number of configs it was built from,
+        # see _get_config_index()
+        self.__config_index = None
+        self.__config_index_length = 0
+        # filetype -> config index ranges of the chunks of a zip result
+        self.__zip_member_index = None
 
     def get_data_frame(self):
         if not isinstance(self.__data_frame, pd.DataFrame):
             self.__data_frame = pd.DataFrame(self.__result_dict)
+        if self.__data_frames_to_concat:
+            self.__data_frame = pd.concat([self.__data_frame, *self.__data_frames_to_concat])
+            self.__data_frames_to_concat = []
         return self.__data_frame
 
     def get_result_dict(self):
         if len(self.__result_dict) == 0 and isinstance(self.__data_frame, pd.DataFrame):
-            self.__result_dict = self.__data_frame.to_dict("records")
+            self.__result_dict = self.get_data_frame().to_dict("records")
         return self.__result_dict
 
     def get_benchmark_configs(self):
@@ -92,8 +151,18 @@ class BenchmarkResult:
         return self.__histories
 
     def get_benchmark_config(self, config_idx):
-        return BenchmarkResult.find_benchmark_config(
-            self.__benchmark_configs, config_idx)
+        return self._get_config_index().get(config_idx, None)
+
+    def _get_config_index(self):
+        # rebuilt if the list of configs has been changed from outside, the
+        # list length is compared as duplicate config indices can be merged
+        if self.__config_index is None or \
+              self.__config_index_length != len(self.__benchmark_configs):
+            # the first config of an index is found as in find_benchmark_config
+            self.__config_index = {bc.config_idx : bc for bc in \
+                                        reversed(self.__benchmark_configs)}
+            self.__config_index_length = len(self.__benchmark_configs)
+        return self.__config_index
 
     def get_benchmark_config_indices(self):
         return [bc.config_idx for bc in self.__benchmark_configs]
@@ -140,6 +209,15 @@ class BenchmarkResult:
         if filename.endswith("*.pickle"):
           logging.warning("pickle files have been depricated")
           return BenchmarkResult.load_pickle(filename)
+        elif BenchmarkResult.is_columnar(filename):
+          rst = BenchmarkResult.load_results_columnar(filename)
+          if load_configs:
+              rst.load_benchmark_configs()
+          if load_histories:
+              rst.load_histories()
+          return rst
+        elif CheckpointLog.is_checkpoint_log(filename):
+          return BenchmarkResult.load_checkpoint_log(filename, load_configs, load_histories)
         else:
           rst = BenchmarkResult.load_results(filename)
           if not rst:
@@ -157,9 +235,16 @@ class BenchmarkResult:
         else:
             configs_idx_to_load = None # all available histories are loaded
         new_histories = None
-        with zipfile.ZipFile(self.__file_name, 'r') as result_zip_file:
+        if BenchmarkResult.is_columnar(self.__file_name):
+            new_histories, configs_not_found, processed_files = BenchmarkResult._load_columnar( \
+                self.__file_name, "histories", configs_idx_to_load)
+        elif CheckpointLog.is_checkpoint_log(self.__file_name):
+            new_histories, configs_not_found, processed_files = BenchmarkResult._load_checkpoint_log( \
+                self.__file_name, "histories", configs_idx_to_load)
+        else:
+          with zipfile.ZipFile(self.__file_name, 'r') as result_zip_file:
             new_histories, configs_not_found, processed_files = BenchmarkResult._load_and_merge(result_zip_file, \
-                "histories", configs_idx_to_load)
+                "histories", configs_idx_to_load, self._get_zip_member_index(result_zip_file))
         if len(configs_not_found) > 0:
             logging.warning("The histories with config indices {} were not found in {}".format(configs_not_found, self.__file_name))
         if new_histories:
@@ -175,9 +260,16 @@ class BenchmarkResult:
         else:
             configs_idx_to_load = None # all available configs are loaded
         new_bench_configs = None
-        with zipfile.ZipFile(self.__file_name, 'r') as result_zip_file:
+        if BenchmarkResult.is_columnar(self.__file_name):
+            new_bench_configs, configs_not_found, processed_files = BenchmarkResult._load_columnar( \
+                self.__file_name, "configs", configs_idx_to_load)
+        elif CheckpointLog.is_checkpoint_log(self.__file_name):
+            new_bench_configs, configs_not_found, processed_files = BenchmarkResult._load_checkpoint_log( \
+                self.__file_name, "configs", configs_idx_to_load)
+        else:
+          with zipfile.ZipFile(self.__file_name, 'r') as result_zip_file:
             new_bench_configs, configs_not_found, processed_files = BenchmarkResult._load_and_merge(result_zip_file, \
-                "configs", configs_idx_to_load)
+                "configs", configs_idx_to_load, self._get_zip_member_index(result_zip_file))
         if len(configs_not_found) > 0:
             logging.warning("The benchmark configs with indices {} were not found in {}".format(configs_not_found, self.__file_name))
         if new_bench_configs:
@@ -186,24 +278,49 @@ class BenchmarkResult:
             self.extend(new_result)
         return processed_files
 
+    def _get_zip_member_index(self, zip_file_handle):
+        # the member list of the zip file is only parsed once
+        if self.__zip_member_index is None:
+            self.__zip_member_index = BenchmarkResult._build_zip_member_index( \
+                zip_file_handle.namelist())
+        return self.__zip_member_index
+
     @staticmethod
-    def _find_files_to_load(total_file_list, filetype, config_idx_list):
-        files_to_load = []
-        configs_not_found = set(config_idx_list)
+    def _build_zip_member_index(total_file_list):
+        """Returns the first and last config index and the name of all chunks
+        per filetype"""
+        member_ranges = {}
         for file in total_file_list:
-            match = re.search("config_idx_(?P<from>[0-9]+)_to_(?P<to>[0-9]+).{}".format(filetype), file)
+            match = re.search("config_idx_(?P<from>[0-9]+)_to_(?P<to>[0-9]+)\\.(?P<filetype>\\w+)$", file)
             if not match:
                 continue
-            range_dct = match.groupdict()
-            found_config = list(filter(lambda conf_idx: conf_idx >= int(range_dct["from"]) \
-                                 and conf_idx <= int(range_dct["to"]), config_idx_list))
-            configs_not_found -= set(found_config)
-            if len(found_config) > 0:
-                files_to_load.append(file)
+            member_ranges.setdefault(match.group("filetype"), []).append( \
+                (int(match.group("from")), int(match.group("to")), file))
+        member_index = {}
+        for filetype, ranges in member_ranges.items():
+            member_index[filetype] = (np.array([r[0] for r in ranges], dtype=np.int64),
+                                      np.array([r[1] for r in ranges], dtype=np.int64),
+                                      [r[2] for r in ranges])
+        return member_index
+
+    @staticmethod
+    def _find_files_to_load(member_index, filetype, config_idx_list):
+        if filetype not in member_index:
+            return [], set(config_idx_list)
+        range_from, range_to, files = member_index[filetype]
+        config_idxs = np.unique(np.asarray(config_idx_list, dtype=np.int64))
+        # the configs of each chunk are a slice of the sorted config indices
+        first = np.searchsorted(config_idxs, range_from, side="left")
+        last = np.searchsorted(config_idxs, range_to, side="right")
+        files_to_load = [file for file, num_found in zip(files, last - first) if num_found > 0]
+        covered = np.zeros(len(config_idxs) + 1, dtype=np.int64)
+        np.add.at(covered, first, 1)
+        np.add.at(covered, last, -1)
+        configs_not_found = set(config_idxs[np.cumsum(covered[:-1]) <= 0].tolist())
         return files_to_load, configs_not_found
 
     @staticmethod
-    def _load_and_merge(zip_file_handle, filetype, config_idx_list):
+    def _load_and_merge(zip_file_handle, filetype, config_idx_list, member_index=None):
         total_file_list = [filename for filename in zip_file_handle.namelist() \
                         if filetype in filename]
         configs_not_found = []
@@ -211,7 +328,9 @@ class BenchmarkResult:
             logging.warning("There are no files for type: {}. Have you forgotten to specify it in dump()?".format(filetype))
         files_to_load = total_file_list
         if config_idx_list:
-            files_to_load, configs_not_found = BenchmarkResult._find_files_to_load(total_file_list, \
+            member_index = member_index or \
+                BenchmarkResult._build_zip_member_index(total_file_list)
+            files_to_load, configs_not_found = BenchmarkResult._find_files_to_load(member_index, \
                 filetype, config_idx_list)
         merged_iterable = None
         for file in files_to_load:
@@ -289,19 +408,225 @@ class BenchmarkResult:
         logging.info("Saved BenchmarkResult to {}".format(
             os.path.abspath(filename)))
 
+    # checkpoint logs (see CheckpointLog) contain one record per config
+    @staticmethod
+    def load_checkpoint_log(filename, load_configs=False, load_histories=False):
+        result_dict = []
+        benchmark_configs = []
+        histories = {}
+        for record in CheckpointLog(filename).records( \
+                load_configs=load_configs, load_histories=load_histories):
+            result_dict.append(record.result_dict)
+            if load_configs and record.benchmark_config is not None:
+                benchmark_configs.append(record.benchmark_config)
+            if load_histories and record.history is not None:
+                histories[record.config_idx] = record.history
+        return BenchmarkResult(result_dict=result_dict, benchmark_configs=benchmark_configs,
+                               histories=histories, file_name=filename)
+
+    @staticmethod
+    def _load_checkpoint_log(filename, filetype, config_idx_list):
+        config_indices = set(config_idx_list) if config_idx_list else None
+        loaded = [] if filetype == "configs" else {}
+        for record in CheckpointLog(filename).records(load_configs=(filetype == "configs"),
+                                                      load_histories=(filetype == "histories")):
+            if config_indices is not None and record.config_idx not in config_indices:
+                continue
+            if filetype == "configs":
+                if record.benchmark_config is not None:
+                    loaded.append(record.benchmark_config)
+            elif record.history is not None:
+                loaded[record.config_idx] = record.history
+        found = [bc.config_idx for bc in loaded] if filetype == "configs" else loaded.keys()
+        configs_not_found = list(config_indices - set(found)) if config_indices else []
+        return loaded or None, configs_not_found, [filename]
+
+    # columnar format: a directory with the results as parquet file and one
+    # file per config for configs and histories, the agent states of a
+    # history are stored as numpy arrays that can be memory-mapped
+    @staticmethod
+    def is_columnar(filename):
+        return filename is not None and os.path.isdir(filename) and \
+            os.path.exists(os.path.join(filename, "benchmark_results.parquet"))
+
+    @staticmethod
+    def _columnar_file_name(dirname, filetype, config_idx, extension=None):
+        return os.path.join(dirname, filetype, "config_idx_{}.{}".format(
+            config_idx, extension or filetype))
+
+    @staticmethod
+    def _load_columnar(dirname, filetype, config_idx_list):
+        if config_idx_list is None:
+            config_idx_list = []
+            for file in os.listdir(os.path.join(dirname, filetype)):
+                match = re.fullmatch("config_idx_(?P<idx>[0-9]+)\\.{}".format(filetype), file)
+                if match:
+                    config_idx_list.append(int(match.group("idx")))
+        loaded = [] if filetype == "configs" else {}
+        configs_not_found = []
+        processed_files = []
+        for config_idx in sorted(config_idx_list):
+            file = BenchmarkResult._columnar_file_name(dirname, filetype, config_idx)
+            if not os.path.exists(file):
+                configs_not_found.append(config_idx)
+                continue
+            with open(file, 'rb') as handle:
+                value = pickle.load(handle)
+            if filetype == "histories" and hasattr(value, "HasStates") and not value.HasStates():
+                value.SetStateArrays(*BenchmarkResult._load_columnar_state_arrays(
+                    dirname, config_idx))
+            if filetype == "configs":
+                loaded.append(value)
+            else:
+                loaded[config_idx] = value
+            processed_files.append(file)
+        return loaded or None, configs_not_found, processed_files
+
+    @staticmethod
+    def _history_to_state_arrays(history):
+        """Stacks the agent states of all steps of a history into rows of
+        [step, agent id, state] and returns them with the row offsets per step,
+        None if the history does not contain scenarios"""
+        # compact histories (ScenarioHistory) store the states as arrays
+        if hasattr(history, "GetStateArrays"):
+            return history.GetStateArrays() if len(history) > 0 else None
+        rows = []
+        step_offsets = [0]
+        for step, scenario in enumerate(history):
+            agent_list = getattr(scenario, "_agent_list", None)
+            if agent_list is None:
+                return None
+            for agent in agent_list:
+                rows.append(np.concatenate(([step, agent.id], np.asarray(agent.state))))
+            step_offsets.append(len(rows))
+        try:
+            states = np.array(rows, dtype=np.float64)
+        except ValueError:
+            logging.warning("Agent states differ in size, not storing state arrays.")
+            return None
+        return states, np.array(step_offsets, dtype=np.int64)
+
+    @staticmethod
+    def _dump_columnar_entry(dirname, filetype, config_idx, value):
+        # the states of compact histories are only stored as numpy arrays
+        if filetype == "histories" and hasattr(value, "GetStateArrays") and len(value) > 0:
+            states, step_offsets = value.GetStateArrays()
+            np.save(BenchmarkResult._columnar_file_name(dirname, filetype, \
+                config_idx, "states.npy"), states)
+            np.save(BenchmarkResult._columnar_file_name(dirname, filetype, \
+                config_idx, "offsets.npy"), step_offsets)
+            value = value.WithoutStates()
+        with open(BenchmarkResult._columnar_file_name(dirname, filetype, config_idx), 'wb') as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load_columnar_state_arrays(dirname, config_idx, mmap_mode=None):
+        states = np.load(BenchmarkResult._columnar_file_name(dirname, \
+            "histories", config_idx, "states.npy"), mmap_mode=mmap_mode)
+        step_offsets = np.load(BenchmarkResult._columnar_file_name(dirname, \
+            "histories", config_idx, "offsets.npy"))
+        return states, step_offsets
+
+    @staticmethod
+    def _check_parquet_engine():
+        try:
+            import pyarrow
+        except ImportError:
+            try:
+                import fastparquet
+            except ImportError:
+                raise ImportError("The columnar format of BenchmarkResult requires "
+                    "pyarrow or fastparquet, install it using 'pip install pyarrow'.")
+
+    @staticmethod
+    def _make_columnar_dirs(dirname):
+        for filetype in ["configs", "histories"]:
+            os.makedirs(os.path.join(dirname, filetype), exist_ok=True)
+
+    @staticmethod
+    def load_results_columnar(dirname):
+        BenchmarkResult._check_parquet_engine()
+        data_frame = pd.read_parquet(os.path.join(dirname, "benchmark_results.parquet"))
+        return BenchmarkResult(data_frame = data_frame, file_name = dirname)
+
+    def dump_columnar(self, dirname, dump_configs=False, dump_histories=False):
+        BenchmarkResult._check_parquet_engine()
+        BenchmarkResult._make_columnar_dirs(dirname)
+        self.get_data_frame().to_parquet(os.path.join(dirname, "benchmark_results.parquet"))
+        if dump_configs:
+            for config in self.get_benchmark_configs():
+                BenchmarkResult._dump_columnar_entry(dirname, "configs", config.config_idx, config)
+        if dump_histories:
+            for config_idx, history in self.get_histories().items():
+                BenchmarkResult._dump_columnar_entry(dirname, "histories", config_idx, history)
+        logging.info("Saved BenchmarkResult to {}".format(
+            os.path.abspath(dirname)))
+
+    def get_history_states(self, config_idx):
+        """Returns the agent states of the history of a config as list with one
+        array per step, each row being [agent id, state], None if the history
+        has no agent states
+
+        The states of compact histories are memory-mapped, the ones of lists of
+        scenarios are extracted from the loaded history."""
+        if not BenchmarkResult.is_columnar(self.__file_name):
+            logging.warning("History states are only available for columnar results.")
+            return None
+        states_file = BenchmarkResult._columnar_file_name(self.__file_name, \
+            "histories", config_idx, "states.npy")
+        if os.path.exists(states_file):
+            states, step_offsets = BenchmarkResult._load_columnar_state_arrays(
+                self.__file_name, config_idx, mmap_mode='r')
+        else:
+            histories, _, _ = BenchmarkResult._load_columnar(
+                self.__file_name, "histories", [config_idx])
+            state_arrays = BenchmarkResult._history_to_state_arrays(histories[config_idx]) \
+                if histories else None
+            if state_arrays is None:
+                logging.warning("No history states for config idx {}".format(config_idx))
+                return None
+            states, step_offsets = state_arrays
+        return [states[step_offsets[step]:step_offsets[step+1], 1:] \
+                    for step in range(0, len(step_offsets) - 1)]
+
+    @staticmethod
+    def convert_to_columnar(filename, dirname):
+        """Converts a zip result (e.g. a .ckpnt file) into the columnar format,
+        loading only one of its config and history chunks at a time"""
+        BenchmarkResult._check_parquet_engine()
+        BenchmarkResult._make_columnar_dirs(dirname)
+        with zipfile.ZipFile(filename, 'r') as result_zip_file:
+            data_frame = pickle.loads(result_zip_file.read("benchmark.results"))
+            data_frame.to_parquet(os.path.join(dirname, "benchmark_results.parquet"))
+            for filetype in ["configs", "histories"]:
+                for file in result_zip_file.namelist():
+                    if not file.endswith(".{}".format(filetype)):
+                        continue
+                    chunk = pickle.loads(result_zip_file.read(file))
+                    if isinstance(chunk, list):
+                        chunk = {config.config_idx : config for config in chunk}
+                    for config_idx, value in chunk.items():
+                        BenchmarkResult._dump_columnar_entry(dirname, filetype, config_idx, value)
+                    del chunk
+        logging.info("Converted {} to {}".format(os.path.abspath(filename),
+            os.path.abspath(dirname)))
+        return BenchmarkResult.load_results_columnar(dirname)
+
     def extend(self, benchmark_result):
-        new_idxs = benchmark_result.get_benchmark_config_indices()
-        this_idxs = self.get_benchmark_config_indices()
-        overlap = set(new_idxs) & set(this_idxs)
-        if len(overlap) != 0:
+        new_configs = benchmark_result.get_benchmark_configs()
+        config_index = self._get_config_index()
+        if any(bc.config_idx in config_index for bc in new_configs):
             raise ValueError("Overlapping config indices. No extension possible.")
         self.__result_dict.extend(benchmark_result.get_result_dict())
-        self.__benchmark_configs.extend(benchmark_result.get_benchmark_configs())
+        self.__benchmark_configs.extend(new_configs)
+        for bc in new_configs:
+            config_index.setdefault(bc.config_idx, bc)
+        self.__config_index_length = len(self.__benchmark_configs)
 
         other_data_frame = benchmark_result.get_data_frame()
         if isinstance(self.__data_frame, pd.DataFrame):
             if isinstance(other_data_frame, pd.DataFrame):
-                self.__data_frame = pd.concat((self.__data_frame, other_data_frame))
+                self.__data_frames_to_concat.append(other_data_frame)
         else:
             if isinstance(other_data_frame, pd.DataFrame):
                 self.__data_frame = other_data_frame
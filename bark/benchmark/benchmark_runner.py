@@ -20,7 +20,10 @@ logging.getLogger().setLevel(logging.INFO)
 
 from bark.runtime.commons.parameters import ParameterServer
 from bark.runtime.scenario.scenario import Scenario
+from bark.runtime.scenario.scenario_history import ScenarioHistory
 from bark.benchmark.benchmark_result import BenchmarkResult, BenchmarkConfig, BehaviorConfig
+from bark.benchmark.checkpoint_log import CheckpointLog, CheckpointRecord
+from bark.core.world import RunEpisode, TerminalCondition, TerminalComparison
 from bark.core.world.evaluation import *
 
 try:
@@ -28,6 +31,36 @@ try:
 except Exception as e:
   logging.warning("LTL evaluators not loaded: {}".format(e))
 
+# evaluator types by name, the evaluators of a benchmark are looked up here
+_EVALUATOR_REGISTRY = {name: evaluator_type for name, evaluator_type in globals().items()
+                       if name.startswith("Evaluator")}
+
+# declarative terminal conditions given as (comparison, threshold) tuples
+_TERMINAL_COMPARISONS = {">": TerminalComparison.greater,
+                         ">=": TerminalComparison.greater_equal,
+                         "<": TerminalComparison.less,
+                         "<=": TerminalComparison.less_equal,
+                         "==": TerminalComparison.equal}
+
+
+def register_evaluator(name, evaluator_type):
+    """Makes an evaluator type, e.g. one implemented in Python, available to
+    the evaluators of a BenchmarkRunner by its name"""
+    _EVALUATOR_REGISTRY[name] = evaluator_type
+
+
+def _create_terminal_condition(evaluator_name, condition):
+    if isinstance(condition, TerminalCondition):
+        return condition
+    if isinstance(condition, bool):
+        return TerminalCondition(evaluator_name,
+            TerminalComparison.is_true if condition else TerminalComparison.is_false)
+    if isinstance(condition, tuple) and len(condition) == 2 and \
+          condition[0] in _TERMINAL_COMPARISONS:
+        return TerminalCondition(evaluator_name, _TERMINAL_COMPARISONS[condition[0]],
+                                 float(condition[1]))
+    raise ValueError("Invalid terminal condition {} for {}".format(condition, evaluator_name))
+
 
 class BenchmarkRunner:
     def __init__(self,
@@ -46,7 +79,11 @@ class BenchmarkRunner:
 
         self.benchmark_database = benchmark_database
         self.evaluators = evaluators or {}
-        self.terminal_when = terminal_when or []
+        self.terminal_when = terminal_when or {}
+        # conditions that are not Python callables are evaluated in C++
+        self._terminal_conditions = {evaluator_name: _create_terminal_condition(evaluator_name, condition)
+                                     for evaluator_name, condition in self.terminal_when.items()
+                                     if not callable(condition)}
         if behaviors:
           self.behavior_configs = BehaviorConfig.configs_from_dict(behaviors)
         else:
@@ -86,33 +123,41 @@ class BenchmarkRunner:
     @staticmethod
     def merge_checkpoint_benchmark_results(checkpoint_dir):
         checkpoint_files = glob.glob(os.path.join(checkpoint_dir, "**/*.ckpnt"), recursive=True)
-        merged_result = BenchmarkResult()
-        # merge all checkpoints with new results
-        for checkpoint_file in checkpoint_files:
-          logging.info("Loading checkpoint {}".format(os.path.abspath(checkpoint_file)))
-          next_result = BenchmarkResult.load(os.path.abspath(checkpoint_file), \
-              load_configs=True, load_histories=True)
-          merged_result.extend(next_result)
-        # dump merged result
-        if len(merged_result.get_result_dict()) > 0:
-          logging.info("Dumping merged result")
-          merged_result_filename = os.path.join(checkpoint_dir,"merged_results.ckpnt")
-          merged_result.dump(merged_result_filename, \
-              dump_configs=True, dump_histories=True)
+        merged_result_filename = os.path.join(checkpoint_dir,"merged_results.ckpnt")
+        # the records of all checkpoints are streamed into the merged checkpoint
+        num_merged = CheckpointLog.merge(checkpoint_files, merged_result_filename,
+            read_file=BenchmarkRunner._read_zip_checkpoint)
+        logging.info("Merged {} configs into {}".format(num_merged, merged_result_filename))
 
         # delete checkpoints
         for checkpoint_file in checkpoint_files:
-          if checkpoint_file == merged_result_filename:
+          if os.path.abspath(checkpoint_file) == os.path.abspath(merged_result_filename):
             continue
           os.remove(checkpoint_file)
           logging.info("Removed old checkpoint file {}".format(checkpoint_file))
-        return merged_result
+        # histories are only loaded on demand from the merged checkpoint
+        return BenchmarkResult.load(merged_result_filename, load_configs=True)
+
+    @staticmethod
+    def _read_zip_checkpoint(checkpoint_file):
+        # checkpoints written as zip file by former versions
+        logging.info("Loading checkpoint {}".format(os.path.abspath(checkpoint_file)))
+        result = BenchmarkResult.load(os.path.abspath(checkpoint_file), \
+            load_configs=True, load_histories=True)
+        if not result:
+          return
+        histories = result.get_histories()
+        for result_dict in result.get_result_dict():
+          config_idx = result_dict["config_idx"]
+          yield CheckpointRecord(config_idx, result_dict,
+                                 result.get_benchmark_config(config_idx),
+                                 histories.get(config_idx, None))
 
     @staticmethod
     def get_configs_to_run(benchmark_configs, existing_benchmark_result):
         existing_inds = existing_benchmark_result.get_benchmark_config_indices()
         required_inds = BenchmarkResult(benchmark_configs=benchmark_configs).get_benchmark_config_indices()
-        missing_inds = list(set(required_inds) - set(existing_inds))
+        missing_inds = set(required_inds) - set(existing_inds)
 
         filtered_configs = filter(lambda bc : bc.config_idx in missing_inds, benchmark_configs)
         return list(filtered_configs)
@@ -122,6 +167,11 @@ class BenchmarkRunner:
         for behavior_config in self.behavior_configs:
             # run over all scenario generators from benchmark database
             for scenario_generator, scenario_set_name, scenario_set_param_desc in self.benchmark_database:
+                if getattr(scenario_generator, "lazy", False):
+                    benchmark_configs.extend(self._create_lazy_configurations(
+                        len(benchmark_configs), behavior_config, scenario_generator,
+                        scenario_set_name, scenario_set_param_desc, num_scenarios))
+                    continue
                 for scenario, scenario_idx in scenario_generator:
                     if num_scenarios and scenario_idx >= num_scenarios:
                         break
@@ -143,9 +193,38 @@ class BenchmarkRunner:
                     benchmark_configs.append(benchmark_config)
         return benchmark_configs
 
+    @staticmethod
+    def _create_lazy_configurations(first_config_idx, behavior_config, scenario_generator,
+                                    scenario_set_name, scenario_set_param_desc, num_scenarios=None):
+        # the configs reference the scenarios by index, which are created
+        # by the generator when the config is run
+        num_configs = scenario_generator.num_scenarios
+        if num_scenarios:
+            num_configs = min(num_configs, num_scenarios)
+        benchmark_configs = []
+        for scenario_idx in range(0, num_configs):
+            temp_scenario_set_param_desc = scenario_set_param_desc.copy()
+            temp_scenario_set_param_desc.update(
+                scenario_generator.get_scenario_description(scenario_idx))
+            benchmark_configs.append(
+                BenchmarkConfig(
+                    first_config_idx + scenario_idx,
+                    behavior_config,
+                    None,
+                    scenario_idx,
+                    scenario_set_name,
+                    temp_scenario_set_param_desc,
+                    scenario_generator=scenario_generator
+                ))
+        return benchmark_configs
+
     def run(self, viewer=None, maintain_history=False, checkpoint_every=None):
         results = []
         histories = {}
+        if checkpoint_every:
+            checkpoint_log = CheckpointLog.create(
+                os.path.join(self.checkpoint_dir, self.get_checkpoint_file_name()))
+            records_to_checkpoint = []
         for idx, bmark_conf in enumerate(self.configs_to_run):
             self.logger.info("Running config idx {} being {}/{}: Scenario {} of set \"{}\" for behavior \"{}\"".format(
                 bmark_conf.config_idx, idx, len(self.benchmark_configs) - 1, bmark_conf.scenario_idx,
@@ -153,17 +232,25 @@ class BenchmarkRunner:
             bmark_conf = copy.deepcopy(bmark_conf) if self._deepcopy else bmark_conf
             result_dict, scenario_history = self._run_benchmark_config(bmark_conf, viewer,
                                                                        maintain_history)
+            # without deepcopy, lazy scenarios would stay cached on the configs
+            bmark_conf.release_scenario()
             results.append(result_dict)
             histories[bmark_conf.config_idx] = scenario_history
             if self.log_eval_avg_every and (idx + 1) % self.log_eval_avg_every == 0:
                 self._log_eval_average(results, self.configs_to_run)
 
-            if checkpoint_every and (idx+1) % checkpoint_every == 0:
-                intermediate_result = BenchmarkResult(results, \
-                         self.configs_to_run[0:idx+1], histories=histories)
-                checkpoint_file = os.path.join(self.checkpoint_dir, self.get_checkpoint_file_name())
-                intermediate_result.dump(checkpoint_file, dump_configs=True, dump_histories=maintain_history)
-                self.logger.info("Saved checkpoint {}".format(checkpoint_file))
+            if checkpoint_every:
+                # only the configs run since the last checkpoint are appended
+                records_to_checkpoint.append(CheckpointRecord(bmark_conf.config_idx,
+                    result_dict, self.configs_to_run[idx],
+                    scenario_history if maintain_history else None))
+                if (idx+1) % checkpoint_every == 0:
+                    checkpoint_log.append(records_to_checkpoint)
+                    records_to_checkpoint = []
+                    self.logger.info("Saved checkpoint {}".format(checkpoint_log.filename))
+        if checkpoint_every and len(records_to_checkpoint) > 0:
+            checkpoint_log.append(records_to_checkpoint)
+            self.logger.info("Saved checkpoint {}".format(checkpoint_log.filename))
         benchmark_result = BenchmarkResult(results, self.configs_to_run, histories=histories)
         self.existing_benchmark_result.extend(benchmark_result)
         return self.existing_benchmark_result
@@ -173,6 +260,7 @@ class BenchmarkRunner:
             if bmark_conf.config_idx == config_idx:
                 bmark_conf = copy.deepcopy(bmark_conf) if self._deepcopy else bmark_conf
                 result_dict, scenario_history = self._run_benchmark_config(bmark_conf, **kwargs)
+                bmark_conf.release_scenario()
                 return BenchmarkResult(result_dict, [bmark_conf], histories={config_idx : scenario_history})
         self.logger.error("Config idx {} not found in benchmark configs. Skipping...".format(config_idx))
         return
@@ -181,7 +269,9 @@ class BenchmarkRunner:
         scenario = benchmark_config.scenario
         behavior = benchmark_config.behavior_config.behavior
         parameter_server = ParameterServer(json=scenario._json_params)
-        scenario_history = []
+        # compact histories store the agents once and then only their states
+        scenario_history = ScenarioHistory(scenario) \
+            if maintain_history == "compact" else []
         step = 0
         try:
             world = scenario.GetWorldState()
@@ -195,13 +285,16 @@ class BenchmarkRunner:
 
         # if behavior is not None (None specifies that also the default model can be evalauted)
         if behavior:
-            world.agents[scenario._eval_agent_ids[0]].behavior_model = behavior
+            world.GetMutableAgent(scenario._eval_agent_ids[0]).behavior_model = behavior
         if maintain_history:
             self._append_to_scenario_history(scenario_history, world, scenario)
         self._reset_evaluators(world, scenario._eval_agent_ids)
         step_time = parameter_server["Simulation"]["StepTime", "", 0.2]
         if not isinstance(step_time, float):
             step_time = 0.2
+        if not viewer and not maintain_history and \
+              len(self._terminal_conditions) == len(self.terminal_when):
+            return self._run_episode(benchmark_config, world, step_time), scenario_history
         terminal = False
         terminal_why = None
         while not terminal:
@@ -251,7 +344,25 @@ class BenchmarkRunner:
 
         return dct, scenario_history
 
+    def _run_episode(self, benchmark_config, world, step_time):
+        # runs the whole episode in C++ if all terminal conditions are declarative
+        episode_result = RunEpisode(world, list(self._terminal_conditions.values()), step_time)
+        terminal_why = episode_result.terminal_reasons
+        if episode_result.exception_raised:
+            self.logger.error("For config-idx {}, Exception thrown in episode: {}".format(
+                benchmark_config.config_idx, episode_result.exception_message))
+            terminal_why = "exception_raised"
+            self._append_exception(benchmark_config,
+                                   RuntimeError(episode_result.exception_message))
+        return {**benchmark_config.as_dict(),
+                "step": episode_result.num_steps,
+                **episode_result.evaluation,
+                "Terminal": terminal_why}
+
     def _append_to_scenario_history(self, scenario_history, world, scenario):
+        if isinstance(scenario_history, ScenarioHistory):
+            scenario_history.Record(world)
+            return
         scenario = Scenario(agent_list=list(world.agents.values()),
                             map_file_name=scenario.map_file_name,
                             eval_agent_ids=scenario.eval_agent_ids,
@@ -265,13 +376,14 @@ class BenchmarkRunner:
         for evaluator_name, evaluator_params in self.evaluators.items():
             evaluator_bark = None
             if isinstance(evaluator_params, str):
+                evaluator_type = _EVALUATOR_REGISTRY[evaluator_params]
                 try:
-                    evaluator_bark = eval("{}(eval_agent_ids[0])".format(evaluator_params))
-                except:
-                    evaluator_bark = eval("{}()".format(evaluator_params))
+                    evaluator_bark = evaluator_type(eval_agent_ids[0])
+                except TypeError:
+                    evaluator_bark = evaluator_type()
             elif isinstance(evaluator_params, dict):
-                evaluator_bark = eval(
-                    "{}(agent_id=eval_agent_ids[0], **evaluator_params['params'])".format(evaluator_params["type"]))
+                evaluator_bark = _EVALUATOR_REGISTRY[evaluator_params["type"]](
+                    agent_id=eval_agent_ids[0], **evaluator_params['params'])
             else:
                 raise ValueError
             world.AddEvaluator(evaluator_name, evaluator_bark)
@@ -287,8 +399,13 @@ class BenchmarkRunner:
     def _is_terminal(self, evaluation_dict):
         terminal = False
         terminal_why = []
-        for evaluator_name, function in self.terminal_when.items():
-            if function(evaluation_dict[evaluator_name]):
+        for evaluator_name, condition in self.terminal_when.items():
+            if evaluator_name in self._terminal_conditions:
+                is_terminal = self._terminal_conditions[evaluator_name].IsTerminal(
+                    evaluation_dict[evaluator_name])
+            else:
+                is_terminal = condition(evaluation_dict[evaluator_name])
+            if is_terminal:
                 terminal = True
                 terminal_why.append(evaluator_name)
         return terminal, terminal_why
@@ -0,0 +1,179 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import copy
+import queue
+import pickle
+import logging
+import multiprocessing
+
+logging.getLogger().setLevel(logging.INFO)
+
+from bark.benchmark.benchmark_result import BenchmarkResult
+from bark.benchmark.benchmark_runner import BenchmarkRunner
+from bark.benchmark.checkpoint_log import CheckpointLog, CheckpointRecord
+
+# implement a parallelized version of benchmark running based on a local
+# process pool: the workers pull config indices from a shared queue, such that
+# long and short scenarios are balanced dynamically, and send every result
+# back as soon as it is finished
+
+# the workers are forked to inherit the runner including its lambdas
+_MP_CONTEXT = multiprocessing.get_context("fork")
+
+
+class BenchmarkRunnerPool(BenchmarkRunner):
+    def __init__(self, benchmark_database=None,
+               evaluators=None,
+               terminal_when=None,
+               behaviors=None,
+               behavior_configs=None,
+               num_scenarios=None,
+               benchmark_configs=None,
+               log_eval_avg_every=None,
+               checkpoint_dir=None,
+               merge_existing=False,
+               num_workers=None,
+               deepcopy=True):
+        super().__init__(benchmark_database=benchmark_database,
+                          evaluators=evaluators, terminal_when=terminal_when,
+                          behaviors=behaviors, behavior_configs=behavior_configs,
+                          num_scenarios=num_scenarios, benchmark_configs=benchmark_configs,
+                          logger_name="BenchmarkRunnerPool",
+                          log_eval_avg_every=log_eval_avg_every,
+                          checkpoint_dir=checkpoint_dir, merge_existing=merge_existing,
+                          deepcopy=deepcopy)
+        self.num_workers = num_workers or os.cpu_count()
+        self.worker_id = None
+
+    def get_checkpoint_file_name(self):
+        if self.worker_id is None:
+            return super().get_checkpoint_file_name()
+        # the process id separates the logs of concurrent and earlier runs
+        return "benchmark_runner_worker{}_{}.ckpnt".format(os.getpid(), self.worker_id)
+
+    def run(self, viewer=None, maintain_history=False, checkpoint_every=None):
+        if viewer:
+            self.logger.warning("Viewer is not supported by BenchmarkRunnerPool.")
+        results = []
+        configs = []
+        histories = {}
+        for result in self.run_iter(maintain_history=maintain_history,
+                                    checkpoint_every=checkpoint_every):
+            results.extend(result.get_result_dict())
+            configs.extend(result.get_benchmark_configs())
+            histories.update(result.get_histories())
+            if self.log_eval_avg_every and len(results) % self.log_eval_avg_every == 0:
+                self._log_eval_average(results, configs)
+        benchmark_result = BenchmarkResult(results, configs, histories=histories)
+        self.existing_benchmark_result.extend(benchmark_result)
+        return self.existing_benchmark_result
+
+    def run_iter(self, maintain_history=False, checkpoint_every=None):
+        """Runs all configs to run on the worker processes and yields a
+        BenchmarkResult for each config in the order they finish"""
+        task_queue = _MP_CONTEXT.Queue()
+        result_queue = _MP_CONTEXT.Queue()
+        for bmark_conf in self.configs_to_run:
+            task_queue.put(bmark_conf.config_idx)
+        num_workers = max(1, min(self.num_workers, len(self.configs_to_run)))
+        for _ in range(num_workers):
+            task_queue.put(None)
+
+        workers = [_MP_CONTEXT.Process(target=self._run_worker,
+                                       args=(worker_id, task_queue, result_queue,
+                                             maintain_history, checkpoint_every))
+                   for worker_id in range(num_workers)]
+        for worker in workers:
+            worker.start()
+
+        configs_by_idx = {bc.config_idx : bc for bc in self.configs_to_run}
+        running_workers = set(range(num_workers))
+        num_finished = 0
+        while running_workers:
+            try:
+                worker_id, config_idx, result_dict, scenario_history, exceptions = \
+                    result_queue.get(timeout=1.0)
+            except queue.Empty:
+                # a crashed worker never reports that it is done
+                for worker_id in list(running_workers):
+                    if not workers[worker_id].is_alive():
+                        self.logger.error("Worker {} exited with code {}".format(
+                            worker_id, workers[worker_id].exitcode))
+                        running_workers.discard(worker_id)
+                continue
+            if config_idx is None:
+                running_workers.discard(worker_id)
+                continue
+            num_finished += 1
+            # exceptions caught and recorded while running the config
+            self.exceptions_caught.extend(exceptions)
+            if result_dict is None:
+                self.logger.error("For config-idx {}, Exception thrown in worker {}: {}".format(
+                    config_idx, worker_id, scenario_history))
+                self._append_exception(configs_by_idx[config_idx], scenario_history)
+                continue
+            self.logger.info("Finished config idx {} on worker {} ({}/{})".format(
+                config_idx, worker_id, num_finished, len(self.configs_to_run)))
+            yield BenchmarkResult([result_dict], [configs_by_idx[config_idx]],
+                                  histories={config_idx : scenario_history})
+        for worker in workers:
+            worker.join()
+
+    def _run_worker(self, worker_id, task_queue, result_queue, maintain_history,
+                    checkpoint_every):
+        self.worker_id = worker_id
+        configs_by_idx = {bc.config_idx : bc for bc in self.configs_to_run}
+        if checkpoint_every:
+            # appends to the log if a former worker used the same process id
+            checkpoint_log = CheckpointLog(
+                os.path.join(self.checkpoint_dir, self.get_checkpoint_file_name()))
+        records_to_checkpoint = []
+        while True:
+            config_idx = task_queue.get()
+            if config_idx is None:
+                break
+            bmark_conf = configs_by_idx[config_idx]
+            num_exceptions = len(self.exceptions_caught)
+            try:
+                bmark_conf = copy.deepcopy(bmark_conf) if self._deepcopy else bmark_conf
+                result_dict, scenario_history = self._run_benchmark_config(
+                    bmark_conf, None, maintain_history)
+                bmark_conf.release_scenario()
+            except Exception as e:
+                result_queue.put((worker_id, config_idx, None, str(e), []))
+                continue
+            exceptions = [(idx, _picklable_exception(exception)) for idx, exception \
+                            in self.exceptions_caught[num_exceptions:]]
+            result_queue.put((worker_id, config_idx, result_dict, scenario_history,
+                              exceptions))
+
+            if checkpoint_every:
+                records_to_checkpoint.append(CheckpointRecord(config_idx, result_dict,
+                    configs_by_idx[config_idx], scenario_history if maintain_history else None))
+                if len(records_to_checkpoint) == checkpoint_every:
+                    self._append_checkpoint(checkpoint_log, records_to_checkpoint)
+                    records_to_checkpoint = []
+        if checkpoint_every and len(records_to_checkpoint) > 0:
+            self._append_checkpoint(checkpoint_log, records_to_checkpoint)
+        result_queue.put((worker_id, None, None, None, []))
+
+    def _append_checkpoint(self, checkpoint_log, records):
+        checkpoint_log.append(records)
+        self.logger.info("Saved checkpoint {}".format(checkpoint_log.filename))
+
+
+def _picklable_exception(exception):
+    # exceptions are sent to the parent process, which fails silently for
+    # exceptions that cannot be pickled
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:
+        return RuntimeError(str(exception))
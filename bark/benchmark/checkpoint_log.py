@@ -0,0 +1,182 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import pickle
+import struct
+import zlib
+import logging
+
+# file layout: the magic bytes followed by one record per finished config,
+# each record being a header with the checksum and the sizes of the pickled
+# result, config and history followed by the three pickles
+_MAGIC = b"BARKCKPNTLOG1\n"
+_RECORD_HEADER = struct.Struct("<IQQQ")
+# number of records written at once when merging logs
+_MERGE_BATCH_SIZE = 100
+
+
+class CheckpointRecord:
+    def __init__(self, config_idx, result_dict, benchmark_config=None, history=None):
+        self.config_idx = config_idx
+        self.result_dict = result_dict
+        self.benchmark_config = benchmark_config
+        self.history = history
+
+
+class CheckpointLog:
+    """Append-only log of the finished configs of a benchmark run
+
+    Records are only appended, thus, the cost of a checkpoint does not grow
+    with the number of configs that have been run before. A record that was
+    truncated or corrupted, e.g. by a crash while writing, and all records
+    after it are ignored when reading and overwritten when appending.
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        # the end of the valid records is searched before the first append
+        self._checked = False
+
+    @staticmethod
+    def create(filename):
+        """Creates an empty log, an existing file is overwritten"""
+        with open(filename, "wb") as handle:
+            handle.write(_MAGIC)
+            handle.flush()
+            os.fsync(handle.fileno())
+        checkpoint_log = CheckpointLog(filename)
+        checkpoint_log._checked = True
+        return checkpoint_log
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @staticmethod
+    def is_checkpoint_log(filename):
+        if filename is None or not os.path.isfile(filename):
+            return False
+        with open(filename, "rb") as handle:
+            return handle.read(len(_MAGIC)) == _MAGIC
+
+    @staticmethod
+    def _encode(record):
+        pickles = [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in \
+                      [(record.config_idx, record.result_dict), record.benchmark_config,
+                       record.history]]
+        payload = b"".join(pickles)
+        return _RECORD_HEADER.pack(zlib.crc32(payload), *[len(p) for p in pickles]) + payload
+
+    def append(self, records):
+        """Appends the records with a single write and syncs them to disk"""
+        self._append_data(b"".join([CheckpointLog._encode(record) for record in records]))
+
+    def _append_data(self, data):
+        if not data:
+            return
+        if not self._checked:
+            if CheckpointLog.is_checkpoint_log(self._filename):
+                self._truncate(self._find_valid_end())
+            else:
+                CheckpointLog.create(self._filename)
+            self._checked = True
+        with open(self._filename, "ab") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _read_raw_records(self):
+        # yields the end offset of each valid record with its header and payload
+        with open(self._filename, "rb") as handle:
+            if handle.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError("{} is not a checkpoint log".format(self._filename))
+            offset = len(_MAGIC)
+            while True:
+                header = handle.read(_RECORD_HEADER.size)
+                if len(header) == 0:
+                    return
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                crc, *sizes = _RECORD_HEADER.unpack(header)
+                payload = handle.read(sum(sizes))
+                if len(payload) < sum(sizes) or zlib.crc32(payload) != crc:
+                    break
+                offset += _RECORD_HEADER.size + len(payload)
+                yield offset, header, payload
+        logging.warning("Ignoring incomplete record at byte {} of {}".format(
+            offset, self._filename))
+
+    def _read_records(self, load_configs, load_histories):
+        # yields the end offset of each valid record with the record
+        for offset, header, payload in self._read_raw_records():
+            _, *sizes = _RECORD_HEADER.unpack(header)
+            config_idx, result_dict = pickle.loads(payload[0:sizes[0]])
+            benchmark_config = pickle.loads(payload[sizes[0]:sizes[0] + sizes[1]]) \
+                                  if load_configs else None
+            history = pickle.loads(payload[sizes[0] + sizes[1]:]) \
+                                  if load_histories else None
+            yield offset, CheckpointRecord(config_idx, result_dict, benchmark_config, history)
+
+    def records(self, load_configs=True, load_histories=True):
+        """Yields the valid records one by one"""
+        for _, record in self._read_records(load_configs, load_histories):
+            yield record
+
+    def _encoded_records(self):
+        # yields the config index of each valid record with its encoding, only
+        # the result pickle is loaded
+        for _, header, payload in self._read_raw_records():
+            result_size = _RECORD_HEADER.unpack(header)[1]
+            config_idx, _ = pickle.loads(payload[0:result_size])
+            yield config_idx, header + payload
+
+    def _find_valid_end(self):
+        offset = len(_MAGIC)
+        for offset, _, _ in self._read_raw_records():
+            pass
+        return offset
+
+    def _truncate(self, offset):
+        if os.path.getsize(self._filename) > offset:
+            with open(self._filename, "r+b") as handle:
+                handle.truncate(offset)
+
+    @staticmethod
+    def merge(filenames, merged_filename, read_file=None):
+        """Streams the records of the files into a new log, keeping the first
+        record of each config index, and returns the number of records
+
+        read_file(filename) yields the records of files that are no checkpoint
+        logs, e.g. checkpoints in the zip format"""
+        tmp_filename = merged_filename + ".tmp"
+        merged_log = CheckpointLog.create(tmp_filename)
+        config_indices = set()
+        data_to_append = []
+        for filename in filenames:
+            # records of checkpoint logs are copied without unpickling them
+            if CheckpointLog.is_checkpoint_log(filename):
+                encoded_records = CheckpointLog(filename)._encoded_records()
+            elif read_file:
+                encoded_records = ((record.config_idx, CheckpointLog._encode(record)) \
+                                      for record in read_file(filename))
+            else:
+                logging.warning("Skipping {}, it is not a checkpoint log".format(filename))
+                continue
+            for config_idx, data in encoded_records:
+                if config_idx in config_indices:
+                    logging.warning("Skipping duplicate config idx {} in {}".format(
+                        config_idx, filename))
+                    continue
+                config_indices.add(config_idx)
+                data_to_append.append(data)
+                if len(data_to_append) >= _MERGE_BATCH_SIZE:
+                    merged_log._append_data(b"".join(data_to_append))
+                    data_to_append = []
+        merged_log._append_data(b"".join(data_to_append))
+        os.replace(tmp_filename, merged_filename)
+        return len(config_indices)
@@ -75,11 +75,16 @@ class ScenarioDumper(BenchmarkAnalyzer):
     if histories is None:
       logging.warning("No historic state saved, cannot dump trajetory")
       return
-    scenario = histories[-1] #the last state inclues all the historic states
-    world = scenario.GetWorldState()
-    for (agent_id, agent) in world.agents.items():
-      for state_action in agent.history:
-        state = state_action[0]
+    if hasattr(histories, "GetAgentTrajectories"):
+      # compact histories contain the states of all steps
+      trajectory_per_agents = histories.GetAgentTrajectories()
+    else:
+      scenario = histories[-1] #the last state inclues all the historic states
+      world = scenario.GetWorldState()
+      trajectory_per_agents = {agent_id: [state_action[0] for state_action in agent.history] \
+        for agent_id, agent in world.agents.items()}
+    for agent_id, trajectory in trajectory_per_agents.items():
+      for state in trajectory:
         table.append([agent_id, state[0], state[1], state[2], state[3], state[4]])
     np_table = np.array(table)
     df = pd.DataFrame(np_table, columns=cols)
@@ -146,9 +151,13 @@ class OpenScenarioDumper(ScenarioDumper):
       return
     # one history for each time-step
     total_history_length = len(histories)
-    scenario = histories[-1]  # the last state inclues all the historic states
-    world = scenario.GetWorldState()
-    trajectory_per_agents = self.GetTrajectoryPerAgent(world)
+    if hasattr(histories, "GetAgentTrajectories"):
+      # compact histories contain the states of all steps
+      trajectory_per_agents = histories.GetAgentTrajectories()
+    else:
+      scenario = histories[-1]  # the last state inclues all the historic states
+      world = scenario.GetWorldState()
+      trajectory_per_agents = self.GetTrajectoryPerAgent(world)
     temp_vertex, temp_xml = self.GetTemplates()
     
     for agent_id, traj in trajectory_per_agents.items():
@@ -66,6 +66,13 @@ class BenchmarkAnalyzerTests(unittest.TestCase):
         configs_found = analyzer.find_configs(scenario_idx_list=[4, 10, 7], in_configs=[1, 42])
         self.assertEqual(configs_found, [1, 42])
 
+        # values instead of functions are compared for equality
+        configs_found = analyzer.find_configs({"collision" : True, "behavior" : "test"})
+        self.assertEqual(configs_found, [1, 500, 11])
+
+        configs_found = analyzer.find_configs({"behavior" : lambda x : x.startswith("test1")})
+        self.assertEqual(configs_found, [24, 41, 3, 12, 35, 42])
+
     def test_make_scenarios_congruent(self):
         brst = BenchmarkResult(result_dict=dummy_benchmark_results(), benchmark_configs=None)
         analyzer = BenchmarkAnalyzer(benchmark_result = brst)
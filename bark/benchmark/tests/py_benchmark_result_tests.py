@@ -6,6 +6,8 @@
 import unittest
 import os
 import random
+import pickle
+import numpy as np
 
 try:
     import debug_settings
@@ -14,6 +16,7 @@ except:
 
 
 from bark.benchmark.benchmark_result import BenchmarkResult
+from bark.benchmark.checkpoint_log import CheckpointLog, CheckpointRecord
 
 def random_result_data(size):
     columns = ['value1', 'value2', 'value3', 'value4']
@@ -37,6 +40,43 @@ def random_benchmark_conf_data(num_confs, conf_size):
     confs = [ TestConfig(i, conf_size)for i in range(0, num_confs)]
     return confs
 
+class TestAgent:
+    def __init__(self, id, state):
+        self.id = id
+        self.state = state
+
+class TestScenario:
+    def __init__(self, agent_list):
+        self._agent_list = agent_list
+
+class TestStateHistory:
+    """Stores the states like the ScenarioHistory as arrays per step"""
+    def __init__(self, states, payload):
+        self._states = states
+        self.payload = payload
+    def __len__(self):
+        return len(self._states)
+    def __eq__(self, other):
+        return self.payload == other.payload and \
+          all((a == b).all() for a, b in zip(self._states, other._states))
+    def GetStateArrays(self):
+        rows = [np.column_stack((np.full(len(states), step), states)) \
+                  for step, states in enumerate(self._states)]
+        return np.concatenate(rows), np.cumsum([0] + [len(s) for s in self._states])
+    def WithoutStates(self):
+        return TestStateHistory(None, self.payload)
+    def HasStates(self):
+        return self._states is not None
+    def SetStateArrays(self, states, step_offsets):
+        self._states = [np.array(states[step_offsets[step]:step_offsets[step + 1], 1:]) \
+                          for step in range(0, len(step_offsets) - 1)]
+
+def scenario_history_data(history_num, num_steps, num_agents):
+    histories = {i : [TestScenario([TestAgent(agent_id, [step, agent_id*1.0, 0.0, 0.0, 5.0]) \
+                    for agent_id in range(0, num_agents)]) for step in range(0, num_steps)] \
+                  for i in range(0, history_num)}
+    return histories
+
 class DatabaseRunnerTests(unittest.TestCase):
     def test_dump_and_load_results(self):
         result_data = random_result_data(size = 10)
@@ -102,6 +142,164 @@ class DatabaseRunnerTests(unittest.TestCase):
         for conf_idx in loaded_configs_idx:
             self.assertEqual(br_loaded.get_history(conf_idx), histories[conf_idx])
 
+    def test_dump_and_load_columnar(self):
+        result_num = 20
+        result_data = random_result_data(size = result_num)
+        confs = random_benchmark_conf_data(result_num, 1000)
+        histories = random_history_data(result_num, 1000)
+        br = BenchmarkResult(result_dict=result_data,
+          benchmark_configs=confs, histories=histories)
+        br.dump_columnar("./results_columnar", dump_configs=True, dump_histories=True)
+        br_loaded = BenchmarkResult.load("./results_columnar")
+        self.assertEqual(br.get_result_dict(), br_loaded.get_result_dict())
+
+        loaded_configs_idx = list(range(5, 8))
+        processed_files = br_loaded.load_benchmark_configs(config_idx_list = loaded_configs_idx)
+        self.assertEqual(len(processed_files), 3)
+        for conf_idx in loaded_configs_idx:
+            self.assertEqual(br_loaded.get_benchmark_config(conf_idx), confs[conf_idx])
+
+        processed_files = br_loaded.load_histories(config_idx_list = [3])
+        self.assertEqual(len(br_loaded.get_histories()), 1)
+        self.assertEqual(br_loaded.get_history(3), histories[3])
+
+        br_all = BenchmarkResult.load("./results_columnar", load_configs=True, load_histories=True)
+        self.assertEqual(br_all.get_benchmark_configs(), confs)
+        self.assertEqual(br_all.get_histories(), histories)
+
+    def test_columnar_history_states(self):
+        result_num = 5
+        result_data = random_result_data(size = result_num)
+        histories = scenario_history_data(result_num, num_steps=10, num_agents=3)
+        br = BenchmarkResult(result_dict=result_data, histories=histories)
+        br.dump_columnar("./results_columnar_states", dump_histories=True)
+        br_loaded = BenchmarkResult.load("./results_columnar_states")
+        states = br_loaded.get_history_states(2)
+        self.assertEqual(len(states), 10)
+        self.assertEqual(states[4].shape, (3, 6))
+        self.assertEqual(list(states[4][1]), [1.0, 4.0, 1.0, 0.0, 0.0, 5.0])
+
+    def test_columnar_history_states_stored_once(self):
+        result_num = 3
+        result_data = random_result_data(size = result_num)
+        histories = {i : TestStateHistory([np.array([[agent_id, step, i, 0.0, 5.0] \
+                        for agent_id in range(0, 4)]) for step in range(0, 6)], bytearray(os.urandom(100))) \
+                      for i in range(0, result_num)}
+        br = BenchmarkResult(result_dict=result_data, histories=histories)
+        br.dump_columnar("./results_columnar_compact", dump_histories=True)
+        with open("./results_columnar_compact/histories/config_idx_1.histories", "rb") as handle:
+            self.assertFalse(pickle.load(handle).HasStates())
+        br_loaded = BenchmarkResult.load("./results_columnar_compact", load_histories=True)
+        self.assertEqual(br_loaded.get_histories(), histories)
+        states = br_loaded.get_history_states(1)
+        self.assertEqual(len(states), 6)
+        self.assertEqual(list(states[2][3]), [3.0, 2.0, 1.0, 0.0, 5.0])
+
+    def test_convert_to_columnar(self):
+        result_num = 30
+        result_data = random_result_data(size = result_num)
+        confs = random_benchmark_conf_data(result_num, 500000)
+        histories = random_history_data(result_num, 500000)
+        br = BenchmarkResult(result_dict=result_data,
+          benchmark_configs=confs, histories=histories)
+        br.dump("./results_to_convert.ckpnt", dump_configs=True, dump_histories=True, max_mb_per_file = 2)
+        BenchmarkResult.convert_to_columnar("./results_to_convert.ckpnt", "./results_converted")
+        br_loaded = BenchmarkResult.load("./results_converted", load_configs=True, load_histories=True)
+        self.assertEqual(br.get_result_dict(), br_loaded.get_result_dict())
+        self.assertEqual(br_loaded.get_benchmark_configs(), confs)
+        self.assertEqual(br_loaded.get_histories(), histories)
+
+    def test_extend_and_config_lookup(self):
+        merged = BenchmarkResult()
+        for first_idx in range(0, 100, 10):
+            confs = [TestConfig(i, 10) for i in range(first_idx, first_idx + 10)]
+            results = [{"config_idx": i, "value": i*2} for i in range(first_idx, first_idx + 10)]
+            merged.extend(BenchmarkResult(result_dict=results, benchmark_configs=confs))
+        self.assertEqual(merged.get_benchmark_config(42).config_idx, 42)
+        self.assertEqual(merged.get_benchmark_config(100), None)
+        df = merged.get_data_frame()
+        self.assertEqual(len(df.index), 100)
+        self.assertEqual(list(df["config_idx"]), list(range(0, 100)))
+        # the extended data frames keep their index
+        self.assertEqual(list(df.index), list(range(0, 10))*10)
+        with self.assertRaises(ValueError):
+            merged.extend(BenchmarkResult(benchmark_configs=[TestConfig(5, 10)]))
+        # configs appended to the list from outside are found as well
+        merged.get_benchmark_configs().append(TestConfig(100, 10))
+        self.assertEqual(merged.get_benchmark_config(100).config_idx, 100)
+        # duplicate config indices of merged results do not rebuild the index
+        duplicate_confs = [TestConfig(7, 10), TestConfig(7, 10)]
+        duplicates = BenchmarkResult(benchmark_configs=duplicate_confs)
+        config_index = duplicates._get_config_index()
+        self.assertTrue(duplicates._get_config_index() is config_index)
+        self.assertTrue(duplicates.get_benchmark_config(7) is duplicate_confs[0])
+
+    def test_find_files_to_load(self):
+        file_list = ["configs/config_idx_0_to_4.configs", "configs/config_idx_5_to_9.configs",
+                     "histories/config_idx_0_to_9.histories", "benchmark.results",
+                     "configs/config_idx_12_to_15.configs"]
+        member_index = BenchmarkResult._build_zip_member_index(file_list)
+        files_to_load, configs_not_found = BenchmarkResult._find_files_to_load(
+            member_index, "configs", [14, 3, 10, 4, 20])
+        self.assertEqual(files_to_load, ["configs/config_idx_0_to_4.configs",
+                                         "configs/config_idx_12_to_15.configs"])
+        self.assertEqual(configs_not_found, {10, 20})
+        files_to_load, configs_not_found = BenchmarkResult._find_files_to_load(
+            member_index, "histories", [9])
+        self.assertEqual(files_to_load, ["histories/config_idx_0_to_9.histories"])
+        self.assertEqual(configs_not_found, set())
+
+    def test_checkpoint_log(self):
+        result_num = 10
+        result_data = [{"config_idx": i, "value": i} for i in range(0, result_num)]
+        confs = random_benchmark_conf_data(result_num, 100)
+        histories = random_history_data(result_num, 100)
+        checkpoint_log = CheckpointLog.create("./results_log.ckpnt")
+        for first_idx in range(0, result_num, 4):
+            checkpoint_log.append([CheckpointRecord(i, result_data[i], confs[i], histories[i]) \
+                for i in range(first_idx, min(first_idx + 4, result_num))])
+        br_loaded = BenchmarkResult.load("./results_log.ckpnt", load_configs=True, load_histories=True)
+        self.assertEqual(br_loaded.get_result_dict(), result_data)
+        self.assertEqual(br_loaded.get_benchmark_configs(), confs)
+        self.assertEqual(br_loaded.get_histories(), histories)
+
+        br_loaded = BenchmarkResult.load("./results_log.ckpnt")
+        br_loaded.load_histories(config_idx_list=[2, 3])
+        self.assertEqual(br_loaded.get_histories(), {2: histories[2], 3: histories[3]})
+
+        # a truncated record is ignored and overwritten by the next append
+        with open("./results_log.ckpnt", "r+b") as handle:
+            handle.truncate(os.path.getsize("./results_log.ckpnt") - 10)
+        br_loaded = BenchmarkResult.load("./results_log.ckpnt")
+        self.assertEqual(len(br_loaded.get_result_dict()), result_num - 1)
+        checkpoint_log = CheckpointLog("./results_log.ckpnt")
+        checkpoint_log.append([CheckpointRecord(9, result_data[9], confs[9], histories[9])])
+        br_loaded = BenchmarkResult.load("./results_log.ckpnt", load_configs=True)
+        self.assertEqual(br_loaded.get_benchmark_configs(), confs)
+
+    def test_merge_checkpoint_logs(self):
+        result_data = [{"config_idx": i, "value": i} for i in range(0, 6)]
+        confs = random_benchmark_conf_data(6, 100)
+        for log_idx in range(0, 2):
+            checkpoint_log = CheckpointLog.create("./results_log{}.ckpnt".format(log_idx))
+            checkpoint_log.append([CheckpointRecord(i, result_data[i], confs[i]) \
+                for i in range(log_idx*3, log_idx*3 + 3)])
+        # records of config indices that were already merged are skipped
+        log1_size = os.path.getsize("./results_log1.ckpnt")
+        checkpoint_log.append([CheckpointRecord(0, result_data[0], confs[0])])
+        num_merged = CheckpointLog.merge(["./results_log0.ckpnt", "./results_log1.ckpnt"],
+                                         "./results_merged.ckpnt")
+        self.assertEqual(num_merged, 6)
+        # the records are copied unchanged
+        with open("./results_log0.ckpnt", "rb") as log0, open("./results_log1.ckpnt", "rb") as log1, \
+                open("./results_merged.ckpnt", "rb") as merged:
+            magic = log0.read(14)
+            log1.read(len(magic))
+            self.assertEqual(merged.read(), magic + log0.read() + log1.read(log1_size - len(magic)))
+        br_loaded = BenchmarkResult.load("./results_merged.ckpnt", load_configs=True)
+        self.assertEqual(br_loaded.get_result_dict(), result_data)
+        self.assertEqual(br_loaded.get_benchmark_configs(), confs)
+
 
 if __name__ == '__main__':
     unittest.main()
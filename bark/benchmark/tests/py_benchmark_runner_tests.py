@@ -9,7 +9,9 @@
 import unittest
 import os
 import time
+import pickle
 import ray
+import numpy as np
 
 try:
     import debug_settings
@@ -21,12 +23,15 @@ from serialization.database_serializer import DatabaseSerializer
 from bark.benchmark.benchmark_runner import BenchmarkRunner, BenchmarkConfig
 from bark.benchmark.benchmark_runner_mp import BenchmarkRunnerMP, _BenchmarkRunnerActor, \
   deserialize_benchmark_config, serialize_benchmark_config
+from bark.benchmark.benchmark_runner_pool import BenchmarkRunnerPool
 
 from bark.runtime.viewer.matplotlib_viewer import MPViewer
 
 from bark.core.world.evaluation import *
 from bark.core.world.evaluation.ltl import ConstantLabelFunction
 from bark.runtime.commons.parameters import ParameterServer
+from bark.runtime.scenario.scenario_generation.configurable_scenario_generation \
+    import ConfigurableScenarioGeneration
 from bark.core.models.behavior import BehaviorIDMClassic, BehaviorConstantAcceleration
 
 try: # bazel run
@@ -63,6 +68,32 @@ class DatabaseRunnerTests(unittest.TestCase):
         groups = result.get_evaluation_groups()
         self.assertEqual(set(groups), set(["behavior", "scen_set"]))
 
+    def test_database_runner_declarative_terminal_when(self):
+        dbs = DatabaseSerializer(test_scenarios=4, test_world_steps=5, num_serialize_scenarios=2)
+        dbs.process("data/database1")
+        local_release_filename = dbs.release(version="test")
+
+        db = BenchmarkDatabase(database_root=local_release_filename)
+        evaluators = {"success" : "EvaluatorGoalReached", "collision" : "EvaluatorCollisionEgoAgent",
+                      "max_steps": "EvaluatorStepCount"}
+        params = ParameterServer() # only for evaluated agents not passed to scenario!
+        behaviors_tested = {"IDM": BehaviorIDMClassic(params), "Const" : BehaviorConstantAcceleration(params)}
+
+        # lambdas are evaluated in Python, the declarative conditions in C++
+        results = []
+        for terminal_when in [{"collision" :lambda x: x, "max_steps": lambda x : x>2},
+                              {"collision" : True, "max_steps": (">", 2)}]:
+            benchmark_runner = BenchmarkRunner(benchmark_database=db,
+                                               evaluators=evaluators,
+                                               terminal_when=terminal_when,
+                                               behaviors=behaviors_tested)
+            results.append(benchmark_runner.run().get_data_frame())
+        self.assertEqual(len(results[1].index), 2*2*2)
+        for column in ["step", "collision", "max_steps", "success"]:
+            self.assertEqual(list(results[0][column]), list(results[1][column]))
+        self.assertEqual(list(results[0]["Terminal"].apply(str)),
+                         list(results[1]["Terminal"].apply(str)))
+
     def test_database_runner_checkpoint(self):
         dbs = DatabaseSerializer(test_scenarios=4, test_world_steps=5, num_serialize_scenarios=10)
         dbs.process("data/database1")
@@ -83,11 +114,12 @@ class DatabaseRunnerTests(unittest.TestCase):
                                            log_eval_avg_every=20,
                                            checkpoint_dir="checkpoints1/")
 
-        # one run after 30 steps benchmark dumped
-        result = benchmark_runner.run(checkpoint_every = 30)
+        # only run a part of the configs to resume from the checkpoints
+        benchmark_runner.configs_to_run = benchmark_runner.configs_to_run[0:30]
+        result = benchmark_runner.run(checkpoint_every = 20)
         df = result.get_data_frame()
         print(df)
-        self.assertEqual(len(df.index), 40) # 2 Behaviors * 10 Serialize Scenarios * 2 scenario sets
+        self.assertEqual(len(df.index), 30)
         # check twice first, merging from checkpoints
         merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints1/")
         df = merged_result.get_data_frame()
@@ -114,10 +146,10 @@ class DatabaseRunnerTests(unittest.TestCase):
         print(df)
         self.assertEqual(len(df.index), 40) # 2 Behaviors * 10 Serialize Scenarios * 2 scenario sets
 
-        # check if results maintained in existing result dump, 30 from previous run + 7 after new checkpoint
+        # check if results maintained in existing result dump, 30 from previous run + 10 of the new run
         merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints1/")
         df = merged_result.get_data_frame()
-        self.assertEqual(len(df.index), 37)
+        self.assertEqual(len(df.index), 40)
 
     def test_database_multiprocessing_runner(self):
         dbs = DatabaseSerializer(test_scenarios=4, test_world_steps=5, num_serialize_scenarios=5)
@@ -185,6 +217,103 @@ class DatabaseRunnerTests(unittest.TestCase):
 
         viewer.show(block=True)
 
+    def test_database_runner_compact_history(self):
+        dbs = DatabaseSerializer(test_scenarios=4, test_world_steps=5, num_serialize_scenarios=2)
+        dbs.process("data/database1")
+        local_release_filename = dbs.release(version="test")
+
+        db = BenchmarkDatabase(database_root=local_release_filename)
+        evaluators = {"success" : "EvaluatorGoalReached", "collision" : "EvaluatorCollisionEgoAgent",
+                      "max_steps": "EvaluatorStepCount"}
+        terminal_when = {"collision" :lambda x: x, "max_steps": lambda x : x>2}
+        params = ParameterServer() # only for evaluated agents not passed to scenario!
+        behaviors_tested = {"IDM": BehaviorIDMClassic(params), "Const" : BehaviorConstantAcceleration(params)}
+
+        benchmark_runner = BenchmarkRunner(benchmark_database=db,
+                                           evaluators=evaluators,
+                                           terminal_when=terminal_when,
+                                           behaviors=behaviors_tested)
+        scenario_history = benchmark_runner.run_benchmark_config(
+            3, maintain_history=True).get_histories()[3]
+        compact_history = benchmark_runner.run_benchmark_config(
+            3, maintain_history="compact").get_histories()[3]
+        # the compact history survives pickling, e.g. in checkpoints
+        compact_history = pickle.loads(pickle.dumps(compact_history))
+        self.assertEqual(len(compact_history), len(scenario_history))
+
+        # the reconstructed scenarios match the recorded ones
+        for step in range(0, len(scenario_history)):
+            agents = {agent.id: agent for agent in scenario_history[step]._agent_list}
+            compact_agents = {agent.id: agent for agent in compact_history[step]._agent_list}
+            self.assertEqual(set(agents.keys()), set(compact_agents.keys()))
+            for agent_id, agent in agents.items():
+                np.testing.assert_array_almost_equal(
+                    agent.state, compact_agents[agent_id].state)
+                self.assertEqual(len(agent.history), len(compact_agents[agent_id].history))
+        world = compact_history[-1].GetWorldState()
+        self.assertEqual(len(world.agents), len(compact_history[-1]._agent_list))
+
+        # steps without agents are stored with the state dimension of the others
+        for agent_id in list(world.agents.keys()):
+            world.RemoveAgentById(agent_id)
+        compact_history.Record(world)
+        states, step_offsets = compact_history.GetStateArrays()
+        self.assertEqual(step_offsets[-1], step_offsets[-2])
+        compact_history = pickle.loads(pickle.dumps(compact_history))
+        self.assertEqual(len(compact_history), len(scenario_history) + 1)
+        self.assertEqual(len(compact_history[-1]._agent_list), 0)
+
+    def test_lazy_scenario_generation_runner(self):
+        params = ParameterServer()
+        mapfile = os.path.join(os.path.dirname(__file__), "../../runtime/tests/data/city_highway_straight.xodr")
+        params["Scenario"]["Generation"]["ConfigurableScenarioGeneration"]["MapFilename"] = mapfile
+        scenario_generation = ConfigurableScenarioGeneration(
+            num_scenarios=3, params=params, lazy=True)
+        db = [(scenario_generation, "lazy_set", {"lazy": True})]
+        evaluators = {"success" : "EvaluatorGoalReached", "collision" : "EvaluatorCollisionEgoAgent",
+                      "max_steps": "EvaluatorStepCount"}
+        terminal_when = {"collision" :lambda x: x, "max_steps": lambda x : x>2}
+        behaviors_tested = {"IDM": BehaviorIDMClassic(params), "Const" : BehaviorConstantAcceleration(params)}
+
+        benchmark_runner = BenchmarkRunnerPool(benchmark_database=db,
+                                               evaluators=evaluators,
+                                               terminal_when=terminal_when,
+                                               behaviors=behaviors_tested,
+                                               num_workers=2)
+        # the configs only reference their scenarios
+        benchmark_configs = benchmark_runner.benchmark_configs
+        self.assertEqual(len(benchmark_configs), 6)
+        self.assertTrue(all(bc._scenario is None for bc in benchmark_configs))
+        self.assertEqual(benchmark_configs[4].scenario_idx, 1)
+
+        result = benchmark_runner.run()
+        df = result.get_data_frame()
+        self.assertEqual(len(df.index), 6)
+        self.assertTrue(all(df["lazy"]))
+
+        # the scenario is created once and cached
+        scenario = benchmark_configs[4].scenario
+        self.assertTrue(benchmark_configs[4].scenario is scenario)
+
+        # pickled configs only reference the generation, not the scenario
+        pickled_config = pickle.dumps(benchmark_configs[4])
+        self.assertLess(len(pickled_config), len(pickle.dumps(scenario)))
+        benchmark_config = pickle.loads(pickled_config)
+        self.assertEqual(benchmark_config._scenario, None)
+        self.assertTrue(benchmark_config.scenario_generator.generation is scenario_generation)
+        self.assertEqual(len(benchmark_config.scenario._agent_list),
+            len(scenario_generation.get_scenario(1)._agent_list))
+
+        # without deepcopy, the configs do not keep their scenarios after running
+        benchmark_runner = BenchmarkRunner(benchmark_database=db,
+                                           evaluators=evaluators,
+                                           terminal_when=terminal_when,
+                                           behaviors=behaviors_tested,
+                                           deepcopy=False)
+        result = benchmark_runner.run()
+        self.assertEqual(len(result.get_data_frame().index), 6)
+        self.assertTrue(all(bc._scenario is None for bc in benchmark_runner.benchmark_configs))
+
     def test_database_multiprocessing_runner_checkpoint(self):
         dbs = DatabaseSerializer(test_scenarios=1, test_world_steps=2, num_serialize_scenarios=10)
         dbs.process("data/database1")
@@ -213,32 +342,62 @@ class DatabaseRunnerTests(unittest.TestCase):
         print(df)
         self.assertEqual(len(df.index), 40) # 2 Behaviors * 10 Serialize Scenarios * 2 scenario sets
 
+        # the configs run after the last full checkpoint interval are checkpointed as well
         merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints2/")
         df = merged_result.get_data_frame()
-        self.assertEqual(len(df.index), 4*9)
-       # self.assertEqual(len(merged_result.get_histories()), 4*9)
-        self.assertEqual(len(merged_result.get_benchmark_configs()), 4*9)
+        self.assertEqual(len(df.index), 40)
+        self.assertEqual(len(merged_result.get_benchmark_configs()), 40)
 
         configs_to_run = BenchmarkRunner.get_configs_to_run(benchmark_runner.configs_to_run, merged_result)
-        self.assertEqual(len(configs_to_run), 4)
-        ray.shutdown()
-        benchmark_runner2 = BenchmarkRunnerMP(benchmark_database=db,
+        self.assertEqual(len(configs_to_run), 0)
+
+    def test_database_process_pool_runner_checkpoint(self):
+        dbs = DatabaseSerializer(test_scenarios=1, test_world_steps=2, num_serialize_scenarios=10)
+        dbs.process("data/database1")
+        local_release_filename = dbs.release(version="test")
+
+        db = BenchmarkDatabase(database_root=local_release_filename)
+        evaluators = {"success" : "EvaluatorGoalReached", "collision" : "EvaluatorCollisionEgoAgent",
+                      "max_steps": "EvaluatorStepCount"}
+        terminal_when = {"collision" :lambda x: x, "max_steps": lambda x : x>2}
+        params = ParameterServer() # only for evaluated agents not passed to scenario!
+        behaviors_tested = {"IDM": BehaviorIDMClassic(params), "Const" : BehaviorConstantAcceleration(params)}
+
+        benchmark_runner = BenchmarkRunnerPool(benchmark_database=db,
                                            evaluators=evaluators,
                                            terminal_when=terminal_when,
                                            behaviors=behaviors_tested,
-                                           log_eval_avg_every=1,
-                                           checkpoint_dir="checkpoints2/",
-                                           merge_existing=True)
+                                           log_eval_avg_every=10,
+                                           num_workers=4,
+                                           checkpoint_dir="checkpoints3/",
+                                           merge_existing=False)
+        benchmark_runner.clear_checkpoint_dir()
+        # only run a part of the configs to resume from the checkpoints
+        benchmark_runner.configs_to_run = benchmark_runner.configs_to_run[0:25]
+        result = benchmark_runner.run(checkpoint_every = 2, maintain_history=True)
+        df = result.get_data_frame()
+        self.assertEqual(len(df.index), 25)
+        self.assertEqual(len(result.get_histories()), 25)
 
+        merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints3/")
+        self.assertEqual(len(merged_result.get_data_frame().index), 25)
+        self.assertEqual(len(merged_result.get_benchmark_configs()), 25)
+
+        benchmark_runner2 = BenchmarkRunnerPool(benchmark_database=db,
+                                           evaluators=evaluators,
+                                           terminal_when=terminal_when,
+                                           behaviors=behaviors_tested,
+                                           num_workers=3,
+                                           checkpoint_dir="checkpoints3/",
+                                           merge_existing=True)
+        self.assertEqual(len(benchmark_runner2.configs_to_run), 15)
         result = benchmark_runner2.run(checkpoint_every = 1)
         df = result.get_data_frame()
-        print(df)
         self.assertEqual(len(df.index), 40) # 2 Behaviors * 10 Serialize Scenarios * 2 scenario sets
+        self.assertEqual(sorted(df["config_idx"]), list(range(0, 40)))
 
-        # check if existing result is incorporated for mergin result
-        merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints2/")
-        df = merged_result.get_data_frame()
-        self.assertEqual(len(df.index), 40)
+        merged_result = BenchmarkRunner.merge_checkpoint_benchmark_results(checkpoint_dir="checkpoints3/")
+        self.assertEqual(len(merged_result.get_data_frame().index), 40)
 
 
 if __name__ == '__main__':
@@ -12,18 +12,22 @@ namespace bark {
 namespace commons {
 
 SetterParams::SetterParams(bool log_if_default,
-                           const CondensedParamList& param_list)
-    : log_if_default_(log_if_default) {
+                           const CondensedParamList& param_list,
+                           bool record_defaults)
+    : log_if_default_(log_if_default), record_defaults_(false) {
   for (const auto& param_pair : param_list) {
     const auto& param_name = param_pair.first;
     const auto& param_variant = param_pair.second;
     boost::apply_visitor(ParamVisitor(this, param_name), param_variant);
   }
+  SetRecordDefaults(record_defaults);
 }
 
 CondensedParamList SetterParams::GetCondensedParamList() const {
   std::string hierarchy_delimiter = "::";
   CondensedParamList param_list;
+  std::vector<std::pair<std::string, std::shared_ptr<SetterParams>>> childs;
+  std::unique_lock<std::mutex> lock(mutex_);
   // Add Booleans
   for (const auto param : params_bool_) {
     param_list.push_back(std::make_pair(param.first, param.second));
@@ -54,8 +58,11 @@ CondensedParamList SetterParams::GetCondensedParamList() const {
     param_list.push_back(std::make_pair(param.first, param.second));
   }
 
+  childs.assign(childs_.begin(), childs_.end());
+  lock.unlock();
+
   // Add Childs recursively
-  for (const auto& child : childs_) {
+  for (const auto& child : childs) {
     CondensedParamList param_list_child = child.second->GetCondensedParamList();
     for (const auto& param_pair : param_list_child) {
       const std::string param_name =
@@ -9,8 +9,12 @@
 #ifndef BARK_COMMONS_PARAMS_SETTER_PARAMS_HPP_
 #define BARK_COMMONS_PARAMS_SETTER_PARAMS_HPP_
 
+#include <atomic>
+#include <mutex>
 #include <string>
 #include <unordered_map>
+#include <utility>
+#include <vector>
 #include "bark/commons/params/params.hpp"
 #include "bark/commons/util/util.hpp"
 namespace bark {
@@ -24,8 +28,10 @@ class SetterParams : public Params {
         params_int_(),
         params_listlist_double_(),
         params_list_double_(),
-        log_if_default_(log_if_default) {}
-  SetterParams(bool log_if_default, const CondensedParamList& param_list);
+        log_if_default_(log_if_default),
+        record_defaults_(false) {}
+  SetterParams(bool log_if_default, const CondensedParamList& param_list,
+               bool record_defaults = false);
 
   virtual ~SetterParams() {}
 
@@ -39,7 +45,18 @@ class SetterParams : public Params {
   virtual double GetReal(const std::string& param_name,
                         const std::string& description,
                         const double& default_value) {
-    return get_parameter(params_real_, param_name, default_value);
+    auto search_result =
+        get_parameter_recursive(params_real_, param_name, default_value);
+    if (search_result.second) {
+      return search_result.first;
+    }
+    // integral values of python parameters, e.g. from json files, are ints
+    auto int_search_result = get_parameter_recursive(params_int_, param_name, 0);
+    if (int_search_result.second) {
+      return int_search_result.first;
+    }
+    use_default(params_real_, param_name, default_value);
+    return default_value;
   }
 
   virtual int GetInt(const std::string& param_name,
@@ -95,6 +112,19 @@ class SetterParams : public Params {
 
   virtual CondensedParamList GetCondensedParamList() const;
 
+  //! Whether default values are stored when a parameter is not found, such
+  //! that GetCondensedParamList contains all parameters that have been read
+  bool GetRecordDefaults() const { return record_defaults_; }
+  void SetRecordDefaults(bool record_defaults) {
+    std::vector<std::shared_ptr<SetterParams>> childs;
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      record_defaults_ = record_defaults;
+      for (auto& child : childs_) childs.push_back(child.second);
+    }
+    for (auto& child : childs) child->SetRecordDefaults(record_defaults);
+  }
+
   virtual int operator[](const std::string& param_name) {
     throw;
   }  //< not supported atm
@@ -112,13 +142,17 @@ class SetterParams : public Params {
       rest_name.erase(0, pos + delimiter.length());
     }
 
-    const auto it = childs_.find(child_name);
     std::shared_ptr<SetterParams> child;
-    if (it != childs_.end()) {
-      child = it->second;
-    } else {
-      child = std::make_shared<SetterParams>(log_if_default_);
-      childs_[child_name] = child;
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      const auto it = childs_.find(child_name);
+      if (it != childs_.end()) {
+        child = it->second;
+      } else {
+        child = std::make_shared<SetterParams>(log_if_default_);
+        child->record_defaults_ = record_defaults_.load();
+        childs_[child_name] = child;
+      }
     }
     if (rest_name.empty()) {
       return child;
@@ -146,41 +180,56 @@ class SetterParams : public Params {
                                  child_param_name, value);
       return;
     }
-    map[param_name] = value;  // no child specification found, simply set value
+    // no child specification found, simply set value
+    std::lock_guard<std::mutex> lock(mutex_);
+    map[param_name] = value;
   }
 
   template <typename M, typename T>
-  T get_parameter(M map, std::string param_name, const T& default_value) {
+  T get_parameter(M& map, const std::string& param_name,
+                  const T& default_value) {
     auto search_result =
         get_parameter_recursive(map, param_name, default_value);
-    if (!search_result.second && log_if_default_) {
+    if (!search_result.second) {
+      use_default(map, param_name, default_value);
+    }
+    return search_result.first;
+  }
+
+  template <typename M, typename T>
+  void use_default(M& map, const std::string& param_name,
+                   const T& default_value) {
+    if (log_if_default_) {
       LOG(FATAL) << "Using default " << default_value << " for param \""
                  << param_name << "\"";
     }
-    return search_result.first;
+    if (record_defaults_) {
+      set_parameter(map, param_name, default_value);
+    }
   }
 
   template <typename M, typename T>
-  std::pair<T, bool> get_parameter_recursive(M map, std::string param_name,
+  std::pair<T, bool> get_parameter_recursive(const M& map,
+                                             std::string param_name,
                                              const T& default_value) {
-    const auto it = map.find(param_name);
-    if (it != map.end()) {
-      return std::make_pair(it->second, true);
-    } else {
-      // find first child search there
-      std::string delimiter = "::";
-      auto pos = param_name.find(delimiter);
-      if (pos != std::string::npos) {
-        std::string child_name = param_name.substr(0, pos);
-        auto child_param =
-            std::dynamic_pointer_cast<SetterParams>(this->AddChild(child_name));
-        std::string child_param_name =
-            param_name.erase(0, pos + delimiter.length());
-        return child_param->get_parameter_recursive(
-            child_param->get_param_map<T>(), child_param_name, default_value);
-      }
-      return std::make_pair(default_value, false);
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      const auto it = map.find(param_name);
+      if (it != map.end()) return std::make_pair(it->second, true);
+    }
+    // find first child search there
+    std::string delimiter = "::";
+    auto pos = param_name.find(delimiter);
+    if (pos != std::string::npos) {
+      std::string child_name = param_name.substr(0, pos);
+      auto child_param =
+          std::dynamic_pointer_cast<SetterParams>(this->AddChild(child_name));
+      std::string child_param_name =
+          param_name.erase(0, pos + delimiter.length());
+      return child_param->get_parameter_recursive(
+          child_param->get_param_map<T>(), child_param_name, default_value);
     }
+    return std::make_pair(default_value, false);
   }
 
   std::unordered_map<std::string, std::shared_ptr<SetterParams>> childs_;
@@ -193,6 +242,10 @@ class SetterParams : public Params {
   std::unordered_map<std::string, std::string> params_string_;
 
   bool log_if_default_;
+  std::atomic<bool> record_defaults_;
+  //! guards the parameters and childs of this node, as reading parameters
+  //! adds childs and, if defaults are recorded, parameters
+  mutable std::mutex mutex_;
 };
 
 struct ParamVisitor : public boost::static_visitor<> {
@@ -8,6 +8,9 @@
 
 #include <fstream>
 #include <iostream>
+#include <string>
+#include <thread>
+#include <vector>
 
 #include <boost/make_shared.hpp>
 #include <boost/shared_ptr.hpp>
@@ -82,6 +85,48 @@ TEST(setter_params, param_tests) {
               typeid(bark::commons::NormalDistribution1D));
 }
 
+TEST(setter_params, record_defaults) {
+  bark::commons::CondensedParamList param_list{
+      {"Child1::ValueInt", 3}, {"Child1::ValueReal", 2.5}};
+  bark::commons::SetterParams params(false, param_list, true);
+  EXPECT_TRUE(params.GetRecordDefaults());
+
+  // integral values can be read as real
+  EXPECT_EQ(params.GetReal("Child1::ValueInt", "", 1.0), 3.0);
+  EXPECT_EQ(params.GetReal("Child1::ValueReal", "", 1.0), 2.5);
+
+  // defaults are stored and show up in the condensed param list
+  EXPECT_EQ(params.GetBool("Child1::Child2::ValueBool", "", true), true);
+  EXPECT_EQ(params.AddChild("Child3")->GetInt("ValueInt", "", 7), 7);
+  const auto condensed = params.GetCondensedParamList();
+  EXPECT_EQ(condensed.size(), 4);
+  EXPECT_EQ(params.GetInt("Child3::ValueInt", "", 8), 7);
+
+  bark::commons::SetterParams params_no_record(false, param_list);
+  EXPECT_EQ(params_no_record.GetBool("Child1::ValueBool", "", true), true);
+  EXPECT_EQ(params_no_record.GetCondensedParamList().size(), 2);
+}
+
+TEST(setter_params, record_defaults_concurrently) {
+  bark::commons::SetterParams params(false, {}, true);
+  // reading defaults adds childs and parameters
+  std::vector<std::thread> threads;
+  for (int t = 0; t < 4; ++t) {
+    threads.emplace_back([&params, t]() {
+      for (int i = 0; i < 100; ++i) {
+        const std::string child = "Child" + std::to_string(i % 10) + "::";
+        params.GetInt(child + "ValueInt" + std::to_string(t), "", i % 10);
+        params.GetReal(child + "Shared::ValueReal", "", 1.0);
+      }
+    });
+  }
+  for (auto& thread : threads) thread.join();
+
+  // ten childs with four ints and one shared real each
+  EXPECT_EQ(params.GetCondensedParamList().size(), 50);
+  EXPECT_EQ(params.GetInt("Child3::ValueInt2", "", 0), 3);
+}
+
 int main(int argc, char** argv) {
   ::testing::InitGoogleTest(&argc, argv);
   return RUN_ALL_TESTS();
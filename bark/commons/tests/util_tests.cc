@@ -13,6 +13,7 @@
 #include <boost/shared_ptr.hpp>
 #include "gtest/gtest.h"
 
+#include "bark/commons/util/thread_pool.hpp"
 #include "bark/commons/util/util.hpp"
 
 // TODO(@all): fill our this test
@@ -21,6 +22,28 @@ TEST(load_test, param_tests) {
   BARK_EXPECT_TRUE(temp);
 }
 
+TEST(thread_pool, parallel_for) {
+  bark::commons::ThreadPool thread_pool(4);
+  EXPECT_EQ(thread_pool.GetNumThreads(), 4u);
+  std::vector<int> results(100, 0);
+  for (int run = 0; run < 10; ++run) {
+    thread_pool.ParallelFor(results.size(), [&](std::size_t idx) {
+      results[idx] += idx;
+      // nested calls are executed serially
+      thread_pool.ParallelFor(2, [](std::size_t) {});
+    });
+  }
+  for (std::size_t idx = 0; idx < results.size(); ++idx) {
+    EXPECT_EQ(results[idx], 10 * static_cast<int>(idx));
+  }
+  EXPECT_THROW(thread_pool.ParallelFor(10,
+                                       [](std::size_t idx) {
+                                         if (idx == 5)
+                                           throw std::runtime_error("task");
+                                       }),
+               std::runtime_error);
+}
+
 int main(int argc, char** argv) {
   ::testing::InitGoogleTest(&argc, argv);
   return RUN_ALL_TESTS();
@@ -0,0 +1,181 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#ifndef BARK_COMMONS_UTIL_THREAD_POOL_HPP_
+#define BARK_COMMONS_UTIL_THREAD_POOL_HPP_
+
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <cstdint>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace bark {
+namespace commons {
+
+/**
+ * @brief Fixed-size pool of worker threads executing index-based tasks
+ *
+ * The calling thread takes part in the work of ParallelFor. Nested calls from
+ * within a task run serially in the calling worker to avoid deadlocks, e.g.
+ * when a behavior model steps a predicted world that itself plans in parallel.
+ */
+class ThreadPool {
+ public:
+  explicit ThreadPool(unsigned int num_threads)
+      : task_(nullptr),
+        num_tasks_(0),
+        next_task_(0),
+        num_finished_(0),
+        num_active_workers_(0),
+        generation_(0),
+        stop_(false) {
+    num_threads = std::max(1u, num_threads);
+    // the calling thread is the first worker
+    for (unsigned int i = 1; i < num_threads; ++i) {
+      workers_.emplace_back([this]() { WorkerLoop(); });
+    }
+  }
+
+  ThreadPool(const ThreadPool&) = delete;
+  ThreadPool& operator=(const ThreadPool&) = delete;
+
+  ~ThreadPool() {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stop_ = true;
+    }
+    cv_task_.notify_all();
+    for (auto& worker : workers_) {
+      worker.join();
+    }
+  }
+
+  unsigned int GetNumThreads() const {
+    return static_cast<unsigned int>(workers_.size()) + 1;
+  }
+
+  /**
+   * @brief  Calls task(i) for all i in [0, num_tasks) and blocks until all
+   *         tasks have finished; the first exception thrown is rethrown
+   */
+  void ParallelFor(std::size_t num_tasks,
+                   const std::function<void(std::size_t)>& task) {
+    if (num_tasks == 0) return;
+    if (InWorker() || workers_.empty() || num_tasks == 1) {
+      for (std::size_t i = 0; i < num_tasks; ++i) task(i);
+      return;
+    }
+
+    std::lock_guard<std::mutex> run_lock(run_mutex_);
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      task_ = &task;
+      num_tasks_ = num_tasks;
+      next_task_ = 0;
+      num_finished_ = 0;
+      exception_ = nullptr;
+      ++generation_;
+    }
+    cv_task_.notify_all();
+
+    RunTasks(&task, num_tasks);
+
+    std::unique_lock<std::mutex> lock(mutex_);
+    cv_done_.wait(lock, [this]() {
+      return num_finished_ == num_tasks_ && num_active_workers_ == 0;
+    });
+    task_ = nullptr;
+    if (exception_) {
+      std::exception_ptr exception = exception_;
+      exception_ = nullptr;
+      std::rethrow_exception(exception);
+    }
+  }
+
+ private:
+  static bool& InWorker() {
+    static thread_local bool in_worker = false;
+    return in_worker;
+  }
+
+  void WorkerLoop() {
+    std::uint64_t seen_generation = 0;
+    while (true) {
+      const std::function<void(std::size_t)>* task;
+      std::size_t num_tasks;
+      {
+        std::unique_lock<std::mutex> lock(mutex_);
+        cv_task_.wait(lock, [this, seen_generation]() {
+          return stop_ || generation_ != seen_generation;
+        });
+        if (stop_) return;
+        seen_generation = generation_;
+        // the job may already be finished by the other threads
+        if (!task_) continue;
+        task = task_;
+        num_tasks = num_tasks_;
+        ++num_active_workers_;
+      }
+      RunTasks(task, num_tasks);
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        --num_active_workers_;
+      }
+      cv_done_.notify_all();
+    }
+  }
+
+  void RunTasks(const std::function<void(std::size_t)>* task,
+                std::size_t num_tasks) {
+    bool& in_worker = InWorker();
+    in_worker = true;
+    std::size_t num_done = 0;
+    std::size_t task_idx;
+    while ((task_idx = next_task_.fetch_add(1)) < num_tasks) {
+      try {
+        (*task)(task_idx);
+      } catch (...) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (!exception_) exception_ = std::current_exception();
+      }
+      ++num_done;
+    }
+    in_worker = false;
+    if (num_done > 0) {
+      std::lock_guard<std::mutex> lock(mutex_);
+      num_finished_ += num_done;
+    }
+  }
+
+  std::vector<std::thread> workers_;
+  std::mutex run_mutex_;
+  std::mutex mutex_;
+  std::condition_variable cv_task_;
+  std::condition_variable cv_done_;
+  const std::function<void(std::size_t)>* task_;
+  std::size_t num_tasks_;
+  std::atomic<std::size_t> next_task_;
+  std::size_t num_finished_;
+  unsigned int num_active_workers_;
+  std::uint64_t generation_;
+  std::exception_ptr exception_;
+  bool stop_;
+};
+
+typedef std::shared_ptr<ThreadPool> ThreadPoolPtr;
+
+}  // namespace commons
+}  // namespace bark
+
+#endif  // BARK_COMMONS_UTIL_THREAD_POOL_HPP_
@@ -0,0 +1,51 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import time
+import shutil
+
+from load.benchmark_database import BenchmarkDatabase
+from bark.benchmark.benchmark_runner_pool import BenchmarkRunnerPool
+from bark.runtime.commons.parameters import ParameterServer
+from bark.core.models.behavior import BehaviorIDMClassic, BehaviorConstantAcceleration
+
+# measures the throughput of the BenchmarkRunnerPool for 1 to N workers
+db = BenchmarkDatabase(database_root="external/benchmark_database_release")
+evaluators = {"success" : "EvaluatorGoalReached",
+              "collision" : "EvaluatorCollisionEgoAgent",
+              "max_steps": "EvaluatorStepCount"}
+terminal_when = {"collision" :lambda x: x,
+                 "max_steps": lambda x : x>20}
+params = ParameterServer()
+behaviors_tested = {"IDM": BehaviorIDMClassic(params),
+                    "Const" : BehaviorConstantAcceleration(params)}
+
+max_workers = os.cpu_count()
+num_workers = 1
+print("workers | configs | time [s] | configs/s | speedup")
+base_throughput = None
+while num_workers <= max_workers:
+  checkpoint_dir = "scaling_checkpoints_{}".format(num_workers)
+  benchmark_runner = BenchmarkRunnerPool(benchmark_database=db,
+                                         evaluators=evaluators,
+                                         terminal_when=terminal_when,
+                                         behaviors=behaviors_tested,
+                                         num_workers=num_workers,
+                                         checkpoint_dir=checkpoint_dir)
+  start = time.time()
+  result = benchmark_runner.run()
+  duration = time.time() - start
+  num_configs = len(result.get_result_dict())
+  throughput = num_configs / duration
+  base_throughput = base_throughput or throughput
+  print("{:7d} | {:7d} | {:8.1f} | {:9.2f} | {:7.2f}".format(
+    num_workers, num_configs, duration, throughput, throughput / base_throughput))
+  shutil.rmtree(checkpoint_dir, ignore_errors=True)
+  num_workers = num_workers * 2 if num_workers * 2 <= max_workers or \
+    num_workers == max_workers else max_workers
@@ -0,0 +1,88 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import glob
+import math
+import time
+import tempfile
+
+from bark.core.world.map import MapInterface
+from bark.runtime.commons.xodr_parser import XodrParser
+
+# measures the time to parse OpenDRIVE maps and to build the map interface
+# for the bundled example maps and synthetic maps with a very long road
+
+_LANE = """
+          <lane id="{id}" type="driving" level="0">
+            <link></link>
+            <width sOffset="0.0" a="3.5" b="0.0" c="0.0" d="0.0"/>
+            <roadMark sOffset="0.0" type="solid" weight="standard" color="standard" width="0.15"/>
+          </lane>"""
+
+
+def write_synthetic_map(file_name, num_geometries, geometry_length=100.0,
+                        curvature=0.005):
+  """Writes a map with a single road of alternating left and right arcs"""
+  geometries = []
+  x, y, hdg = 0.0, 0.0, 0.0
+  for idx in range(num_geometries):
+    k = curvature if idx % 2 == 0 else -curvature
+    geometries.append(
+      '<geometry s="{}" x="{}" y="{}" hdg="{}" length="{}"><arc curvature="{}"/></geometry>'.format(
+        idx * geometry_length, x, y, hdg, geometry_length, k))
+    end_hdg = hdg + k * geometry_length
+    x += (math.sin(end_hdg) - math.sin(hdg)) / k
+    y -= (math.cos(end_hdg) - math.cos(hdg)) / k
+    hdg = end_hdg
+  with open(file_name, "w") as xodr_file:
+    xodr_file.write("""<?xml version="1.0" standalone="yes"?>
+<OpenDRIVE>
+  <header revMajor="1" revMinor="4" name="" version="1"></header>
+  <road name="" length="{length}" id="1" junction="-1">
+    <link></link>
+    <planView>{geometries}</planView>
+    <lanes>
+      <laneSection s="0.0">
+        <left>{left}</left>
+        <center>
+          <lane id="0" type="driving" level="0"><link></link></lane>
+        </center>
+        <right>{right}</right>
+      </laneSection>
+    </lanes>
+  </road>
+</OpenDRIVE>
+""".format(length=num_geometries * geometry_length,
+           geometries="\n      ".join(geometries),
+           left="".join([_LANE.format(id=lane_id) for lane_id in [2, 1]]),
+           right="".join([_LANE.format(id=lane_id) for lane_id in [-1, -2]])))
+
+
+def measure_load_time(map_file, num_repetitions):
+  start_time = time.time()
+  for _ in range(num_repetitions):
+    xodr_parser = XodrParser(map_file)
+    map_interface = MapInterface()
+    map_interface.SetOpenDriveMap(xodr_parser.map)
+  return (time.time() - start_time) / num_repetitions
+
+
+map_files = sorted(glob.glob(os.path.join(
+  os.path.dirname(__file__), "../runtime/tests/data/*.xodr")))
+print("map | load time [s]")
+for map_file in map_files:
+  print("{} | {:.4f}".format(os.path.basename(map_file),
+                             measure_load_time(map_file, 3)))
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+  for num_geometries in [10, 100, 1000]:
+    map_file = os.path.join(tmp_dir, "synthetic_{}.xodr".format(num_geometries))
+    write_synthetic_map(map_file, num_geometries)
+    print("synthetic road of {:.0f} km | {:.4f}".format(
+      num_geometries * 0.1, measure_load_time(map_file, 1)))
@@ -0,0 +1,42 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import glob
+import time
+
+from bark.core.world.map import MapInterface
+from bark.runtime.commons.xodr_parser import XodrParser
+from bark.runtime.commons.compile_map import CompileMap, LoadCompiledMap
+
+# compares the startup time of parsing OpenDRIVE maps with loading the
+# precompiled maps
+map_files = sorted(glob.glob(os.path.join(
+  os.path.dirname(__file__), "../runtime/tests/data/*.xodr")))
+num_repetitions = 3
+print("map | xodr [s] | compiled [s] | speedup")
+for map_file in map_files:
+  compiled_map_file = CompileMap(
+    map_file, os.path.basename(os.path.splitext(map_file)[0]) + ".bmap")
+
+  start_time = time.time()
+  for _ in range(num_repetitions):
+    xodr_parser = XodrParser(map_file)
+    map_interface = MapInterface()
+    map_interface.SetOpenDriveMap(xodr_parser.map)
+  xodr_time = (time.time() - start_time) / num_repetitions
+
+  start_time = time.time()
+  for _ in range(num_repetitions):
+    map_interface = LoadCompiledMap(compiled_map_file)
+  compiled_time = (time.time() - start_time) / num_repetitions
+
+  print("{} | {:.4f} | {:.4f} | {:.1f}".format(
+    os.path.basename(map_file), xodr_time, compiled_time,
+    xodr_time / max(compiled_time, 1e-9)))
+  os.remove(compiled_map_file)
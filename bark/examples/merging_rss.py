@@ -147,7 +147,7 @@ for episode in range(0, 10):
   env.reset()
   current_world = env._world
   eval_agent_id = env._scenario._eval_agent_ids[0]
-  current_world.agents[eval_agent_id].behavior_model = \
+  current_world.GetMutableAgent(eval_agent_id).behavior_model = \
     BehaviorRSSConformant(param_server)
   evaluator_rss = EvaluatorRSS(eval_agent_id, param_server)
   current_world.AddEvaluator("rss", evaluator_rss)
@@ -0,0 +1,61 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import glob
+import time
+
+from bark.core.world.map import MapInterface
+from bark.runtime.commons.xodr_parser import XodrParser
+from bark.runtime.commons.compile_map import CompileMap, LoadCompiledMap
+
+# compares generating the road corridors of all routes of a map on their
+# first lookup (cold), in parallel before the simulation and looking them up
+# once generated (warm) or loaded from a compiled map
+num_threads = os.cpu_count() or 1
+
+
+def create_map_interface(map_file):
+  xodr_parser = XodrParser(map_file)
+  map_interface = MapInterface()
+  map_interface.SetOpenDriveMap(xodr_parser.map)
+  return map_interface
+
+
+def time_lookups(map_interface, routes):
+  start_time = time.time()
+  for road_ids, driving_direction in routes:
+    map_interface.GenerateRoadCorridor(road_ids, driving_direction)
+    map_interface.GetRoadCorridor(road_ids, driving_direction)
+  return (time.time() - start_time) / max(len(routes), 1)
+
+
+map_files = sorted(glob.glob(os.path.join(
+  os.path.dirname(__file__), "../runtime/tests/data/*.xodr")))
+print("map | routes | cold [s] | parallel ({} threads) [s] | warm [s] | "
+      "compiled [s]".format(num_threads))
+for map_file in map_files:
+  map_interface = create_map_interface(map_file)
+  routes = map_interface.GetAllRoutes()
+  cold_time = time_lookups(map_interface, routes)
+  warm_time = time_lookups(map_interface, routes)
+
+  map_interface = create_map_interface(map_file)
+  start_time = time.time()
+  map_interface.GenerateRoadCorridors(routes, num_threads)
+  parallel_time = (time.time() - start_time) / max(len(routes), 1)
+
+  compiled_map_file = CompileMap(
+    map_file, os.path.basename(os.path.splitext(map_file)[0]) + ".bmap",
+    all_routes=True, num_threads=num_threads)
+  compiled_time = time_lookups(LoadCompiledMap(compiled_map_file), routes)
+  os.remove(compiled_map_file)
+
+  print("{} | {} | {:.5f} | {:.5f} | {:.7f} | {:.7f}".format(
+    os.path.basename(map_file), len(routes), cold_time, parallel_time,
+    warm_time, compiled_time))
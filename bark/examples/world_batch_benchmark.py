@@ -0,0 +1,37 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import time
+
+from bark.core.world import MakeTestWorldHighway, WorldBatch
+
+# compares the throughput of stepping worlds in a python loop with stepping
+# them in a WorldBatch
+num_steps = 20
+delta_time = 0.2
+
+print("worlds | python loop [steps/s] | WorldBatch [steps/s]")
+for num_worlds in [1, 8, 64]:
+  worlds = [MakeTestWorldHighway() for _ in range(num_worlds)]
+  start_time = time.time()
+  for _ in range(num_steps):
+    for world in worlds:
+      world.Step(delta_time)
+      world.Evaluate()
+  loop_steps_per_second = num_worlds * num_steps / (time.time() - start_time)
+
+  worlds = [MakeTestWorldHighway() for _ in range(num_worlds)]
+  ego_agent_ids = [list(world.agents.keys())[0] for world in worlds]
+  world_batch = WorldBatch(worlds, ego_agent_ids, num_threads=8)
+  start_time = time.time()
+  for _ in range(num_steps):
+    observations, evaluations, done = world_batch.Step([], delta_time)
+  batch_steps_per_second = num_worlds * num_steps / (time.time() - start_time)
+
+  print("{} | {:.1f} | {:.1f}".format(
+    num_worlds, loop_steps_per_second, batch_steps_per_second))
@@ -0,0 +1,68 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import time
+import numpy as np
+
+from bark.runtime.commons.parameters import ParameterServer
+from bark.core.models.behavior import BehaviorConstantAcceleration
+from bark.core.models.execution import ExecutionModelInterpolate
+from bark.core.models.dynamic import SingleTrackModel, StateDefinition
+from bark.core.world import World
+from bark.core.world.agent import Agent
+from bark.core.geometry.standard_shapes import CarLimousine
+
+# compares exporting the agent states, polygons and histories per agent with
+# the bulk accessors of the world
+num_agents = 200
+history_window = 5
+num_repetitions = 10
+
+params = ParameterServer()
+world = World(params)
+for i in range(num_agents):
+  init_state = np.array([0, 10.*i, 0, 0, 5])
+  agent = Agent(init_state, BehaviorConstantAcceleration(params),
+                SingleTrackModel(params), ExecutionModelInterpolate(params),
+                CarLimousine(), params.AddChild("agent"))
+  world.AddAgent(agent)
+
+
+def per_agent_export(world):
+  agents = world.agents
+  states = np.stack([agent.state for agent in agents.values()])
+  polygons = []
+  for agent in agents.values():
+    state = agent.state
+    pose = np.array([state[int(StateDefinition.X_POSITION)],
+                     state[int(StateDefinition.Y_POSITION)],
+                     state[int(StateDefinition.THETA_POSITION)]])
+    polygons.append(agent.shape.Transform(pose).ToArray())
+  histories = [[state_action[0] for state_action in
+                agent.history[-history_window:]] for agent in agents.values()]
+  return states, polygons, histories
+
+
+def bulk_export(world):
+  return world.GetAgentStates(), world.GetAgentPolygons(), \
+    world.GetAgentHistories(history_window)
+
+
+print("export | time [ms]")
+for name, export in [("per agent", per_agent_export), ("bulk", bulk_export)]:
+  start_time = time.time()
+  for _ in range(num_repetitions):
+    export(world)
+  print("{} | {:.3f}".format(
+    name, 1000.*(time.time() - start_time) / num_repetitions))
+
+states, polygons, histories = bulk_export(world)
+assert states.shape == (num_agents, 5)
+assert polygons.shape[0] == num_agents and polygons.shape[2] == 2
+assert histories.shape == (num_agents, history_window, 5)
+np.testing.assert_allclose(states, per_agent_export(world)[0])
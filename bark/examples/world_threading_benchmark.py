@@ -0,0 +1,42 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import threading
+import time
+
+from bark.core.world import MakeTestWorldHighway
+
+# steps one world per python thread; as World.Step and World.Evaluate
+# release the GIL, the throughput scales with the number of threads
+num_steps = 50
+delta_time = 0.2
+
+
+def step_world(world):
+  for _ in range(num_steps):
+    world.Step(delta_time)
+    world.Evaluate()
+
+
+print("threads | steps/s | speedup")
+single_thread_steps_per_second = None
+for num_threads in [1, 2, 4, 8]:
+  worlds = [MakeTestWorldHighway() for _ in range(num_threads)]
+  threads = [threading.Thread(target=step_world, args=(world,))
+             for world in worlds]
+  start_time = time.time()
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  steps_per_second = num_threads * num_steps / (time.time() - start_time)
+  if single_thread_steps_per_second is None:
+    single_thread_steps_per_second = steps_per_second
+  print("{} | {:.1f} | {:.2f}".format(
+    num_threads, steps_per_second,
+    steps_per_second / single_thread_steps_per_second))
@@ -12,12 +12,14 @@
 #include <algorithm>
 #include <cmath>
 #include <limits>
+#include <memory>
 #include <tuple>
 #include <utility>
 #include <vector>
 
 #include <boost/geometry.hpp>
 #include <boost/geometry/geometries/geometries.hpp>
+#include <boost/geometry/index/rtree.hpp>
 #include <boost/tuple/tuple.hpp>
 
 #include "bark/geometry/angle.hpp"
@@ -28,6 +30,56 @@
 namespace bark {
 namespace geometry {
 
+//! lines with fewer segments are searched linearly without an index
+const unsigned int kLineSegmentIndexMinSegments = 32;
+
+//! r-tree over the segments of a line, a value stores the segment and the
+//! index of its first point
+template <typename T>
+using LineSegmentIndex_t = bg::index::rtree<
+    std::pair<bg::model::segment<T>, unsigned int>, bg::index::linear<16, 4>>;
+
+//! lazily built segment index of a line
+//! the index is immutable once built and can be read by several threads;
+//! copies of a line do not share the index but build their own on demand
+template <typename T>
+class LineSegmentIndexCache {
+ public:
+  LineSegmentIndexCache() {}
+  LineSegmentIndexCache(const LineSegmentIndexCache&) {}
+  LineSegmentIndexCache& operator=(const LineSegmentIndexCache&) {
+    Reset();
+    return *this;
+  }
+
+  template <typename Points>
+  std::shared_ptr<const LineSegmentIndex_t<T>> Get(const Points& points) const {
+    auto index = std::atomic_load(&index_);
+    // rebuild if the points were modified without calling RecomputeS
+    if (!index || index->size() + 1 != points.size()) {
+      std::vector<std::pair<bg::model::segment<T>, unsigned int>> segments;
+      segments.reserve(points.size());
+      for (unsigned int i = 0; i + 1 < points.size(); ++i) {
+        segments.emplace_back(bg::model::segment<T>(points[i], points[i + 1]),
+                              i);
+      }
+      // packing construction of the r-tree
+      index = std::make_shared<const LineSegmentIndex_t<T>>(segments.begin(),
+                                                            segments.end());
+      std::atomic_store(&index_, index);
+    }
+    return index;
+  }
+
+  void Reset() {
+    std::atomic_store(&index_,
+                      std::shared_ptr<const LineSegmentIndex_t<T>>());
+  }
+
+ private:
+  mutable std::shared_ptr<const LineSegmentIndex_t<T>> index_;
+};
+
 //! templated line class with a boost polygon as a member function
 template <typename T>
 class Line_t : public Shape<bg::model::linestring<T>, T> {
@@ -40,9 +92,19 @@ class Line_t : public Shape<bg::model::linestring<T>, T> {
 
   virtual std::shared_ptr<Shape<bg::model::linestring<T>, T>> Clone() const;
 
-  //! TODO(@all): do not recompute full s but only add one point
+  //! only computes the arc length of the new point
   bool AddPoint(const T& p) {
-    return Shape<bg::model::linestring<T>, T>::AddPoint(p) && RecomputeS();
+    return Shape<bg::model::linestring<T>, T>::AddPoint(p) &&
+           ExtendS(size() - 1);
+  }
+
+  //! appends all points at once, e.g. the samples of a geometry
+  bool AddPoints(const std::vector<T>& points) {
+    const unsigned int first_idx = size();
+    Shape<bg::model::linestring<T>, T>::obj_.insert(
+        Shape<bg::model::linestring<T>, T>::obj_.end(), points.begin(),
+        points.end());
+    return ExtendS(first_idx);
   }
 
   auto Length() const {
@@ -54,8 +116,7 @@ class Line_t : public Shape<bg::model::linestring<T>, T> {
   }
 
   void AppendLinestring(const Line_t& ls) {
-    bg::append(Shape<bg::model::linestring<T>, T>::obj_, ls.obj_);
-    RecomputeS();
+    AddPoints(ls.obj_);
   }
 
   std::vector<T> GetPointsInSInterval(double begin, double end) const {
@@ -74,6 +135,12 @@ class Line_t : public Shape<bg::model::linestring<T>, T> {
 
   void Reverse() {
     boost::geometry::reverse(Shape<bg::model::linestring<T>, T>::obj_);
+    RecomputeS();
+  }
+
+  //! segment index used for nearest point queries, built on first use
+  std::shared_ptr<const LineSegmentIndex_t<T>> GetSegmentIndex() const {
+    return segment_index_.Get(Shape<bg::model::linestring<T>, T>::obj_);
   }
 
   typedef typename std::vector<T>::iterator point_iterator;
@@ -114,6 +181,7 @@ class Line_t : public Shape<bg::model::linestring<T>, T> {
   //! @todo free function, s_ private?
   bool RecomputeS() {
     s_.clear();
+    segment_index_.Reset();
     // edge case no points
     if (Shape<bg::model::linestring<T>, T>::obj_.empty()) {
       return true;
@@ -135,10 +203,29 @@ class Line_t : public Shape<bg::model::linestring<T>, T> {
       return true;
     }
   }
+
+  //! extends s_ by the points from first_idx on; s_ is recomputed if it does
+  //! not belong to the points before first_idx, e.g. after modifying obj_
+  bool ExtendS(unsigned int first_idx) {
+    if (s_.size() != first_idx) {
+      return RecomputeS();
+    }
+    segment_index_.Reset();
+    const auto& points = Shape<bg::model::linestring<T>, T>::obj_;
+    for (unsigned int i = first_idx; i < points.size(); ++i) {
+      s_.push_back(i == 0 ? 0.0
+                          : s_.back() + bg::distance(points[i], points[i - 1]));
+    }
+    return true;
+  }
+
   bool operator==(const Line_t& rhs) const {
     return bg::equals(this->obj_, rhs.obj_);
   }
   bool operator!=(const Line_t& rhs) const { return !(rhs == *this); }
+
+ private:
+  LineSegmentIndexCache<T> segment_index_;
 };
 
 //! for better usage simple double defines
@@ -196,6 +283,8 @@ inline Line Translate(const Line& line, double x, double y) {
   translate_transformer<double, 2, 2> translate(x, y);
   Line line_translated;
   boost::geometry::transform(line.obj_, line_translated.obj_, translate);
+  // the translation keeps the distances between the points
+  line_translated.s_ = line.s_;
   return line_translated;
 }
 
@@ -206,8 +295,8 @@ inline Line Simplify(const Line& line, double max_distance) {
   return temp_line;
 }
 
-inline int GetSegmentEndIdx(Line l, double s) {
-  std::vector<double>::iterator up =
+inline int GetSegmentEndIdx(const Line& l, double s) {
+  std::vector<double>::const_iterator up =
       std::upper_bound(l.s_.begin(), l.s_.end(), s);
   if (up != l.s_.end()) {
     int retval = up - l.s_.begin();
@@ -217,9 +306,9 @@ inline int GetSegmentEndIdx(Line l, double s) {
   }
 }
 
-inline bool CheckSForSegmentIntersection(Line l, double s) {
+inline bool CheckSForSegmentIntersection(const Line& l, double s) {
   int start_it = GetSegmentEndIdx(l, s);
-  std::vector<double>::iterator low =
+  std::vector<double>::const_iterator low =
       std::lower_bound(l.s_.begin(), l.s_.end(), s);
   int start_it_low = low - l.s_.begin();
   return start_it != start_it_low;
@@ -268,7 +357,53 @@ inline Eigen::VectorXd GetCurvature(Line l) {
   return curvature;
 }
 
-inline Point2d GetPointAtS(Line l, double s) {
+namespace detail {
+//! point at s on the segment ending at segment_end_idx
+inline Point2d InterpolateOnSegment(const Line& l, int segment_end_idx,
+                                    double s) {
+  int segment_begin_idx = segment_end_idx - 1;
+
+  double s_on_segment =
+      (s - l.s_.at(segment_begin_idx)) /
+      (l.s_.at(segment_end_idx) - l.s_.at(segment_begin_idx));
+  double interp_pt_x =
+      bg::get<0>(l.obj_.at(segment_begin_idx)) +
+      s_on_segment * (bg::get<0>(l.obj_.at(segment_end_idx)) -
+                      bg::get<0>(l.obj_.at(segment_begin_idx)));
+  double interp_pt_y =
+      bg::get<1>(l.obj_.at(segment_begin_idx)) +
+      s_on_segment * (bg::get<1>(l.obj_.at(segment_end_idx)) -
+                      bg::get<1>(l.obj_.at(segment_begin_idx)));
+  return Point2d(interp_pt_x, interp_pt_y);
+}
+
+//! tangent angle on the segment ending at end_segment_it, the mean angle of
+//! both segments if s is at the point between them
+inline double TangentAngleOnSegment(const Line& l, int end_segment_it,
+                                    bool at_segment_intersection) {
+  if (at_segment_intersection) {
+    Point2d p1 = l.obj_.at(end_segment_it - 2);
+    Point2d p2 = l.obj_.at(end_segment_it - 1);
+    Point2d p3 = l.obj_.at(end_segment_it);
+    double sin_mean = 0.5 * (sin(atan2(bg::get<1>(p2) - bg::get<1>(p1),
+                                       bg::get<0>(p2) - bg::get<0>(p1))) +
+                             sin(atan2(bg::get<1>(p3) - bg::get<1>(p2),
+                                       bg::get<0>(p3) - bg::get<0>(p2))));
+    double cos_mean = 0.5 * (cos(atan2(bg::get<1>(p2) - bg::get<1>(p1),
+                                       bg::get<0>(p2) - bg::get<0>(p1))) +
+                             cos(atan2(bg::get<1>(p3) - bg::get<1>(p2),
+                                       bg::get<0>(p3) - bg::get<0>(p2))));
+    return atan2(sin_mean, cos_mean);
+  } else {  // every s not start, end or intersection
+    Point2d p1 = l.obj_.at(end_segment_it - 1);
+    Point2d p2 = l.obj_.at(end_segment_it);
+    return atan2(bg::get<1>(p2) - bg::get<1>(p1),
+                 bg::get<0>(p2) - bg::get<0>(p1));
+  }
+}
+}  // namespace detail
+
+inline Point2d GetPointAtS(const Line& l, double s) {
   const size_t& length = l.obj_.size();
   if (length <= 1) {  // this is an error Line consist of 0 or 1 element
     return Point2d(0, 0);
@@ -277,25 +412,11 @@ inline Point2d GetPointAtS(Line l, double s) {
   } else if (s >= l.s_.back()) {  // edge case end
     return l.obj_.at(length - 1);
   } else {  // nominal case
-    int segment_end_idx = GetSegmentEndIdx(l, s);
-    int segment_begin_idx = segment_end_idx - 1;
-
-    double s_on_segment =
-        (s - l.s_.at(segment_begin_idx)) /
-        (l.s_.at(segment_end_idx) - l.s_.at(segment_begin_idx));
-    double interp_pt_x =
-        bg::get<0>(l.obj_.at(segment_begin_idx)) +
-        s_on_segment * (bg::get<0>(l.obj_.at(segment_end_idx)) -
-                        bg::get<0>(l.obj_.at(segment_begin_idx)));
-    double interp_pt_y =
-        bg::get<1>(l.obj_.at(segment_begin_idx)) +
-        s_on_segment * (bg::get<1>(l.obj_.at(segment_end_idx)) -
-                        bg::get<1>(l.obj_.at(segment_begin_idx)));
-    return Point2d(interp_pt_x, interp_pt_y);
+    return detail::InterpolateOnSegment(l, GetSegmentEndIdx(l, s), s);
   }
 }
 
-inline double GetTangentAngleAtS(Line l, double s) {
+inline double GetTangentAngleAtS(const Line& l, double s) {
   if (s >= l.s_.back()) {
     Point2d p1 = l.obj_.at(l.obj_.size() - 2);
     Point2d p2 = l.obj_.at(l.obj_.size() - 1);
@@ -308,37 +429,49 @@ inline double GetTangentAngleAtS(Line l, double s) {
     return atan2(bg::get<1>(p2) - bg::get<1>(p1),
                  bg::get<0>(p2) - bg::get<0>(p1));
   } else {  // not start or end
-    int end_segment_it = GetSegmentEndIdx(l, s);
-    // check if s is at intersection, if true then calculate the angle
-    if (CheckSForSegmentIntersection(l, s)) {
-      Point2d p1 = l.obj_.at(end_segment_it - 2);
-      Point2d p2 = l.obj_.at(end_segment_it - 1);
-      Point2d p3 = l.obj_.at(end_segment_it);
-      double sin_mean = 0.5 * (sin(atan2(bg::get<1>(p2) - bg::get<1>(p1),
-                                         bg::get<0>(p2) - bg::get<0>(p1))) +
-                               sin(atan2(bg::get<1>(p3) - bg::get<1>(p2),
-                                         bg::get<0>(p3) - bg::get<0>(p2))));
-      double cos_mean = 0.5 * (cos(atan2(bg::get<1>(p2) - bg::get<1>(p1),
-                                         bg::get<0>(p2) - bg::get<0>(p1))) +
-                               cos(atan2(bg::get<1>(p3) - bg::get<1>(p2),
-                                         bg::get<0>(p3) - bg::get<0>(p2))));
-      return atan2(sin_mean, cos_mean);
-    } else {  // every s not start, end or intersection
-      Point2d p1 = l.obj_.at(end_segment_it - 1);
-      Point2d p2 = l.obj_.at(end_segment_it);
-      return atan2(bg::get<1>(p2) - bg::get<1>(p1),
-                   bg::get<0>(p2) - bg::get<0>(p1));
-    }
+    return detail::TangentAngleOnSegment(l, GetSegmentEndIdx(l, s),
+                                         CheckSForSegmentIntersection(l, s));
   }
 }
 
-inline Point2d GetNormalAtS(Line l, double s) {
+inline Point2d GetNormalAtS(const Line& l, double s) {
   double tangent = GetTangentAngleAtS(l, s);
   // rotate unit vector anti-clockwise with angle = tangent by 1/2 pi
   Point2d t(cos(tangent + asin(1)), sin(tangent + asin(1)));
   return t;
 }
 
+//! points and normals at the s values, equal to GetPointAtS and GetNormalAtS;
+//! for ascending s values, the segments are found in a single pass
+inline void GetPointsAndNormalsAtS(const Line& l,
+                                   const std::vector<double>& s_values,
+                                   std::vector<Point2d>* points,
+                                   std::vector<Point2d>* normals) {
+  points->clear();
+  normals->clear();
+  points->reserve(s_values.size());
+  normals->reserve(s_values.size());
+  std::size_t segment_end_idx = 1;
+  for (const double s : s_values) {
+    if (l.obj_.size() <= 1 || s <= 0.0 || s >= l.s_.back()) {
+      points->push_back(GetPointAtS(l, s));
+      normals->push_back(GetNormalAtS(l, s));
+      continue;
+    }
+    if (l.s_[segment_end_idx - 1] > s) {
+      segment_end_idx = 1;
+    }
+    // first point with a larger s, as in GetSegmentEndIdx
+    while (l.s_[segment_end_idx] <= s) {
+      ++segment_end_idx;
+    }
+    points->push_back(detail::InterpolateOnSegment(l, segment_end_idx, s));
+    const double tangent = detail::TangentAngleOnSegment(
+        l, segment_end_idx, l.s_[segment_end_idx - 1] == s);
+    normals->push_back(Point2d(cos(tangent + asin(1)), sin(tangent + asin(1))));
+  }
+}
+
 inline Line GetLineFromSInterval(Line line, double begin, double end) {
   Line new_line;
   new_line.AddPoint(GetPointAtS(line, begin));
@@ -361,34 +494,106 @@ inline Line GetLineShiftedLaterally(const Line& line, double lateral_shift) {
   return new_line;
 }
 
-inline std::tuple<Point2d, double, uint> GetNearestPointAndS(
-    Line l, const Point2d& p) {  // GetNearestPoint
-  // edge cases: empty or one-point line
-  if (l.obj_.empty()) {
-    return std::make_tuple(Point2d(0, 0), 0.0, 0);
-  } else if (l.obj_.size() == 1) {
-    return std::make_tuple(l.obj_.at(0), 0.0, 0);
-  }
+//! squared distance from p to the segment of l starting at segment_idx
+inline double ComparableDistanceToSegment(const Line& l, const Point2d& p,
+                                          uint segment_idx) {
+  const Point2d& a = l.obj_[segment_idx];
+  const Point2d& b = l.obj_[segment_idx + 1];
+  const double dx = bg::get<0>(b) - bg::get<0>(a);
+  const double dy = bg::get<1>(b) - bg::get<1>(a);
+  const double px = bg::get<0>(p) - bg::get<0>(a);
+  const double py = bg::get<1>(p) - bg::get<1>(a);
+  const double length_sq = dx * dx + dy * dy;
+  double t = length_sq > 0.0 ? (px * dx + py * dy) / length_sq : 0.0;
+  t = std::max(0.0, std::min(1.0, t));
+  const double ex = px - t * dx;
+  const double ey = py - t * dy;
+  return ex * ex + ey * ey;
+}
 
-  // nominal case:
-  // check distance to each line segment and find closest segment
-  double min_dist = boost::numeric::bounds<double>::highest();
-  int min_segment_idx = 0;
-  for (uint line_idx = 0; line_idx < l.obj_.size() - 1; ++line_idx) {
-    bg::model::linestring<Point2d> current_segment;
-    bg::append(current_segment, l.obj_.at(line_idx));
-    bg::append(current_segment, l.obj_.at(line_idx + 1));
-    double d = bg::comparable_distance(current_segment, p);
-    if (d < min_dist) {
+//! nearest segment among the indexed segments within sqrt(max_dist) of p;
+//! ties are resolved to the lowest segment index as in the linear search
+inline uint FindNearestSegmentInRange(const Line& l,
+                                      const LineSegmentIndex_t<Point2d>& index,
+                                      const Point2d& p, double max_dist,
+                                      uint segment_idx) {
+  // widen the box slightly to not miss segments due to rounding
+  const double r = std::sqrt(max_dist) * (1.0 + 1e-9) + 1e-9;
+  const bg::model::box<Point2d> box(
+      Point2d(bg::get<0>(p) - r, bg::get<1>(p) - r),
+      Point2d(bg::get<0>(p) + r, bg::get<1>(p) + r));
+  double min_dist = max_dist;
+  uint min_segment_idx = segment_idx;
+  for (auto it = index.qbegin(bg::index::intersects(box)); it != index.qend();
+       ++it) {
+    const double d = ComparableDistanceToSegment(l, p, it->second);
+    if (d < min_dist || (d == min_dist && it->second < min_segment_idx)) {
       min_dist = d;
-      min_segment_idx = line_idx;
+      min_segment_idx = it->second;
     }
   }
+  return min_segment_idx;
+}
+
+//! index of the first point of the segment of l that is nearest to p
+//! uses the segment index of the line for long lines
+inline uint FindNearestSegmentIdx(const Line& l, const Point2d& p) {
+  const uint num_segments = l.obj_.size() - 1;
+  if (num_segments < kLineSegmentIndexMinSegments) {
+    double min_dist = boost::numeric::bounds<double>::highest();
+    uint min_segment_idx = 0;
+    for (uint segment_idx = 0; segment_idx < num_segments; ++segment_idx) {
+      const double d = ComparableDistanceToSegment(l, p, segment_idx);
+      if (d < min_dist) {
+        min_dist = d;
+        min_segment_idx = segment_idx;
+      }
+    }
+    return min_segment_idx;
+  }
+  const auto index = l.GetSegmentIndex();
+  auto nearest = index->qbegin(bg::index::nearest(p, 1));
+  const uint segment_idx = nearest->second;
+  return FindNearestSegmentInRange(
+      l, *index, p, ComparableDistanceToSegment(l, p, segment_idx),
+      segment_idx);
+}
 
-  const double a1 = bg::get<0>(l.obj_.at(min_segment_idx));
-  const double a2 = bg::get<1>(l.obj_.at(min_segment_idx));
-  const double b1 = bg::get<0>(l.obj_.at(min_segment_idx + 1));
-  const double b2 = bg::get<1>(l.obj_.at(min_segment_idx + 1));
+//! same as FindNearestSegmentIdx but starts the search at the segment
+//! hint_idx, e.g. the nearest segment of the previous time step, and
+//! descends along the line from there
+inline uint FindNearestSegmentIdx(const Line& l, const Point2d& p,
+                                  uint hint_idx) {
+  const uint num_segments = l.obj_.size() - 1;
+  if (num_segments < kLineSegmentIndexMinSegments) {
+    return FindNearestSegmentIdx(l, p);
+  }
+  uint segment_idx = std::min(hint_idx, num_segments - 1);
+  double min_dist = ComparableDistanceToSegment(l, p, segment_idx);
+  while (segment_idx + 1 < num_segments) {
+    const double d = ComparableDistanceToSegment(l, p, segment_idx + 1);
+    if (d >= min_dist) break;
+    min_dist = d;
+    ++segment_idx;
+  }
+  while (segment_idx > 0) {
+    const double d = ComparableDistanceToSegment(l, p, segment_idx - 1);
+    if (d > min_dist) break;
+    min_dist = d;
+    --segment_idx;
+  }
+  // the local minimum bounds the search radius for the global one
+  return FindNearestSegmentInRange(l, *l.GetSegmentIndex(), p, min_dist,
+                                   segment_idx);
+}
+
+//! nearest point, its s value and the segment index on the given segment
+inline std::tuple<Point2d, double, uint> GetNearestPointAndSOnSegment(
+    const Line& l, const Point2d& p, uint segment_idx) {
+  const double a1 = bg::get<0>(l.obj_.at(segment_idx));
+  const double a2 = bg::get<1>(l.obj_.at(segment_idx));
+  const double b1 = bg::get<0>(l.obj_.at(segment_idx + 1));
+  const double b2 = bg::get<1>(l.obj_.at(segment_idx + 1));
   const double p1 = bg::get<0>(p);
   const double p2 = bg::get<1>(p);
 
@@ -403,18 +608,18 @@ inline std::tuple<Point2d, double, uint> GetNearestPointAndS(
   Point2d retval;
 
   if (lambda < 0) {  // extrapolation front
-    s = l.s_.at(min_segment_idx);
+    s = l.s_.at(segment_idx);
     retval = Point2d(a1, a2);
     // debug
     // dist = sqrt(pow(p1 - a1, 2) + pow(p2 - a2, 2));
   } else if (lambda > 1) {  // extrapolation end
-    s = l.s_.at(min_segment_idx + 1);
+    s = l.s_.at(segment_idx + 1);
     retval = Point2d(b1, b2);
     // debug
     // dist = sqrt(pow(p1 - b1, 2) + pow(p2 - b2, 2));
   } else {  // real interpolation
-    s = (1 - lambda) * l.s_.at(min_segment_idx) +
-        lambda * l.s_.at(min_segment_idx + 1);  // NOLINT
+    s = (1 - lambda) * l.s_.at(segment_idx) +
+        lambda * l.s_.at(segment_idx + 1);  // NOLINT
 
     const double s1 =
         (p1 * a1 * a1 - a1 * a2 * b2 + p2 * a1 * a2 - 2 * p1 * a1 * b1 +
@@ -434,19 +639,40 @@ inline std::tuple<Point2d, double, uint> GetNearestPointAndS(
     retval = Point2d(s1, s2);
   }
 
-  // debug
-  // const double dist_boost = bg::distance(l.obj_, p);
+  return std::make_tuple(retval, s, segment_idx);
+}
 
-  // return
-  return std::make_tuple(retval, s, min_segment_idx);
+inline std::tuple<Point2d, double, uint> GetNearestPointAndS(
+    const Line& l, const Point2d& p) {  // GetNearestPoint
+  // edge cases: empty or one-point line
+  if (l.obj_.empty()) {
+    return std::make_tuple(Point2d(0, 0), 0.0, 0);
+  } else if (l.obj_.size() == 1) {
+    return std::make_tuple(l.obj_.at(0), 0.0, 0);
+  }
+  return GetNearestPointAndSOnSegment(l, p, FindNearestSegmentIdx(l, p));
+}
+
+//! incremental version starting at the segment hint_idx, e.g. the segment
+//! index returned for the same agent in the previous step
+inline std::tuple<Point2d, double, uint> GetNearestPointAndS(const Line& l,
+                                                             const Point2d& p,
+                                                             uint hint_idx) {
+  if (l.obj_.empty()) {
+    return std::make_tuple(Point2d(0, 0), 0.0, 0);
+  } else if (l.obj_.size() == 1) {
+    return std::make_tuple(l.obj_.at(0), 0.0, 0);
+  }
+  return GetNearestPointAndSOnSegment(l, p,
+                                      FindNearestSegmentIdx(l, p, hint_idx));
 }
-inline Point2d GetNearestPoint(Line l, const Point2d& p) {
+inline Point2d GetNearestPoint(const Line& l, const Point2d& p) {
   return std::get<0>(GetNearestPointAndS(l, p));
 }
-inline double GetNearestS(Line l, const Point2d& p) {
+inline double GetNearestS(const Line& l, const Point2d& p) {
   return std::get<1>(GetNearestPointAndS(l, p));
 }
-inline uint FindNearestIdx(Line l, const Point2d& p) {
+inline uint FindNearestIdx(const Line& l, const Point2d& p) {
   return std::get<2>(GetNearestPointAndS(l, p));
 }
 //! Point - Line collision checker using boost::intersection
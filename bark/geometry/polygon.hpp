@@ -9,6 +9,8 @@
 #ifndef BARK_GEOMETRY_POLYGON_HPP_
 #define BARK_GEOMETRY_POLYGON_HPP_
 
+#include <algorithm>
+#include <limits>
 #include <memory>
 #include <vector>
 
@@ -213,6 +215,95 @@ inline bool Collide(const Polygon& poly1, const Polygon& poly2) {
   return bg::intersects(poly1.obj_, poly2.obj_);
 }
 
+//! Polygon transformed by the pose in a single pass over its points;
+//! equal to Transform(pose) without the intermediate copies and the clone
+inline Polygon TransformPolygon(const Polygon& polygon, const Pose& pose) {
+  Polygon transformed(polygon);
+  const double cos_theta = cos(pose[2]);
+  const double sin_theta = sin(pose[2]);
+  const double center_x = polygon.center_[0];
+  const double center_y = polygon.center_[1];
+  auto transform_ring = [&](const bg::model::ring<Point2d>& ring,
+                            bg::model::ring<Point2d>* transformed_ring) {
+    for (std::size_t i = 0; i < ring.size(); ++i) {
+      const double x = bg::get<0>(ring[i]) - center_x;
+      const double y = bg::get<1>(ring[i]) - center_y;
+      bg::set<0>((*transformed_ring)[i],
+                 cos_theta * x - sin_theta * y + (center_x + pose[0]));
+      bg::set<1>((*transformed_ring)[i],
+                 sin_theta * x + cos_theta * y + (center_y + pose[1]));
+    }
+  };
+  transform_ring(polygon.obj_.outer(), &transformed.obj_.outer());
+  for (std::size_t i = 0; i < polygon.obj_.inners().size(); ++i) {
+    transform_ring(polygon.obj_.inners()[i], &transformed.obj_.inners()[i]);
+  }
+  transformed.center_[0] += pose[0];
+  transformed.center_[1] += pose[1];
+  transformed.center_[2] += pose[2];
+  return transformed;
+}
+
+//! True if the polygon has no holes and its outer ring turns in one direction
+inline bool IsConvex(const Polygon& poly) {
+  const auto& ring = poly.obj_.outer();
+  if (!poly.obj_.inners().empty() || ring.size() < 3) return false;
+  const std::size_t num_points =
+      bg::equals(ring.front(), ring.back()) ? ring.size() - 1 : ring.size();
+  int orientation = 0;
+  for (std::size_t i = 0; i < num_points; ++i) {
+    const Point2d& p0 = ring[i];
+    const Point2d& p1 = ring[(i + 1) % num_points];
+    const Point2d& p2 = ring[(i + 2) % num_points];
+    const double cross =
+        (bg::get<0>(p1) - bg::get<0>(p0)) * (bg::get<1>(p2) - bg::get<1>(p1)) -
+        (bg::get<1>(p1) - bg::get<1>(p0)) * (bg::get<0>(p2) - bg::get<0>(p1));
+    if (cross == 0.0) continue;
+    const int sign = cross > 0.0 ? 1 : -1;
+    if (orientation != 0 && sign != orientation) return false;
+    orientation = sign;
+  }
+  return orientation != 0;
+}
+
+namespace detail {
+//! True if an edge normal of poly1 separates the projections of both polygons
+inline bool HasSeparatingAxis(const bg::model::ring<Point2d>& ring1,
+                              const bg::model::ring<Point2d>& ring2) {
+  for (std::size_t i = 0; i < ring1.size(); ++i) {
+    const Point2d& p0 = ring1[i];
+    const Point2d& p1 = ring1[(i + 1) % ring1.size()];
+    const double axis_x = bg::get<1>(p0) - bg::get<1>(p1);
+    const double axis_y = bg::get<0>(p1) - bg::get<0>(p0);
+    if (axis_x == 0.0 && axis_y == 0.0) continue;
+    double min1 = std::numeric_limits<double>::max();
+    double max1 = std::numeric_limits<double>::lowest();
+    for (const Point2d& p : ring1) {
+      const double projection = axis_x * bg::get<0>(p) + axis_y * bg::get<1>(p);
+      min1 = std::min(min1, projection);
+      max1 = std::max(max1, projection);
+    }
+    double min2 = std::numeric_limits<double>::max();
+    double max2 = std::numeric_limits<double>::lowest();
+    for (const Point2d& p : ring2) {
+      const double projection = axis_x * bg::get<0>(p) + axis_y * bg::get<1>(p);
+      min2 = std::min(min2, projection);
+      max2 = std::max(max2, projection);
+    }
+    if (max1 < min2 || max2 < min1) return true;
+  }
+  return false;
+}
+}  // namespace detail
+
+//! Convex polygon - convex polygon collision checker using the separating
+//! axis theorem; as for boost::intersects, touching polygons collide
+//! @note both polygons have to be convex, see IsConvex
+inline bool CollideConvex(const Polygon& poly1, const Polygon& poly2) {
+  return !detail::HasSeparatingAxis(poly1.obj_.outer(), poly2.obj_.outer()) &&
+         !detail::HasSeparatingAxis(poly2.obj_.outer(), poly1.obj_.outer());
+}
+
 inline bool BufferPolygon(const Polygon& polygon, const double distance,
                           Polygon* buffered_polygon) {
   namespace bg = boost::geometry;
@@ -0,0 +1,181 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <cmath>
+#include <vector>
+
+#include "benchmark/benchmark.h"
+
+#include "bark/geometry/line.hpp"
+#include "bark/geometry/polygon.hpp"
+#include "bark/geometry/standard_shapes.hpp"
+
+using bark::geometry::Line;
+using bark::geometry::Point2d;
+using bark::geometry::Polygon;
+using bark::geometry::Pose;
+using bark::geometry::operator+;
+
+// Slightly curved line with the given number of points and 1m spacing
+static Line MakeBenchmarkLine(int num_points) {
+  Line line;
+  for (int i = 0; i < num_points; ++i) {
+    line.AddPoint(Point2d(i, 20.0 * sin(0.005 * i)));
+  }
+  return line;
+}
+
+// Query points that move along the line like an agent does
+static std::vector<Point2d> MakeQueryPoints(const Line& line) {
+  std::vector<Point2d> points;
+  for (double s = 0.0; s < line.Length(); s += 1.5) {
+    points.push_back(GetPointAtS(line, s) + Point2d(0.3, 1.2));
+  }
+  return points;
+}
+
+// building a line point by point, as done when loading maps
+static void BM_LineAddPoint(benchmark::State& state) {
+  for (auto _ : state) {
+    Line line;
+    for (int i = 0; i < state.range(0); ++i) {
+      line.AddPoint(Point2d(i, 20.0 * sin(0.005 * i)));
+    }
+    benchmark::DoNotOptimize(line.s_.back());
+  }
+}
+BENCHMARK(BM_LineAddPoint)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_GetPointsAndNormalsAtS(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  std::vector<double> s_values;
+  for (double s = 0.0; s < line.Length(); s += 0.2) {
+    s_values.push_back(s);
+  }
+  std::vector<Point2d> points, normals;
+  for (auto _ : state) {
+    GetPointsAndNormalsAtS(line, s_values, &points, &normals);
+    benchmark::DoNotOptimize(points.data());
+  }
+}
+BENCHMARK(BM_GetPointsAndNormalsAtS)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_GetNearestPointAndS(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  const auto points = MakeQueryPoints(line);
+  for (auto _ : state) {
+    for (const auto& p : points) {
+      benchmark::DoNotOptimize(GetNearestPointAndS(line, p));
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.size());
+}
+BENCHMARK(BM_GetNearestPointAndS)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_GetNearestPointAndSHint(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  const auto points = MakeQueryPoints(line);
+  for (auto _ : state) {
+    uint hint_idx = 0;
+    for (const auto& p : points) {
+      auto nearest = GetNearestPointAndS(line, p, hint_idx);
+      hint_idx = std::get<2>(nearest);
+      benchmark::DoNotOptimize(nearest);
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.size());
+}
+BENCHMARK(BM_GetNearestPointAndSHint)->RangeMultiplier(4)->Range(8, 8192);
+
+// Includes building the segment index on the first query
+static void BM_GetNearestPointAndSColdIndex(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  const Point2d p(0.5 * state.range(0), 3.0);
+  for (auto _ : state) {
+    Line line_copy = line;
+    benchmark::DoNotOptimize(GetNearestPointAndS(line_copy, p));
+  }
+}
+BENCHMARK(BM_GetNearestPointAndSColdIndex)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_GetPointAtS(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  const double length = line.Length();
+  for (auto _ : state) {
+    for (double s = 0.0; s < length; s += 10.0) {
+      benchmark::DoNotOptimize(GetPointAtS(line, s));
+    }
+  }
+}
+BENCHMARK(BM_GetPointAtS)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_LineDistance(benchmark::State& state) {
+  const Line line = MakeBenchmarkLine(state.range(0));
+  const Point2d p(0.5 * state.range(0), 3.0);
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(Distance(line, p));
+  }
+}
+BENCHMARK(BM_LineDistance)->RangeMultiplier(4)->Range(8, 8192);
+
+static void BM_PolygonCollide(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  const auto other = std::dynamic_pointer_cast<Polygon>(
+      car.Transform(Pose(3.0, 1.0, 0.3)));
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(Collide(car, *other));
+  }
+}
+BENCHMARK(BM_PolygonCollide);
+
+// separating axis test of the same footprints as in BM_PolygonCollide
+static void BM_PolygonCollideConvex(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  const Polygon other = TransformPolygon(car, Pose(3.0, 1.0, 0.3));
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(CollideConvex(car, other));
+  }
+}
+BENCHMARK(BM_PolygonCollideConvex);
+
+// footprints that do not overlap
+static void BM_PolygonCollideSeparated(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  const Polygon other = TransformPolygon(car, Pose(3.0, 2.2, 0.3));
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(Collide(car, other));
+  }
+}
+BENCHMARK(BM_PolygonCollideSeparated);
+
+static void BM_PolygonCollideConvexSeparated(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  const Polygon other = TransformPolygon(car, Pose(3.0, 2.2, 0.3));
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(CollideConvex(car, other));
+  }
+}
+BENCHMARK(BM_PolygonCollideConvexSeparated);
+
+static void BM_PolygonTransform(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(car.Transform(Pose(3.0, 1.0, 0.3)));
+  }
+}
+BENCHMARK(BM_PolygonTransform);
+
+static void BM_TransformPolygon(benchmark::State& state) {
+  const Polygon car = bark::geometry::standard_shapes::CarRectangle();
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(TransformPolygon(car, Pose(3.0, 1.0, 0.3)));
+  }
+}
+BENCHMARK(BM_TransformPolygon);
+
+BENCHMARK_MAIN();
@@ -1190,6 +1190,169 @@ TEST(buffer, inflate) {
   EXPECT_TRUE(Equals(out, s)) << s.ToArray();
 }
 
+TEST(line, nearest_point_segment_index) {
+  using bark::geometry::ComparableDistanceToSegment;
+  using bark::geometry::GetNearestPointAndS;
+  using bark::geometry::Line;
+  using bark::geometry::Point2d;
+  namespace bg = boost::geometry;
+
+  // spiral with many segments, long enough to use the segment index
+  Line line;
+  for (int i = 0; i < 2000; ++i) {
+    const double r = 10.0 + 0.05 * i;
+    line.AddPoint(Point2d(r * cos(0.01 * i), r * sin(0.01 * i)));
+  }
+  ASSERT_GE(line.size() - 1, bark::geometry::kLineSegmentIndexMinSegments);
+
+  uint hint_idx = 0;
+  for (int j = 0; j < 400; ++j) {
+    const Point2d p(20.0 * cos(0.05 * j) + 0.3 * sin(0.7 * j),
+                    20.0 * sin(0.05 * j) - 0.2 * cos(0.3 * j));
+    // brute force reference
+    double min_dist = std::numeric_limits<double>::max();
+    uint min_idx = 0;
+    for (uint i = 0; i + 1 < line.size(); ++i) {
+      const double d = ComparableDistanceToSegment(line, p, i);
+      if (d < min_dist) {
+        min_dist = d;
+        min_idx = i;
+      }
+    }
+    auto nearest = GetNearestPointAndS(line, p);
+    EXPECT_EQ(std::get<2>(nearest), min_idx);
+
+    auto nearest_hint = GetNearestPointAndS(line, p, hint_idx);
+    EXPECT_EQ(std::get<2>(nearest_hint), min_idx);
+    EXPECT_NEAR(std::get<1>(nearest_hint), std::get<1>(nearest), 1e-9);
+    EXPECT_NEAR(bg::distance(std::get<0>(nearest), p), sqrt(min_dist), 1e-6);
+    hint_idx = std::get<2>(nearest_hint);
+  }
+
+  // hints outside of the line are clamped
+  const Point2d p(0.0, 10.0);
+  EXPECT_EQ(std::get<2>(GetNearestPointAndS(line, p, 100000)),
+            std::get<2>(GetNearestPointAndS(line, p)));
+
+  // modifying the line invalidates the index
+  line.AddPoint(Point2d(200.0, 0.0));
+  EXPECT_EQ(std::get<2>(GetNearestPointAndS(line, Point2d(199.0, 1.0))),
+            line.size() - 2);
+}
+
+TEST(line, incremental_s) {
+  using bark::geometry::Line;
+  using bark::geometry::Point2d;
+  Line line, bulk_line;
+  std::vector<Point2d> points;
+  for (int i = 0; i < 100; ++i) {
+    points.push_back(Point2d(i, 20.0 * sin(0.05 * i)));
+    line.AddPoint(points.back());
+  }
+  bulk_line.AddPoints(points);
+  Line reference_line = line;
+  reference_line.RecomputeS();
+  EXPECT_EQ(line.s_, reference_line.s_);
+  EXPECT_EQ(bulk_line.s_, reference_line.s_);
+  EXPECT_NEAR(line.s_.back(), line.Length(), 1e-9);
+
+  // modifying the points without updating s recomputes it
+  line.obj_.pop_back();
+  line.obj_.pop_back();
+  line.AddPoint(Point2d(100.0, 0.0));
+  reference_line = line;
+  reference_line.RecomputeS();
+  EXPECT_EQ(line.s_, reference_line.s_);
+
+  line.Reverse();
+  reference_line = line;
+  reference_line.RecomputeS();
+  EXPECT_EQ(line.s_, reference_line.s_);
+}
+
+TEST(line, get_points_and_normals_at_s) {
+  namespace bg = boost::geometry;
+  using bark::geometry::Line;
+  using bark::geometry::Point2d;
+  Line line;
+  for (int i = 0; i < 50; ++i) {
+    line.AddPoint(Point2d(i, 10.0 * sin(0.1 * i)));
+  }
+  // samples between and at the points and beyond both ends
+  std::vector<double> s_values{-1.0, 0.0};
+  for (double s = 0.1; s < line.Length(); s += 0.7) s_values.push_back(s);
+  s_values.insert(s_values.end(), line.s_.begin(), line.s_.end());
+  s_values.push_back(line.Length() + 1.0);
+  std::sort(s_values.begin(), s_values.end());
+  // unsorted values are supported as well
+  s_values.push_back(3.3);
+
+  std::vector<Point2d> points, normals;
+  GetPointsAndNormalsAtS(line, s_values, &points, &normals);
+  ASSERT_EQ(points.size(), s_values.size());
+  for (std::size_t i = 0; i < s_values.size(); ++i) {
+    const Point2d point = GetPointAtS(line, s_values[i]);
+    const Point2d normal = GetNormalAtS(line, s_values[i]);
+    EXPECT_EQ(bg::get<0>(points[i]), bg::get<0>(point));
+    EXPECT_EQ(bg::get<1>(points[i]), bg::get<1>(point));
+    EXPECT_EQ(bg::get<0>(normals[i]), bg::get<0>(normal));
+    EXPECT_EQ(bg::get<1>(normals[i]), bg::get<1>(normal));
+  }
+}
+
+TEST(polygon, transform_polygon) {
+  namespace bg = boost::geometry;
+  using bark::geometry::Polygon;
+  using bark::geometry::Pose;
+  using bark::geometry::standard_shapes::CarLimousine;
+  const Polygon car = CarLimousine();
+  for (const Pose& pose : {Pose(0.0, 0.0, 0.0), Pose(3.0, -1.0, 0.7),
+                           Pose(-20.0, 5.0, -2.5)}) {
+    const auto expected =
+        std::dynamic_pointer_cast<Polygon>(car.Transform(pose));
+    const Polygon transformed = TransformPolygon(car, pose);
+    ASSERT_EQ(transformed.obj_.outer().size(), expected->obj_.outer().size());
+    for (std::size_t i = 0; i < transformed.obj_.outer().size(); ++i) {
+      EXPECT_NEAR(bg::get<0>(transformed.obj_.outer()[i]),
+                  bg::get<0>(expected->obj_.outer()[i]), 1e-9);
+      EXPECT_NEAR(bg::get<1>(transformed.obj_.outer()[i]),
+                  bg::get<1>(expected->obj_.outer()[i]), 1e-9);
+    }
+    EXPECT_TRUE(transformed.center_.isApprox(expected->center_));
+  }
+}
+
+TEST(polygon, collide_convex) {
+  using bark::geometry::Point2d;
+  using bark::geometry::Polygon;
+  using bark::geometry::Pose;
+  using bark::geometry::standard_shapes::CarLimousine;
+  using bark::geometry::standard_shapes::CarRectangle;
+  const Polygon car = CarRectangle();
+  EXPECT_TRUE(IsConvex(car));
+  EXPECT_TRUE(IsConvex(CarLimousine()));
+  const Polygon l_shape(Pose(0, 0, 0),
+                        std::vector<Point2d>{Point2d(0, 0), Point2d(0, 2),
+                                             Point2d(1, 2), Point2d(1, 1),
+                                             Point2d(2, 1), Point2d(2, 0),
+                                             Point2d(0, 0)});
+  EXPECT_FALSE(IsConvex(l_shape));
+
+  // same results as boost for overlapping, touching and separated polygons
+  const Polygon box(Pose(0, 0, 0),
+                    std::vector<Point2d>{Point2d(0, 0), Point2d(0, 1),
+                                         Point2d(1, 1), Point2d(1, 0),
+                                         Point2d(0, 0)});
+  EXPECT_TRUE(CollideConvex(box, TransformPolygon(box, Pose(1.0, 0.5, 0.0))));
+  EXPECT_FALSE(
+      CollideConvex(box, TransformPolygon(box, Pose(1.01, 0.5, 0.0))));
+  for (int i = 0; i < 500; ++i) {
+    const Pose pose(6.0 * sin(0.37 * i), 3.0 * cos(0.61 * i), 0.13 * i);
+    const Polygon other = TransformPolygon(car, pose);
+    EXPECT_EQ(CollideConvex(car, other), Collide(car, other)) << i;
+  }
+}
+
 int main(int argc, char** argv) {
   ::testing::InitGoogleTest(&argc, argv);
   return RUN_ALL_TESTS();
@@ -191,8 +191,8 @@ IDMRelativeValues BaseIDM::CalcRelativeValues(
     interaction_term_active = true;
     // Get acceleration action other
     if (param_coolness_factor_ > 0.0) {
-      Action last_action =
-          leading_vehicle.first->GetStateInputHistory().back().second;
+      const Action& last_action =
+          leading_vehicle.first->GetHistory().GetLastAction();
       if (last_action.type() == typeid(Continuous1DAction)) {
         leading_acc = boost::get<Continuous1DAction>(last_action);
       } else if (last_action.type() == typeid(LonLatAction)) {
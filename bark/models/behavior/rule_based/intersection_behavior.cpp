@@ -111,26 +111,34 @@ BehaviorIntersectionRuleBased::CheckIntersectingVehicles(
       std::dynamic_pointer_cast<ObservedWorld>(observed_world.Clone());
   tmp_observed_world->SetupPrediction(prediction_settings);
 
-  // predict for n seconds
-  for (double t = 0.; t < prediction_time_horizon_; t += prediction_t_inc_) {
-    ObservedWorldPtr predicted_world = tmp_observed_world->Predict(t);
-    // all agents intersecting at time t
-    AgentMap intersecting_agents =
-        predicted_world->GetAgentsIntersectingPolygon(
-            lane_corr->GetMergedPolygon());
-    // first agent intersecting
-    std::pair<AgentId, bool> intersecting_agent_id =
-        GetIntersectingAgent(intersecting_agents, *predicted_world);
-    if (intersecting_agent_id.second) {
-      lane_corr_intersecting_agent =
-          observed_world.GetAgent(intersecting_agent_id.first);
-      // if there is an agent that intersects at time t
-      if (lane_corr_intersecting_agent) {
-        intersection_time = t;
-        break;
-      }
-    }
-  }
+  if (prediction_time_horizon_ <= 0.)
+    return std::tuple<double, AgentPtr>(intersection_time,
+                                        lane_corr_intersecting_agent);
+
+  // predict for n seconds stepping a single world forward
+  unsigned int num_steps = static_cast<unsigned int>(
+      std::ceil(prediction_time_horizon_ / prediction_t_inc_) - 1);
+  tmp_observed_world->PredictRollout(
+      prediction_t_inc_, num_steps,
+      [&](double t, const ObservedWorld& predicted_world) {
+        // all agents intersecting at time t
+        AgentMap intersecting_agents =
+            predicted_world.GetAgentsIntersectingPolygon(
+                lane_corr->GetMergedPolygon());
+        // first agent intersecting
+        std::pair<AgentId, bool> intersecting_agent_id =
+            GetIntersectingAgent(intersecting_agents, predicted_world);
+        if (intersecting_agent_id.second) {
+          lane_corr_intersecting_agent =
+              observed_world.GetAgent(intersecting_agent_id.first);
+          // if there is an agent that intersects at time t
+          if (lane_corr_intersecting_agent) {
+            intersection_time = t;
+            return false;
+          }
+        }
+        return true;
+      });
   return std::tuple<double, AgentPtr>(intersection_time,
                                       lane_corr_intersecting_agent);
 }
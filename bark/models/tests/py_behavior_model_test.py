@@ -9,6 +9,7 @@
 
 import unittest
 import os
+import threading
 import numpy as np
 from bark.runtime.scenario.scenario_generation.deterministic \
   import DeterministicScenarioGeneration
@@ -114,6 +115,36 @@ class PyBehaviorModelTests(unittest.TestCase):
       np.array([1., 1.], dtype=np.float32))
     world.Step(0.2)
 
+  def test_python_model_threads(self):
+    # World.Step releases the GIL, the python model has to reacquire it
+    param_server = ParameterServer(
+      filename= os.path.join(os.path.dirname(__file__),"../../runtime/tests/data/deterministic_scenario.json"))
+    mapfile = os.path.join(os.path.dirname(__file__),"../../runtime/tests/data/city_highway_straight.xodr")
+    param_server["Scenario"]["Generation"]["DeterministicScenarioGeneration"]["MapFilename"] = mapfile
+    scenario_generation = DeterministicScenarioGeneration(num_scenarios=4,
+                                                          random_seed=0,
+                                                          params=param_server)
+    worlds = []
+    for _ in range(0, 4):
+      scenario, idx = scenario_generation.get_next_scenario()
+      world = scenario.GetWorldState()
+      world.GetAgent(0).behavior_model = \
+        PythonBehaviorModelWrapperInheritance(param_server)
+      worlds.append(world)
+
+    def step_world(world):
+      for _ in range(0, 5):
+        world.Step(0.2)
+
+    threads = [threading.Thread(target=step_world, args=(world,))
+               for world in worlds]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    for world in worlds:
+      self.assertAlmostEqual(world.time, 1.0)
+
 
 if __name__ == '__main__':
   unittest.main()
\ No newline at end of file
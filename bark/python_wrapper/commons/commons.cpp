@@ -37,6 +37,26 @@ void python_commons(py::module m) {
       .def("getCondensedParamList", &Params::GetCondensedParamList)
       .def("setInt", &Params::SetInt);
 
+  py::class_<SetterParams, Params, std::shared_ptr<SetterParams>>(
+      m, "SetterParams")
+      .def(py::init<bool>(), py::arg("log_if_default") = false)
+      .def(py::init<bool, const CondensedParamList&, bool>(),
+           py::arg("log_if_default"), py::arg("param_list"),
+           py::arg("record_defaults") = false)
+      .def_property("record_defaults", &SetterParams::GetRecordDefaults,
+                    &SetterParams::SetRecordDefaults)
+      .def(py::pickle(
+          [](const SetterParams& p) -> py::tuple {
+            return py::make_tuple(p.GetCondensedParamList(),
+                                  p.GetRecordDefaults());
+          },
+          [](py::tuple t) {
+            if (t.size() != 2)
+              throw std::runtime_error("Invalid params state!");
+            return std::make_shared<SetterParams>(
+                false, t[0].cast<CondensedParamList>(), t[1].cast<bool>());
+          }));
+
   m.def("ParamsTest", &DoSomeParams);
 
   py::class_<CppParamServerTestObject,
@@ -85,9 +85,17 @@ void python_geometry(py::module m) {
         "get the angle at position s of the line");
 
   m.def(
-      "GetNearestPointAndS", &bark::geometry::GetNearestPointAndS,
+      "GetNearestPointAndS",
+      py::overload_cast<const Line&, const Point2d&>(
+          &bark::geometry::GetNearestPointAndS),
       "get the point nearest to another point and its position on the line s ");
 
+  m.def("GetNearestPointAndS",
+        py::overload_cast<const Line&, const Point2d&, uint>(
+            &bark::geometry::GetNearestPointAndS),
+        "get the point nearest to another point and its position on the line s "
+        "starting the search at the given segment index");
+
   m.def("GetLineFromSInterval", &bark::geometry::GetLineFromSInterval,
         "get line between specified interval.");
 
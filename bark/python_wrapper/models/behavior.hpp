@@ -25,6 +25,8 @@ using bark::models::dynamic::Trajectory;
 using bark::world::ObservedWorld;
 using bark::world::ObservedWorldPtr;
 
+// the PYBIND11_OVERLOAD macros acquire the GIL, thus, python models can be
+// called from bindings that release it, e.g. World.Step
 class PyBehaviorModel : public BehaviorModel {
  public:
   using BehaviorModel::BehaviorModel;
@@ -41,7 +41,21 @@ void python_agent(py::module m) {
            py::arg("map_interface") = nullptr, py::arg("model_3d") = Model3D())
       .def("__repr__", [](const Agent& a) { return "bark.agent.Agent"; })
       .def_property_readonly("history", &Agent::GetStateInputHistory)
+      // (len(history), state_dim) copy of the states; a view would dangle
+      // once the buffer is reallocated or overwritten
+      .def_property_readonly("history_states",
+                             [](const Agent& a) {
+                               return StateActionBuffer::StateMatrix(
+                                   a.GetHistory().GetStates());
+                             })
+      .def_property_readonly("max_history_length",
+                             &Agent::GetMaxHistoryLength)
+      .def("SetStateInputHistory", &Agent::SetStateInputHistory)
       .def_property_readonly("shape", &Agent::GetShape)
+      // copy of the cached footprint of the current state
+      .def_property_readonly(
+          "polygon", [](const Agent& a) { return a.GetCurrentPolygon(); })
+      .def("GetPolygonFromState", &Agent::GetPolygonFromState)
       .def_property_readonly("id", &Agent::GetAgentId)
       .def_property_readonly("followed_trajectory",
                              &Agent::GetExecutionTrajectory)
@@ -60,7 +74,8 @@ void python_agent(py::module m) {
       .def_property("first_valid_timestamp", &Agent::GetFirstValidTimestamp, &Agent::SetFirstValidTimestamp)
       .def("IsValidAtTime", &Agent::IsValidAtTime)
       .def("SetAgentId", &Object::SetAgentId)
-      .def("GenerateRoadCorridor", &Agent::GenerateRoadCorridor)
+      .def("GenerateRoadCorridor", &Agent::GenerateRoadCorridor,
+           py::call_guard<py::gil_scoped_release>())
       .def(py::pickle(
           [](const Agent& a) -> py::tuple {
             return py::make_tuple(
@@ -56,6 +56,13 @@ void python_evaluation(py::module m) {
              std::shared_ptr<EvaluatorCollisionAgents>>(
       m, "EvaluatorCollisionAgents")
       .def(py::init<>())
+      // no conversion, agent ids passed as first argument must not enable
+      // the reporting of all colliding agents
+      .def(py::init<bool>(), py::arg("report_colliding_agents").noconvert())
+      .def("GetCollidingAgents", &EvaluatorCollisionAgents::GetCollidingAgents)
+      .def_property_readonly(
+          "report_colliding_agents",
+          &EvaluatorCollisionAgents::GetReportCollidingAgents)
       .def("__repr__", [](const EvaluatorCollisionAgents& g) {
         return "bark.core.world.evaluation.EvaluatorCollisionAgents";
       });
@@ -26,7 +26,8 @@ using bark::world::opendrive::XodrLaneId;
 void python_map(py::module m) {
   py::class_<MapInterface, std::shared_ptr<MapInterface>>(m, "MapInterface")
       .def(py::init<>())
-      .def("SetOpenDriveMap", &MapInterface::SetOpenDriveMap)
+      .def("SetOpenDriveMap", &MapInterface::SetOpenDriveMap,
+           py::call_guard<py::gil_scoped_release>())
       .def("find_nearest_lanes",
            [](const MapInterface& m, const Point2d& point,
               const unsigned& num_lanes) {
@@ -40,15 +41,50 @@ void python_map(py::module m) {
       .def("GenerateRoadCorridor",
            py::overload_cast<const std::vector<XodrRoadId>&,
                              const XodrDrivingDirection&>(
-               &MapInterface::GenerateRoadCorridor))
+               &MapInterface::GenerateRoadCorridor),
+           py::call_guard<py::gil_scoped_release>())
       .def("GenerateRoadCorridor",
            py::overload_cast<const bark::geometry::Point2d&,
                              const bark::geometry::Polygon&>(
-               &MapInterface::GenerateRoadCorridor))
+               &MapInterface::GenerateRoadCorridor),
+           py::call_guard<py::gil_scoped_release>())
+      .def("GenerateRoadCorridors", &MapInterface::GenerateRoadCorridors,
+           py::arg("routes"), py::arg("num_threads") = 1,
+           py::call_guard<py::gil_scoped_release>())
+      .def("GetAllRoutes", &MapInterface::GetAllRoutes,
+           py::call_guard<py::gil_scoped_release>())
+      .def("FindRoute", &MapInterface::FindRoute)
       .def("GetRoadCorridor", &MapInterface::GetRoadCorridor)
+      .def_property_readonly("num_road_corridors",
+                             &MapInterface::GetNumRoadCorridors)
       .def("GetLane", &MapInterface::GetLane)
-      .def("ComputeAllPathBoundaries", &MapInterface::ComputeAllPathBoundaries)
-      .def("FindLane", &MapInterface::FindXodrLane);
+      .def("ComputeAllPathBoundaries", &MapInterface::ComputeAllPathBoundaries,
+           py::call_guard<py::gil_scoped_release>())
+      .def("FindLane",
+           py::overload_cast<const Point2d&>(&MapInterface::FindXodrLane,
+                                             py::const_))
+      .def("FindLane",
+           py::overload_cast<const Point2d&, const XodrLanePtr&>(
+               &MapInterface::FindXodrLane, py::const_))
+      .def("MatchPoints", &MapInterface::MatchPoints, py::arg("points"),
+           py::arg("road_corridor") = nullptr,
+           py::call_guard<py::gil_scoped_release>())
+      .def("SaveCompiledMap", &MapInterface::SaveCompiledMap,
+           py::call_guard<py::gil_scoped_release>())
+      .def("LoadCompiledMap", &MapInterface::LoadCompiledMap,
+           py::call_guard<py::gil_scoped_release>());
+
+  py::class_<LaneCorridorMatchingResult>(m, "LaneCorridorMatchingResult")
+      .def_readonly("in_lane_corridors",
+                    &LaneCorridorMatchingResult::in_lane_corridors)
+      .def_readonly("lane_corridor_indices",
+                    &LaneCorridorMatchingResult::lane_corridor_indices)
+      .def_readonly("frenet_positions",
+                    &LaneCorridorMatchingResult::frenet_positions);
+
+  py::class_<MapMatchingResult, LaneCorridorMatchingResult>(
+      m, "MapMatchingResult")
+      .def_readonly("lane_ids", &MapMatchingResult::lane_ids);
 
   py::class_<Roadgraph, std::shared_ptr<Roadgraph>>(m, "Roadgraph")
       .def(py::init<>())
@@ -70,7 +106,8 @@ void python_map(py::module m) {
       .def("PrintGraph",
            (void (Roadgraph::*)(const char*)) & Roadgraph::PrintGraph)
       .def("AddLaneSuccessor", &Roadgraph::AddLaneSuccessor)
-      .def("Generate", &Roadgraph::Generate)
+      .def("Generate", &Roadgraph::Generate,
+           py::call_guard<py::gil_scoped_release>())
       .def("GetLanePolygonForLaneId", &Roadgraph::GetLanePolygonForLaneId)
       .def("GetRoadForLaneId", &Roadgraph::GetRoadForLaneId)
       .def("GetDrivingDirectionsForRoadId",
@@ -86,8 +123,13 @@ void python_map(py::module m) {
       .def("GetRoad", &RoadCorridor::GetRoad)
       .def_property_readonly("polygon", &RoadCorridor::GetPolygon)
       .def("GetLaneCorridor", &RoadCorridor::GetLaneCorridor)
-      .def("GetCurrentLaneCorridor", &RoadCorridor::GetCurrentLaneCorridor)
+      .def("GetCurrentLaneCorridor", &RoadCorridor::GetCurrentLaneCorridor,
+           py::arg("pt"), py::arg("hint") = nullptr)
+      .def("GetNearestLaneCorridor", &RoadCorridor::GetNearestLaneCorridor,
+           py::arg("pt"), py::arg("hint") = nullptr)
       .def("GetLeftRightLaneCorridor", &RoadCorridor::GetLeftRightLaneCorridor)
+      .def("MatchPoints", &RoadCorridor::MatchPoints,
+           py::call_guard<py::gil_scoped_release>())
       .def("ComputeRoadPolygon", &RoadCorridor::ComputeRoadPolygon)
       .def_property_readonly("lane_corridors",
                              &RoadCorridor::GetUniqueLaneCorridors)
@@ -27,7 +27,9 @@ void python_opendrive(py::module m) {
       .def("GetReferenceLine", &PlanView::GetReferenceLine,
            "Return as numpy array")
       .def("ApplyOffsetTransform", &PlanView::ApplyOffsetTransform,
-           "Apply offset to planview");
+           "Apply offset to planview")
+      .def("CheckSelfIntersection", &PlanView::CheckSelfIntersection,
+           "Check planview for self-intersections");
 
   py::class_<XodrRoadLinkInfo>(m, "XodrRoadLinkInfo")
       .def(py::init<>())
@@ -100,6 +102,8 @@ void python_opendrive(py::module m) {
                     &XodrLane::SetRoadMark)
       .def_property("speed", &XodrLane::GetSpeed, &XodrLane::SetSpeed)
       .def("append", &XodrLane::append, "Append lane")
+      .def("CheckSelfIntersection", &XodrLane::CheckSelfIntersection,
+           "Check lane line for self-intersections")
       .def("CreateLaneFromLaneWidth", &CreateLaneFromLaneWidth, "Create lane")
       .def("__repr__", [](const XodrLane& l) {
         std::stringstream ss;
@@ -18,6 +18,8 @@
 #include "bark/python_wrapper/world/world.hpp"
 #include "bark/world/map/roadgraph.hpp"
 #include "bark/world/observed_world.hpp"
+#include "bark/world/world_batch.hpp"
+#include "bark/world/world_episode.hpp"
 #include "bark/world/tests/make_test_world.hpp"
 #include "bark/python_wrapper/world/prediction.hpp"
 
@@ -29,17 +31,27 @@ using bark::commons::ParamsPtr;
 using bark::models::behavior::Action;
 using bark::models::behavior::BehaviorDynamicModel;
 using bark::models::behavior::BehaviorIDMClassic;
+using bark::models::behavior::BehaviorModelPtr;
 using bark::world::ObservedWorldPtr;
 using bark::world::World;
+using bark::world::WorldBatch;
+using bark::world::WorldBatchResult;
+using bark::world::EpisodeResult;
+using bark::world::TerminalComparison;
+using bark::world::TerminalCondition;
 using bark::world::WorldPtr;
 
 void python_world(py::module m) {
   py::class_<World, std::shared_ptr<World>>(m, "World")
       .def(py::init<ParamsPtr>())
-      .def("Step", &World::Step)
-      .def("PlanAgents", &World::PlanAgents)
-      .def("Execute", &World::Execute)
-      .def("Observe", &World::Observe)
+      .def("Step", &World::Step,
+           py::call_guard<py::gil_scoped_release>())
+      .def("PlanAgents", &World::PlanAgents,
+           py::call_guard<py::gil_scoped_release>())
+      .def("Execute", &World::Execute,
+           py::call_guard<py::gil_scoped_release>())
+      .def("Observe", &World::Observe,
+           py::call_guard<py::gil_scoped_release>())
       .def("AddAgent", &World::AddAgent)
       .def("RemoveAgentById", &World::RemoveAgentById)
       .def("AddObject", &World::AddObject)
@@ -49,28 +61,145 @@ void python_world(py::module m) {
       .def("SetMap", &World::SetMap)
       .def("AddEvaluator", &World::AddEvaluator)
       .def("GetNearestAgents", &World::GetNearestAgents)
+      .def("GetNearestAgentsInLane", &World::GetNearestAgentsInLane)
+      .def("GetAgentsInLaneInterval", &World::GetAgentsInLaneInterval)
       .def_property_readonly("evaluators", &World::GetEvaluators)
-      .def("Evaluate", &World::Evaluate)
+      .def("Evaluate", &World::Evaluate,
+           py::call_guard<py::gil_scoped_release>())
+      // reading does not detach the agents shared in copy-on-write mode,
+      // agents that python modifies are obtained with GetMutableAgent(s)
       .def_property_readonly("agents", &World::GetAgents)
       .def_property_readonly("agents_valid", &World::GetValidAgents)
       .def_property_readonly("objects", &World::GetObjects)
       .def_property("time", &World::GetWorldTime, &World::SetWorldTime)
       .def_property_readonly("bounding_box", &World::BoundingBox)
       .def("GetAgent", &World::GetAgent)
+      .def("GetMutableAgent", &World::GetMutableAgent)
+      .def("GetMutableAgents", &World::GetMutableAgents)
       .def_property("map", &World::GetMap, &World::SetMap)
-      .def("Copy", &World::Clone)
-      .def("GetWorldAtTime", &World::GetWorldAtTime)
+      .def("Copy", &World::Clone,
+           py::call_guard<py::gil_scoped_release>())
+      .def("GetWorldAtTime", &World::GetWorldAtTime,
+           py::call_guard<py::gil_scoped_release>())
+      .def("GetAgentIds", &World::GetAgentIds)
+      .def("GetAgentStates", &World::GetAgentStates,
+           py::arg("agent_ids") = std::vector<AgentId>())
+      .def("GetAgentValidity", &World::GetAgentValidity,
+           py::arg("agent_ids") = std::vector<AgentId>())
+      .def("GetAgentLastActions", &World::GetAgentLastActions,
+           py::arg("agent_ids") = std::vector<AgentId>())
+      .def(
+          "GetAgentPolygons",
+          [](const World& world, const std::vector<AgentId>& agent_ids) {
+            // (num_agents, num_points, 2) array of the polygon points
+            const auto points = world.GetAgentPolygons(agent_ids);
+            const py::ssize_t num_agents =
+                agent_ids.empty() ? world.GetAgents().size() : agent_ids.size();
+            const py::ssize_t num_points =
+                num_agents > 0 ? points.rows() / num_agents : 0;
+            return py::array_t<double>(
+                std::vector<py::ssize_t>{num_agents, num_points, 2},
+                points.data());
+          },
+          py::arg("agent_ids") = std::vector<AgentId>())
+      .def(
+          "GetAgentHistories",
+          [](const World& world, unsigned int window,
+             const std::vector<AgentId>& agent_ids) {
+            // (num_agents, window, state_dim) array of the last states
+            const auto histories = world.GetAgentHistories(window, agent_ids);
+            const py::ssize_t num_agents =
+                agent_ids.empty() ? world.GetAgents().size() : agent_ids.size();
+            return py::array_t<double>(
+                std::vector<py::ssize_t>{num_agents,
+                                         static_cast<py::ssize_t>(window),
+                                         histories.cols()},
+                histories.data());
+          },
+          py::arg("window"), py::arg("agent_ids") = std::vector<AgentId>())
       // .def("FillWorldFromCarla",&World::FillWorldFromCarla)
       // .def("PlanAgents",&World::PlanSpecificAgents)
       .def("__repr__", [](const World& a) { return "bark.core.world.World"; });
 
   m.def("MakeTestWorldHighway", &bark::world::tests::MakeTestWorldHighway);
 
+  py::class_<WorldBatch, std::shared_ptr<WorldBatch>>(m, "WorldBatch")
+      .def(py::init<const std::vector<WorldPtr>&, const std::vector<AgentId>&,
+                    const std::vector<std::string>&, unsigned int>(),
+           py::arg("worlds"), py::arg("ego_agent_ids"),
+           py::arg("terminal_evaluators") = std::vector<std::string>(),
+           py::arg("num_threads") = 4)
+      .def(
+          "Step",
+          [](WorldBatch& world_batch, const std::vector<Action>& ego_actions,
+             double delta_time) {
+            WorldBatchResult result;
+            {
+              // python behavior models reacquire the GIL
+              py::gil_scoped_release release;
+              result = world_batch.Step(ego_actions, delta_time);
+            }
+            return py::make_tuple(result.observations, result.evaluations,
+                                  result.done);
+          },
+          py::arg("ego_actions"), py::arg("delta_time"))
+      .def("Observe",
+           [](const WorldBatch& world_batch) {
+             WorldBatchResult result;
+             {
+               py::gil_scoped_release release;
+               result = world_batch.Observe();
+             }
+             return py::make_tuple(result.observations, result.evaluations,
+                                   result.done);
+           })
+      .def("SetWorld", &WorldBatch::SetWorld)
+      .def("GetWorld", &WorldBatch::GetWorld)
+      .def_property_readonly("num_worlds", &WorldBatch::GetNumWorlds)
+      .def_property_readonly("ego_agent_ids", &WorldBatch::GetEgoAgentIds)
+      .def_property_readonly("evaluator_names",
+                             &WorldBatch::GetEvaluatorNames)
+      .def_property_readonly("done", &WorldBatch::GetDone);
+
+  py::enum_<TerminalComparison>(m, "TerminalComparison")
+      .value("is_true", TerminalComparison::IS_TRUE)
+      .value("is_false", TerminalComparison::IS_FALSE)
+      .value("greater", TerminalComparison::GREATER)
+      .value("greater_equal", TerminalComparison::GREATER_EQUAL)
+      .value("less", TerminalComparison::LESS)
+      .value("less_equal", TerminalComparison::LESS_EQUAL)
+      .value("equal", TerminalComparison::EQUAL);
+
+  py::class_<TerminalCondition>(m, "TerminalCondition")
+      .def(py::init<const std::string&, TerminalComparison, double>(),
+           py::arg("evaluator_name"),
+           py::arg("comparison") = TerminalComparison::IS_TRUE,
+           py::arg("threshold") = 0.0)
+      .def("IsTerminal", &TerminalCondition::IsTerminal)
+      .def_readwrite("evaluator_name", &TerminalCondition::evaluator_name)
+      .def_readwrite("comparison", &TerminalCondition::comparison)
+      .def_readwrite("threshold", &TerminalCondition::threshold)
+      .def("__repr__", [](const TerminalCondition& c) {
+        return "bark.core.world.TerminalCondition(" + c.evaluator_name + ")";
+      });
+
+  py::class_<EpisodeResult>(m, "EpisodeResult")
+      .def_readonly("evaluation", &EpisodeResult::evaluation)
+      .def_readonly("terminal_reasons", &EpisodeResult::terminal_reasons)
+      .def_readonly("num_steps", &EpisodeResult::num_steps)
+      .def_readonly("exception_raised", &EpisodeResult::exception_raised)
+      .def_readonly("exception_message", &EpisodeResult::exception_message);
+
+  m.def("RunEpisode", &bark::world::RunEpisode, py::arg("world"),
+        py::arg("terminal_conditions"), py::arg("step_time"),
+        py::arg("max_steps") = 0, py::call_guard<py::gil_scoped_release>());
+
   py::class_<ObservedWorld, World, std::shared_ptr<ObservedWorld>>(
       m, "ObservedWorld")
       .def(py::init<const WorldPtr&, const AgentId&>())
       .def_property_readonly("ego_agent", &ObservedWorld::GetEgoAgent)
-      .def("Evaluate", &ObservedWorld::Evaluate)
+      .def("Evaluate", &ObservedWorld::Evaluate,
+           py::call_guard<py::gil_scoped_release>())
       .def("GetAgentInFront",
            py::overload_cast<>(&ObservedWorld::GetAgentInFront, py::const_))
       .def("GetAgentInFront", py::overload_cast<const LaneCorridorPtr&>(
@@ -85,8 +214,20 @@ void python_world(py::module m) {
       .def_property_readonly("other_agents", &ObservedWorld::GetOtherAgents)
       .def_property_readonly("ego_state", &ObservedWorld::CurrentEgoState)
       .def_property_readonly("ego_position", &ObservedWorld::CurrentEgoPosition)
+      .def("SetupPrediction", &ObservedWorld::SetupPrediction)
+      .def("Predict",
+           py::overload_cast<double>(&ObservedWorld::Predict, py::const_),
+           py::call_guard<py::gil_scoped_release>())
+      .def("Predict",
+           py::overload_cast<double, BehaviorModelPtr,
+                             std::unordered_map<AgentId, BehaviorModelPtr>>(
+               &ObservedWorld::Predict, py::const_),
+           py::call_guard<py::gil_scoped_release>())
+      .def("PredictAgentPolygons", &ObservedWorld::PredictAgentPolygons,
+           py::call_guard<py::gil_scoped_release>())
       .def("PredictWithOthersIDM",
-           &ObservedWorld::Predict<BehaviorIDMClassic, BehaviorDynamicModel>)
+           &ObservedWorld::Predict<BehaviorIDMClassic, BehaviorDynamicModel>,
+           py::call_guard<py::gil_scoped_release>())
       .def_property_readonly("other_agents", &ObservedWorld::GetOtherAgents)
       .def("__repr__", [](const ObservedWorld& a) {
         return "bark.core.world.ObservedWorld";
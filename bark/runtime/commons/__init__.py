@@ -1,5 +1,9 @@
 from .parameters import ParameterServer
 from .xodr_parser import XodrParser
 from .model_json_conversion import ModelJsonConversion
+from .compile_map import CompileMap, LoadCompiledMap, GetScenarioRoutes
+from .map_interface_cache import MapInterfaceCache, GetMapInterfaceCache
 
-__all__ = ["ParameterServer", "XodrParser","ModelJsonConversion"]
+__all__ = ["ParameterServer", "XodrParser","ModelJsonConversion",
+           "CompileMap", "LoadCompiledMap", "GetScenarioRoutes",
+           "MapInterfaceCache", "GetMapInterfaceCache"]
@@ -0,0 +1,132 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import argparse
+
+from bark.core.geometry import Point2d
+from bark.core.models.dynamic import StateDefinition
+from bark.core.world.map import MapInterface
+from bark.core.world.opendrive import XodrDrivingDirection
+from bark.runtime.commons.xodr_parser import XodrParser
+
+# compiled maps contain the OpenDriveMap, the Roadgraph with all lane polygons
+# and the generated road corridors and skip parsing the OpenDRIVE file
+COMPILED_MAP_EXTENSION = ".bmap"
+
+
+def IsCompiledMap(map_file_name):
+    return map_file_name.endswith(COMPILED_MAP_EXTENSION)
+
+
+def LoadCompiledMap(compiled_map_file_name):
+    map_interface = MapInterface()
+    if not map_interface.LoadCompiledMap(compiled_map_file_name):
+        raise ValueError("Could not load compiled map {}".format(
+            compiled_map_file_name))
+    return map_interface
+
+
+def GetScenarioRoutes(map_interface, scenarios):
+    """Returns the routes of the road corridors the agents of the scenarios
+    generate from their position and goal definition
+
+    Arguments:
+      map_interface {[MapInterface]} -- [map of the scenarios]
+      scenarios {[iterable]} -- [scenarios, e.g. of a scenario generation]
+
+    Returns: [list of unique (road ids, XodrDrivingDirection) tuples]
+    """
+    routes = []
+    for scenario in scenarios:
+        for agent in scenario._agent_list:
+            if agent.goal_definition is None:
+                continue
+            route, found = map_interface.FindRoute(
+                Point2d(agent.state[int(StateDefinition.X_POSITION)],
+                        agent.state[int(StateDefinition.Y_POSITION)]),
+                agent.goal_definition.goal_shape)
+            if found and route not in routes:
+                routes.append(route)
+    return routes
+
+
+def CompileMap(map_file_name, compiled_map_file_name=None, road_corridors=None,
+               all_routes=False, num_threads=1):
+    """Parses the OpenDRIVE file, generates the given road corridors and
+    writes the compiled map
+
+    Arguments:
+      map_file_name {[string]} -- [File name of XODR]
+      compiled_map_file_name {[string]} -- [defaults to the XODR file name
+        with the compiled map extension]
+      road_corridors {[list]} -- [(road ids, XodrDrivingDirection) tuples,
+        e.g. from GetScenarioRoutes]
+      all_routes {[bool]} -- [also generates the road corridors between all
+        sources and sinks of the map]
+      num_threads {[int]} -- [threads generating the road corridors]
+
+    Returns: [File name of the compiled map]
+    """
+    compiled_map_file_name = compiled_map_file_name or \
+        os.path.splitext(map_file_name)[0] + COMPILED_MAP_EXTENSION
+    xodr_parser = XodrParser(map_file_name)
+    map_interface = MapInterface()
+    map_interface.SetOpenDriveMap(xodr_parser.map)
+    routes = list(road_corridors or [])
+    if all_routes:
+        routes += map_interface.GetAllRoutes()
+    map_interface.GenerateRoadCorridors(routes, num_threads)
+    if not map_interface.SaveCompiledMap(compiled_map_file_name):
+        raise ValueError("Could not write compiled map {}".format(
+            compiled_map_file_name))
+    return compiled_map_file_name
+
+
+def _parse_road_corridor(road_corridor):
+    road_ids, _, driving_direction = road_corridor.partition(":")
+    driving_direction = getattr(XodrDrivingDirection,
+                                driving_direction or "forward")
+    return [int(road_id) for road_id in road_ids.split(",")], driving_direction
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompiles OpenDRIVE maps to the binary map format.")
+    parser.add_argument("map_files", nargs="+", help="OpenDRIVE map files")
+    parser.add_argument("--output_dir", default=None,
+                        help="Directory of the compiled maps, defaults to "
+                             "the directory of each map file")
+    parser.add_argument("--road_corridor", action="append", default=[],
+                        type=_parse_road_corridor,
+                        help="Road corridor to precompute as comma-separated "
+                             "road ids with an optional driving direction, "
+                             "e.g. 100,101:forward")
+    parser.add_argument("--all_routes", action="store_true",
+                        help="Precompute the road corridors between all "
+                             "sources and sinks of the map")
+    parser.add_argument("--num_threads", type=int, default=1,
+                        help="Threads generating the road corridors")
+    args = parser.parse_args()
+
+    for map_file_name in args.map_files:
+        compiled_map_file_name = None
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            compiled_map_file_name = os.path.join(args.output_dir,
+                os.path.splitext(os.path.basename(map_file_name))[0] +
+                COMPILED_MAP_EXTENSION)
+        compiled_map_file_name = CompileMap(
+            map_file_name, compiled_map_file_name,
+            road_corridors=args.road_corridor, all_routes=args.all_routes,
+            num_threads=args.num_threads)
+        print("Compiled {} to {}".format(map_file_name, compiled_map_file_name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from bark.core.world.map import MapInterface
+from bark.runtime.commons.xodr_parser import XodrParser
+from bark.runtime.commons.compile_map import IsCompiledMap, LoadCompiledMap
+
+
+class MapInterfaceCache(object):
+    """Least-recently-used cache of MapInterfaces keyed by the resolved map
+    path and the hash of the map file content
+
+    Parsing an OpenDRIVE file and building the roadgraph is expensive, thus,
+    all scenarios of a process share the MapInterface of the same map file.
+    """
+    def __init__(self, max_size=16):
+        self._max_size = max_size
+        self._map_interfaces = OrderedDict()
+        # content hashes are only recomputed if the file has been modified
+        self._file_hashes = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    def GetMapInterface(self, map_file_name):
+        """Returns the MapInterface of the map file, parses the map file if
+        it is not cached
+
+        The returned MapInterface is shared by all scenarios and worlds of
+        the process. Generating and querying road corridors is thread-safe,
+        but a cached map must not be mutated concurrently otherwise, e.g.,
+        by SetOpenDriveMap, SetRoadgraph or LoadCompiledMap."""
+        key = self._key(map_file_name)
+        with self._lock:
+            map_interface = self._map_interfaces.get(key, None)
+            if map_interface is not None:
+                self._hits += 1
+                self._map_interfaces.move_to_end(key)
+                return map_interface
+            self._misses += 1
+        map_interface = self._create_map_interface(key[0])
+        with self._lock:
+            # another thread might have added the map in between
+            map_interface = self._map_interfaces.setdefault(key, map_interface)
+            self._map_interfaces.move_to_end(key)
+            self._evict()
+        return map_interface
+
+    def SetMaxSize(self, max_size):
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def Clear(self):
+        with self._lock:
+            self._map_interfaces.clear()
+            self._file_hashes.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def GetStatistics(self):
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses,
+                    "size": len(self._map_interfaces),
+                    "max_size": self._max_size}
+
+    def _evict(self):
+        while len(self._map_interfaces) > max(self._max_size, 0):
+            self._map_interfaces.popitem(last=False)
+
+    def _key(self, map_file_name):
+        resolved_path = os.path.realpath(map_file_name)
+        return resolved_path, self._file_hash(resolved_path)
+
+    def _file_hash(self, resolved_path):
+        stat = os.stat(resolved_path)
+        file_id = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._file_hashes.get(resolved_path, None)
+            if cached is not None and cached[0] == file_id:
+                return cached[1]
+        with open(resolved_path, "rb") as map_file:
+            file_hash = hashlib.sha1(map_file.read()).hexdigest()
+        with self._lock:
+            self._file_hashes[resolved_path] = (file_id, file_hash)
+        return file_hash
+
+    @staticmethod
+    def _create_map_interface(map_file_name):
+        if IsCompiledMap(map_file_name):
+            return LoadCompiledMap(map_file_name)
+        xodr_parser = XodrParser(map_file_name)
+        map_interface = MapInterface()
+        map_interface.SetOpenDriveMap(xodr_parser.map)
+        return map_interface
+
+
+# Module variable to maintain the process-wide cache
+__MAP_INTERFACE_CACHE = MapInterfaceCache()
+
+
+def GetMapInterfaceCache():
+    global __MAP_INTERFACE_CACHE
+    return __MAP_INTERFACE_CACHE
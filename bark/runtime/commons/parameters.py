@@ -8,7 +8,7 @@
 
 import json
 import os
-from bark.core.commons import Params
+from bark.core.commons import Params, SetterParams
 import logging
 
 class ParameterServer(Params):
@@ -16,6 +16,8 @@ class ParameterServer(Params):
         Params.__init__(self)
         self.param_filename = None
         self.log_if_default = kwargs.pop("log_if_default", False)
+        # native snapshots, see Freeze
+        self._frozen_params = []
         if "filename" in kwargs:
             self.load(kwargs["filename"])
             self.param_filename = kwargs["filename"]
@@ -155,7 +157,29 @@ class ParameterServer(Params):
       return ParameterServer(json = self.ConvertToDict(), \
           log_if_default = self.log_if_default)
 
+    def Freeze(self):
+        """Returns a native C++ snapshot of the parameters
+
+        C++ objects read the snapshot with hashed lookups and without calling
+        into python. Parameters that are changed afterwards are not part of the
+        snapshot. Defaults read by C++ are recorded in the snapshot and merged
+        back into this ParameterServer before it is converted or saved; with
+        log_if_default, the merged defaults are logged as warnings.
+        """
+        # the native log_if_default aborts on defaults, thus, python logs them
+        frozen_params = SetterParams(False, self.GetCondensedParamList(), True)
+        self._frozen_params.append(frozen_params)
+        return frozen_params
+
+    def _merge_frozen_params(self):
+        for frozen_params in self._frozen_params:
+            for param_name, value in frozen_params.getCondensedParamList():
+                # only adds the defaults, existing values are kept
+                self.GetValFromString(param_name, "", value,
+                                      log_if_default=self.log_if_default)
+
     def ConvertToDict(self, print_description=False):
+        self._merge_frozen_params()
         dict = {}
         for key, value in self.store.items():
             if isinstance(value, ParameterServer):
@@ -256,20 +280,34 @@ class ParameterServer(Params):
                     return False
               return True
           return False
+        def to_float_lists(value):
+          # lists of ints, e.g. [1, 3] for a ListFloat, are passed as floats
+          if isinstance(value, list) and all(isinstance(el, (int, float)) \
+              and not isinstance(el, bool) for el in value):
+            return [float(el) for el in value]
+          elif isinstance(value, list) and all(isinstance(el, list) for el in value):
+            return [to_float_lists(el) for el in value]
+          return value
         hierarchy_delimiter = "::"
         condensed_param_list = []
         for key, value in self.store.items():
             if isinstance(value, ParameterServer):
-                child_list = value.GetCondensedParamList()
-                for param_tuple in child_list:
-                    param_name = "{}{}{}".format(key,
-                                    hierarchy_delimiter, param_tuple[0])
-                    param_value = param_tuple[1]
-                    if check_append(param_value):
-                        condensed_param_list.append((param_name, param_value))
+                children = [(key, value)]
+            elif isinstance(value, list) and len(value) > 0 and \
+                all(isinstance(el, ParameterServer) for el in value):
+                # lists of dicts are condensed as children named by their index
+                children = [("{}{}{}".format(key, hierarchy_delimiter, idx), child) \
+                              for idx, child in enumerate(value)]
             else:
+                value = to_float_lists(value)
                 if check_append(value):
                     condensed_param_list.append((key, value))
+                continue
+            for child_key, child in children:
+                for param_tuple in child.GetCondensedParamList():
+                    param_name = "{}{}{}".format(child_key,
+                                    hierarchy_delimiter, param_tuple[0])
+                    condensed_param_list.append((param_name, param_tuple[1]))
         test = condensed_param_list
         return condensed_param_list
 
@@ -318,6 +318,8 @@ class XodrParser(object):
                         header["offset"])
             new_plan_view.ApplyOffsetTransform(off_x, off_y, off_hdg)
 
+        # checked once for all geometries
+        new_plan_view.CheckSelfIntersection()
         return new_plan_view
 
     def create_cpp_road_link(self, link):
@@ -397,6 +399,9 @@ class XodrParser(object):
                 # TODO (@hart): make sampling flexible
                 succ = new_lane.append(reference_line, lane_width, 0.2)
 
+            # checked once for all lane widths
+            new_lane.CheckSelfIntersection()
+
             new_lane.lane_type = lane["type"]
             new_lane.driving_direction = lane["driving_direction"]
 
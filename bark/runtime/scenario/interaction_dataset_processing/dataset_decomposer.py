@@ -8,13 +8,14 @@
 
 import os
 import shutil
+import numpy as np
 
 from bark.runtime.commons.parameters import ParameterServer
 from bark.runtime.scenario.interaction_dataset_processing.interaction_dataset_reader import TrajectoryFromTrack
 from bark.runtime.scenario.interaction_dataset_processing.agent_track_info import AgentTrackInfo
 from bark.runtime.scenario.interaction_dataset_processing.scenario_track_info import ScenarioTrackInfo
 from bark.runtime.scenario.scenario import Scenario
-from bark.core.geometry import Point2d, Collide
+from bark.core.world.opendrive import XodrLaneType
 
 from com_github_interaction_dataset_interaction_dataset.python.utils import dataset_reader
 
@@ -32,26 +33,23 @@ class DatasetDecomposer:
 
     def __setup_map_interface__(self):
         params = ParameterServer()
-        # we are creating a dummy scenario to get the map interface from it
+        # we are creating a dummy scenario to get the cached map interface
         scenario = Scenario(map_file_name=self._map_filename,
                             json_params=params.ConvertToDict())
-        world = scenario.GetWorldState()
-        map_interface = world.map
-        return map_interface
+        scenario.CreateMapInterface(scenario.full_map_file_name)
+        return scenario.map_interface
 
     def __find_first_ts_on_map__(self, id_ego):
         traj = TrajectoryFromTrack(self._track_dict[id_ego], xy_offset=self._xy_offset)
-        for state in traj:
-            point_agent = Point2d(state[1], state[2])
-            lane_list = self._map_interface.find_nearest_lanes(point_agent, 3)
-            for lane in lane_list:
-                polygon = self._map_interface.GetRoadgraph().GetLanePolygonForLaneId(lane.lane_id)
-                if Collide(polygon, point_agent):
-                    timestamp_scaling = 1e3 # scale timestamp from s (BARK) to ms (dataset)
-                    time_ego_first = state[0]*timestamp_scaling + self._starting_offset_ms 
-                    return time_ego_first
-
-        return None
+        lane_ids = self._map_interface.MatchPoints(traj[:, 1:3]).lane_ids
+        driving_lane_ids = [lane_id for lane_id in np.unique(lane_ids[lane_ids >= 0]) \
+            if self._map_interface.GetLane(int(lane_id)).lane_type == XodrLaneType.driving]
+        on_map = np.flatnonzero(np.isin(lane_ids, driving_lane_ids))
+        if len(on_map) == 0:
+            return None
+        timestamp_scaling = 1e3 # scale timestamp from s (BARK) to ms (dataset)
+        time_ego_first = traj[on_map[0], 0]*timestamp_scaling + self._starting_offset_ms
+        return time_ego_first
 
     def __setup_agents_track_infos__(self):
         # dictionary mapping first valid timestamp to agnet id
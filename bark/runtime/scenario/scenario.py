@@ -8,9 +8,8 @@
 
 from bark.core.world.agent import Agent
 from bark.core.world import World
-from bark.core.world.map import MapInterface
 from bark.runtime.commons.parameters import ParameterServer
-from bark.runtime.commons.xodr_parser import XodrParser
+from bark.runtime.commons.map_interface_cache import GetMapInterfaceCache
 import copy
 import os
 from pathlib import Path
@@ -85,7 +84,7 @@ class Scenario:
 
     def _build_world_state(self):
         param_server = ParameterServer(json=self._json_params)
-        world = World(param_server)
+        world = World(param_server.Freeze())
         if self._map_interface is None:
             self.CreateMapInterface(self.full_map_file_name)
             world.SetMap(self._map_interface)
@@ -106,12 +105,11 @@ class Scenario:
         sdict['_map_interface'] = None
         self.__dict__.update(sdict)
 
-    # TODO(@hart): should be a commons function
     def CreateMapInterface(self, map_file_name):
+        """Gets the MapInterface of the map file from the process-wide
+        MapInterfaceCache, such that it is only parsed once"""
         map_file_load_test = Path(map_file_name)
-        if map_file_load_test.is_file():
-            xodr_parser = XodrParser(map_file_name)
-        else:
+        if not map_file_load_test.is_file():
             print("Searching for map file {}".format(map_file_name))
             objects_found = sorted(Path().rglob(map_file_name))
             if len(objects_found) == 0:
@@ -119,11 +117,9 @@ class Scenario:
             elif len(objects_found) > 1:
                 raise ValueError("Multiple Maps found")
             else:
-                xodr_parser = XodrParser(objects_found[0].as_posix())
+                map_file_name = objects_found[0].as_posix()
 
-        map_interface = MapInterface()
-        map_interface.SetOpenDriveMap(xodr_parser.map)
-        self._map_interface = map_interface
+        self._map_interface = GetMapInterfaceCache().GetMapInterface(map_file_name)
 
     def GetDatasetScenarioDescription(self):
         # only relevant for scenarios from dataset
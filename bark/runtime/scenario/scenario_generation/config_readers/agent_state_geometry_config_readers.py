@@ -114,10 +114,9 @@ class InteractionDataTrackIdsStatesGeometries(ConfigReaderAgentStatesAndGeometri
 
     agent_geometries = []
     agent_states = []
-    lane_positions = []
     tracks = []
+    tracks_read = dataset_reader.read_tracks(track_file_name)
     for track_id in track_ids:
-      tracks_read = dataset_reader.read_tracks(track_file_name)
       track = tracks_read[track_id]
       if start_time is None:
           start_time = track.time_stamp_ms_first
@@ -129,21 +128,19 @@ class InteractionDataTrackIdsStatesGeometries(ConfigReaderAgentStatesAndGeometri
       shape = ShapeFromTrack(track, wheel_base)
       agent_geometries.append(shape)
       tracks.append(track)
-      lane_positions_agent = self.find_lane_positions(numpy_state, road_corridor)
-      lane_positions.append(lane_positions_agent)
+    lane_positions = self.find_lane_positions(agent_states, road_corridor)
 
     assert(len(agent_states) == len(agent_geometries))
     return agent_states, agent_geometries, {"track_ids": track_ids, "tracks" : tracks, \
              "agent_ids" : track_ids, "xy_offset" : xy_offset, "start_time" : start_time, "end_time" : end_time, \
                "agent_lane_positions" : lane_positions}, config_param_object
   
-  def find_lane_positions(self, init_state, road_corridor):
-    lps = []
-    for idx, lane_corridor in enumerate(road_corridor.lane_corridors):
-      if Collide(lane_corridor.polygon, Point2d(init_state[int(StateDefinition.X_POSITION)], \
-         init_state[int(StateDefinition.Y_POSITION)])):
-        lps.append(idx)
-    return lps
+  def find_lane_positions(self, agent_states, road_corridor):
+    # matches the positions of all agents at once
+    positions = np.array([[state[int(StateDefinition.X_POSITION)], \
+                           state[int(StateDefinition.Y_POSITION)]] for state in agent_states]).reshape(-1, 2)
+    in_lane_corridors = road_corridor.MatchPoints(positions).in_lane_corridors
+    return [np.flatnonzero(in_lane_corridor).tolist() for in_lane_corridor in in_lane_corridors]
 
 class InteractionDataWindowStatesGeometries(ConfigReaderAgentStatesAndGeometries):
   window_start = None
@@ -32,8 +32,8 @@ def add_config_reader_module(module_name):
 
 
 class ConfigurableScenarioGeneration(ScenarioGeneration):
-  def __init__(self, num_scenarios, params=None, random_seed=1000):
-    super(ConfigurableScenarioGeneration, self).__init__(params, num_scenarios, random_seed)
+  def __init__(self, num_scenarios, params=None, random_seed=1000, lazy=False):
+    super(ConfigurableScenarioGeneration, self).__init__(params, num_scenarios, random_seed, lazy)
 
   def initialize_params(self, params):
     print (params["Scenario"])
@@ -24,10 +24,11 @@ class InteractionDatasetScenarioGenerationFull(ScenarioGeneration):
     # This class reads in a track file from the interaction dataset
     # and generates a scenario for each agent as the eval agent.
 
-    def __init__(self, params=None, num_scenarios=None, random_seed=None):
+    def __init__(self, params=None, num_scenarios=None, random_seed=None, lazy=False):
         self._map_interface = None
         self.interaction_ds_reader = InteractionDatasetReader()
-        super().__init__(params, num_scenarios, random_seed)
+        self._scenario_track_infos = None
+        super().__init__(params, num_scenarios, random_seed, lazy)
 
     def initialize_params(self, params):
         super().initialize_params(params)
@@ -51,6 +52,43 @@ class InteractionDatasetScenarioGenerationFull(ScenarioGeneration):
         self._starting_offset_ms = params_temp["StartingOffsetMs",
                                                "Starting Offset to each agent in miliseconds", 500]
 
+    def count_scenarios(self, params, num_scenarios):
+        """
+            see baseclass, only the track infos of the scenarios are kept
+        """
+        self._scenario_track_infos = self.__decompose_track_files__(num_scenarios)
+        return len(self._scenario_track_infos)
+
+    def create_scenario(self, idx, seed):
+        """
+            see baseclass
+        """
+        return self.__create_single_scenario__(self._scenario_track_infos[idx])
+
+    def get_scenario_description(self, idx):
+        """
+            see baseclass
+        """
+        if not self.lazy:
+            return super().get_scenario_description(idx)
+        scenario_track_info = self._scenario_track_infos[idx]
+        return {'TrackIdEgo': scenario_track_info.GetEgoTrackInfo().GetTrackId(),
+                'TrackFileName': scenario_track_info.GetTrackFilename()}
+
+    def __decompose_track_files__(self, num_scenarios):
+        scenario_track_infos = []
+        for track_file_name in self._track_file_name_list:
+            dataset_decomposer = DatasetDecomposer(map_filename=self._map_file_name,
+                                                   track_filename=track_file_name,
+                                                   xy_offset=self._xy_offset,
+                                                   starting_offset_ms=self._starting_offset_ms)
+            for idx_s, scenario_track_info in enumerate(dataset_decomposer.decompose()):
+                if idx_s < num_scenarios and scenario_track_info.GetEgoTrackInfo().GetTrackId() not in self._excluded_tracks:
+                    scenario_track_infos.append(scenario_track_info)
+                else:
+                    break
+        return scenario_track_infos
+
     # TODO: remove code duplication with configurable scenario generation
     def create_scenarios(self, params, num_scenarios):
         """
@@ -8,20 +8,33 @@
 
 import pickle
 import os
+import json
+import weakref
+import numpy as np
 from bark.runtime.commons.parameters import ParameterServer
 
+# lazy generations recreated from references, shared within a process as
+# long as a reference or the original generation is alive
+_referenced_generations = weakref.WeakValueDictionary()
+
 class ScenarioGeneration:
-  def __init__(self, params=None, num_scenarios=None, random_seed=1000):
+  def __init__(self, params=None, num_scenarios=None, random_seed=1000, lazy=False):
     self._params = params
     self._current_scenario_idx = 0
     self._random_seed = random_seed
+    self._lazy = lazy
 
     if params is None:
         self._params = ParameterServer()
     else:
         self._params = params
     self.initialize_params(self._params)
-    self._scenario_list = self.create_scenarios(params, num_scenarios)
+    if lazy:
+      # scenarios are created on demand in get_scenario
+      self._scenario_list = None
+      self._num_scenarios = self.count_scenarios(params, num_scenarios)
+    else:
+      self._scenario_list = self.create_scenarios(params, num_scenarios)
   
   def initialize_params(self, params):
     pass
@@ -30,6 +43,10 @@ class ScenarioGeneration:
   def params(self):
       return self._params
 
+  @property
+  def lazy(self):
+      return self._lazy
+
   def get_next_scenario(self):
     if self._current_scenario_idx >= self.num_scenarios:
       self._current_scenario_idx = 0
@@ -40,11 +57,36 @@ class ScenarioGeneration:
     return scenario, scenario_idx
 
   def get_num_scenarios(self):
-    return len(self._scenario_list)
+    return self.num_scenarios
 
   def get_scenario(self, idx):
+    if self._lazy:
+      if idx < 0 or idx >= self.num_scenarios:
+        raise IndexError("Scenario index {} out of range".format(idx))
+      return self.create_scenario(idx, self.get_scenario_seed(idx))
     return self._scenario_list[idx].copy()
 
+  def get_scenario_seed(self, idx):
+    """Seed of the scenario with index idx in the lazy mode"""
+    return (self._random_seed or 0) + idx
+
+  def get_reference(self):
+    """Lightweight reference to the lazy generation that can be pickled in
+       place of the generation"""
+    if not self._lazy:
+      raise ValueError("Only lazy scenario generations can be referenced")
+    reference = ScenarioGenerationReference(type(self), self._params.ConvertToDict(),
+                                            self.num_scenarios, self._random_seed)
+    reference._generation = _referenced_generations.setdefault(reference.key, self)
+    return reference
+
+  def get_scenario_description(self, idx):
+    """Dataset description of the scenario with index idx, which is known
+       in the lazy mode without creating the scenario"""
+    if self._lazy:
+      return {}
+    return self._scenario_list[idx].GetDatasetScenarioDescription()
+
   def __iter__(self):
     self._current_iter_idx=0
     return self
@@ -75,15 +117,103 @@ class ScenarioGeneration:
     """
     return None
 
+  def count_scenarios(self, params, num_scenarios):
+    """ Returns the number of scenarios in the lazy mode, subclasses can
+        prepare lightweight descriptions of their scenarios here
+
+    Arguments:
+        params {[bark.common.ParameterServer]} -- [provides additional parameters]
+        num_scenarios {[int]} -- [how many scenarios should be created]
+    """
+    return num_scenarios
+
+  def create_scenario(self, idx, seed):
+    """ Creates the scenario with index idx in the lazy mode, it has to be
+        reproducible given the seed. The default implementation creates the
+        numpy RandomState self._random_state from the seed and calls
+        create_single_scenario of the subclass. Subclasses sampling from the
+        global numpy generator sample from the same seed; its state is
+        restored afterwards.
+
+    Returns:
+        scenario {[instance of the scenario class]}
+    """
+    self._random_state = np.random.RandomState(seed)
+    self._current_scenario_idx = idx
+    global_random_state = np.random.get_state()
+    np.random.set_state(self._random_state.get_state())
+    try:
+      return self.create_single_scenario()
+    finally:
+      np.random.set_state(global_random_state)
+
   @property
   def num_scenarios(self):
+    if self._lazy:
+      return self._num_scenarios
     return len(self._scenario_list)
 
   def dump_scenario_list(self, filename):
+    scenario_list = self._scenario_list
+    if self._lazy:
+      scenario_list = [self.get_scenario(idx) for idx in range(0, self.num_scenarios)]
     with open(filename, "wb") as file:
       # print("SAVE PATH:", os.path.abspath(filename))
-      pickle.dump(self._scenario_list, file)
+      pickle.dump(scenario_list, file)
 
   def load_scenario_list(self, filename):
     with open(filename, "rb") as file:
       self._scenario_list = pickle.load(file)
+    self._lazy = False
+
+
+class ScenarioGenerationReference:
+  """References a lazy scenario generation by its type and constructor
+     arguments. The generation is recreated when the first scenario is
+     requested and shared by all references with the same arguments."""
+  def __init__(self, generation_type, params_dict, num_scenarios, random_seed):
+    self._generation_type = generation_type
+    self._params_dict = params_dict
+    self._num_scenarios = num_scenarios
+    self._random_seed = random_seed
+    # keeps the generation alive in _referenced_generations
+    self._generation = None
+
+  def __getstate__(self):
+    odict = self.__dict__.copy()
+    odict['_generation'] = None
+    return odict
+
+  @property
+  def lazy(self):
+    return True
+
+  @property
+  def num_scenarios(self):
+    return self._num_scenarios
+
+  @property
+  def key(self):
+    return (self._generation_type, json.dumps(self._params_dict, sort_keys=True, default=str),
+            self._num_scenarios, self._random_seed)
+
+  @property
+  def generation(self):
+    if self._generation is None:
+      key = self.key
+      self._generation = _referenced_generations.get(key, None)
+      if self._generation is None:
+        self._generation = self._generation_type(
+          params=ParameterServer(json=self._params_dict), num_scenarios=self._num_scenarios,
+          random_seed=self._random_seed, lazy=True)
+        _referenced_generations[key] = self._generation
+    return self._generation
+
+  def get_reference(self):
+    return self
+
+  def get_scenario(self, idx):
+    return self.generation.get_scenario(idx)
+
+  def get_scenario_description(self, idx):
+    return self.generation.get_scenario_description(idx)
@@ -0,0 +1,220 @@
+# Copyright (c) 2020 fortiss GmbH
+#
+# Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+# Tobias Kessler
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import copy
+import numpy as np
+
+from bark.core.models.behavior import LonLatAction
+from bark.runtime.scenario.scenario import Scenario
+
+# type codes of the recorded actions
+_DISCRETE_ACTION = 0
+_CONTINUOUS_1D_ACTION = 1
+_INPUT_ACTION = 2
+_LON_LAT_ACTION = 3
+
+
+def _ActionToArray(action):
+    if isinstance(action, LonLatAction):
+        return _LON_LAT_ACTION, np.array([action.acc_lat, action.acc_lon])
+    if isinstance(action, (int, np.integer)):
+        return _DISCRETE_ACTION, np.array([action], dtype=np.float64)
+    if isinstance(action, (float, np.floating)):
+        return _CONTINUOUS_1D_ACTION, np.array([action])
+    return _INPUT_ACTION, np.asarray(action, dtype=np.float64).flatten()
+
+
+def _ArrayToAction(action_type, action):
+    if action_type == _DISCRETE_ACTION:
+        return int(action[0])
+    if action_type == _CONTINUOUS_1D_ACTION:
+        return float(action[0])
+    if action_type == _LON_LAT_ACTION:
+        lon_lat_action = LonLatAction()
+        lon_lat_action.acc_lat = float(action[0])
+        lon_lat_action.acc_lon = float(action[1])
+        return lon_lat_action
+    return np.array(action)
+
+
+class ScenarioHistory:
+    """History of a simulated scenario that stores the agents with their
+    models once and afterwards only the agent states, actions and validity
+    flags of every step in numpy arrays
+
+    Indexing it like the list of scenarios recorded by the BenchmarkRunner
+    reconstructs the Scenario of the step; its agents have the models of their
+    first recording and the recorded states as history.
+    """
+    def __init__(self, scenario):
+        self._eval_agent_ids = scenario.eval_agent_ids.copy()
+        self._map_file_name = scenario.map_file_name
+        self._json_params = scenario.json_params.copy()
+        self._map_interface = scenario.map_interface
+        self._agents = {}
+        # one array per step, the rows belong to the agent ids of the step
+        self._agent_ids = []
+        self._states = []
+        self._actions = []
+        self._action_types = []
+        self._action_sizes = []
+        self._valid = []
+
+    def Record(self, world):
+        """Appends the current states of the agents of the world as step"""
+        # the bulk getters do not detach agents shared in copy-on-write mode
+        world_agent_ids = world.GetAgentIds()
+        for agent_id in world_agent_ids:
+            if agent_id not in self._agents:
+                self._agents[agent_id] = copy.deepcopy(world.GetAgent(agent_id))
+        agent_ids = np.array(world_agent_ids, dtype=np.int64)
+        encoded_actions = [_ActionToArray(action) for action
+                           in world.GetAgentLastActions(world_agent_ids)]
+        action_dim = max([len(action) for _, action in encoded_actions] or [0])
+        actions = np.full((len(agent_ids), action_dim), np.nan)
+        for row, (_, action) in enumerate(encoded_actions):
+            actions[row, 0:len(action)] = action
+        self._agent_ids.append(agent_ids)
+        self._states.append(world.GetAgentStates(world_agent_ids))
+        self._actions.append(actions)
+        self._action_types.append(np.array(
+            [action_type for action_type, _ in encoded_actions], dtype=np.int8))
+        self._action_sizes.append(np.array(
+            [len(action) for _, action in encoded_actions], dtype=np.int16))
+        self._valid.append(np.array(world.GetAgentValidity(world_agent_ids),
+                                    dtype=bool))
+
+    def __len__(self):
+        return len(self._agent_ids)
+
+    def __getitem__(self, step):
+        return self.GetScenario(step)
+
+    def __iter__(self):
+        for step in range(0, len(self)):
+            yield self.GetScenario(step)
+
+    @property
+    def eval_agent_ids(self):
+        return self._eval_agent_ids
+
+    @property
+    def map_interface(self):
+        return self._map_interface
+
+    @map_interface.setter
+    def map_interface(self, map_interface):
+        self._map_interface = map_interface
+
+    def GetStates(self, step):
+        """Returns the agent ids, states and validity flags of a step"""
+        return self._agent_ids[step], self._states[step], self._valid[step]
+
+    def GetAgentTrajectories(self):
+        """Returns the recorded states of every agent over all steps"""
+        trajectories = {}
+        for agent_ids, states in zip(self._agent_ids, self._states):
+            for agent_id, state in zip(agent_ids, states):
+                trajectories.setdefault(int(agent_id), []).append(state)
+        return {agent_id: np.array(states)
+                for agent_id, states in trajectories.items()}
+
+    def _StatesOfSteps(self):
+        # steps without agents have (0, 0) state arrays
+        state_dim = max([states.shape[1] for states in self._states
+                         if states.ndim == 2] or [0])
+        return [states.reshape(0, state_dim) if len(states) == 0 else states
+                for states in self._states]
+
+    def GetStateArrays(self):
+        """Stacks the states into rows of [step, agent id, state] and returns
+        them with the row offsets per step"""
+        rows = [np.column_stack((np.full(len(agent_ids), step), agent_ids,
+                                 states))
+                for step, (agent_ids, states) in enumerate(
+                    zip(self._agent_ids, self._StatesOfSteps()))]
+        step_offsets = np.cumsum([0] + [len(agent_ids)
+                                        for agent_ids in self._agent_ids])
+        return np.concatenate(rows).astype(np.float64), \
+            step_offsets.astype(np.int64)
+
+    def WithoutStates(self):
+        """Returns a shallow copy without the agent states, which are stored
+        separately using GetStateArrays"""
+        history = copy.copy(self)
+        history._states = None
+        return history
+
+    def HasStates(self):
+        return self._states is not None
+
+    def SetStateArrays(self, states, step_offsets):
+        """Restores the states from the arrays returned by GetStateArrays"""
+        self._states = [np.array(states[step_offsets[step]:step_offsets[step + 1], 2:])
+                        for step in range(0, len(step_offsets) - 1)]
+
+    def GetScenario(self, step):
+        """Reconstructs the scenario of a step"""
+        step = range(0, len(self))[step]
+        agent_list = []
+        for agent_id in self._agent_ids[step]:
+            agent = copy.deepcopy(self._agents[int(agent_id)])
+            first_step = max(0, step - agent.max_history_length + 1)
+            history = []
+            for history_step in range(first_step, step + 1):
+                rows = np.nonzero(self._agent_ids[history_step] == agent_id)[0]
+                if len(rows) == 0:
+                    continue
+                row = rows[0]
+                action_size = self._action_sizes[history_step][row]
+                history.append((
+                    self._states[history_step][row],
+                    _ArrayToAction(self._action_types[history_step][row],
+                                   self._actions[history_step][row][0:action_size])))
+            agent.SetStateInputHistory(history)
+            agent_list.append(agent)
+        return Scenario(agent_list=agent_list,
+                        eval_agent_ids=self._eval_agent_ids.copy(),
+                        map_file_name=self._map_file_name,
+                        json_params=self._json_params,
+                        map_interface=self._map_interface)
+
+    def GetWorldState(self, step):
+        return self.GetScenario(step).GetWorldState()
+
+    def __getstate__(self):
+        # the steps are stored as single arrays with row offsets per step
+        odict = self.__dict__.copy()
+        del odict['_map_interface']
+        step_offsets = np.cumsum([0] + [len(agent_ids)
+                                        for agent_ids in self._agent_ids])
+        odict['_step_offsets'] = step_offsets.astype(np.int64)
+        if self._states is not None:
+            odict['_states'] = self._StatesOfSteps()
+        action_dim = max([actions.shape[1] for actions in self._actions] or [0])
+        odict['_actions'] = [np.pad(actions, ((0, 0), (0, action_dim - actions.shape[1])),
+                                    constant_values=np.nan)
+                             for actions in self._actions]
+        for key in ['_agent_ids', '_states', '_actions', '_action_types',
+                    '_action_sizes', '_valid']:
+            if odict[key] is None:
+                continue
+            odict[key] = np.concatenate(odict[key]) if len(odict[key]) > 0 \
+                else np.array([])
+        return odict
+
+    def __setstate__(self, sdict):
+        step_offsets = sdict.pop('_step_offsets')
+        for key in ['_agent_ids', '_states', '_actions', '_action_types',
+                    '_action_sizes', '_valid']:
+            if sdict[key] is None:
+                continue
+            sdict[key] = [sdict[key][step_offsets[step]:step_offsets[step + 1]]
+                          for step in range(0, len(step_offsets) - 1)]
+        sdict['_map_interface'] = None
+        self.__dict__.update(sdict)
@@ -126,5 +126,56 @@ class ParamServerTests(unittest.TestCase):
     self.assertAlmostEquals(params_unpickled["test_child"]["Test1"]["Test2"]["Lala"], False)
     self.assertAlmostEquals(params_unpickled["test_child"]["Test3"]["Test2"]["Lala1"], 23.3434)
     self.assertAlmostEquals(params_unpickled["test_child"]["Test1"]["Test2"]["asdsd"], 14)
+  def test_freeze_param_server(self):
+    params = ParameterServer()
+    params["Child1"]["Child2"]["ValueFloat"] = 2
+    params["Child1"]["Child2"]["ValueBoolFalse"] = False
+    frozen_params = params.Freeze()
+    params["Child1"]["Child4"]["ValueInt"] = 12
+
+    cpp_object = CppParamServerTestObject(frozen_params)
+    self.assertEqual(cpp_object.GetRealValue(), 2.0)
+    self.assertEqual(cpp_object.GetBoolValueFalse(), False)
+    # changes after freezing are not part of the snapshot
+    self.assertEqual(cpp_object.GetIntValue(), 234)
+
+    # defaults read by C++ are recorded, existing values are kept
+    params_dict = params.ConvertToDict()
+    self.assertEqual(params_dict["Child1"]["Child4"]["ValueInt"], 12)
+    self.assertEqual(params_dict["Child3"]["Child2"]["ValueBoolTrue"], False)
+    self.assertEqual(params_dict["Child1"]["Child5"]["ValueListFloat"],
+                     [1.0, 3.4545234, 1.1266135, 2.0, 3434.4])
+
+    frozen_unpickled = pickle_unpickle(frozen_params)
+    self.assertEqual(frozen_unpickled.getReal("Child1::Child2::ValueFloat", "", 0.0), 2.0)
+
+  def test_freeze_param_server_lists(self):
+    params = ParameterServer()
+    params["Child1"]["Child5"]["ValueListFloat"] = [1, 3]
+    params["Child1"]["Child4"]["ValueListListFloat"] = [[1, 2.5], [3]]
+    params["Child1"]["Sources"] = [{"Value": 1.5}, {"Value": 2.5}]
+    frozen_params = params.Freeze()
+
+    # lists of ints are converted instead of being dropped
+    cpp_object = CppParamServerTestObject(frozen_params)
+    self.assertEqual(cpp_object.GetListFloatValue(), [1.0, 3.0])
+    self.assertEqual(cpp_object.GetListListFloatValue(), [[1.0, 2.5], [3.0]])
+    # lists of dicts are part of the snapshot
+    self.assertEqual(frozen_params.getReal("Child1::Sources::1::Value", "", 0.0), 2.5)
+    self.assertEqual(params.ConvertToDict()["Child1"]["Sources"],
+                     [{"Value": 1.5}, {"Value": 2.5}])
+
+  def test_freeze_param_server_log_if_default(self):
+    params = ParameterServer(log_if_default=True)
+    params["Child1"]["Child2"]["ValueFloat"] = 2
+    frozen_params = params.Freeze()
+
+    # C++ reads of missing parameters use their defaults instead of aborting
+    cpp_object = CppParamServerTestObject(frozen_params)
+    self.assertEqual(cpp_object.GetIntValue(), 234)
+    with self.assertLogs(level="WARNING"):
+      params_dict = params.ConvertToDict()
+    self.assertEqual(params_dict["Child1"]["Child4"]["ValueInt"], 234)
+
 if __name__ == '__main__':
   unittest.main()
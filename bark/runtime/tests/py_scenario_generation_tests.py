@@ -13,6 +13,7 @@ except:
 
 import unittest
 import os
+import numpy as np
 from bark.runtime.scenario.scenario_generation.scenario_generation\
   import ScenarioGeneration
 
@@ -23,7 +24,9 @@ from bark.runtime.scenario.scenario_generation.interaction_dataset_scenario_gene
     import InteractionDatasetScenarioGeneration
 from bark.runtime.scenario.scenario_generation.interaction_dataset_scenario_generation_full \
     import InteractionDatasetScenarioGenerationFull
-from bark.runtime.commons import ParameterServer
+from bark.runtime.commons import ParameterServer, MapInterfaceCache, \
+  GetMapInterfaceCache
+from bark.runtime.scenario.scenario import Scenario
 
 from bark.core.geometry import *
 from bark.core.world.agent import Agent
@@ -50,6 +53,41 @@ class ScenarioGenerationTests(unittest.TestCase):
 
     params.Save("default_params.json")
 
+  def test_configurable_scenario_generation_lazy(self):
+    params = ParameterServer()
+    mapfile = os.path.join(os.path.dirname(__file__),"data/city_highway_straight.xodr")
+    params["Scenario"]["Generation"]["ConfigurableScenarioGeneration"]["MapFilename"] = mapfile
+    scenario_generation = ConfigurableScenarioGeneration(
+        num_scenarios=3, params=params, lazy=True)
+    self.assertTrue(scenario_generation.lazy)
+    self.assertEqual(scenario_generation.num_scenarios, 3)
+    self.assertEqual(scenario_generation._scenario_list, None)
+
+    # a scenario is reproducible from its index and seed
+    scenario_2 = scenario_generation.get_scenario(2)
+    scenario_0 = scenario_generation.get_scenario(0)
+    scenario_2_again = scenario_generation.get_scenario(2)
+    self.assertEqual(len(scenario_2._agent_list), len(scenario_2_again._agent_list))
+    for agent, agent_again in zip(scenario_2._agent_list, scenario_2_again._agent_list):
+      self.assertTrue((agent.state == agent_again.state).all())
+    self.assertEqual(len([scenario for scenario, _ in scenario_generation]), 3)
+    # the global numpy generator of other code is not reseeded
+    np.random.seed(7)
+    expected_sample = np.random.RandomState(7).rand(2)[1]
+    np.random.rand()
+    scenario_generation.get_scenario(1)
+    self.assertEqual(np.random.rand(), expected_sample)
+    with self.assertRaises(IndexError):
+      scenario_generation.get_scenario(3)
+
+    scenario_generation.dump_scenario_list("test.scenario")
+    scenario_loader = ScenarioGeneration()
+    scenario_loader.load_scenario_list("test.scenario")
+    self.assertFalse(scenario_loader.lazy)
+    self.assertEqual(len(scenario_loader._scenario_list), 3)
+    self.assertEqual(len(scenario_loader.get_scenario(0)._agent_list),
+                     len(scenario_0._agent_list))
+
   def test_configurable_scenario_generation_sample_behavior_types(self):
     sink_source_dict = [{
         "SourceSink": [[-1.057, -172.1695],  [-1.894, 14.1725]],
@@ -342,5 +380,30 @@ class ScenarioGenerationTests(unittest.TestCase):
     model_str = scenario_generation.get_scenario(0)._agent_list[1].behavior_model.__repr__()
     self.assertEqual(model_str, "bark.behavior.BehaviorMobilRuleBased")
 
+  def test_map_interface_cache(self):
+    mapfile = os.path.join(os.path.dirname(__file__),"data/city_highway_straight.xodr")
+    params = ParameterServer()
+    GetMapInterfaceCache().Clear()
+    scenario = Scenario(map_file_name=mapfile, json_params=params.ConvertToDict())
+    world = scenario.GetWorldState()
+    stats = GetMapInterfaceCache().GetStatistics()
+    self.assertEqual(stats["misses"], 1)
+    self.assertEqual(stats["hits"], 0)
+
+    # unpickled scenarios drop their map interface and get it from the cache
+    scenario_copy = Scenario(map_file_name=mapfile, json_params=params.ConvertToDict())
+    scenario_copy.__setstate__(scenario.__getstate__())
+    world_copy = scenario_copy.GetWorldState()
+    self.assertEqual(GetMapInterfaceCache().GetStatistics()["hits"], 1)
+    self.assertTrue(scenario_copy.map_interface is scenario.map_interface)
+
+    # the cache is bounded in size
+    cache = MapInterfaceCache(max_size=1)
+    map_interface = cache.GetMapInterface(mapfile)
+    cache.GetMapInterface(os.path.join(os.path.dirname(__file__),"data/4way_intersection.xodr"))
+    self.assertEqual(cache.GetStatistics()["size"], 1)
+    self.assertFalse(cache.GetMapInterface(mapfile) is map_interface)
+    self.assertEqual(cache.GetStatistics()["misses"], 3)
+
 if __name__ == '__main__':
   unittest.main()
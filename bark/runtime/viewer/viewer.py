@@ -220,10 +220,10 @@ class BaseViewer(Viewer):
     def drawHistory(self, agent, color, alpha, facecolor, zorder):
         shape = agent.shape
         if isinstance(shape, Polygon2d):
-            history = agent.history
-            lh = len(history)
-            for idx, state_action in enumerate(history):
-                state = state_action[0]
+            # view of the states without copying the history
+            history_states = agent.history_states
+            lh = len(history_states)
+            for idx, state in enumerate(history_states):
                 pose = generatePoseFromState(state)
                 transformed_polygon = shape.Transform(pose)
                 alpha = 1-0.8*(lh-idx)/3.4
@@ -374,7 +374,7 @@ class BaseViewer(Viewer):
         if isinstance(shape, Polygon2d):
             state = agent.state
             pose = generatePoseFromState(state)
-            transformed_polygon = shape.Transform(pose)
+            transformed_polygon = agent.polygon
 
             centerx = (shape.front_dist - 0.5*(shape.front_dist +
                                                shape.rear_dist)) * math.cos(pose[2]) + pose[0]
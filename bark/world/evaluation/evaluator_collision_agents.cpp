@@ -7,33 +7,59 @@
 // For a copy, see <https://opensource.org/licenses/MIT>.
 
 #include "bark/world/evaluation/evaluator_collision_agents.hpp"
+#include <algorithm>
 #include "bark/world/world.hpp"
 
 namespace bark {
 namespace world {
 namespace evaluation {
 
+using bark::world::objects::Agent;
+using bark::world::objects::CollideFootprints;
+
 EvaluationReturn EvaluatorCollisionAgents::Evaluate(const world::World& world) {
-  bark::geometry::Polygon poly_agent1;
-  bark::geometry::Polygon poly_agent2;
-  bool colliding = false;
+  colliding_agents_ = FindCollidingAgents(world, report_colliding_agents_);
+  return !colliding_agents_.empty();
+}
+
+std::vector<AgentIdPair> EvaluatorCollisionAgents::FindCollidingAgents(
+    const world::World& world, bool find_all) {
+  namespace bgi = boost::geometry::index;
+  // the agents are selected as before and indexed with their current
+  // footprints, as the r-tree of the world is not updated if agents are
+  // removed or their states are set between steps
+  const AgentMap valid_agents = world.GetValidAgents();
+  std::vector<rtree_agent_value> values;
+  values.reserve(valid_agents.size());
+  for (const auto& agent : valid_agents) {
+    const auto& bounding_box = agent.second->GetCurrentBoundingBox();
+    values.emplace_back(
+        rtree_agent_model(bounding_box.first, bounding_box.second),
+        agent.first);
+  }
+  const AgentRTree rtree(values.begin(), values.end());
 
-  for (auto agent_outer : world.GetValidAgents()) {
-    poly_agent1 = agent_outer.second->GetPolygonFromState(
-        agent_outer.second->GetCurrentState());
-    for (auto agent_inner : world.GetValidAgents()) {
-      poly_agent2 = agent_inner.second->GetPolygonFromState(
-          agent_inner.second->GetCurrentState());
-      if (agent_inner.first != agent_outer.first) {
-        if (Collide(poly_agent1, poly_agent2)) {
-          colliding = true;
-          break;
-        }
+  std::vector<AgentIdPair> colliding_agents;
+  std::vector<rtree_agent_value> candidates;
+  for (const auto& value : values) {
+    const Agent& agent = *valid_agents.at(value.second);
+    // broad phase: overlapping bounding boxes
+    candidates.clear();
+    rtree.query(bgi::intersects(value.first) &&
+                    bgi::satisfies([&value](const rtree_agent_value& other) {
+                      return other.second > value.second;
+                    }),
+                std::back_inserter(candidates));
+    // narrow phase: intersection of the cached footprints
+    for (const auto& candidate : candidates) {
+      if (CollideFootprints(agent, *valid_agents.at(candidate.second))) {
+        colliding_agents.emplace_back(value.second, candidate.second);
+        if (!find_all) return colliding_agents;
       }
-      if (colliding == true) break;
     }
   }
-  return colliding;
+  std::sort(colliding_agents.begin(), colliding_agents.end());
+  return colliding_agents;
 }
 
 }  // namespace evaluation
@@ -9,6 +9,9 @@
 #ifndef BARK_WORLD_EVALUATION_COLLISION_AGENTS_HPP_
 #define BARK_WORLD_EVALUATION_COLLISION_AGENTS_HPP_
 
+#include <utility>
+#include <vector>
+
 #include "bark/world/evaluation/base_evaluator.hpp"
 
 namespace bark {
@@ -16,11 +19,37 @@ namespace world {
 class World;
 namespace evaluation {
 
+typedef unsigned int AgentId;
+typedef std::pair<AgentId, AgentId> AgentIdPair;
+
 class EvaluatorCollisionAgents : public BaseEvaluator {
  public:
-  EvaluatorCollisionAgents() {}
+  explicit EvaluatorCollisionAgents(bool report_colliding_agents = false)
+      : report_colliding_agents_(report_colliding_agents) {}
   virtual ~EvaluatorCollisionAgents() {}
   virtual EvaluationReturn Evaluate(const world::World& world);
+
+  /**
+   * @brief  Colliding agent pairs of the last evaluation; contains all
+   *         pairs if report_colliding_agents is set, else at most one
+   */
+  std::vector<AgentIdPair> GetCollidingAgents() const {
+    return colliding_agents_;
+  }
+
+  bool GetReportCollidingAgents() const { return report_colliding_agents_; }
+
+  /**
+   * @brief  Finds colliding agents of World::GetValidAgents using an r-tree
+   *         of their current bounding boxes as broad phase; the smaller id
+   *         comes first in each pair
+   */
+  static std::vector<AgentIdPair> FindCollidingAgents(const world::World& world,
+                                                      bool find_all);
+
+ private:
+  bool report_colliding_agents_;
+  std::vector<AgentIdPair> colliding_agents_;
 };
 
 }  // namespace evaluation
@@ -18,6 +18,7 @@ using bark::geometry::Polygon;
 using bark::models::dynamic::State;
 using bark::models::dynamic::StateDefinition::X_POSITION;
 using bark::models::dynamic::StateDefinition::Y_POSITION;
+using bark::world::objects::CollideFootprints;
 EvaluationReturn EvaluatorCollisionEgoAgent::Evaluate(
     const world::World& world) {
   bool colliding = false;
@@ -28,14 +29,11 @@ EvaluationReturn EvaluatorCollisionEgoAgent::Evaluate(
   }
   State ego_state = ego_agent->GetCurrentState();
   Point2d ego_position(ego_state(X_POSITION), ego_state(Y_POSITION));
-  const Polygon& ego_polygon = ego_agent->GetPolygonFromState(ego_state);
   AgentMap nearby_agents = world.GetNearestAgents(ego_position, num_agents);
 
   for (const auto& agent : nearby_agents) {
     if (this->agent_id_ != agent.second->GetAgentId()) {
-      const Polygon& agent_polygon =
-          agent.second->GetPolygonFromState(agent.second->GetCurrentState());
-      if (Collide(ego_polygon, agent_polygon)) {
+      if (CollideFootprints(*ego_agent, *agent.second)) {
         colliding = true;
         break;
       }
@@ -51,15 +49,12 @@ EvaluationReturn EvaluatorCollisionEgoAgent::Evaluate(
   auto ego_agent = observed_world.GetEgoAgent();
   State ego_state = ego_agent->GetCurrentState();
   Point2d ego_position(ego_state(X_POSITION), ego_state(Y_POSITION));
-  const Polygon& ego_polygon = ego_agent->GetPolygonFromState(ego_state);
   AgentMap nearby_agents =
       observed_world.GetNearestAgents(ego_position, num_agents);
 
   for (const auto& agent : nearby_agents) {
     if (ego_agent->GetAgentId() != agent.second->GetAgentId()) {
-      const Polygon& agent_polygon =
-          agent.second->GetPolygonFromState(agent.second->GetCurrentState());
-      if (Collide(ego_polygon, agent_polygon)) {
+      if (CollideFootprints(*ego_agent, *agent.second)) {
         colliding = true;
         break;
       }
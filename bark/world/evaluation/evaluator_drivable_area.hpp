@@ -37,7 +37,7 @@ class EvaluatorDrivableArea : public BaseEvaluator {
       if (!agent) {
         return true;
       }
-      Polygon poly_agent = agent->GetPolygonFromState(agent->GetCurrentState());
+      const Polygon& poly_agent = agent->GetCurrentPolygon();
       const auto& poly_road = agent->GetRoadCorridor()->GetPolygon();
       if (!bg::within(poly_agent.obj_, poly_road.obj_)) {
         return true;
@@ -46,8 +46,7 @@ class EvaluatorDrivableArea : public BaseEvaluator {
     }
 
     for (const auto& agent : world.GetValidAgents()) {
-      Polygon poly_agent =
-          agent.second->GetPolygonFromState(agent.second->GetCurrentState());
+      const Polygon& poly_agent = agent.second->GetCurrentPolygon();
       auto poly_road = agent.second->GetRoadCorridor()->GetPolygon();
       if (!bg::within(poly_agent.obj_, poly_road.obj_)) {
         return true;
@@ -62,7 +61,7 @@ class EvaluatorDrivableArea : public BaseEvaluator {
     namespace bg = boost::geometry;
 
     const auto& agent = observed_world.GetEgoAgent();
-    Polygon poly_agent = agent->GetPolygonFromState(agent->GetCurrentState());
+    const Polygon& poly_agent = agent->GetCurrentPolygon();
     const auto& poly_road = agent->GetRoadCorridor()->GetPolygon();
     if (!bg::within(poly_agent.obj_, poly_road.obj_)) {
       return true;
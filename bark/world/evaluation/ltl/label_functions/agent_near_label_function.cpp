@@ -28,10 +28,8 @@ bool AgentNearLabelFunction::EvaluateAgent(
     const AgentPtr& other_agent) const {
   const auto ego_agent = observed_world.GetEgoAgent();
   if (other_agent) {
-    const auto& poly_ego =
-        ego_agent->GetPolygonFromState(ego_agent->GetCurrentState());
-    const auto& poly_other =
-        other_agent->GetPolygonFromState(other_agent->GetCurrentState());
+    const auto& poly_ego = ego_agent->GetCurrentPolygon();
+    const auto& poly_other = other_agent->GetCurrentPolygon();
     return std::abs(Distance(poly_ego, poly_other)) < distance_thres_;
   }
   return false;
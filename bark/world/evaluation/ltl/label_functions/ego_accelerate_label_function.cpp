@@ -15,6 +15,7 @@ namespace bark {
 namespace world {
 namespace evaluation {
 
+using bark::models::dynamic::State;
 using bark::models::dynamic::StateDefinition;
 
 EgoAccelerateLabelFunction::EgoAccelerateLabelFunction(
@@ -25,9 +26,10 @@ LabelMap EgoAccelerateLabelFunction::Evaluate(
     const world::ObservedWorld& observed_world) const {
   bool accel = false;
   const auto ego = observed_world.GetEgoAgent();
-  const auto& history = ego->GetStateInputHistory();
+  const auto& history = ego->GetHistory();
   if (history.size() > 2) {
-    const auto dx = (history.end() - 1)->first - (history.end() - 2)->first;
+    const State dx = history.GetState(history.size() - 1) -
+                     history.GetState(history.size() - 2);
     const double dv = dx(StateDefinition::VEL_POSITION);
     const double dt = dx(StateDefinition::TIME_POSITION);
     const double avg_accel = dv / dt;
@@ -23,8 +23,9 @@ LabelMap LaneChangeLabelFunction::Evaluate(
   bool lane_change = false;
   const auto lc = observed_world.GetLaneCorridor();
   const auto ego = observed_world.GetEgoAgent();
-  if (ego->GetStateInputHistory().size() >= 2 && lc) {
-    const State prev_state = (ego->GetStateInputHistory().end() - 2)->first;
+  const auto& history = ego->GetHistory();
+  if (history.size() >= 2 && lc) {
+    const auto prev_state = history.GetState(history.size() - 2);
     const geometry::LinePoint prev_pos(prev_state(StateDefinition::X_POSITION),
                                        prev_state(StateDefinition::Y_POSITION));
     const auto current_pos = observed_world.GetEgoAgent()->GetCurrentPosition();
@@ -114,13 +114,13 @@ void RssInterface::FillRSSDynamics(::ad::rss::world::RssDynamics& rss_dynamics,
 }
 
 ::ad::physics::AngularVelocity RssInterface::CalculateAngularVelocity(
-    const models::behavior::StateActionHistory& history) {
+    const objects::StateActionBuffer& history) {
   ::ad::physics::AngularVelocity av;
   if (history.size() < 2) {
     av = ::ad::physics::AngularVelocity(0.0);
   } else {
-    models::dynamic::State curr_state = history.at(history.size() - 1).first;
-    models::dynamic::State prev_state = history.at(history.size() - 2).first;
+    const auto curr_state = history.GetState(history.size() - 1);
+    const auto prev_state = history.GetState(history.size() - 2);
     double diff_theta =
         SignedAngleDiff(curr_state(THETA_POSITION), prev_state(THETA_POSITION));
     double diff_time = curr_state(TIME_POSITION) - prev_state(TIME_POSITION);
@@ -291,7 +291,7 @@ bool RssInterface::CreateWorldModel(
     ::ad::rss::world::WorldModel& rss_world) {
   geometry::Point2d ego_center(ego_rss_state.center.x, ego_rss_state.center.y);
   auto ego_av = CalculateAngularVelocity(
-      agents.find(ego_id)->second->GetStateInputHistory());
+      agents.find(ego_id)->second->GetHistory());
   ::ad::rss::map::RssObjectData ego_data = {
       ::ad::rss::world::ObjectId(ego_id),
       ::ad::rss::world::ObjectType::EgoVehicle,
@@ -320,7 +320,7 @@ bool RssInterface::CreateWorldModel(
     auto const other_match_object =
         GenerateMatchObject(other_state, other_shape);
 
-    auto other_av = CalculateAngularVelocity(other->GetStateInputHistory());
+    auto other_av = CalculateAngularVelocity(other->GetHistory());
 
     ::ad::rss::map::RssObjectData other_data = {
         ::ad::rss::world::ObjectId(other->GetAgentId()),
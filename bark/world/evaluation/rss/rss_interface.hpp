@@ -172,7 +172,7 @@ class RssInterface {
       const models::dynamic::State& agent_state, const Polygon& agent_shape);
 
   ::ad::physics::AngularVelocity CalculateAngularVelocity(
-    const models::behavior::StateActionHistory& history);
+    const objects::StateActionBuffer& history);
 
   // Generate a RSS route from the current position and the goal of the
   // specified BARK agent and the corresponding RSS match object.
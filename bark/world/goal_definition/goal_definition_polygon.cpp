@@ -14,8 +14,7 @@ namespace world {
 namespace goal_definition {
 
 bool GoalDefinitionPolygon::AtGoal(const bark::world::objects::Agent& agent) {
-  return bark::geometry::Within(
-      agent.GetPolygonFromState(agent.GetCurrentState()), goal_shape_);
+  return bark::geometry::Within(agent.GetCurrentPolygon(), goal_shape_);
 }
 
 }  // namespace goal_definition
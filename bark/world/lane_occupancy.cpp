@@ -0,0 +1,136 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <algorithm>
+#include <limits>
+
+#include "bark/world/lane_occupancy.hpp"
+
+namespace bark {
+namespace world {
+
+namespace {
+bool LonLess(const AgentFrenetPair& agent, double lon) {
+  return agent.second.lon < lon;
+}
+
+bool LessLon(double lon, const AgentFrenetPair& agent) {
+  return lon < agent.second.lon;
+}
+
+AgentFrenetPair RelativeTo(const AgentFrenetPair& agent,
+                           const FrenetPosition& frenet_ego) {
+  return std::make_pair(
+      agent.first, FrenetPosition(agent.second.lon - frenet_ego.lon,
+                                  agent.second.lat - frenet_ego.lat));
+}
+}  // namespace
+
+LaneOccupancy::LaneOccupancy(const std::vector<AgentFrenetPair>& agents,
+                             bool has_intersecting_agents)
+    : agents_(agents), has_intersecting_agents_(has_intersecting_agents) {
+  std::sort(agents_.begin(), agents_.end(),
+            [](const AgentFrenetPair& a, const AgentFrenetPair& b) {
+              if (a.second.lon != b.second.lon) {
+                return a.second.lon < b.second.lon;
+              }
+              return a.first->GetAgentId() < b.first->GetAgentId();
+            });
+}
+
+FrontRearAgents LaneOccupancy::GetFrontRearAgents(
+    const AgentId& agent_id, const FrenetPosition& frenet_ego) const {
+  FrontRearAgents fr_agents;
+  if (!has_intersecting_agents_) {
+    fr_agents.front = std::make_pair(AgentPtr(nullptr), FrenetPosition(0, 0));
+    fr_agents.rear = fr_agents.front;
+    return fr_agents;
+  }
+  const double numeric_max = std::numeric_limits<double>::max();
+  fr_agents.front = std::make_pair(AgentPtr(nullptr),
+                                   FrenetPosition(numeric_max, numeric_max));
+  fr_agents.rear = fr_agents.front;
+
+  // first agent strictly in front of the ego agent
+  for (auto it = std::upper_bound(agents_.begin(), agents_.end(),
+                                  frenet_ego.lon, LessLon);
+       it != agents_.end(); ++it) {
+    if (it->first->GetAgentId() != agent_id) {
+      fr_agents.front = RelativeTo(*it, frenet_ego);
+      break;
+    }
+  }
+
+  // nearest agent strictly behind the ego agent, the one with the lowest id
+  // if several agents share the same position
+  auto rear_end = std::lower_bound(agents_.begin(), agents_.end(),
+                                   frenet_ego.lon, LonLess);
+  while (rear_end != agents_.begin()) {
+    auto rear = std::lower_bound(agents_.begin(), rear_end,
+                                 std::prev(rear_end)->second.lon, LonLess);
+    for (auto it = rear; it != rear_end; ++it) {
+      if (it->first->GetAgentId() != agent_id) {
+        fr_agents.rear = RelativeTo(*it, frenet_ego);
+        return fr_agents;
+      }
+    }
+    rear_end = rear;
+  }
+  return fr_agents;
+}
+
+std::vector<AgentFrenetPair> LaneOccupancy::GetNearestAgents(
+    const AgentId& agent_id, const FrenetPosition& frenet_ego,
+    unsigned int num_agents) const {
+  std::vector<AgentFrenetPair> nearest_agents;
+  // expands from the ego position to the front and to the rear
+  auto front = std::lower_bound(agents_.begin(), agents_.end(),
+                                frenet_ego.lon, LonLess);
+  auto rear = front;
+  while (nearest_agents.size() < num_agents &&
+         (front != agents_.end() || rear != agents_.begin())) {
+    bool take_front = rear == agents_.begin();
+    if (front != agents_.end() && !take_front) {
+      take_front = front->second.lon - frenet_ego.lon <=
+                   frenet_ego.lon - std::prev(rear)->second.lon;
+    }
+    const auto& agent = take_front ? *front++ : *--rear;
+    if (agent.first->GetAgentId() != agent_id) {
+      nearest_agents.push_back(RelativeTo(agent, frenet_ego));
+    }
+  }
+  return nearest_agents;
+}
+
+std::vector<AgentFrenetPair> LaneOccupancy::GetAgentsInInterval(
+    double lon_min, double lon_max) const {
+  auto first = std::lower_bound(agents_.begin(), agents_.end(), lon_min,
+                                LonLess);
+  auto last = std::upper_bound(first, agents_.end(), lon_max, LessLon);
+  return std::vector<AgentFrenetPair>(first, last);
+}
+
+LaneOccupancyPtr LaneOccupancyIndex::GetLaneOccupancy(
+    const LaneCorridorPtr& lane_corridor,
+    const std::function<LaneOccupancyPtr()>& make_lane_occupancy) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = lane_occupancies_.find(lane_corridor);
+    if (it != lane_occupancies_.end()) {
+      return it->second;
+    }
+  }
+  // agents planned in parallel might create the same occupancy, the first
+  // one is kept
+  LaneOccupancyPtr lane_occupancy = make_lane_occupancy();
+  std::lock_guard<std::mutex> lock(mutex_);
+  return lane_occupancies_.emplace(lane_corridor, lane_occupancy).first->second;
+}
+
+}  // namespace world
+}  // namespace bark
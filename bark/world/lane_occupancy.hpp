@@ -0,0 +1,99 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#ifndef BARK_WORLD_LANE_OCCUPANCY_HPP_
+#define BARK_WORLD_LANE_OCCUPANCY_HPP_
+
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <utility>
+#include <vector>
+
+#include "bark/commons/transformation/frenet.hpp"
+#include "bark/world/map/lane_corridor.hpp"
+#include "bark/world/objects/agent.hpp"
+
+namespace bark {
+namespace world {
+
+using bark::commons::transformation::FrenetPosition;
+using world::map::LaneCorridorPtr;
+using world::objects::AgentId;
+using world::objects::AgentPtr;
+
+typedef std::pair<AgentPtr, FrenetPosition> AgentFrenetPair;
+
+struct FrontRearAgents {
+  AgentFrenetPair front;
+  AgentFrenetPair rear;
+};
+
+/**
+ * @brief  Agents on a lane corridor sorted by their Frenet position along the
+ *         center line of the corridor
+ */
+class LaneOccupancy {
+ public:
+  LaneOccupancy(const std::vector<AgentFrenetPair>& agents,
+                bool has_intersecting_agents);
+
+  //! Agents with their absolute Frenet positions, sorted by lon and id
+  const std::vector<AgentFrenetPair>& GetAgents() const { return agents_; }
+
+  /**
+   * @brief  Nearest agents in front of and behind the Frenet position of the
+   *         agent with the Frenet distances relative to it
+   */
+  FrontRearAgents GetFrontRearAgents(const AgentId& agent_id,
+                                     const FrenetPosition& frenet_ego) const;
+
+  /**
+   * @brief  Up to num_agents agents with the smallest longitudinal distance to
+   *         the Frenet position of the agent, relative Frenet distances
+   */
+  std::vector<AgentFrenetPair> GetNearestAgents(
+      const AgentId& agent_id, const FrenetPosition& frenet_ego,
+      unsigned int num_agents) const;
+
+  //! Agents with lon_min <= lon <= lon_max, absolute Frenet positions
+  std::vector<AgentFrenetPair> GetAgentsInInterval(double lon_min,
+                                                   double lon_max) const;
+
+ private:
+  std::vector<AgentFrenetPair> agents_;
+  // whether any valid agent intersects the corridor, also outside of the
+  // lateral offset
+  bool has_intersecting_agents_;
+};
+
+typedef std::shared_ptr<const LaneOccupancy> LaneOccupancyPtr;
+
+/**
+ * @brief  Lane occupancies of the lane corridors at one world state; the
+ *         occupancy of a corridor is created on the first query and shared by
+ *         all worlds observing the same state
+ */
+class LaneOccupancyIndex {
+ public:
+  LaneOccupancyPtr GetLaneOccupancy(
+      const LaneCorridorPtr& lane_corridor,
+      const std::function<LaneOccupancyPtr()>& make_lane_occupancy);
+
+ private:
+  std::mutex mutex_;
+  std::map<LaneCorridorPtr, LaneOccupancyPtr> lane_occupancies_;
+};
+
+typedef std::shared_ptr<LaneOccupancyIndex> LaneOccupancyIndexPtr;
+
+}  // namespace world
+}  // namespace bark
+
+#endif  // BARK_WORLD_LANE_OCCUPANCY_HPP_
@@ -0,0 +1,611 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <exception>
+#include <fstream>
+#include <limits>
+#include <memory>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <vector>
+#include "bark/world/map/map_interface.hpp"
+
+namespace bark {
+namespace world {
+namespace map {
+
+namespace {
+
+namespace bg = boost::geometry;
+using bark::world::opendrive::Connection;
+using bark::world::opendrive::Junction;
+using bark::world::opendrive::JunctionPtr;
+using bark::world::opendrive::OpenDriveMap;
+using bark::world::opendrive::PlanView;
+using bark::world::opendrive::XodrLaneLink;
+using bark::world::opendrive::XodrLaneSection;
+using bark::world::opendrive::XodrLaneSectionPtr;
+using bark::world::opendrive::XodrRoadLink;
+using bark::world::opendrive::XodrRoadLinkInfo;
+using bark::world::opendrive::XodrRoadMark;
+
+// the file stores the data in the byte order of the machine it was compiled
+// on; the version has to be increased whenever the layout changes
+const char kCompiledMapMagic[8] = {'B', 'A', 'R', 'K', 'M', 'A', 'P', '\0'};
+const uint32_t kCompiledMapVersion = 1;
+const uint32_t kNoId = std::numeric_limits<uint32_t>::max();
+
+class CompiledMapWriter {
+ public:
+  explicit CompiledMapWriter(std::ostream& os) : os_(os) {}
+
+  template <typename T>
+  void Write(const T& value) {
+    static_assert(std::is_arithmetic<T>::value || std::is_enum<T>::value,
+                  "only arithmetic types and enums can be written directly");
+    os_.write(reinterpret_cast<const char*>(&value), sizeof(T));
+  }
+
+  void Write(const std::string& str) {
+    Write<uint64_t>(str.size());
+    os_.write(str.data(), str.size());
+  }
+
+  void Write(const Point2d& point) {
+    Write(bg::get<0>(point));
+    Write(bg::get<1>(point));
+  }
+
+  template <typename Range>
+  void WritePoints(const Range& points) {
+    Write<uint64_t>(points.size());
+    for (const auto& point : points) Write(point);
+  }
+
+  void Write(const Line& line) {
+    WritePoints(line.obj_);
+    Write<uint64_t>(line.s_.size());
+    for (const auto& s : line.s_) Write(s);
+  }
+
+  void Write(const Polygon& polygon) {
+    for (int i = 0; i < 3; ++i) Write(polygon.center_[i]);
+    WritePoints(polygon.obj_.outer());
+    Write<uint64_t>(polygon.obj_.inners().size());
+    for (const auto& inner : polygon.obj_.inners()) WritePoints(inner);
+    Write(polygon.rear_dist_);
+    Write(polygon.front_dist_);
+    Write(polygon.left_dist_);
+    Write(polygon.right_dist_);
+  }
+
+  void Write(const XodrRoadMark& road_mark) {
+    Write(road_mark.type_);
+    Write(road_mark.color_);
+    Write(road_mark.width_);
+  }
+
+  void Write(const XodrLaneLink& link) {
+    Write(link.from_position);
+    Write(link.to_position);
+  }
+
+ private:
+  std::ostream& os_;
+};
+
+class CompiledMapReader {
+ public:
+  explicit CompiledMapReader(std::istream& is) : is_(is) {
+    const std::streampos position = is_.tellg();
+    is_.seekg(0, std::ios::end);
+    end_ = is_.tellg();
+    is_.seekg(position);
+  }
+
+  template <typename T>
+  T Read() {
+    static_assert(std::is_arithmetic<T>::value || std::is_enum<T>::value,
+                  "only arithmetic types and enums can be read directly");
+    T value{};
+    is_.read(reinterpret_cast<char*>(&value), sizeof(T));
+    return value;
+  }
+
+  uint64_t ReadSize() {
+    uint64_t size = Read<uint64_t>();
+    // a corrupted file must not trigger huge allocations: every element takes
+    // at least one byte, so a size beyond the remaining bytes is invalid
+    if (!is_.good()) return 0;
+    if (size > static_cast<uint64_t>(end_ - is_.tellg())) {
+      is_.setstate(std::ios::failbit);
+      return 0;
+    }
+    return size;
+  }
+
+  std::string ReadString() {
+    std::string str(ReadSize(), '\0');
+    is_.read(&str[0], str.size());
+    return str;
+  }
+
+  Point2d ReadPoint() {
+    double x = Read<double>();
+    double y = Read<double>();
+    // invalid coordinates would break the r-trees of the map
+    if (!std::isfinite(x) || !std::isfinite(y))
+      is_.setstate(std::ios::failbit);
+    return Point2d(x, y);
+  }
+
+  template <typename Range>
+  void ReadPoints(Range* points) {
+    uint64_t size = ReadSize();
+    points->clear();
+    for (uint64_t i = 0; i < size && is_.good(); ++i)
+      points->push_back(ReadPoint());
+  }
+
+  Line ReadLine() {
+    Line line;
+    ReadPoints(&line.obj_);
+    uint64_t size = ReadSize();
+    for (uint64_t i = 0; i < size && is_.good(); ++i)
+      line.s_.push_back(Read<double>());
+    return line;
+  }
+
+  Polygon ReadPolygon() {
+    Polygon polygon;
+    for (int i = 0; i < 3; ++i) polygon.center_[i] = Read<double>();
+    ReadPoints(&polygon.obj_.outer());
+    polygon.obj_.inners().resize(ReadSize());
+    for (auto& inner : polygon.obj_.inners()) ReadPoints(&inner);
+    polygon.rear_dist_ = Read<double>();
+    polygon.front_dist_ = Read<double>();
+    polygon.left_dist_ = Read<double>();
+    polygon.right_dist_ = Read<double>();
+    return polygon;
+  }
+
+  XodrRoadMark ReadRoadMark() {
+    XodrRoadMark road_mark;
+    road_mark.type_ = Read<roadmark::XodrRoadMarkType>();
+    road_mark.color_ = Read<roadmark::XodrRoadMarkColor>();
+    road_mark.width_ = Read<double>();
+    return road_mark;
+  }
+
+  XodrLaneLink ReadLaneLink() {
+    XodrLaneLink link;
+    link.from_position = Read<XodrLanePosition>();
+    link.to_position = Read<XodrLanePosition>();
+    return link;
+  }
+
+  bool Good() const { return is_.good(); }
+
+ private:
+  std::istream& is_;
+  std::streampos end_;
+};
+
+void WriteRoadLinkInfo(const XodrRoadLinkInfo& info, CompiledMapWriter* w) {
+  w->Write(info.id_);
+  w->Write(info.type_);
+}
+
+XodrRoadLinkInfo ReadRoadLinkInfo(CompiledMapReader* r) {
+  XodrRoadId id = r->Read<XodrRoadId>();
+  return XodrRoadLinkInfo(id, r->ReadString());
+}
+
+void WriteXodrLane(const XodrLane& lane, CompiledMapWriter* w) {
+  w->Write(lane.GetId());
+  w->Write(lane.GetLanePosition());
+  w->Write(lane.GetLink());
+  w->Write(lane.GetLine());
+  w->Write(lane.GetLaneType());
+  w->Write(lane.GetDrivingDirection());
+  w->Write(lane.GetRoad_mark());
+  w->Write(lane.GetSpeed());
+}
+
+XodrLanePtr ReadXodrLane(CompiledMapReader* r) {
+  XodrLanePtr lane = std::make_shared<XodrLane>();
+  lane->SetId(r->Read<XodrLaneId>());
+  lane->SetLanePosition(r->Read<XodrLanePosition>());
+  lane->SetLink(r->ReadLaneLink());
+  lane->SetLine(r->ReadLine());
+  lane->SetLaneType(r->Read<XodrLaneType>());
+  lane->SetDrivingDirection(r->Read<XodrDrivingDirection>());
+  lane->SetRoadMark(r->ReadRoadMark());
+  lane->SetSpeed(r->Read<double>());
+  return lane;
+}
+
+void WriteOpenDriveMap(const OpenDriveMap& open_drive_map,
+                       CompiledMapWriter* w) {
+  const auto roads = open_drive_map.GetRoads();
+  w->Write<uint64_t>(roads.size());
+  for (const auto& road : roads) {
+    w->Write(road.second->GetId());
+    w->Write(road.second->GetName());
+    WriteRoadLinkInfo(road.second->GetLink().GetPredecessor(), w);
+    WriteRoadLinkInfo(road.second->GetLink().GetSuccessor(), w);
+    const auto plan_view = road.second->GetPlanView();
+    w->Write<uint8_t>(plan_view != nullptr);
+    if (plan_view) {
+      w->Write(plan_view->GetReferenceLine());
+      w->Write(plan_view->GetLength());
+    }
+    const auto lane_sections = road.second->GetLaneSections();
+    w->Write<uint64_t>(lane_sections.size());
+    for (const auto& lane_section : lane_sections) {
+      w->Write(lane_section->GetS());
+      const auto lanes = lane_section->GetLanes();
+      w->Write<uint64_t>(lanes.size());
+      for (const auto& lane : lanes) WriteXodrLane(*lane.second, w);
+    }
+  }
+
+  const auto junctions = open_drive_map.GetJunctions();
+  w->Write<uint64_t>(junctions.size());
+  for (const auto& junction : junctions) {
+    w->Write(junction.second->GetId());
+    w->Write(junction.second->GetName());
+    const auto connections = junction.second->GetConnections();
+    w->Write<uint64_t>(connections.size());
+    for (const auto& connection : connections) {
+      w->Write(connection.second.id_);
+      w->Write(connection.second.incoming_road_);
+      w->Write(connection.second.connecting_road_);
+      w->Write<uint64_t>(connection.second.lane_links_.size());
+      for (const auto& link : connection.second.lane_links_) w->Write(link);
+    }
+  }
+}
+
+OpenDriveMapPtr ReadOpenDriveMap(CompiledMapReader* r) {
+  OpenDriveMapPtr open_drive_map = std::make_shared<OpenDriveMap>();
+  uint64_t num_roads = r->ReadSize();
+  for (uint64_t i = 0; i < num_roads && r->Good(); ++i) {
+    XodrRoadId id = r->Read<XodrRoadId>();
+    XodrRoadPtr road = std::make_shared<XodrRoad>(r->ReadString(), id);
+    XodrRoadLinkInfo predecessor = ReadRoadLinkInfo(r);
+    XodrRoadLinkInfo successor = ReadRoadLinkInfo(r);
+    road->SetLink(XodrRoadLink(predecessor, successor));
+    if (r->Read<uint8_t>()) {
+      Line reference_line = r->ReadLine();
+      road->SetPlanView(
+          std::make_shared<PlanView>(reference_line, r->Read<double>()));
+    }
+    uint64_t num_lane_sections = r->ReadSize();
+    for (uint64_t j = 0; j < num_lane_sections && r->Good(); ++j) {
+      XodrLaneSectionPtr lane_section =
+          std::make_shared<XodrLaneSection>(r->Read<double>());
+      uint64_t num_lanes = r->ReadSize();
+      for (uint64_t k = 0; k < num_lanes && r->Good(); ++k)
+        lane_section->AddLane(ReadXodrLane(r));
+      road->AddLaneSection(lane_section);
+    }
+    open_drive_map->AddRoad(road);
+  }
+
+  uint64_t num_junctions = r->ReadSize();
+  for (uint64_t i = 0; i < num_junctions && r->Good(); ++i) {
+    uint32_t id = r->Read<uint32_t>();
+    JunctionPtr junction = std::make_shared<Junction>(r->ReadString(), id);
+    uint64_t num_connections = r->ReadSize();
+    for (uint64_t j = 0; j < num_connections && r->Good(); ++j) {
+      Connection connection;
+      connection.id_ = r->Read<uint32_t>();
+      connection.incoming_road_ = r->Read<uint32_t>();
+      connection.connecting_road_ = r->Read<uint32_t>();
+      uint64_t num_links = r->ReadSize();
+      for (uint64_t k = 0; k < num_links && r->Good(); ++k)
+        connection.AddLaneLink(r->ReadLaneLink());
+      junction->AddConnection(connection);
+    }
+    open_drive_map->AddJunction(junction);
+  }
+  return open_drive_map;
+}
+
+void WriteRoadgraph(const Roadgraph& roadgraph, CompiledMapWriter* w) {
+  const XodrLaneGraph g = roadgraph.GetLaneGraph();
+  w->Write<uint64_t>(boost::num_vertices(g));
+  boost::graph_traits<XodrLaneGraph>::vertex_iterator vi, vi_end;
+  for (boost::tie(vi, vi_end) = boost::vertices(g); vi != vi_end; ++vi) {
+    const XodrLaneVertex& vertex = g[*vi];
+    w->Write(vertex.road_id);
+    w->Write(vertex.global_lane_id);
+    w->Write(vertex.lane ? vertex.lane->GetId() : kNoId);
+    w->Write<uint8_t>(vertex.polygon != nullptr);
+    if (vertex.polygon) w->Write(*vertex.polygon);
+  }
+  w->Write<uint64_t>(boost::num_edges(g));
+  boost::graph_traits<XodrLaneGraph>::edge_iterator ei, ei_end;
+  for (boost::tie(ei, ei_end) = boost::edges(g); ei != ei_end; ++ei) {
+    w->Write<uint64_t>(boost::source(*ei, g));
+    w->Write<uint64_t>(boost::target(*ei, g));
+    w->Write(g[*ei].edge_type);
+    w->Write(g[*ei].weight);
+  }
+}
+
+RoadgraphPtr ReadRoadgraph(const OpenDriveMapPtr& open_drive_map,
+                           CompiledMapReader* r) {
+  XodrLaneGraph g;
+  uint64_t num_vertices = r->ReadSize();
+  for (uint64_t i = 0; i < num_vertices && r->Good(); ++i) {
+    XodrLaneVertex vertex;
+    vertex.road_id = r->Read<XodrRoadId>();
+    vertex.global_lane_id = r->Read<XodrLaneId>();
+    XodrLaneId lane_id = r->Read<XodrLaneId>();
+    if (lane_id != kNoId) vertex.lane = open_drive_map->GetLane(lane_id);
+    if (r->Read<uint8_t>())
+      vertex.polygon = std::make_shared<Polygon>(r->ReadPolygon());
+    boost::add_vertex(vertex, g);
+  }
+  uint64_t num_edges = r->ReadSize();
+  for (uint64_t i = 0; i < num_edges && r->Good(); ++i) {
+    vertex_t source = r->Read<uint64_t>();
+    vertex_t target = r->Read<uint64_t>();
+    XodrLaneEdge edge(r->Read<XodrLaneEdgeType>());
+    edge.weight = r->Read<double>();
+    if (source >= num_vertices || target >= num_vertices) break;
+    boost::add_edge(source, target, edge, g);
+  }
+  RoadgraphPtr roadgraph = std::make_shared<Roadgraph>();
+  roadgraph->SetLaneGraph(g);
+  return roadgraph;
+}
+
+void WriteLaneRef(const LanePtr& lane, CompiledMapWriter* w) {
+  w->Write(lane ? lane->GetId() : kNoId);
+}
+
+LanePtr ReadLaneRef(const Lanes& lanes, CompiledMapReader* r) {
+  LaneId lane_id = r->Read<LaneId>();
+  auto lane = lanes.find(lane_id);
+  if (lane == lanes.end()) return nullptr;
+  return lane->second;
+}
+
+void WriteRoadCorridor(const RoadCorridor& road_corridor,
+                       CompiledMapWriter* w) {
+  const auto road_ids = road_corridor.GetRoadIds();
+  w->Write<uint64_t>(road_ids.size());
+  for (const auto& road_id : road_ids) w->Write(road_id);
+  w->Write(road_corridor.GetDrivingDirection());
+
+  // roads and lanes are written first as they reference each other
+  const Roads roads = road_corridor.GetRoads();
+  w->Write<uint64_t>(roads.size());
+  for (const auto& road : roads) {
+    w->Write(road.first);
+    w->Write(road.second->GetId());
+    const Lanes lanes = road.second->GetLanes();
+    w->Write<uint64_t>(lanes.size());
+    for (const auto& lane : lanes) {
+      w->Write(lane.first);
+      w->Write(lane.second->GetId());
+      w->Write(lane.second->GetPolygon());
+      w->Write(lane.second->GetCenterLine());
+      w->Write(lane.second->GetLeftBoundary().GetLine());
+      w->Write(lane.second->GetLeftBoundary().GetType());
+      w->Write(lane.second->GetRightBoundary().GetLine());
+      w->Write(lane.second->GetRightBoundary().GetType());
+    }
+  }
+  for (const auto& road : roads) {
+    const auto next_road = road.second->GetNextRoad();
+    w->Write(next_road ? next_road->GetId() : kNoId);
+    for (const auto& lane : road.second->GetLanes()) {
+      WriteLaneRef(lane.second->GetNextLane(), w);
+      WriteLaneRef(lane.second->GetLeftLane(), w);
+      WriteLaneRef(lane.second->GetRightLane(), w);
+    }
+  }
+
+  const auto lane_corridors = road_corridor.GetUniqueLaneCorridors();
+  w->Write<uint64_t>(lane_corridors.size());
+  for (const auto& lane_corridor : lane_corridors) {
+    w->Write<uint64_t>(lane_corridor->GetLanes().size());
+    for (const auto& lane : lane_corridor->GetLanes()) {
+      w->Write(lane.first);
+      WriteLaneRef(lane.second, w);
+    }
+    w->Write(lane_corridor->GetCenterLine());
+    w->Write(lane_corridor->GetFineCenterLine());
+    w->Write(lane_corridor->GetMergedPolygon());
+    w->Write(lane_corridor->GetLeftBoundary());
+    w->Write(lane_corridor->GetRightBoundary());
+  }
+  const auto lane_corridor_map = road_corridor.GetLaneCorridorMap();
+  w->Write<uint64_t>(lane_corridor_map.size());
+  for (const auto& lane_corridor : lane_corridor_map) {
+    w->Write(lane_corridor.first);
+    w->Write<uint64_t>(std::find(lane_corridors.begin(), lane_corridors.end(),
+                                 lane_corridor.second) -
+                       lane_corridors.begin());
+  }
+  w->Write(road_corridor.GetPolygon());
+}
+
+RoadCorridorPtr ReadRoadCorridor(const OpenDriveMapPtr& open_drive_map,
+                                 CompiledMapReader* r) {
+  std::vector<XodrRoadId> road_ids(r->ReadSize());
+  for (auto& road_id : road_ids) road_id = r->Read<XodrRoadId>();
+  XodrDrivingDirection driving_direction = r->Read<XodrDrivingDirection>();
+
+  Roads roads;
+  // all lanes of the road corridor to resolve references
+  Lanes all_lanes;
+  uint64_t num_roads = r->ReadSize();
+  for (uint64_t i = 0; i < num_roads && r->Good(); ++i) {
+    RoadId road_key = r->Read<RoadId>();
+    RoadPtr road =
+        std::make_shared<Road>(open_drive_map->GetRoad(r->Read<XodrRoadId>()));
+    Lanes lanes;
+    uint64_t num_lanes = r->ReadSize();
+    for (uint64_t j = 0; j < num_lanes && r->Good(); ++j) {
+      LaneId lane_key = r->Read<LaneId>();
+      LanePtr lane =
+          std::make_shared<Lane>(open_drive_map->GetLane(r->Read<XodrLaneId>()));
+      lane->SetPolygon(r->ReadPolygon());
+      lane->SetCenterLine(r->ReadLine());
+      Boundary left_boundary, right_boundary;
+      left_boundary.SetLine(r->ReadLine());
+      left_boundary.SetType(r->ReadRoadMark());
+      right_boundary.SetLine(r->ReadLine());
+      right_boundary.SetType(r->ReadRoadMark());
+      lane->SetLeftBoundary(left_boundary);
+      lane->SetRightBoundary(right_boundary);
+      lanes[lane_key] = lane;
+      all_lanes[lane->GetId()] = lane;
+    }
+    road->SetLanes(lanes);
+    roads[road_key] = road;
+  }
+  std::map<XodrRoadId, RoadPtr> roads_by_id;
+  for (const auto& road : roads) roads_by_id[road.second->GetId()] = road.second;
+  for (const auto& road : roads) {
+    XodrRoadId next_road_id = r->Read<XodrRoadId>();
+    if (roads_by_id.count(next_road_id) > 0)
+      road.second->SetNextRoad(roads_by_id.at(next_road_id));
+    for (const auto& lane : road.second->GetLanes()) {
+      LanePtr next_lane = ReadLaneRef(all_lanes, r);
+      if (next_lane) lane.second->SetNextLane(next_lane);
+      LanePtr left_lane = ReadLaneRef(all_lanes, r);
+      if (left_lane) lane.second->SetLeftLane(left_lane);
+      LanePtr right_lane = ReadLaneRef(all_lanes, r);
+      if (right_lane) lane.second->SetRightLane(right_lane);
+    }
+  }
+
+  std::vector<LaneCorridorPtr> lane_corridors(r->ReadSize());
+  for (auto& lane_corridor : lane_corridors) {
+    lane_corridor = std::make_shared<LaneCorridor>();
+    uint64_t num_lanes = r->ReadSize();
+    for (uint64_t j = 0; j < num_lanes && r->Good(); ++j) {
+      double s = r->Read<double>();
+      lane_corridor->SetLane(s, ReadLaneRef(all_lanes, r));
+    }
+    lane_corridor->SetCenterLine(r->ReadLine());
+    lane_corridor->SetFineCenterLine(r->ReadLine());
+    lane_corridor->SetMergedPolygon(r->ReadPolygon());
+    lane_corridor->SetLeftBoundary(r->ReadLine());
+    lane_corridor->SetRightBoundary(r->ReadLine());
+  }
+  std::map<LaneId, LaneCorridorPtr> lane_corridor_map;
+  uint64_t num_lane_corridors = r->ReadSize();
+  for (uint64_t i = 0; i < num_lane_corridors && r->Good(); ++i) {
+    LaneId lane_id = r->Read<LaneId>();
+    uint64_t idx = r->Read<uint64_t>();
+    if (idx < lane_corridors.size())
+      lane_corridor_map[lane_id] = lane_corridors.at(idx);
+  }
+
+  RoadCorridorPtr road_corridor = std::make_shared<RoadCorridor>();
+  road_corridor->SetRoads(roads);
+  road_corridor->SetUniqueLaneCorridors(lane_corridors);
+  road_corridor->SetLaneCorridorMap(lane_corridor_map);
+  road_corridor->SetPolygon(r->ReadPolygon());
+  road_corridor->SetRoadIds(road_ids);
+  road_corridor->SetDrivingDirection(driving_direction);
+  return road_corridor;
+}
+
+}  // namespace
+
+bool MapInterface::SaveCompiledMap(const std::string& filename) const {
+  if (!open_drive_map_ || !roadgraph_) {
+    LOG(ERROR) << "Cannot compile a map interface without a map.";
+    return false;
+  }
+  std::ofstream file(filename, std::ios::binary | std::ios::trunc);
+  if (!file) {
+    LOG(ERROR) << "Could not open " << filename << " for writing.";
+    return false;
+  }
+  CompiledMapWriter writer(file);
+  file.write(kCompiledMapMagic, sizeof(kCompiledMapMagic));
+  writer.Write(kCompiledMapVersion);
+  WriteOpenDriveMap(*open_drive_map_, &writer);
+  WriteRoadgraph(*roadgraph_, &writer);
+  writer.Write(bounding_box_.first);
+  writer.Write(bounding_box_.second);
+  std::shared_lock<std::shared_mutex> lock(road_corridors_mutex_);
+  writer.Write<uint64_t>(road_corridors_.size());
+  for (const auto& road_corridor : road_corridors_)
+    WriteRoadCorridor(*road_corridor.second, &writer);
+  return file.good();
+}
+
+bool MapInterface::LoadCompiledMap(const std::string& filename) {
+  std::ifstream file(filename, std::ios::binary);
+  if (!file) {
+    LOG(ERROR) << "Could not open " << filename << " for reading.";
+    return false;
+  }
+  char magic[sizeof(kCompiledMapMagic)];
+  file.read(magic, sizeof(magic));
+  CompiledMapReader reader(file);
+  if (!file || std::memcmp(magic, kCompiledMapMagic, sizeof(magic)) != 0 ||
+      reader.Read<uint32_t>() != kCompiledMapVersion) {
+    LOG(ERROR) << filename << " is not a compiled map of version "
+               << kCompiledMapVersion << ".";
+    return false;
+  }
+  OpenDriveMapPtr open_drive_map;
+  RoadgraphPtr roadgraph;
+  std::pair<Point2d, Point2d> bounding_box;
+  std::map<std::size_t, RoadCorridorPtr> road_corridors;
+  // runs without the GIL, so nothing may escape from corrupted contents
+  try {
+    open_drive_map = ReadOpenDriveMap(&reader);
+    roadgraph = ReadRoadgraph(open_drive_map, &reader);
+    bounding_box.first = reader.ReadPoint();
+    bounding_box.second = reader.ReadPoint();
+    uint64_t num_road_corridors = reader.ReadSize();
+    for (uint64_t i = 0; i < num_road_corridors && reader.Good(); ++i) {
+      RoadCorridorPtr road_corridor = ReadRoadCorridor(open_drive_map, &reader);
+      road_corridors[RoadCorridor::GetHash(
+          road_corridor->GetDrivingDirection(), road_corridor->GetRoadIds())] =
+          road_corridor;
+    }
+  } catch (const std::exception& e) {
+    LOG(ERROR) << filename << " is corrupted: " << e.what();
+    return false;
+  }
+  if (!reader.Good()) {
+    LOG(ERROR) << filename << " is truncated or corrupted.";
+    return false;
+  }
+
+  open_drive_map_ = open_drive_map;
+  roadgraph_ = roadgraph;
+  bounding_box_ = bounding_box;
+  {
+    std::unique_lock<std::shared_mutex> lock(road_corridors_mutex_);
+    road_corridors_ = road_corridors;
+  }
+  UpdateLaneRTree();
+  return true;
+}
+
+}  // namespace map
+}  // namespace world
+}  // namespace bark
@@ -8,8 +8,12 @@
 
 #include "bark/world/map/map_interface.hpp"
 #include <math.h>
+#include <algorithm>
+#include <limits>
 #include <memory>
 #include <random>
+#include <stdexcept>
+#include "bark/commons/util/thread_pool.hpp"
 
 namespace bark {
 namespace world {
@@ -24,6 +28,12 @@ bool MapInterface::interface_from_opendrive(
   roadgraph->Generate(open_drive_map);
   roadgraph_ = roadgraph;
 
+  UpdateLaneRTree();
+  bounding_box_ = open_drive_map_->BoundingBox();
+  return true;
+}
+
+void MapInterface::UpdateLaneRTree() {
   rtree_lane_.clear();
   for (auto& road : open_drive_map_->GetRoads()) {
     for (auto& lane_section : road.second->GetLaneSections()) {
@@ -35,9 +45,25 @@ bool MapInterface::interface_from_opendrive(
       }
     }
   }
+  UpdateLanePolygonRTree();
+}
 
-  bounding_box_ = open_drive_map_->BoundingBox();
-  return true;
+void MapInterface::UpdateLanePolygonRTree() {
+  rtree_lane_polygon_.clear();
+  lane_polygons_.clear();
+  if (!roadgraph_) return;
+  std::vector<rtree_lane_polygon_value> lane_boxes;
+  for (const auto& v : roadgraph_->GetVertices()) {
+    const auto& vertex = roadgraph_->GetLaneGraph()[v];
+    if (!vertex.polygon) continue;
+    lane_polygons_[vertex.global_lane_id] = vertex.polygon;
+    lane_boxes.push_back(std::make_pair(
+        boost::geometry::return_envelope<rtree_lane_polygon_model>(
+            vertex.polygon->obj_),
+        vertex.lane));
+  }
+  // packing construction of the r-tree
+  rtree_lane_polygon_ = rtree_lane_polygon(lane_boxes.begin(), lane_boxes.end());
 }
 
 bool MapInterface::FindNearestXodrLanes(const Point2d& point,
@@ -65,41 +91,62 @@ bool MapInterface::FindNearestXodrLanes(const Point2d& point,
 }
 
 XodrLanePtr MapInterface::FindXodrLane(const Point2d& point) const {
+  std::vector<rtree_lane_polygon_value> candidates;
+  rtree_lane_polygon_.query(boost::geometry::index::intersects(point),
+                            std::back_inserter(candidates));
+  // a point on the border of two lanes is assigned to the lane whose line has
+  // the nearest chord
   XodrLanePtr lane;
-  std::vector<XodrLanePtr> nearest_lanes;
-  // TODO(@esterle): parameter (20) auslagern
-  if (!FindNearestXodrLanes(point, 20, nearest_lanes, false)) {
-    return nullptr;
-  }
-  for (auto& close_lane : nearest_lanes) {
-    if (IsInXodrLane(point, close_lane->GetId())) {
-      lane = close_lane;
-      return lane;
+  double min_distance = std::numeric_limits<double>::max();
+  for (const auto& candidate : candidates) {
+    if (!IsInXodrLane(point, candidate.second->GetId())) continue;
+    const Line& line = candidate.second->GetLine();
+    const double distance = boost::geometry::comparable_distance(
+        point, LineSegment(*line.begin(), *(line.end() - 1)));
+    if (distance < min_distance) {
+      min_distance = distance;
+      lane = candidate.second;
     }
   }
-  return nullptr;
+  return lane;
+}
+
+XodrLanePtr MapInterface::FindXodrLane(const Point2d& point,
+                                       const XodrLanePtr& hint) const {
+  if (hint && IsInXodrLane(point, hint->GetId())) return hint;
+  return FindXodrLane(point);
 }
 
 bool MapInterface::IsInXodrLane(const Point2d& point, XodrLaneId id) const {
-  std::pair<vertex_t, bool> v = roadgraph_->GetVertexByLaneId(id);
-  if (v.second) {
-    auto polygon = roadgraph_->GetLaneGraph()[v.first].polygon;
-    if (!polygon) {
-      // found vertex has no polygon
-      return false;
-    } else {
-      // found vertex has a polygon
-      bool point_in_polygon = bark::geometry::Collide(*polygon, point);
-      if (point_in_polygon) {
-        return true;
-      } else {
-        return false;
-      }
-    }
+  auto lane_polygon = lane_polygons_.find(id);
+  // no vertex found or the vertex has no polygon
+  if (lane_polygon == lane_polygons_.end()) return false;
+  return bark::geometry::Collide(*lane_polygon->second, point);
+}
+
+MapMatchingResult MapInterface::MatchPoints(
+    const Eigen::MatrixXd& points, const RoadCorridorPtr& road_corridor) const {
+  if (points.rows() > 0 && points.cols() != 2) {
+    throw std::invalid_argument("MatchPoints expects an Nx2 matrix of points");
+  }
+  const Eigen::Index num_points = points.rows();
+  MapMatchingResult result;
+  if (road_corridor) {
+    static_cast<LaneCorridorMatchingResult&>(result) =
+        road_corridor->MatchPoints(points);
   } else {
-    // no vertex found
-    return false;
+    result.in_lane_corridors.resize(num_points, 0);
+    result.lane_corridor_indices.setConstant(num_points, -1);
+    result.frenet_positions.setConstant(
+        num_points, 2, std::numeric_limits<double>::quiet_NaN());
   }
+  result.lane_ids.setConstant(num_points, -1);
+  XodrLanePtr lane;
+  for (Eigen::Index i = 0; i < num_points; ++i) {
+    lane = FindXodrLane(Point2d(points(i, 0), points(i, 1)), lane);
+    if (lane) result.lane_ids(i) = lane->GetId();
+  }
+  return result;
 }
 
 std::vector<PathBoundaries> MapInterface::ComputeAllPathBoundaries(
@@ -290,8 +337,53 @@ void MapInterface::GenerateRoadCorridor(
       RoadCorridor::GetHash(driving_direction, road_ids);
 
   // only compute if it has not been computed yet
-  if (road_corridors_.count(road_corridor_hash) > 0) return;
+  {
+    std::shared_lock<std::shared_mutex> lock(road_corridors_mutex_);
+    if (road_corridors_.count(road_corridor_hash) > 0) return;
+  }
+
+  RoadCorridorPtr road_corridor =
+      ComputeRoadCorridor(road_ids, driving_direction);
+  if (!road_corridor) return;
+  // keeps the road corridor of a thread that has been faster
+  std::unique_lock<std::shared_mutex> lock(road_corridors_mutex_);
+  road_corridors_.emplace(road_corridor_hash, road_corridor);
+}
+
+void MapInterface::GenerateRoadCorridors(const std::vector<Route>& routes,
+                                         unsigned int num_threads) {
+  std::vector<std::pair<std::size_t, Route>> missing_routes;
+  std::shared_lock<std::shared_mutex> shared_lock(road_corridors_mutex_);
+  for (const auto& route : routes) {
+    std::size_t road_corridor_hash =
+        RoadCorridor::GetHash(route.second, route.first);
+    if (road_corridors_.count(road_corridor_hash) > 0 ||
+        std::find_if(missing_routes.begin(), missing_routes.end(),
+                     [&](const std::pair<std::size_t, Route>& missing) {
+                       return missing.first == road_corridor_hash;
+                     }) != missing_routes.end())
+      continue;
+    missing_routes.push_back(std::make_pair(road_corridor_hash, route));
+  }
+  shared_lock.unlock();
+
+  std::vector<RoadCorridorPtr> road_corridors(missing_routes.size());
+  bark::commons::ThreadPool thread_pool(
+      std::min(num_threads, static_cast<unsigned int>(missing_routes.size())));
+  thread_pool.ParallelFor(missing_routes.size(), [&](std::size_t idx) {
+    road_corridors[idx] = ComputeRoadCorridor(missing_routes[idx].second.first,
+                                              missing_routes[idx].second.second);
+  });
+  std::unique_lock<std::shared_mutex> lock(road_corridors_mutex_);
+  for (std::size_t idx = 0; idx < missing_routes.size(); ++idx) {
+    if (road_corridors[idx])
+      road_corridors_.emplace(missing_routes[idx].first, road_corridors[idx]);
+  }
+}
 
+RoadCorridorPtr MapInterface::ComputeRoadCorridor(
+    const std::vector<XodrRoadId>& road_ids,
+    const XodrDrivingDirection& driving_direction) {
   Roads roads;
   for (auto& road_id : road_ids)
     roads[road_id] = GenerateRoadCorridorRoad(road_id);
@@ -371,19 +463,83 @@ void MapInterface::GenerateRoadCorridor(
     }
   }
 
-  if (roads.size() == 0) return;
+  if (roads.size() == 0) return nullptr;
   RoadCorridorPtr road_corridor = std::make_shared<RoadCorridor>();
   road_corridor->SetRoads(roads);
   CalculateLaneCorridors(road_corridor, road_ids[0]);
   road_corridor->ComputeRoadPolygon();
   road_corridor->SetRoadIds(road_ids);
   road_corridor->SetDrivingDirection(driving_direction);
-  road_corridors_[road_corridor_hash] = road_corridor;
+  return road_corridor;
 }
 
-RoadCorridorPtr MapInterface::GenerateRoadCorridor(
+std::vector<Route> MapInterface::GetAllRoutes() const {
+  auto driving_directions_of_road = [&](const XodrRoadId& road_id) {
+    std::vector<XodrDrivingDirection> driving_directions;
+    for (const auto& lane_section :
+         open_drive_map_->GetRoad(road_id)->GetLaneSections()) {
+      for (const auto& lane : lane_section->GetLanes()) {
+        if (lane.second->GetLanePosition() == 0 ||
+            lane.second->GetLaneType() != XodrLaneType::DRIVING ||
+            std::find(driving_directions.begin(), driving_directions.end(),
+                      lane.second->GetDrivingDirection()) !=
+                driving_directions.end())
+          continue;
+        driving_directions.push_back(lane.second->GetDrivingDirection());
+      }
+    }
+    return driving_directions;
+  };
+
+  // routes start and end at roads with an open end
+  std::vector<XodrRoadId> terminal_road_ids;
+  for (const auto& road : open_drive_map_->GetRoads()) {
+    const auto link = road.second->GetLink();
+    if (link.GetPredecessor().type_.empty() ||
+        link.GetSuccessor().type_.empty())
+      terminal_road_ids.push_back(road.first);
+  }
+
+  std::vector<Route> routes;
+  for (const auto& start_road_id : terminal_road_ids) {
+    bool connected = false;
+    for (const auto& end_road_id : terminal_road_ids) {
+      if (start_road_id == end_road_id) continue;
+      std::vector<XodrRoadId> road_ids =
+          roadgraph_->FindRoadPath(start_road_id, end_road_id);
+      if (road_ids.size() < 2) continue;
+      connected = true;
+      // the road corridor leaves the first road at the end closer to the
+      // second road
+      const Line start_line =
+          open_drive_map_->GetRoad(road_ids[0])->GetPlanView()->GetReferenceLine();
+      const Line next_line =
+          open_drive_map_->GetRoad(road_ids[1])->GetPlanView()->GetReferenceLine();
+      const XodrDrivingDirection driving_direction =
+          bark::geometry::Distance(next_line, start_line.obj_.back()) <=
+                  bark::geometry::Distance(next_line, start_line.obj_.front())
+              ? XodrDrivingDirection::FORWARD
+              : XodrDrivingDirection::BACKWARD;
+      std::vector<XodrDrivingDirection> driving_directions =
+          driving_directions_of_road(start_road_id);
+      if (std::find(driving_directions.begin(), driving_directions.end(),
+                    driving_direction) != driving_directions.end())
+        routes.push_back(std::make_pair(road_ids, driving_direction));
+    }
+    // roads that are not connected to other roads are routes by themselves
+    if (!connected) {
+      for (const auto& driving_direction :
+           driving_directions_of_road(start_road_id))
+        routes.push_back(std::make_pair(
+            std::vector<XodrRoadId>{start_road_id}, driving_direction));
+    }
+  }
+  return routes;
+}
+
+std::pair<Route, bool> MapInterface::FindRoute(
     const bark::geometry::Point2d& start_point,
-    const bark::geometry::Polygon& goal_region) {
+    const bark::geometry::Polygon& goal_region) const {
   std::vector<XodrLanePtr> lanes;
   XodrLaneId goal_lane_id;
   bool nearest_start_lane_found = FindNearestXodrLanes(start_point, 1, lanes);
@@ -391,7 +547,7 @@ RoadCorridorPtr MapInterface::GenerateRoadCorridor(
   if (!nearest_start_lane_found || !nearest_goal_lane_found) {
     LOG(INFO) << "Could not generate road corridor based on geometric start "
                  "and goal definitions.";  // NOLINT
-    return nullptr;
+    return std::make_pair(Route(), false);
   }
 
   const auto start_lane_id = lanes.at(0)->GetId();
@@ -405,11 +561,17 @@ RoadCorridorPtr MapInterface::GenerateRoadCorridor(
     std::pair<vertex_t, bool> v_des = roadgraph_->GetVertexByLaneId(lid);
     XodrLaneVertex lv = roadgraph_->GetVertex(v_des.first);
     road_ids.push_back(lv.road_id);
-    // std::cout << "lane_id: " << lid << ", road_id: ";
-    // std::cout << lv.road_id << std::endl;
   }
-  GenerateRoadCorridor(road_ids, driving_direction);
-  return GetRoadCorridor(road_ids, driving_direction);
+  return std::make_pair(std::make_pair(road_ids, driving_direction), true);
+}
+
+RoadCorridorPtr MapInterface::GenerateRoadCorridor(
+    const bark::geometry::Point2d& start_point,
+    const bark::geometry::Polygon& goal_region) {
+  std::pair<Route, bool> route = FindRoute(start_point, goal_region);
+  if (!route.second) return nullptr;
+  GenerateRoadCorridor(route.first.first, route.first.second);
+  return GetRoadCorridor(route.first.first, route.first.second);
 }
 
 RoadCorridorPtr MapInterface::GenerateRoadCorridor(
@@ -10,8 +10,12 @@
 #define BARK_WORLD_MAP_MAP_INTERFACE_HPP_
 
 #include <boost/geometry/index/rtree.hpp>
+#include <cstdint>
 #include <map>
+#include <mutex>
+#include <shared_mutex>
 #include <string>
+#include <unordered_map>
 #include <utility>
 #include <vector>
 #include "bark/geometry/geometry.hpp"
@@ -35,7 +39,22 @@ using rtree_lane_value = std::pair<rtree_lane_model, rtree_lane_id>;
 using rtree_lane =
     boost::geometry::index::rtree<rtree_lane_value,
                                   boost::geometry::index::linear<16, 4>>;
+//! envelopes of the lane polygons
+using rtree_lane_polygon_model = boost::geometry::model::box<Point2d>;
+using rtree_lane_polygon_value =
+    std::pair<rtree_lane_polygon_model, rtree_lane_id>;
+using rtree_lane_polygon =
+    boost::geometry::index::rtree<rtree_lane_polygon_value,
+                                  boost::geometry::index::linear<16, 4>>;
 using PathBoundaries = std::vector<std::pair<XodrLanePtr, XodrLanePtr>>;
+//! road ids of a road corridor and its driving direction
+using Route = std::pair<std::vector<XodrRoadId>, XodrDrivingDirection>;
+
+//! map matching of N points, see MapInterface::MatchPoints
+struct MapMatchingResult : public LaneCorridorMatchingResult {
+  //! ids of the lanes containing the points, -1 for points off the map
+  Eigen::Matrix<int64_t, Eigen::Dynamic, 1> lane_ids;
+};
 
 class MapInterface {
  public:
@@ -46,9 +65,24 @@ class MapInterface {
                             bool type_driving_only = true) const;
 
   XodrLanePtr FindXodrLane(const Point2d& point) const;
+  //! checks the lane hint, e.g. the lane of the previous step, first
+  XodrLanePtr FindXodrLane(const Point2d& point,
+                           const XodrLanePtr& hint) const;
 
   bool IsInXodrLane(const Point2d& point, XodrLaneId id) const;
 
+  /**
+   * @brief  Matches the points, given as Nx2 matrix of x and y, with the
+   *         lanes of the map and the lane corridors of the road corridor
+   *
+   * Consecutive points are assumed to form a trajectory, thus, the lane of
+   * the previous point is checked first. The lane corridors are matched
+   * using RoadCorridor::MatchPoints.
+   */
+  MapMatchingResult MatchPoints(
+      const Eigen::MatrixXd& points,
+      const RoadCorridorPtr& road_corridor = nullptr) const;
+
   std::vector<PathBoundaries> ComputeAllPathBoundaries(
       const std::vector<XodrLaneId>& lane_ids) const;
   std::pair<XodrLanePtr, bool> GetInnerNeighbor(const XodrLaneId lane_id) const;
@@ -67,6 +101,7 @@ class MapInterface {
 
   bool SetRoadgraph(RoadgraphPtr roadgraph) {
     roadgraph_ = roadgraph;
+    UpdateLanePolygonRTree();
     return true;
   }
 
@@ -94,14 +129,32 @@ class MapInterface {
   RoadCorridorPtr GenerateRoadCorridor(
       const bark::geometry::Point2d& start_point,
       const bark::geometry::Polygon& goal_region);
+  //! generates the road corridors of all routes that have not been generated
+  //! yet; with num_threads > 1 the road corridors are computed in parallel
+  void GenerateRoadCorridors(const std::vector<Route>& routes,
+                             unsigned int num_threads = 1);
+  //! shortest routes between all pairs of roads with an open end (sources and
+  //! sinks of the map) and single-road routes of unconnected roads; roads
+  //! that are only reachable on longer paths are not covered
+  std::vector<Route> GetAllRoutes() const;
+  //! route of the road corridor GenerateRoadCorridor(start_point, goal_region)
+  std::pair<Route, bool> FindRoute(
+      const bark::geometry::Point2d& start_point,
+      const bark::geometry::Polygon& goal_region) const;
   bool XodrLaneIdAtPolygon(const bark::geometry::Polygon& polygon,
                            XodrLaneId& found_lane_id) const;
   RoadCorridorPtr GetRoadCorridor(
       const std::vector<XodrRoadId>& road_ids,
       const XodrDrivingDirection& driving_direction) {
     std::size_t rc_hash = RoadCorridor::GetHash(driving_direction, road_ids);
-    if (road_corridors_.count(rc_hash) == 0) return nullptr;
-    return road_corridors_.at(rc_hash);
+    std::shared_lock<std::shared_mutex> lock(road_corridors_mutex_);
+    auto road_corridor = road_corridors_.find(rc_hash);
+    if (road_corridor == road_corridors_.end()) return nullptr;
+    return road_corridor->second;
+  }
+  std::size_t GetNumRoadCorridors() const {
+    std::shared_lock<std::shared_mutex> lock(road_corridors_mutex_);
+    return road_corridors_.size();
   }
 
   LaneId FindCurrentLane(const Point2d& pt) {
@@ -112,12 +165,30 @@ class MapInterface {
     return road_id;
   }
 
+  //! Compiled map containing the OpenDriveMap, the Roadgraph with its lane
+  //! polygons and all generated road corridors (see compiled_map.cpp)
+  bool SaveCompiledMap(const std::string& filename) const;
+  bool LoadCompiledMap(const std::string& filename);
+
  private:
+  void UpdateLaneRTree();
+  void UpdateLanePolygonRTree();
+  //! computes a road corridor without storing it, nullptr if there are no
+  //! roads; only reads the map and, thus, can run in parallel
+  RoadCorridorPtr ComputeRoadCorridor(
+      const std::vector<XodrRoadId>& road_ids,
+      const XodrDrivingDirection& driving_direction);
+
   OpenDriveMapPtr open_drive_map_;
   RoadgraphPtr roadgraph_;
   rtree_lane rtree_lane_;
+  rtree_lane_polygon rtree_lane_polygon_;
+  std::unordered_map<XodrLaneId, PolygonPtr> lane_polygons_;
   std::pair<Point2d, Point2d> bounding_box_;
   std::map<std::size_t, RoadCorridorPtr> road_corridors_;
+  //! road corridors are generated lazily, also without the GIL, on maps
+  //! shared by several worlds; lookups take a shared and inserts a unique lock
+  mutable std::shared_mutex road_corridors_mutex_;
 
   static bool IsLaneType(rtree_lane_value const& m) {
     return (m.second->GetLaneType() == XodrLaneType::DRIVING);
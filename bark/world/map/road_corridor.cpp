@@ -7,8 +7,12 @@
 // For a copy, see <https://opensource.org/licenses/MIT>.
 
 #include "bark/world/map/road_corridor.hpp"
+#include <algorithm>
+#include <limits>
 #include <memory>
+#include <stdexcept>
 #include <utility>
+#include <vector>
 #include "bark/commons/transformation/frenet.hpp"
 
 namespace bark {
@@ -35,16 +39,111 @@ RoadCorridor::GetLeftRightLaneCorridor(const Point2d& pt) const {
                         GetLaneCorridor(right_lane_id));
 }
 
-LaneCorridorPtr RoadCorridor::GetNearestLaneCorridor(const Point2d& pt) const {
+LaneCorridorPtr RoadCorridor::GetCurrentLaneCorridor(
+    const Point2d& pt, const LaneCorridorPtr& hint) const {
+  // keeps the order of the unique lane corridors for overlapping corridors,
+  // a hint containing the point only restricts the query to preceding ones
+  unsigned int current_idx = unique_lane_corridors_.size();
+  if (hint && Collide(pt, hint->GetMergedPolygon())) {
+    current_idx = std::find(unique_lane_corridors_.begin(),
+                            unique_lane_corridors_.end(), hint) -
+                  unique_lane_corridors_.begin();
+    if (current_idx == 0) return hint;
+  }
+  std::vector<std::pair<LaneCorridorBox, unsigned int>> candidates;
+  lane_corridor_index_.Get(unique_lane_corridors_)
+      ->query(boost::geometry::index::intersects(pt) &&
+                  boost::geometry::index::satisfies(
+                      [current_idx](const auto& value) {
+                        return value.second < current_idx;
+                      }),
+              std::back_inserter(candidates));
+  for (const auto& candidate : candidates) {
+    if (candidate.second < current_idx &&
+        Collide(pt, unique_lane_corridors_[candidate.second]->GetMergedPolygon()))
+      current_idx = candidate.second;
+  }
+  if (current_idx == unique_lane_corridors_.size()) return nullptr;
+  return unique_lane_corridors_[current_idx];
+}
+
+std::vector<unsigned int> RoadCorridor::GetLaneCorridorIndices(
+    const Point2d& pt) const {
+  std::vector<std::pair<LaneCorridorBox, unsigned int>> candidates;
+  lane_corridor_index_.Get(unique_lane_corridors_)
+      ->query(boost::geometry::index::intersects(pt),
+              std::back_inserter(candidates));
+  std::vector<unsigned int> indices;
+  for (const auto& candidate : candidates) {
+    if (Collide(pt, unique_lane_corridors_[candidate.second]->GetMergedPolygon()))
+      indices.push_back(candidate.second);
+  }
+  std::sort(indices.begin(), indices.end());
+  return indices;
+}
+
+LaneCorridorMatchingResult RoadCorridor::MatchPoints(
+    const Eigen::MatrixXd& points) const {
+  using bark::commons::transformation::FrenetPosition;
+  if (points.rows() > 0 && points.cols() != 2) {
+    throw std::invalid_argument("MatchPoints expects an Nx2 matrix of points");
+  }
+  const Eigen::Index num_points = points.rows();
+  LaneCorridorMatchingResult result;
+  result.in_lane_corridors.setConstant(num_points,
+                                       unique_lane_corridors_.size(), false);
+  result.lane_corridor_indices.setConstant(num_points, -1);
+  result.frenet_positions.setConstant(
+      num_points, 2, std::numeric_limits<double>::quiet_NaN());
+  int lane_corridor_idx = -1;
+  for (Eigen::Index i = 0; i < num_points; ++i) {
+    const Point2d pt(points(i, 0), points(i, 1));
+    const std::vector<unsigned int> indices = GetLaneCorridorIndices(pt);
+    for (const auto idx : indices) result.in_lane_corridors(i, idx) = true;
+    if (lane_corridor_idx < 0 ||
+        !result.in_lane_corridors(i, lane_corridor_idx)) {
+      if (!indices.empty()) {
+        lane_corridor_idx = indices.front();
+      } else {
+        const auto nearest_lc = GetNearestLaneCorridor(pt);
+        lane_corridor_idx =
+            nearest_lc ? std::find(unique_lane_corridors_.begin(),
+                                   unique_lane_corridors_.end(), nearest_lc) -
+                             unique_lane_corridors_.begin()
+                       : -1;
+      }
+    }
+    if (lane_corridor_idx < 0) continue;
+    result.lane_corridor_indices(i) = lane_corridor_idx;
+    FrenetPosition f(pt,
+                     unique_lane_corridors_[lane_corridor_idx]->GetCenterLine());
+    result.frenet_positions(i, 0) = f.lon;
+    result.frenet_positions(i, 1) = f.lat;
+  }
+  return result;
+}
+
+LaneCorridorPtr RoadCorridor::GetNearestLaneCorridor(
+    const Point2d& pt, const LaneCorridorPtr& hint) const {
   using bark::commons::transformation::FrenetPosition;
-  auto lc = GetCurrentLaneCorridor(pt);
+  auto lc = GetCurrentLaneCorridor(pt, hint);
   if (!lc) {
+    // the distance to the envelope is a lower bound of the distance to the
+    // center line, thus, the search stops at the first farther envelope
     double min_lat = std::numeric_limits<double>::infinity();
-    for (const auto& corridor : unique_lane_corridors_) {
-      FrenetPosition f(pt, corridor->GetCenterLine());
-      if (std::abs(f.lat) < min_lat) {
+    unsigned int nearest_idx = 0;
+    auto index = lane_corridor_index_.Get(unique_lane_corridors_);
+    for (auto it = index->qbegin(
+             boost::geometry::index::nearest(pt, index->size()));
+         it != index->qend(); ++it) {
+      if (boost::geometry::distance(pt, it->first) > min_lat) break;
+      FrenetPosition f(pt, unique_lane_corridors_[it->second]->GetCenterLine());
+      // ties are resolved in the order of the unique lane corridors
+      if (std::abs(f.lat) < min_lat ||
+          (std::abs(f.lat) == min_lat && it->second < nearest_idx)) {
         min_lat = std::abs(f.lat);
-        lc = corridor;
+        nearest_idx = it->second;
+        lc = unique_lane_corridors_[it->second];
       }
     }
   }
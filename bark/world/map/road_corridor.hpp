@@ -9,8 +9,12 @@
 #ifndef BARK_WORLD_MAP_ROAD_CORRIDOR_HPP_
 #define BARK_WORLD_MAP_ROAD_CORRIDOR_HPP_
 
+#include <Eigen/Core>
 #include <boost/functional/hash.hpp>
+#include <boost/geometry/index/rtree.hpp>
+#include <atomic>
 #include <map>
+#include <memory>
 #include <string>
 #include <utility>
 #include <vector>
@@ -32,6 +36,67 @@ using bark::geometry::Within;
 using bark::world::opendrive::XodrDrivingDirection;
 using bark::world::opendrive::XodrRoadId;
 
+using LaneCorridorBox = boost::geometry::model::box<Point2d>;
+//! envelopes of the unique lane corridors with their index
+using LaneCorridorRTree =
+    boost::geometry::index::rtree<std::pair<LaneCorridorBox, unsigned int>,
+                                  boost::geometry::index::linear<16, 4>>;
+
+//! r-tree of the lane corridor envelopes that is built on the first query;
+//! queries may run concurrently, copies start without an index
+class LaneCorridorIndexCache {
+ public:
+  LaneCorridorIndexCache() {}
+  LaneCorridorIndexCache(const LaneCorridorIndexCache&) {}
+  LaneCorridorIndexCache& operator=(const LaneCorridorIndexCache&) {
+    Reset();
+    return *this;
+  }
+
+  std::shared_ptr<const LaneCorridorRTree> Get(
+      const std::vector<LaneCorridorPtr>& lane_corridors) const {
+    auto index = std::atomic_load(&index_);
+    if (!index || index->size() != lane_corridors.size()) {
+      std::vector<std::pair<LaneCorridorBox, unsigned int>> boxes;
+      boxes.reserve(lane_corridors.size());
+      for (unsigned int i = 0; i < lane_corridors.size(); ++i) {
+        // the box also covers the center line for nearest queries
+        auto box = boost::geometry::return_envelope<LaneCorridorBox>(
+            lane_corridors[i]->GetMergedPolygon().obj_);
+        if (!lane_corridors[i]->GetCenterLine().obj_.empty()) {
+          boost::geometry::expand(
+              box, boost::geometry::return_envelope<LaneCorridorBox>(
+                       lane_corridors[i]->GetCenterLine().obj_));
+        }
+        boxes.emplace_back(box, i);
+      }
+      index = std::make_shared<const LaneCorridorRTree>(boxes.begin(),
+                                                        boxes.end());
+      std::atomic_store(&index_, index);
+    }
+    return index;
+  }
+
+  void Reset() {
+    std::atomic_store(&index_, std::shared_ptr<const LaneCorridorRTree>());
+  }
+
+ private:
+  mutable std::shared_ptr<const LaneCorridorRTree> index_;
+};
+
+//! matching of N points with the lane corridors, see RoadCorridor::MatchPoints
+struct LaneCorridorMatchingResult {
+  //! NxK, whether point i lies in the j-th unique lane corridor
+  Eigen::Matrix<bool, Eigen::Dynamic, Eigen::Dynamic> in_lane_corridors;
+  //! index of the unique lane corridor the Frenet position refers to, -1 if
+  //! there is none
+  Eigen::VectorXi lane_corridor_indices;
+  //! Nx2, Frenet positions (s, d) along the center line of the lane corridor
+  //! lane_corridor_indices(i), NaN if there is none
+  Eigen::MatrixXd frenet_positions;
+};
+
 struct RoadCorridor {
   //! Getter
   RoadPtr GetRoad(const RoadId& road_id) const {
@@ -59,13 +124,26 @@ struct RoadCorridor {
     return driving_direction_;
   }
 
-  LaneCorridorPtr GetCurrentLaneCorridor(const Point2d& pt) const {
-    for (const auto& lane_corr : unique_lane_corridors_) {
-      if (Collide(pt, lane_corr->GetMergedPolygon())) return lane_corr;
-    }
-    return nullptr;
-  }
-  LaneCorridorPtr GetNearestLaneCorridor(const Point2d& pt) const;
+  //! first unique lane corridor containing the point; a hint containing the
+  //! point, e.g. the lane corridor of the previous step, only narrows the
+  //! search to the preceding lane corridors and does not change the result
+  LaneCorridorPtr GetCurrentLaneCorridor(
+      const Point2d& pt, const LaneCorridorPtr& hint = nullptr) const;
+  LaneCorridorPtr GetNearestLaneCorridor(
+      const Point2d& pt, const LaneCorridorPtr& hint = nullptr) const;
+  //! indices of all unique lane corridors containing the point, ascending
+  std::vector<unsigned int> GetLaneCorridorIndices(const Point2d& pt) const;
+  /**
+   * @brief  Matches the points, given as Nx2 matrix of x and y, with the
+   *         unique lane corridors
+   *
+   * The membership in all unique lane corridors is queried for every point.
+   * The Frenet positions refer to the lane corridor containing the point or
+   * else the nearest one. Consecutive points are assumed to form a
+   * trajectory, thus, the Frenet positions stay on the lane corridor of the
+   * previous point while it contains the point.
+   */
+  LaneCorridorMatchingResult MatchPoints(const Eigen::MatrixXd& points) const;
   std::pair<LaneCorridorPtr, LaneCorridorPtr> GetLeftRightLaneCorridor(
       const Point2d& pt) const;
 
@@ -86,6 +164,7 @@ struct RoadCorridor {
     if (std::find(unique_lane_corridors_.begin(), unique_lane_corridors_.end(),
                   corr) == unique_lane_corridors_.end()) {
       unique_lane_corridors_.push_back(corr);
+      lane_corridor_index_.Reset();
     }
   }
 
@@ -96,6 +175,7 @@ struct RoadCorridor {
   void SetUniqueLaneCorridors(
       const std::vector<LaneCorridorPtr>& unique_lane_corridors) {
     unique_lane_corridors_ = unique_lane_corridors;
+    lane_corridor_index_.Reset();
   }
   void SetLaneCorridorMap(
       const std::map<LaneId, LaneCorridorPtr>& lane_corridors) {
@@ -128,6 +208,7 @@ struct RoadCorridor {
   std::vector<XodrRoadId> road_ids_;
   XodrDrivingDirection driving_direction_;
   std::map<LaneId, LaneCorridorPtr> lane_corridors_;
+  LaneCorridorIndexCache lane_corridor_index_;
 };
 using RoadCorridorPtr = std::shared_ptr<RoadCorridor>;
 
@@ -201,6 +201,8 @@ class Roadgraph {
 
   XodrLaneGraph GetLaneGraph() const { return g_; }
 
+  void SetLaneGraph(const XodrLaneGraph& g) { g_ = g; }
+
   XodrLaneVertex GetVertex(vertex_t v_des) const { return g_[v_des]; }
 
   std::vector<vertex_t> GetVertices() const;
@@ -50,7 +50,10 @@ Agent::Agent(const State& initial_state,
     pair.second = Action(DiscreteAction(0));
   }
 
-  history_.push_back(pair);
+  history_.SetCapacity(max_history_length_);
+  history_.PushBack(pair);
+  convex_shape_ = geometry::IsConvex(GetShape());
+  UpdateFootprint();
 
   if (map_interface) {
     if (!GenerateRoadCorridor(map_interface)) {
@@ -66,10 +69,15 @@ Agent::Agent(const Agent& other_agent)
       dynamic_model_(other_agent.dynamic_model_),
       execution_model_(other_agent.execution_model_),
       road_corridor_(other_agent.road_corridor_),
+      lane_corridor_(other_agent.lane_corridor_),
       history_(other_agent.history_),
       max_history_length_(other_agent.max_history_length_),
       first_valid_timestamp_(other_agent.first_valid_timestamp_),
-      goal_definition_(other_agent.goal_definition_) {}
+      goal_definition_(other_agent.goal_definition_),
+      footprint_(other_agent.footprint_),
+      footprint_pose_(other_agent.footprint_pose_),
+      footprint_box_(other_agent.footprint_box_),
+      convex_shape_(other_agent.convex_shape_) {}
 
 void Agent::PlanBehavior(const double& min_planning_dt,
                          const ObservedWorld& observed_world) {
@@ -82,14 +90,40 @@ void Agent::PlanExecution(const double& world_time) {
 }
 
 void Agent::UpdateStateAction() {
-  models::behavior::StateActionPair state_action_pair(
-      execution_model_->GetExecutedState(), behavior_model_->GetLastAction());
-  history_.push_back(state_action_pair);
+  //! overwrites the oldest state if the history is full
+  history_.PushBack(execution_model_->GetExecutedState(),
+                    behavior_model_->GetLastAction());
+  UpdateFootprint();
+  lane_corridor_.Invalidate();
+}
 
-  //! remove states if queue becomes too large
-  if (history_.size() > max_history_length_) {
-    history_.erase(history_.begin());
+void Agent::UpdateFootprint() {
+  if (history_.empty()) {
+    footprint_ = Polygon();
+    footprint_pose_.setConstant(std::numeric_limits<double>::quiet_NaN());
+    footprint_box_ = std::make_pair(Point2d(0, 0), Point2d(0, 0));
+    return;
+  }
+  const auto state = history_.GetLastState();
+  footprint_pose_ << state(StateDefinition::X_POSITION),
+      state(StateDefinition::Y_POSITION),
+      state(StateDefinition::THETA_POSITION);
+  footprint_ = geometry::TransformPolygon(GetShape(), footprint_pose_);
+  footprint_box_ = footprint_.BoundingBox();
+}
+
+LaneCorridorPtr Agent::GetLaneCorridor() const {
+  std::lock_guard<std::mutex> lock(lane_corridor_.mutex);
+  if (!lane_corridor_.valid) {
+    if (!road_corridor_ || history_.empty()) {
+      lane_corridor_.lane_corridor = nullptr;
+    } else {
+      lane_corridor_.lane_corridor = road_corridor_->GetNearestLaneCorridor(
+          GetCurrentPosition(), lane_corridor_.lane_corridor);
+    }
+    lane_corridor_.valid = true;
   }
+  return lane_corridor_.lane_corridor;
 }
 
 bool Agent::GenerateRoadCorridor(const MapInterfacePtr& map_interface) {
@@ -98,6 +132,7 @@ bool Agent::GenerateRoadCorridor(const MapInterfacePtr& map_interface) {
   }
   road_corridor_ = map_interface->GenerateRoadCorridor(
       GetCurrentPosition(), goal_definition_->GetShape());
+  lane_corridor_.Reset();
   if (!road_corridor_) {
     return false;
   }
@@ -106,7 +141,8 @@ bool Agent::GenerateRoadCorridor(const MapInterfacePtr& map_interface) {
 
 FrenetPosition Agent::CurrentFrenetPosition() const {
   const Point2d pos = GetCurrentPosition();
-  const auto& lane_corridor = GetRoadCorridor()->GetCurrentLaneCorridor(pos);
+  const auto& lane_corridor =
+      GetRoadCorridor()->GetCurrentLaneCorridor(pos, GetLaneCorridor());
   if (!lane_corridor) {
     // assume vehicle is far far away on same lane
     // (until better failure handling implemented)
@@ -120,9 +156,10 @@ Polygon Agent::GetPolygonFromState(const State& state) const {
   Pose agent_pose(state(StateDefinition::X_POSITION),
                   state(StateDefinition::Y_POSITION),
                   state(StateDefinition::THETA_POSITION));
-  std::shared_ptr<Polygon> polygon(std::dynamic_pointer_cast<Polygon>(
-      this->GetShape().Transform(agent_pose)));
-  return *polygon;
+  if (agent_pose == footprint_pose_) {
+    return footprint_;
+  }
+  return geometry::TransformPolygon(GetShape(), agent_pose);
 }
 
 bool Agent::AtGoal() const {
@@ -141,6 +178,15 @@ bool Agent::IsValidAtTime(const double& world_time) const {
                         first_valid_timestamp_);
 }
 
+bool CollideFootprints(const Agent& agent1, const Agent& agent2) {
+  if (agent1.HasConvexShape() && agent2.HasConvexShape()) {
+    return geometry::CollideConvex(agent1.GetCurrentPolygon(),
+                                   agent2.GetCurrentPolygon());
+  }
+  return geometry::Collide(agent1.GetCurrentPolygon(),
+                           agent2.GetCurrentPolygon());
+}
+
 std::shared_ptr<Object> Agent::Clone() const {
   std::shared_ptr<Agent> new_agent = std::make_shared<Agent>(*this);
   new_agent->SetAgentId(this->GetAgentId());
@@ -9,6 +9,8 @@
 #ifndef BARK_WORLD_OBJECTS_AGENT_HPP_
 #define BARK_WORLD_OBJECTS_AGENT_HPP_
 
+#include <mutex>
+
 #include "bark/commons/base_type.hpp"
 #include "bark/commons/transformation/frenet.hpp"
 #include "bark/geometry/polygon.hpp"
@@ -19,17 +21,20 @@
 #include "bark/world/map/map_interface.hpp"
 #include "bark/world/map/road_corridor.hpp"
 #include "bark/world/objects/object.hpp"
+#include "bark/world/objects/state_action_buffer.hpp"
 #include "bark/world/opendrive/opendrive.hpp"
 
 namespace bark {
 namespace world {
 class ObservedWorld;
+class World;
 namespace objects {
 
 typedef unsigned int AgentId;
 using bark::commons::transformation::FrenetPosition;
 using bark::world::goal_definition::GoalDefinition;
 using bark::world::goal_definition::GoalDefinitionPtr;
+using bark::world::map::LaneCorridorPtr;
 using bark::world::map::MapInterfacePtr;
 using bark::world::map::RoadCorridorPtr;
 using bark::world::opendrive::XodrLaneId;
@@ -53,7 +58,7 @@ using bark::geometry::Pose;
 
 class Agent : public Object {
  public:
-  friend class World;
+  friend class bark::world::World;
 
   Agent(const State& initial_state, const BehaviorModelPtr& behavior_model_ptr,
         const DynamicModelPtr& dynamic_model_ptr,
@@ -105,7 +110,12 @@ class Agent : public Object {
 
   DynamicModelPtr GetDynamicModel() const { return dynamic_model_; }
 
-  StateActionHistory GetStateInputHistory() const { return history_; }
+  //! copy of the history, prefer GetHistory
+  StateActionHistory GetStateInputHistory() const {
+    return history_.ToHistory();
+  }
+
+  const StateActionBuffer& GetHistory() const { return history_; }
 
   GoalDefinitionPtr GetGoalDefinition() const { return goal_definition_; }
 
@@ -117,7 +127,7 @@ class Agent : public Object {
     return behavior_model_->GetLastTrajectory();
   }
 
-  State GetCurrentState() const { return history_.back().first; }
+  State GetCurrentState() const { return history_.GetLastState(); }
 
   Point2d GetCurrentPosition() const {
     const State& state = GetCurrentState();
@@ -127,10 +137,26 @@ class Agent : public Object {
 
   FrenetPosition CurrentFrenetPosition() const;
 
+  //! uses the cached footprint if the state has the pose of the current state
   Polygon GetPolygonFromState(const State& state) const;
 
+  //! footprint of the current state, updated whenever the state changes
+  const Polygon& GetCurrentPolygon() const { return footprint_; }
+
+  //! min and max corner of the bounding box of the current footprint
+  const std::pair<Point2d, Point2d>& GetCurrentBoundingBox() const {
+    return footprint_box_;
+  }
+
+  bool HasConvexShape() const { return convex_shape_; }
+
   const RoadCorridorPtr GetRoadCorridor() const { return road_corridor_; }
 
+  //! nearest lane corridor of the road corridor at the current position,
+  //! determined on the first call after the state or the road corridor
+  //! changed; where lane corridors overlap, the previous one is kept
+  LaneCorridorPtr GetLaneCorridor() const;
+
   BehaviorStatus GetBehaviorStatus() const {
     return behavior_model_->GetBehaviorStatus();
   }
@@ -164,11 +190,14 @@ class Agent : public Object {
   }
 
   void SetStateInputHistory(const StateActionHistory& history) {
-    history_ = history;
+    history_ = StateActionBuffer(history, max_history_length_);
+    UpdateFootprint();
+    lane_corridor_.Invalidate();
   }
 
   void SetRoadCorridor(const RoadCorridorPtr road_corridor) {
     road_corridor_ = road_corridor;
+    lane_corridor_.Reset();
   }
 
   void SetFirstValidTimestamp(const double first_valid_timestamp) {
@@ -178,18 +207,56 @@ class Agent : public Object {
   virtual std::shared_ptr<Object> Clone() const;
 
  private:
+  void UpdateFootprint();
+
+  //! lane corridor at the current state, the previous lane corridor is kept
+  //! as hint when the state changes; concurrent readers are synchronized
+  struct LaneCorridorCache {
+    LaneCorridorCache() : valid(false) {}
+    LaneCorridorCache(const LaneCorridorCache& other) { *this = other; }
+    LaneCorridorCache& operator=(const LaneCorridorCache& other) {
+      if (this != &other) {
+        std::lock_guard<std::mutex> lock(other.mutex);
+        lane_corridor = other.lane_corridor;
+        valid = other.valid;
+      }
+      return *this;
+    }
+    void Invalidate() { valid = false; }
+    void Reset() {
+      lane_corridor = nullptr;
+      valid = false;
+    }
+    mutable std::mutex mutex;
+    LaneCorridorPtr lane_corridor;
+    bool valid;
+  };
+
   BehaviorModelPtr behavior_model_;
   DynamicModelPtr dynamic_model_;
   ExecutionModelPtr execution_model_;
   RoadCorridorPtr road_corridor_;
-  StateActionHistory history_;
+  mutable LaneCorridorCache lane_corridor_;
+  StateActionBuffer history_;
   uint32_t max_history_length_;
   GoalDefinitionPtr goal_definition_;
   double first_valid_timestamp_;
+  Polygon footprint_;
+  Pose footprint_pose_;
+  std::pair<Point2d, Point2d> footprint_box_;
+  bool convex_shape_;
 };
 
 typedef std::shared_ptr<Agent> AgentPtr;
 
+/**
+ * @brief  Checks whether the current footprints of the agents intersect
+ *
+ * Convex footprints, e.g. of vehicles, are checked using the separating axis
+ * theorem, other footprints using boost::geometry::intersects.
+ */
+bool CollideFootprints(const Agent& agent1, const Agent& agent2);
+
 }  // namespace objects
 }  // namespace world
 }  // namespace bark
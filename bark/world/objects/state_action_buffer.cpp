@@ -0,0 +1,70 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <algorithm>
+
+#include "bark/world/objects/state_action_buffer.hpp"
+
+namespace bark {
+namespace world {
+namespace objects {
+
+StateActionBuffer::StateActionBuffer(std::size_t capacity)
+    : capacity_(std::max(capacity, static_cast<std::size_t>(1))),
+      head_(0),
+      size_(0),
+      states_(),
+      actions_(capacity_) {}
+
+StateActionBuffer::StateActionBuffer(const StateActionHistory& history,
+                                     std::size_t capacity)
+    : StateActionBuffer(capacity) {
+  for (const auto& state_action : history) {
+    PushBack(state_action);
+  }
+}
+
+void StateActionBuffer::PushBack(const State& state, const Action& action) {
+  if (state.size() != states_.cols()) {
+    // the memory is only allocated for the first state
+    states_.resize(2 * capacity_, state.size());
+    Clear();
+  }
+  const std::size_t idx = (head_ + size_) % capacity_;
+  states_.row(idx) = state.transpose();
+  states_.row(idx + capacity_) = state.transpose();
+  actions_[idx] = action;
+  if (size_ < capacity_) {
+    ++size_;
+  } else {
+    head_ = (head_ + 1) % capacity_;
+  }
+}
+
+void StateActionBuffer::SetCapacity(std::size_t capacity) {
+  capacity = std::max(capacity, static_cast<std::size_t>(1));
+  if (capacity == capacity_) return;
+  StateActionBuffer buffer(capacity);
+  for (std::size_t i = size_ - std::min(size_, capacity); i < size_; ++i) {
+    buffer.PushBack(GetState(i), GetAction(i));
+  }
+  *this = std::move(buffer);
+}
+
+StateActionHistory StateActionBuffer::ToHistory() const {
+  StateActionHistory history;
+  history.reserve(size_);
+  for (std::size_t i = 0; i < size_; ++i) {
+    history.push_back(GetStateAction(i));
+  }
+  return history;
+}
+
+}  // namespace objects
+}  // namespace world
+}  // namespace bark
@@ -0,0 +1,99 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#ifndef BARK_WORLD_OBJECTS_STATE_ACTION_BUFFER_HPP_
+#define BARK_WORLD_OBJECTS_STATE_ACTION_BUFFER_HPP_
+
+#include <Eigen/Dense>
+#include <vector>
+
+#include "bark/models/behavior/behavior_model.hpp"
+
+namespace bark {
+namespace world {
+namespace objects {
+
+using models::behavior::Action;
+using models::behavior::StateActionHistory;
+using models::behavior::StateActionPair;
+using models::dynamic::State;
+
+/**
+ * @brief  State-action history with a fixed capacity; the oldest pair is
+ *         overwritten once the capacity is reached
+ *
+ * The states are written twice into a row-major matrix with 2 * capacity
+ * rows, thus, the states of the history are always contiguous rows and can be
+ * viewed without copying them (GetStates). All states share one dimension;
+ * pushing a state with another dimension clears the history.
+ */
+class StateActionBuffer {
+ public:
+  typedef Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic,
+                        Eigen::RowMajor>
+      StateMatrix;
+  typedef Eigen::Map<const StateMatrix> StatesView;
+  typedef Eigen::Map<const State> StateView;
+
+  explicit StateActionBuffer(std::size_t capacity = 1);
+  StateActionBuffer(const StateActionHistory& history, std::size_t capacity);
+
+  void PushBack(const State& state, const Action& action);
+  void PushBack(const StateActionPair& state_action) {
+    PushBack(state_action.first, state_action.second);
+  }
+  void Clear() {
+    head_ = 0;
+    size_ = 0;
+  }
+
+  //! keeps the newest pairs if the capacity is reduced
+  void SetCapacity(std::size_t capacity);
+
+  std::size_t size() const { return size_; }
+  bool empty() const { return size_ == 0; }
+  std::size_t capacity() const { return capacity_; }
+  Eigen::Index GetStateDim() const { return states_.cols(); }
+
+  //! (size x state_dim) view of the states, the oldest state first
+  StatesView GetStates() const {
+    return StatesView(states_.data() + head_ * states_.cols(), size_,
+                      states_.cols());
+  }
+
+  //! the pair with idx = 0 is the oldest one
+  StateView GetState(std::size_t idx) const {
+    return StateView(states_.data() + (head_ + idx) * states_.cols(),
+                     states_.cols());
+  }
+  const Action& GetAction(std::size_t idx) const {
+    return actions_[(head_ + idx) % capacity_];
+  }
+  StateActionPair GetStateAction(std::size_t idx) const {
+    return StateActionPair(GetState(idx), GetAction(idx));
+  }
+
+  StateView GetLastState() const { return GetState(size_ - 1); }
+  const Action& GetLastAction() const { return GetAction(size_ - 1); }
+
+  //! copies the pairs, the oldest pair first
+  StateActionHistory ToHistory() const;
+
+ private:
+  std::size_t capacity_;
+  std::size_t head_;
+  std::size_t size_;
+  StateMatrix states_;
+  std::vector<Action> actions_;
+};
+
+}  // namespace objects
+}  // namespace world
+}  // namespace bark
+
+#endif  // BARK_WORLD_OBJECTS_STATE_ACTION_BUFFER_HPP_
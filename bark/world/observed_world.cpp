@@ -64,13 +64,13 @@ AgentFrenetPair ObservedWorld::GetAgentBehind() const {
 }
 
 const LaneCorridorPtr ObservedWorld::GetLaneCorridor() const {
-  Point2d ego_pos = CurrentEgoPosition();
   const auto& road_corridor = GetRoadCorridor();
   if (!road_corridor) {
     LOG(ERROR) << "No road corridor found.";
     return nullptr;
   }
-  const auto& lane_corridor = road_corridor->GetNearestLaneCorridor(ego_pos);
+  // the nearest lane corridor of the ego agent, see Agent::GetLaneCorridor
+  const auto& lane_corridor = GetEgoAgent()->GetLaneCorridor();
   if (!lane_corridor) {
     LOG(ERROR) << "No lane corridor found.";
     return nullptr;
@@ -89,13 +89,42 @@ ObservedWorldPtr ObservedWorld::Predict(double time_span) const {
   return next_world;
 }
 
+void ObservedWorld::PredictRollout(double time_step, unsigned int num_steps,
+                                   const PredictionVisitor& visitor) const {
+  std::shared_ptr<ObservedWorld> next_world =
+      std::dynamic_pointer_cast<ObservedWorld>(ObservedWorld::Clone());
+  next_world->UpdateAgentRTree();
+  if (!visitor(0., *next_world)) return;
+  for (unsigned int step = 1; step <= num_steps; ++step) {
+    next_world->Step(time_step);
+    if (!visitor(step * time_step, *next_world)) return;
+  }
+}
+
+std::vector<AgentPolygonMap> ObservedWorld::PredictAgentPolygons(
+    double time_step, unsigned int num_steps) const {
+  std::vector<AgentPolygonMap> agent_polygons;
+  agent_polygons.reserve(num_steps + 1);
+  PredictRollout(time_step, num_steps,
+                 [&agent_polygons](double t, const ObservedWorld& world) {
+                   AgentPolygonMap polygons;
+                   for (const auto& agent : world.GetValidAgents()) {
+                     polygons[agent.first] =
+                         agent.second->GetCurrentPolygon();
+                   }
+                   agent_polygons.push_back(polygons);
+                   return true;
+                 });
+  return agent_polygons;
+}
+
 ObservedWorldPtr ObservedWorld::Predict(
     double time_span, const DiscreteAction& ego_action) const {
   std::shared_ptr<ObservedWorld> next_world =
       std::dynamic_pointer_cast<ObservedWorld>(ObservedWorld::Clone());
   std::shared_ptr<BehaviorMotionPrimitives> ego_behavior_model =
       std::dynamic_pointer_cast<BehaviorMotionPrimitives>(
-          next_world->GetEgoBehaviorModel());
+          next_world->GetMutableAgent(ego_agent_id_)->GetBehaviorModel());
   if (ego_behavior_model) {
     ego_behavior_model->ActionToBehavior(ego_action);
   } else {
@@ -112,12 +141,13 @@ ObservedWorldPtr ObservedWorld::Predict(
   std::shared_ptr<ObservedWorld> next_world =
       std::dynamic_pointer_cast<ObservedWorld>(ObservedWorld::Clone());
   for (const auto& agent_action : agent_action_map) {
-    if (!next_world->GetAgent(agent_action.first)) {
+    auto agent_ptr = next_world->GetMutableAgent(agent_action.first);
+    if (!agent_ptr) {
       continue;
     }
     std::shared_ptr<BehaviorMotionPrimitives> behavior_model =
         std::dynamic_pointer_cast<BehaviorMotionPrimitives>(
-            next_world->GetAgent(agent_action.first)->GetBehaviorModel());
+            agent_ptr->GetBehaviorModel());
     if (behavior_model) {
       behavior_model->ActionToBehavior(agent_action.second);
     } else {
@@ -137,7 +167,7 @@ ObservedWorldPtr ObservedWorld::Predict(
   std::shared_ptr<ObservedWorld> next_world =
       std::dynamic_pointer_cast<ObservedWorld>(ObservedWorld::Clone());
 
-  auto ego_agent_ptr = next_world->GetEgoAgent();
+  auto ego_agent_ptr = next_world->GetMutableAgent(ego_agent_id_);
   if (ego_agent_ptr) {
     ego_agent_ptr->SetBehaviorModel(ego_behavior_model);
   } else {
@@ -146,7 +176,7 @@ ObservedWorldPtr ObservedWorld::Predict(
   }
 
   for (const auto& agent_pair : other_behaviors) {
-    auto agent_ptr = next_world->GetAgent(agent_pair.first);
+    auto agent_ptr = next_world->GetMutableAgent(agent_pair.first);
     if (!agent_ptr) {
       LOG(WARNING) << "Agent Id" << agent_pair.first
                    << " not existent in observed world during prediction";
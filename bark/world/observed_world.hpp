@@ -9,8 +9,10 @@
 #ifndef BARK_WORLD_OBSERVED_WORLD_HPP_
 #define BARK_WORLD_OBSERVED_WORLD_HPP_
 
+#include <functional>
 #include <unordered_map>
 #include <utility>
+#include <vector>
 #include "bark/geometry/geometry.hpp"
 #include "bark/models/dynamic/dynamic_model.hpp"
 #include "bark/world/prediction/prediction_settings.hpp"
@@ -20,6 +22,7 @@ namespace bark {
 namespace world {
 
 using bark::geometry::Point2d;
+using bark::geometry::Polygon;
 using bark::models::behavior::Action;
 using bark::models::behavior::ActionHash;
 using bark::models::behavior::BehaviorModel;
@@ -35,6 +38,13 @@ using world::objects::Agent;
 using world::objects::AgentId;
 using world::objects::AgentPtr;
 
+class ObservedWorld;
+
+// Called with the prediction time and the predicted world; returning false
+// stops the rollout
+typedef std::function<bool(double, const ObservedWorld&)> PredictionVisitor;
+typedef std::unordered_map<AgentId, Polygon> AgentPolygonMap;
+
 class ObservedWorld : public World {
  public:
   ObservedWorld(const WorldPtr& world, const AgentId& ego_agent_id)
@@ -60,6 +70,9 @@ class ObservedWorld : public World {
     return ObservedWorld::GetEgoAgent()->GetRoadCorridor();
   }
 
+  //! nearest lane corridor of the ego agent; where lane corridors overlap,
+  //! e.g. before a lane split, it stays on the lane corridor of the previous
+  //! state instead of returning the first unique lane corridor
   const LaneCorridorPtr GetLaneCorridor() const;
 
   const AgentPtr GetEgoAgent() const { return World::GetAgent(ego_agent_id_); }
@@ -78,13 +91,14 @@ class ObservedWorld : public World {
     return World::GetAgent(ego_agent_id_)->GetBehaviorModel();
   }
 
-  void SetEgoBehaviorModel(const BehaviorModelPtr& behavior_model) const {
-    return World::GetAgent(ego_agent_id_)->SetBehaviorModel(behavior_model);
+  void SetEgoBehaviorModel(const BehaviorModelPtr& behavior_model) {
+    return World::GetMutableAgent(ego_agent_id_)
+        ->SetBehaviorModel(behavior_model);
   }
 
   void SetBehaviorModel(const AgentId& agent_id,
-                        const BehaviorModelPtr& behavior_model) const {
-    return World::GetAgent(agent_id)->SetBehaviorModel(behavior_model);
+                        const BehaviorModelPtr& behavior_model) {
+    return World::GetMutableAgent(agent_id)->SetBehaviorModel(behavior_model);
   }
 
   const MapInterfacePtr GetMap() const { return World::GetMap(); }
@@ -117,18 +131,29 @@ class ObservedWorld : public World {
                            const std::unordered_map<AgentId, BehaviorModelPtr>
                                other_behaviors) const;
 
+  // Clones the world once and steps the clone num_steps times by time_step;
+  // the visitor is called for t = 0, time_step, ..., num_steps * time_step
+  void PredictRollout(double time_step, unsigned int num_steps,
+                      const PredictionVisitor& visitor) const;
+
+  // Polygons of all valid agents for each step of PredictRollout
+  std::vector<AgentPolygonMap> PredictAgentPolygons(
+      double time_step, unsigned int num_steps) const;
+
   template <class Behavior, class EgoBehavior>
   ObservedWorldPtr Predict(double time_span, const Action& ego_action) const {
     std::shared_ptr<ObservedWorld> next_obs_world =
         std::dynamic_pointer_cast<ObservedWorld>(ObservedWorld::Clone());
     // for all other agents set Behavior
     for (auto& agent : next_obs_world->GetOtherAgents()) {
-      agent.second->SetBehaviorModel(std::make_shared<Behavior>(
-          agent.second->GetBehaviorModel()->GetParams()));
+      next_obs_world->SetBehaviorModel(
+          agent.first, std::make_shared<Behavior>(
+                           agent.second->GetBehaviorModel()->GetParams()));
     }
     std::shared_ptr<EgoBehavior> ego_behavior_model =
         std::dynamic_pointer_cast<EgoBehavior>(
-            next_obs_world->GetEgoBehaviorModel());
+            next_obs_world->GetMutableAgent(ego_agent_id_)
+                ->GetBehaviorModel());
     ego_behavior_model->SetLastAction(ego_action);
     next_obs_world->Step(time_span);
     return next_obs_world;
@@ -201,7 +201,9 @@ inline geometry::Line CreateLineWithOffsetFromLine(
     normal = geometry::Point2d(cos(tangent_angle + asin(1)),
                                sin(tangent_angle + asin(1)));
     scale = -sign * off.a;
-    tmp_line.AddPoint(
+    std::vector<geometry::Point2d> points;
+    points.reserve(simplified_prev_line.obj_.size());
+    points.push_back(
         geometry::Point2d(bg::get<0>(prev_point) + scale * bg::get<0>(normal),
                           bg::get<1>(prev_point) + scale * bg::get<1>(normal)));
 
@@ -212,22 +214,30 @@ inline geometry::Line CreateLineWithOffsetFromLine(
                             bg::get<0>(current_point) - bg::get<0>(prev_point));
       normal = geometry::Point2d(cos(tangent_angle + asin(1)),
                                  sin(tangent_angle + asin(1)));
-      tmp_line.AddPoint(geometry::Point2d(
+      points.push_back(geometry::Point2d(
           bg::get<0>(current_point) + scale * bg::get<0>(normal),
           bg::get<1>(current_point) + scale * bg::get<1>(normal)));
     }
+    tmp_line.AddPoints(points);
   } else {
+    std::vector<double> s_values;
     for (; s <= s_end;) {
-      geometry::Point2d point = GetPointAtS(simplified_prev_line, s);
-      normal = GetNormalAtS(simplified_prev_line, s);
-      scale = -sign * Polynom(s - lane_width_current_lane.s_start, off.a, off.b,
-                              off.c, off.d);
-      tmp_line.AddPoint(
-          geometry::Point2d(bg::get<0>(point) + scale * bg::get<0>(normal),
-                            bg::get<1>(point) + scale * bg::get<1>(normal)));
+      s_values.push_back(s);
       if ((s_end - s < s_inc) && (s_end - s > 0.)) s_inc = s_end - s;
       s += s_inc;
     }
+    // the samples are ascending, thus, the segments are found in one pass
+    std::vector<geometry::Point2d> points, normals;
+    GetPointsAndNormalsAtS(simplified_prev_line, s_values, &points, &normals);
+    for (std::size_t i = 0; i < s_values.size(); ++i) {
+      scale = -sign * Polynom(s_values[i] - lane_width_current_lane.s_start,
+                              off.a, off.b, off.c, off.d);
+      bg::set<0>(points[i],
+                 bg::get<0>(points[i]) + scale * bg::get<0>(normals[i]));
+      bg::set<1>(points[i],
+                 bg::get<1>(points[i]) + scale * bg::get<1>(normals[i]));
+    }
+    tmp_line.AddPoints(points);
   }
 
   // SIMPLIFY line with max error
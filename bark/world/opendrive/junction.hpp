@@ -35,6 +35,7 @@ class Junction {
   Connections GetConnections() const { return connections_; }
   Connection GetConnection(uint32_t id) const { return connections_.at(id); }
   uint32_t GetId() const { return id_; }
+  std::string GetName() const { return name_; }
 
  private:
   uint32_t id_;
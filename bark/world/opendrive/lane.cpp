@@ -41,20 +41,17 @@ bool XodrLane::append(geometry::Line previous_line,
               // too discrete, and this will cause problems for the next line
               // creation with an offset
 
-  if (boost::geometry::intersects(previous_line.obj_)) {
-    LOG(ERROR) << "Previous Line in XodrLane::apend is already intersecting";
-  }
-
+  // the lane line is checked once it is complete, see CheckSelfIntersection
   geometry::Line tmp_line = CreateLineWithOffsetFromLine(
       previous_line, lane_position_, lane_width_current, s_inc, s_max_delta);
-
-  if (boost::geometry::intersects(tmp_line.obj_)) {
-    LOG(ERROR) << "CreateLineWithOffsetFromLine yields intersecting line";
-  }
   line_.AppendLinestring(tmp_line);
+  return true;
+}
 
+bool XodrLane::CheckSelfIntersection() const {
   if (boost::geometry::intersects(line_.obj_)) {
     LOG(ERROR) << "XodrLane line has self-intersection";
+    return false;
   }
   return true;
 }
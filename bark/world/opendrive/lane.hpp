@@ -57,6 +57,10 @@ class XodrLane {
   bool append(Line previous_line, XodrLaneWidth lane_width_current,
               double s_inc);
 
+  //! checks the lane line for self-intersections once all lane widths have
+  //! been appended; returns false and logs an error if there are any
+  bool CheckSelfIntersection() const;
+
   //! getter functions
   Line GetLine() const { return line_; }
 
@@ -106,6 +110,7 @@ inline XodrLanePtr CreateLaneFromLaneWidth(XodrLanePosition lane_position,
                                            double s_inc = 0.05f) {
   std::shared_ptr<XodrLane> ret_lane(new XodrLane(lane_position));
   ret_lane->append(previous_line, lane_width_current, s_inc);
+  ret_lane->CheckSelfIntersection();
   return ret_lane;
 }
 
@@ -9,6 +9,7 @@
 #include "bark/world/opendrive/plan_view.hpp"
 #include <math.h>
 #include <limits>
+#include <vector>
 #include "bark/world/opendrive/lane.hpp"
 #include "bark/world/opendrive/odrSpiral.hpp"
 
@@ -32,24 +33,23 @@ bool PlanView::AddLine(Point2d start_point, double heading, double length,
   using bark::geometry::Point2d;
 
   int num_points = length / s_inc;
+  std::vector<Point2d> points;
+  points.reserve(num_points + 2);
   //! straight line
   for (size_t i = 0; i <= num_points; ++i) {
     Point2d p(bg::get<0>(start_point) + i * s_inc * cos(heading),
               bg::get<1>(start_point) + i * s_inc * sin(heading));
-    reference_line_.AddPoint(p);
+    points.push_back(p);
   }
   if (length > num_points * s_inc) {
     Point2d end_p(bg::get<0>(start_point) + length * cos(heading),
                   bg::get<1>(start_point) + length * sin(heading));
-    reference_line_.AddPoint(end_p);
+    points.push_back(end_p);
   }
+  reference_line_.AddPoints(points);
 
   //! calculate overall length
-  length_ = bg::length(reference_line_.obj_);
-
-  if (boost::geometry::intersects(reference_line_.obj_)) {
-    LOG(ERROR) << "planview has self-intersection after adding line";
-  }
+  length_ = reference_line_.s_.back();
 
   return true;
 }
@@ -64,18 +64,16 @@ bool PlanView::AddSpiral(Point2d start_point, double heading, double length,
   double x_old = bg::get<0>(start_point), y_old = bg::get<1>(start_point);
 
   double s = 0.0;
+  std::vector<Point2d> points;
   for (; s <= length;) {
     odrSpiral(s, x_old, y_old, cDot, curvature_start, heading, &x, &y, &t);
-    reference_line_.AddPoint(Point2d(x, y));
+    points.push_back(Point2d(x, y));
     if ((length - s < s_inc) && (length - s > 0.)) s_inc = length - s;
     s += s_inc;
   }
+  reference_line_.AddPoints(points);
 
-  length_ = bg::length(reference_line_.obj_);
-
-  if (boost::geometry::intersects(reference_line_.obj_)) {
-    LOG(ERROR) << "planview has self-intersection after adding spiral";
-  }
+  length_ = reference_line_.s_.empty() ? 0.0 : reference_line_.s_.back();
 
   return true;
 }
@@ -98,17 +96,23 @@ bool PlanView::AddArc(Point2d start_point, double heading, double length,
   double dx, dy;
   double x_old = bg::get<0>(start_point), y_old = bg::get<1>(start_point);
   double s = 0.0;
+  std::vector<Point2d> points;
   for (; s <= length;) {
     CalcArcPosition(s, heading, curvature, dx, dy);
-    reference_line_.AddPoint(Point2d(x_old + dx, y_old + dy));
+    points.push_back(Point2d(x_old + dx, y_old + dy));
     if (length - s < s_inc && length - s > 0.) s_inc = length - s;
     s += s_inc;
   }
+  reference_line_.AddPoints(points);
 
+  return true;
+}
+
+bool PlanView::CheckSelfIntersection() const {
   if (boost::geometry::intersects(reference_line_.obj_)) {
-    LOG(ERROR) << "planview has self-intersection after adding arc";
+    LOG(ERROR) << "planview has self-intersection";
+    return false;
   }
-
   return true;
 }
 
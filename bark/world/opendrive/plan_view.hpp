@@ -23,6 +23,8 @@ using bark::geometry::Point2d;
 class PlanView {
  public:
   PlanView() : length_(0.0) {}
+  PlanView(const Line& reference_line, double length)
+      : reference_line_(reference_line), length_(length) {}
   ~PlanView() {}
 
   //! setter functions
@@ -35,6 +37,10 @@ class PlanView {
   bool AddArc(Point2d start_point, double heading, double length, double curvature,
               double s_inc = 2.0);
 
+  //! checks the reference line for self-intersections once all geometries
+  //! have been added; returns false and logs an error if there are any
+  bool CheckSelfIntersection() const;
+
   void CalcArcPosition(const double s, double initial_heading, double curvature,
                        double& dx, double& dy);
 
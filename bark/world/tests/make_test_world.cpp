@@ -195,3 +195,41 @@ WorldPtr bark::world::tests::MakeTestWorldHighway() {
 
   return world;
 }
+
+WorldPtr bark::world::tests::MakeTestWorldDenseHighway(
+    int num_agents, const ParamsPtr& params, double spacing) {
+  using bark::geometry::standard_shapes::CarRectangle;
+  using StateDefinition::MIN_STATE_SIZE;
+
+  const double road_length = spacing * (num_agents / 2 + 1) + 100.0;
+  OpenDriveMapPtr open_drive_map = MakeXodrMapOneRoadTwoLanes(road_length);
+  MapInterfacePtr map_interface = std::make_shared<MapInterface>();
+  map_interface->interface_from_opendrive(open_drive_map);
+
+  Polygon goal_polygon(
+      Pose(0, 0, 0),
+      std::vector<Point2d>{Point2d(road_length - 20.0, -7.0),
+                           Point2d(road_length - 20.0, 0.0),
+                           Point2d(road_length, 0.0),
+                           Point2d(road_length, -7.0),
+                           Point2d(road_length - 20.0, -7.0)});
+  auto goal_ptr = std::make_shared<GoalDefinitionPolygon>(goal_polygon);
+
+  WorldPtr world(new World(params));
+  world->SetMap(map_interface);
+  for (int i = 0; i < num_agents; ++i) {
+    State init_state(static_cast<int>(MIN_STATE_SIZE));
+    const double pos_y = (i % 2 == 0) ? -1.75 : -5.25;
+    init_state << 0.0, 5.0 + spacing * (i / 2), pos_y, 0.0,
+        10.0 + 0.1 * (i % 7);
+    AgentPtr agent(new Agent(
+        init_state, std::make_shared<BehaviorIDMClassic>(params),
+        std::make_shared<SingleTrackModel>(params),
+        std::make_shared<ExecutionModelInterpolate>(params), CarRectangle(),
+        params, goal_ptr, map_interface, Model3D()));  // NOLINT
+    agent->SetAgentId(i + 1);
+    world->AddAgent(agent);
+  }
+  world->UpdateAgentRTree();
+  return world;
+}
@@ -45,6 +45,14 @@ ObservedWorld make_test_observed_world(
 
 WorldPtr MakeTestWorldHighway();
 
+/**
+ * @brief  Two-lane highway with num_agents IDM agents that alternate between
+ *         the lanes with a longitudinal spacing of spacing meters per lane
+ */
+WorldPtr MakeTestWorldDenseHighway(int num_agents,
+                                   const commons::ParamsPtr& params,
+                                   double spacing = 10.0);
+
 }  // namespace tests
 }  // namespace world
 }  // namespace bark
@@ -14,14 +14,15 @@
 
 using bark::world::opendrive::OpenDriveMapPtr;
 
-OpenDriveMapPtr bark::world::tests::MakeXodrMapOneRoadTwoLanes() {
+OpenDriveMapPtr bark::world::tests::MakeXodrMapOneRoadTwoLanes(
+    const double length) {
   using namespace bark::geometry;
   using namespace bark::world::opendrive;
 
   OpenDriveMapPtr open_drive_map = std::make_shared<OpenDriveMap>();
 
   PlanViewPtr p(new PlanView());
-  p->AddLine(Point2d(0.0, 0.0), 0.0, 200.0, 200.0);
+  p->AddLine(Point2d(0.0, 0.0), 0.0, length, length);
 
   //! XodrLane-Section 1
   XodrLaneSectionPtr ls(new XodrLaneSection(0.0));
@@ -32,7 +33,7 @@ OpenDriveMapPtr bark::world::tests::MakeXodrMapOneRoadTwoLanes() {
 
   //! Lanes
   XodrLaneOffset off = {3.5, 0.0, 0.0, 0.0};
-  XodrLaneWidth lane_width_1 = {0, 200, off};
+  XodrLaneWidth lane_width_1 = {0, length, off};
 
   XodrLanePtr lane1 =
       CreateLaneFromLaneWidth(-1, p->GetReferenceLine(), lane_width_1, 0.5);
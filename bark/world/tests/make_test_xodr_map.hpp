@@ -17,7 +17,7 @@ namespace tests {
 
 using bark::world::opendrive::OpenDriveMapPtr;
 
-OpenDriveMapPtr MakeXodrMapOneRoadTwoLanes();
+OpenDriveMapPtr MakeXodrMapOneRoadTwoLanes(const double length = 200.0);
 
 OpenDriveMapPtr MakeXodrMapTwoRoadsOneLane();
 
@@ -0,0 +1,203 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <random>
+#include <vector>
+
+#include "benchmark/benchmark.h"
+
+#include "bark/world/map/map_interface.hpp"
+#include "bark/world/opendrive/opendrive.hpp"
+
+using bark::geometry::Collide;
+using bark::geometry::Point2d;
+using bark::world::map::LaneCorridorPtr;
+using bark::world::map::MapInterface;
+using bark::world::map::RoadCorridorPtr;
+using bark::world::opendrive::OpenDriveMapPtr;
+using bark::world::opendrive::XodrDrivingDirection;
+using bark::world::opendrive::XodrLanePtr;
+using bark::world::opendrive::XodrRoadId;
+
+// parallel straight roads with num_lanes lanes each, 20m apart
+static OpenDriveMapPtr MakeMultiLaneMap(int num_roads, int num_lanes,
+                                        double length) {
+  using namespace bark::world::opendrive;
+  OpenDriveMapPtr open_drive_map = std::make_shared<OpenDriveMap>();
+  for (int road_idx = 0; road_idx < num_roads; ++road_idx) {
+    PlanViewPtr plan_view(new PlanView());
+    plan_view->AddLine(Point2d(0.0, (3.5 * num_lanes + 20.0) * road_idx), 0.0,
+                       length, 2.0);
+    XodrLaneSectionPtr lane_section(new XodrLaneSection(0.0));
+    XodrLanePtr plan_view_lane(new XodrLane(0));
+    plan_view_lane->SetLine(plan_view->GetReferenceLine());
+    lane_section->AddLane(plan_view_lane);
+    XodrLaneWidth lane_width = {0, length, {3.5, 0.0, 0.0, 0.0}};
+    XodrLanePtr previous_lane = plan_view_lane;
+    for (int lane_idx = 1; lane_idx <= num_lanes; ++lane_idx) {
+      XodrLanePtr lane = CreateLaneFromLaneWidth(
+          -lane_idx, previous_lane->GetLine(), lane_width, 2.0);
+      lane->SetLaneType(XodrLaneType::DRIVING);
+      lane->SetDrivingDirection(XodrDrivingDirection::FORWARD);
+      lane_section->AddLane(lane);
+      previous_lane = lane;
+    }
+    XodrRoadPtr road(new XodrRoad("road", road_idx));
+    road->SetPlanView(plan_view);
+    road->AddLaneSection(lane_section);
+    open_drive_map->AddRoad(road);
+  }
+  return open_drive_map;
+}
+
+static std::vector<Point2d> MakeQueryPoints(const MapInterface& map_interface,
+                                            int num_points) {
+  std::mt19937 generator(0);
+  const auto bounding_box = map_interface.BoundingBox();
+  std::uniform_real_distribution<double> x(bounding_box.first.get<0>(),
+                                           bounding_box.second.get<0>());
+  std::uniform_real_distribution<double> y(bounding_box.first.get<1>(),
+                                           bounding_box.second.get<1>());
+  std::vector<Point2d> points;
+  for (int i = 0; i < num_points; ++i) {
+    points.push_back(Point2d(x(generator), y(generator)));
+  }
+  return points;
+}
+
+// Arguments: number of roads, lanes per road
+static void BM_FindXodrLane(benchmark::State& state) {
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(
+      MakeMultiLaneMap(state.range(0), state.range(1), 500.0));
+  const auto points = MakeQueryPoints(map_interface, 1000);
+  for (auto _ : state) {
+    for (const auto& point : points) {
+      benchmark::DoNotOptimize(map_interface.FindXodrLane(point));
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.size());
+}
+BENCHMARK(BM_FindXodrLane)->Args({1, 4})->Args({16, 4})->Args({64, 8});
+
+// the previous lookup: point in polygon tests of the 20 lanes with the
+// nearest chords
+static void BM_FindXodrLaneNearestChords(benchmark::State& state) {
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(
+      MakeMultiLaneMap(state.range(0), state.range(1), 500.0));
+  const auto points = MakeQueryPoints(map_interface, 1000);
+  for (auto _ : state) {
+    for (const auto& point : points) {
+      std::vector<XodrLanePtr> lanes;
+      XodrLanePtr found_lane;
+      map_interface.FindNearestXodrLanes(point, 20, lanes, false);
+      for (const auto& lane : lanes) {
+        if (map_interface.IsInXodrLane(point, lane->GetId())) {
+          found_lane = lane;
+          break;
+        }
+      }
+      benchmark::DoNotOptimize(found_lane);
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.size());
+}
+BENCHMARK(BM_FindXodrLaneNearestChords)
+    ->Args({1, 4})
+    ->Args({16, 4})
+    ->Args({64, 8});
+
+// Arguments: lanes of the road corridor, use the r-tree (0/1) or the hint (2)
+static void BM_GetCurrentLaneCorridor(benchmark::State& state) {
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(
+      MakeMultiLaneMap(1, state.range(0), 500.0));
+  map_interface.GenerateRoadCorridor(std::vector<XodrRoadId>{0},
+                                     XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr road_corridor = map_interface.GetRoadCorridor(
+      std::vector<XodrRoadId>{0}, XodrDrivingDirection::FORWARD);
+  // an agent driving along the outermost lane
+  std::vector<Point2d> points;
+  for (double x = 1.0; x < 499.0; x += 0.5) {
+    points.push_back(Point2d(x, -3.5 * (state.range(0) - 0.5)));
+  }
+  for (auto _ : state) {
+    LaneCorridorPtr lane_corridor;
+    for (const auto& point : points) {
+      if (state.range(1) == 0) {
+        lane_corridor = nullptr;
+        for (const auto& corridor : road_corridor->GetUniqueLaneCorridors()) {
+          if (Collide(point, corridor->GetMergedPolygon())) {
+            lane_corridor = corridor;
+            break;
+          }
+        }
+      } else if (state.range(1) == 1) {
+        lane_corridor = road_corridor->GetCurrentLaneCorridor(point);
+      } else {
+        lane_corridor =
+            road_corridor->GetCurrentLaneCorridor(point, lane_corridor);
+      }
+      benchmark::DoNotOptimize(lane_corridor);
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.size());
+}
+BENCHMARK(BM_GetCurrentLaneCorridor)
+    ->ArgsProduct({{2, 8, 32}, {0, 1, 2}});
+
+static void BM_GetNearestLaneCorridorOffRoad(benchmark::State& state) {
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(
+      MakeMultiLaneMap(1, state.range(0), 500.0));
+  map_interface.GenerateRoadCorridor(std::vector<XodrRoadId>{0},
+                                     XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr road_corridor = map_interface.GetRoadCorridor(
+      std::vector<XodrRoadId>{0}, XodrDrivingDirection::FORWARD);
+  const Point2d point(250.0, -3.5 * state.range(0) - 2.0);
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(road_corridor->GetNearestLaneCorridor(point));
+  }
+}
+BENCHMARK(BM_GetNearestLaneCorridorOffRoad)->Arg(2)->Arg(8)->Arg(32);
+
+// Arguments: number of points of a trajectory along the outermost lane, use
+// MatchPoints (1) or per point lookups of the three nearest lanes (0)
+static void BM_MatchPoints(benchmark::State& state) {
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(MakeMultiLaneMap(16, 4, 500.0));
+  Eigen::MatrixXd points(state.range(0), 2);
+  for (int i = 0; i < points.rows(); ++i) {
+    points(i, 0) = 1.0 + 498.0 * i / points.rows();
+    points(i, 1) = -3.5 * 3.5;
+  }
+  for (auto _ : state) {
+    if (state.range(1) == 1) {
+      benchmark::DoNotOptimize(map_interface.MatchPoints(points));
+    } else {
+      for (int i = 0; i < points.rows(); ++i) {
+        const Point2d point(points(i, 0), points(i, 1));
+        std::vector<XodrLanePtr> lanes;
+        XodrLanePtr found_lane;
+        map_interface.FindNearestXodrLanes(point, 3, lanes);
+        for (const auto& lane : lanes) {
+          if (map_interface.IsInXodrLane(point, lane->GetId())) {
+            found_lane = lane;
+            break;
+          }
+        }
+        benchmark::DoNotOptimize(found_lane);
+      }
+    }
+  }
+  state.SetItemsProcessed(state.iterations() * points.rows());
+}
+BENCHMARK(BM_MatchPoints)->ArgsProduct({{100, 10000}, {0, 1}});
+
+BENCHMARK_MAIN();
@@ -6,6 +6,13 @@
 // This work is licensed under the terms of the MIT license.
 // For a copy, see <https://opensource.org/licenses/MIT>.
 
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <limits>
+#include <thread>
 #include "bark/world/map/map_interface.hpp"
 #include "bark/world/tests/make_test_xodr_map.hpp"
 #include "gtest/gtest.h"
@@ -50,4 +57,291 @@ TEST(point_in_lane, map_interface) {
   bool success = map_interface.FindNearestXodrLanes(point, 1, nearest_lanes);
 
   BARK_EXPECT_TRUE(success);
-}
\ No newline at end of file
+}
+TEST(compiled_map, map_interface) {
+  using bark::geometry::Point2d;
+  using bark::geometry::operator==;
+  using bark::world::map::LaneCorridorPtr;
+  using bark::world::map::MapInterface;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::opendrive::OpenDriveMapPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrLanePtr;
+  using bark::world::opendrive::XodrRoadId;
+  using bark::world::tests::MakeXodrMapTwoRoadsOneLane;
+
+  OpenDriveMapPtr open_drive_map = MakeXodrMapTwoRoadsOneLane();
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(open_drive_map);
+  std::vector<XodrRoadId> road_ids{100, 101};
+  XodrDrivingDirection driving_dir = XodrDrivingDirection::FORWARD;
+  map_interface.GenerateRoadCorridor(road_ids, driving_dir);
+
+  const std::string filename = "compiled_map_test.bmap";
+  EXPECT_TRUE(map_interface.SaveCompiledMap(filename));
+  MapInterface loaded_map_interface;
+  EXPECT_TRUE(loaded_map_interface.LoadCompiledMap(filename));
+
+  // open drive map and roadgraph
+  EXPECT_EQ(loaded_map_interface.GetOpenDriveMap()->GetRoads().size(),
+            open_drive_map->GetRoads().size());
+  EXPECT_EQ(loaded_map_interface.GetOpenDriveMap()->GetLanes().size(),
+            open_drive_map->GetLanes().size());
+  EXPECT_EQ(loaded_map_interface.GetRoadgraph()->GetVertices().size(),
+            map_interface.GetRoadgraph()->GetVertices().size());
+  EXPECT_EQ(loaded_map_interface.GetRoadgraph()->GetEdges().size(),
+            map_interface.GetRoadgraph()->GetEdges().size());
+  EXPECT_TRUE(loaded_map_interface.BoundingBox().first ==
+              map_interface.BoundingBox().first);
+  for (const auto& lane : open_drive_map->GetLanes()) {
+    EXPECT_EQ(loaded_map_interface.GetLane(lane.first)->GetLine(),
+              lane.second->GetLine());
+    EXPECT_EQ(loaded_map_interface.GetSuccessorLanes(lane.first),
+              map_interface.GetSuccessorLanes(lane.first));
+  }
+
+  // queries yield the same lanes
+  Point2d point(1.0, -1.0);
+  XodrLanePtr lane = map_interface.FindXodrLane(point);
+  XodrLanePtr loaded_lane = loaded_map_interface.FindXodrLane(point);
+  ASSERT_TRUE(lane != nullptr);
+  ASSERT_TRUE(loaded_lane != nullptr);
+  EXPECT_EQ(loaded_lane->GetId(), lane->GetId());
+
+  // generated road corridors are restored
+  RoadCorridorPtr road_corridor =
+      map_interface.GetRoadCorridor(road_ids, driving_dir);
+  RoadCorridorPtr loaded_road_corridor =
+      loaded_map_interface.GetRoadCorridor(road_ids, driving_dir);
+  ASSERT_TRUE(loaded_road_corridor != nullptr);
+  EXPECT_EQ(loaded_road_corridor->GetRoads().size(), 2);
+  EXPECT_EQ(loaded_road_corridor->GetRoad(100)->GetNextRoad(),
+            loaded_road_corridor->GetRoad(101));
+  EXPECT_EQ(loaded_road_corridor->GetUniqueLaneCorridors().size(),
+            road_corridor->GetUniqueLaneCorridors().size());
+  EXPECT_EQ(loaded_road_corridor->GetLaneCorridorMap().size(),
+            road_corridor->GetLaneCorridorMap().size());
+  EXPECT_TRUE(loaded_road_corridor->GetPolygon().ToArray() ==
+              road_corridor->GetPolygon().ToArray());
+  for (std::size_t i = 0; i < road_corridor->GetUniqueLaneCorridors().size();
+       ++i) {
+    LaneCorridorPtr lane_corridor =
+        road_corridor->GetUniqueLaneCorridors().at(i);
+    LaneCorridorPtr loaded_lane_corridor =
+        loaded_road_corridor->GetUniqueLaneCorridors().at(i);
+    EXPECT_TRUE(*loaded_lane_corridor == *lane_corridor);
+    EXPECT_TRUE(loaded_lane_corridor->GetMergedPolygon().ToArray() ==
+                lane_corridor->GetMergedPolygon().ToArray());
+    EXPECT_EQ(loaded_lane_corridor->GetLength(), lane_corridor->GetLength());
+  }
+
+  // other files are rejected
+  EXPECT_FALSE(loaded_map_interface.LoadCompiledMap("does_not_exist.bmap"));
+  std::ofstream(filename, std::ios::trunc) << "no compiled map";
+  EXPECT_FALSE(loaded_map_interface.LoadCompiledMap(filename));
+  std::remove(filename.c_str());
+}
+
+TEST(compiled_map_corrupted_sizes, map_interface) {
+  using bark::world::map::MapInterface;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+  using bark::world::tests::MakeXodrMapTwoRoadsOneLane;
+
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(MakeXodrMapTwoRoadsOneLane());
+  map_interface.GenerateRoadCorridor(std::vector<XodrRoadId>{100, 101},
+                                     XodrDrivingDirection::FORWARD);
+  const std::string filename = "compiled_map_corrupted_test.bmap";
+  ASSERT_TRUE(map_interface.SaveCompiledMap(filename));
+  std::string contents;
+  {
+    std::ifstream file(filename, std::ios::binary);
+    contents.assign(std::istreambuf_iterator<char>(file),
+                    std::istreambuf_iterator<char>());
+  }
+
+  // huge sizes at any position are rejected instead of being allocated
+  const uint64_t huge_size = std::numeric_limits<uint64_t>::max() / 2;
+  for (std::size_t offset = 12; offset + sizeof(huge_size) <= contents.size();
+       offset += 4) {
+    std::string corrupted = contents;
+    std::memcpy(&corrupted[offset], &huge_size, sizeof(huge_size));
+    std::ofstream(filename, std::ios::binary | std::ios::trunc) << corrupted;
+    MapInterface loaded_map_interface;
+    EXPECT_NO_THROW(loaded_map_interface.LoadCompiledMap(filename));
+  }
+  std::remove(filename.c_str());
+}
+
+TEST(generate_road_corridors, map_interface) {
+  using bark::world::map::MapInterface;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::map::Route;
+  using bark::world::opendrive::OpenDriveMapPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+  using bark::world::tests::MakeXodrMapTwoRoadsOneLane;
+
+  OpenDriveMapPtr open_drive_map = MakeXodrMapTwoRoadsOneLane();
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(open_drive_map);
+
+  std::vector<Route> routes = map_interface.GetAllRoutes();
+  ASSERT_EQ(routes.size(), 1);
+  EXPECT_EQ(routes[0].first, std::vector<XodrRoadId>({100, 101}));
+  EXPECT_EQ(routes[0].second, XodrDrivingDirection::FORWARD);
+
+  // duplicate and already generated routes are skipped
+  const std::vector<XodrRoadId> single_road_ids{100};
+  routes.push_back(routes[0]);
+  routes.push_back(Route(single_road_ids, XodrDrivingDirection::FORWARD));
+  map_interface.GenerateRoadCorridor(single_road_ids,
+                                     XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr single_road_corridor = map_interface.GetRoadCorridor(
+      single_road_ids, XodrDrivingDirection::FORWARD);
+  ASSERT_TRUE(single_road_corridor != nullptr);
+  map_interface.GenerateRoadCorridors(routes, 4);
+  EXPECT_EQ(map_interface.GetNumRoadCorridors(), 2);
+  EXPECT_EQ(map_interface.GetRoadCorridor(single_road_ids,
+                                          XodrDrivingDirection::FORWARD),
+            single_road_corridor);
+
+  // the parallel generation yields the same road corridor
+  MapInterface serial_map_interface;
+  serial_map_interface.interface_from_opendrive(open_drive_map);
+  serial_map_interface.GenerateRoadCorridor(routes[0].first,
+                                            XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr road_corridor = map_interface.GetRoadCorridor(
+      routes[0].first, XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr serial_road_corridor = serial_map_interface.GetRoadCorridor(
+      routes[0].first, XodrDrivingDirection::FORWARD);
+  ASSERT_TRUE(road_corridor != nullptr);
+  EXPECT_EQ(road_corridor->GetUniqueLaneCorridors().size(),
+            serial_road_corridor->GetUniqueLaneCorridors().size());
+  EXPECT_TRUE(road_corridor->GetPolygon().ToArray() ==
+              serial_road_corridor->GetPolygon().ToArray());
+}
+
+TEST(generate_road_corridors_concurrently, map_interface) {
+  using bark::world::map::MapInterface;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+  using bark::world::tests::MakeXodrMapTwoRoadsOneLane;
+
+  // cached maps are shared by all worlds, that might generate their road
+  // corridors in different threads
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(MakeXodrMapTwoRoadsOneLane());
+  const std::vector<std::vector<XodrRoadId>> road_ids{
+      {100}, {101}, {100, 101}};
+  auto generate = [&]() {
+    for (int i = 0; i < 50; ++i) {
+      for (const auto& ids : road_ids) {
+        map_interface.GenerateRoadCorridor(ids, XodrDrivingDirection::FORWARD);
+        EXPECT_TRUE(map_interface.GetRoadCorridor(
+                        ids, XodrDrivingDirection::FORWARD) != nullptr);
+      }
+      map_interface.GenerateRoadCorridors(map_interface.GetAllRoutes(), 2);
+    }
+  };
+  std::thread first_thread(generate);
+  std::thread second_thread(generate);
+  first_thread.join();
+  second_thread.join();
+  EXPECT_EQ(map_interface.GetNumRoadCorridors(), road_ids.size());
+}
+
+TEST(find_lane, map_interface) {
+  using bark::geometry::Point2d;
+  using bark::world::map::MapInterface;
+  using bark::world::opendrive::OpenDriveMapPtr;
+  using bark::world::opendrive::XodrLaneId;
+  using bark::world::opendrive::XodrLanePtr;
+  using bark::world::tests::MakeXodrMapEndingLaneInParallel;
+
+  OpenDriveMapPtr open_drive_map = MakeXodrMapEndingLaneInParallel();
+
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(open_drive_map);
+  const std::vector<XodrLaneId> lane_ids =
+      map_interface.GetRoadgraph()->GetAllLaneids();
+
+  // the found lane contains the point and no lane is found iff no lane
+  // contains the point
+  const auto bounding_box = map_interface.BoundingBox();
+  const double min_x = bounding_box.first.get<0>() - 5.;
+  const double max_x = bounding_box.second.get<0>() + 5.;
+  const double min_y = bounding_box.first.get<1>() - 5.;
+  const double max_y = bounding_box.second.get<1>() + 5.;
+  int num_points_on_lanes = 0;
+  for (double x = min_x; x < max_x; x += (max_x - min_x) / 37.) {
+    for (double y = min_y; y < max_y; y += (max_y - min_y) / 23.) {
+      const Point2d point(x, y);
+      XodrLanePtr containing_lane;
+      for (const auto& lane_id : lane_ids) {
+        if (map_interface.IsInXodrLane(point, lane_id)) {
+          containing_lane = map_interface.GetLane(lane_id);
+          break;
+        }
+      }
+      XodrLanePtr lane = map_interface.FindXodrLane(point);
+      if (containing_lane) {
+        ++num_points_on_lanes;
+        ASSERT_TRUE(lane);
+        EXPECT_TRUE(map_interface.IsInXodrLane(point, lane->GetId()));
+        // a hint containing the point is returned
+        EXPECT_EQ(map_interface.FindXodrLane(point, containing_lane),
+                  containing_lane);
+      } else {
+        EXPECT_FALSE(lane);
+        EXPECT_FALSE(map_interface.FindXodrLane(point, lane));
+      }
+    }
+  }
+  EXPECT_GT(num_points_on_lanes, 0);
+}
+
+TEST(match_points, map_interface) {
+  using bark::geometry::Point2d;
+  using bark::world::map::MapInterface;
+  using bark::world::map::MapMatchingResult;
+  using bark::world::opendrive::XodrLanePtr;
+  using bark::world::tests::MakeXodrMapEndingLaneInParallel;
+
+  MapInterface map_interface;
+  map_interface.interface_from_opendrive(MakeXodrMapEndingLaneInParallel());
+
+  // a trajectory leaving the map
+  const auto bounding_box = map_interface.BoundingBox();
+  const double y =
+      0.5 * (bounding_box.first.get<1>() + bounding_box.second.get<1>());
+  Eigen::MatrixXd points(40, 2);
+  for (int i = 0; i < points.rows(); ++i) {
+    points(i, 0) = bounding_box.first.get<0>() + 1. +
+                   i * (bounding_box.second.get<0>() + 10. -
+                        bounding_box.first.get<0>()) /
+                       points.rows();
+    points(i, 1) = y;
+  }
+  const MapMatchingResult result = map_interface.MatchPoints(points);
+  ASSERT_EQ(result.lane_ids.size(), points.rows());
+  for (int i = 0; i < points.rows(); ++i) {
+    const Point2d point(points(i, 0), points(i, 1));
+    const XodrLanePtr lane = map_interface.FindXodrLane(point);
+    if (lane) {
+      ASSERT_GE(result.lane_ids(i), 0);
+      EXPECT_TRUE(map_interface.IsInXodrLane(point, result.lane_ids(i)));
+    } else {
+      EXPECT_EQ(result.lane_ids(i), -1);
+    }
+    // no road corridor given
+    EXPECT_EQ(result.lane_corridor_indices(i), -1);
+    EXPECT_TRUE(std::isnan(result.frenet_positions(i, 0)));
+  }
+  EXPECT_GE(result.lane_ids(0), 0);
+  EXPECT_EQ(result.lane_ids(points.rows() - 1), -1);
+  EXPECT_EQ(result.in_lane_corridors.rows(), points.rows());
+  EXPECT_EQ(result.in_lane_corridors.cols(), 0);
+}
@@ -133,6 +133,8 @@ TEST(multiple_lane_widths, open_drive) {
   EXPECT_NEAR(lane_width2.s_start, length1, 0.1);
   EXPECT_NEAR(lane_width2.s_end, length2, 0.1);
   EXPECT_TRUE(length1 < length2);
+  // checked once after all lane widths have been appended
+  EXPECT_TRUE(lane->CheckSelfIntersection());
 }
 
 TEST(road, open_drive) {
@@ -13,13 +13,14 @@ import filecmp
 import matplotlib.pyplot as plt
 from bark.core.world.agent import Agent
 from bark.core.world import World
-from bark.core.geometry import Point2d, Polygon2d
+from bark.core.geometry import Point2d, Polygon2d, Collide
 from bark.core.geometry import Point2d
 from bark.runtime.commons.parameters import ParameterServer
 from bark.core.world.opendrive import OpenDriveMap, MakeXodrMapOneRoadTwoLanes, \
     XodrLaneType, MakeXodrMapCurved, XodrDrivingDirection
 from bark.core.world.map import MapInterface
 from bark.runtime.commons.xodr_parser import XodrParser
+from bark.runtime.commons.compile_map import CompileMap, LoadCompiledMap
 from bark.runtime.viewer.matplotlib_viewer import MPViewer
 import numpy as np
 import os
@@ -116,6 +117,88 @@ class EnvironmentTests(unittest.TestCase):
         self.assertTrue(
             switched_lane, "Eventually should have switched lanes!")
 
+    def test_compiled_map(self):
+        map_file_name = os.path.join(os.path.dirname(
+            __file__), "../../../runtime/tests/data/city_highway_straight.xodr")
+        xodr_parser = XodrParser(map_file_name)
+        map_interface = MapInterface()
+        map_interface.SetOpenDriveMap(xodr_parser.map)
+
+        compiled_map_file_name = CompileMap(
+            map_file_name, "city_highway_straight.bmap",
+            road_corridors=[([16], XodrDrivingDirection.forward)])
+        compiled_map_interface = LoadCompiledMap(compiled_map_file_name)
+
+        self.assertEqual(
+            len(compiled_map_interface.GetOpenDriveMap().GetRoads()),
+            len(map_interface.GetOpenDriveMap().GetRoads()))
+        self.assertEqual(
+            len(compiled_map_interface.GetRoadgraph().GetVertices()),
+            len(map_interface.GetRoadgraph().GetVertices()))
+        point = Point2d(2, -92.55029)
+        self.assertEqual(compiled_map_interface.FindLane(point).lane_id,
+                         map_interface.FindLane(point).lane_id)
+        self.assertIsNotNone(compiled_map_interface.GetRoadCorridor(
+            [16], XodrDrivingDirection.forward))
+        os.remove(compiled_map_file_name)
+
+    def test_precompute_all_routes(self):
+        map_file_name = os.path.join(os.path.dirname(
+            __file__), "../../../runtime/tests/data/4way_intersection.xodr")
+        xodr_parser = XodrParser(map_file_name)
+        map_interface = MapInterface()
+        map_interface.SetOpenDriveMap(xodr_parser.map)
+
+        routes = map_interface.GetAllRoutes()
+        self.assertGreater(len(routes), 0)
+        map_interface.GenerateRoadCorridors(routes, 4)
+        self.assertEqual(map_interface.num_road_corridors, len(routes))
+        for road_ids, driving_direction in routes:
+            self.assertIsNotNone(
+                map_interface.GetRoadCorridor(road_ids, driving_direction))
+
+        compiled_map_file_name = CompileMap(
+            map_file_name, "4way_intersection.bmap", all_routes=True,
+            num_threads=4)
+        compiled_map_interface = LoadCompiledMap(compiled_map_file_name)
+        self.assertEqual(compiled_map_interface.num_road_corridors,
+                         len(routes))
+        os.remove(compiled_map_file_name)
+
+    def test_match_points(self):
+        map_interface = MapInterface()
+        map_interface.SetOpenDriveMap(MakeXodrMapCurved(50, 0.1))
+        roads = [100]
+        driving_direction = XodrDrivingDirection.forward
+        map_interface.GenerateRoadCorridor(roads, driving_direction)
+        road_corridor = map_interface.GetRoadCorridor(roads, driving_direction)
+        lane_corridors = road_corridor.lane_corridors
+
+        # the center lines of the lane corridors and a point off the map
+        points = np.concatenate(
+          [lc.center_line.ToArray()[1:-1] for lc in lane_corridors] + [[[1e5, 1e5]]])
+        result = map_interface.MatchPoints(points, road_corridor)
+        self.assertEqual(result.lane_ids.shape, (len(points),))
+        for point, lane_id in zip(points, result.lane_ids):
+            lane = map_interface.FindLane(Point2d(*point))
+            self.assertEqual(lane_id, lane.lane_id if lane else -1)
+        self.assertEqual(result.lane_ids[-1], -1)
+
+        self.assertEqual(result.in_lane_corridors.shape,
+                         (len(points), len(lane_corridors)))
+        self.assertEqual(result.frenet_positions.shape, (len(points), 2))
+        for point, in_lane_corridors in zip(points, result.in_lane_corridors):
+            self.assertEqual(list(in_lane_corridors),
+                [Collide(lc.polygon, Point2d(*point)) for lc in lane_corridors])
+        self.assertTrue(np.all(result.lane_corridor_indices >= 0))
+        # points on center lines have no lateral offset
+        np.testing.assert_allclose(result.frenet_positions[:-1, 1], 0., atol=1e-6)
+
+        # without road corridor only lanes are matched
+        result = map_interface.MatchPoints(points)
+        self.assertTrue(np.all(result.lane_corridor_indices == -1))
+        self.assertTrue(np.all(np.isnan(result.frenet_positions)))
+
 
 if __name__ == '__main__':
     unittest.main()
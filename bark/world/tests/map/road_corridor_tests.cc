@@ -6,6 +6,9 @@
 // This work is licensed under the terms of the MIT license.
 // For a copy, see <https://opensource.org/licenses/MIT>.
 
+#include <limits>
+#include <stdexcept>
+#include "bark/commons/transformation/frenet.hpp"
 #include "bark/world/map/lane.hpp"
 #include "bark/world/map/map_interface.hpp"
 #include "bark/world/map/road.hpp"
@@ -85,3 +88,177 @@ TEST(road_corridor_tests, xodr_map_ending_lane_in_parallel) {
 
   EXPECT_EQ(road_corridor->GetRoads().size(), 1);
 }
+
+TEST(road_corridor_tests, lane_corridor_index) {
+  using bark::commons::transformation::FrenetPosition;
+  using bark::geometry::Collide;
+  using bark::geometry::Point2d;
+  using bark::world::map::LaneCorridorPtr;
+  using bark::world::map::MapInterface;
+  using bark::world::map::MapInterfacePtr;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::opendrive::OpenDriveMapPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+
+  using bark::world::tests::MakeXodrMapEndingLaneInParallel;
+
+  OpenDriveMapPtr open_drive_map = MakeXodrMapEndingLaneInParallel();
+
+  MapInterfacePtr map_interface = std::make_shared<MapInterface>();
+  map_interface->interface_from_opendrive(open_drive_map);
+
+  std::vector<XodrRoadId> road_ids{100};
+  XodrDrivingDirection driving_dir = XodrDrivingDirection::FORWARD;
+  map_interface->GenerateRoadCorridor(road_ids, driving_dir);
+  RoadCorridorPtr road_corridor =
+      map_interface->GetRoadCorridor(road_ids, driving_dir);
+  const auto& lane_corridors = road_corridor->GetUniqueLaneCorridors();
+  ASSERT_GT(lane_corridors.size(), 1);
+
+  // the indexed queries return the same lane corridors as a linear search
+  const auto bounding_box = map_interface->BoundingBox();
+  const double min_x = bounding_box.first.get<0>() - 5.;
+  const double max_x = bounding_box.second.get<0>() + 5.;
+  const double min_y = bounding_box.first.get<1>() - 5.;
+  const double max_y = bounding_box.second.get<1>() + 5.;
+  for (double x = min_x; x < max_x; x += (max_x - min_x) / 37.) {
+    for (double y = min_y; y < max_y; y += (max_y - min_y) / 23.) {
+      const Point2d pt(x, y);
+      LaneCorridorPtr current_lc, nearest_lc;
+      double min_lat = std::numeric_limits<double>::max();
+      for (const auto& lc : lane_corridors) {
+        if (!current_lc && Collide(lc->GetMergedPolygon(), pt)) {
+          current_lc = lc;
+        }
+        FrenetPosition f(pt, lc->GetCenterLine());
+        if (std::abs(f.lat) < min_lat) {
+          min_lat = std::abs(f.lat);
+          nearest_lc = lc;
+        }
+      }
+      if (current_lc) nearest_lc = current_lc;
+      EXPECT_EQ(road_corridor->GetCurrentLaneCorridor(pt), current_lc);
+      EXPECT_EQ(road_corridor->GetNearestLaneCorridor(pt), nearest_lc);
+
+      // the hint does not change the result
+      for (const auto& lc : lane_corridors) {
+        EXPECT_EQ(road_corridor->GetCurrentLaneCorridor(pt, lc), current_lc);
+        EXPECT_EQ(road_corridor->GetNearestLaneCorridor(pt, lc), nearest_lc);
+      }
+    }
+  }
+}
+
+TEST(road_corridor_tests, lane_corridor_hint_overlapping) {
+  using bark::geometry::GetPointAtS;
+  using bark::geometry::Point2d;
+  using bark::world::map::LaneCorridor;
+  using bark::world::map::LaneCorridorPtr;
+  using bark::world::map::MapInterface;
+  using bark::world::map::MapInterfacePtr;
+  using bark::world::map::RoadCorridor;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::opendrive::OpenDriveMapPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+
+  using bark::world::tests::MakeXodrMapOneRoadTwoLanes;
+
+  OpenDriveMapPtr open_drive_map = MakeXodrMapOneRoadTwoLanes();
+  MapInterfacePtr map_interface = std::make_shared<MapInterface>();
+  map_interface->interface_from_opendrive(open_drive_map);
+  std::vector<XodrRoadId> road_ids{100};
+  XodrDrivingDirection driving_dir = XodrDrivingDirection::FORWARD;
+  map_interface->GenerateRoadCorridor(road_ids, driving_dir);
+  RoadCorridorPtr road_corridor =
+      map_interface->GetRoadCorridor(road_ids, driving_dir);
+  const LaneCorridorPtr lc = road_corridor->GetUniqueLaneCorridors().front();
+
+  // a copy of the lane corridor overlaps it entirely
+  const LaneCorridorPtr overlapping_lc = std::make_shared<LaneCorridor>(*lc);
+  RoadCorridor overlapping_road_corridor;
+  overlapping_road_corridor.SetUniqueLaneCorridors({lc, overlapping_lc});
+
+  const auto& center_line = lc->GetCenterLine();
+  for (double s = 1.; s < center_line.Length(); s += 5.) {
+    const Point2d pt = GetPointAtS(center_line, s);
+    ASSERT_EQ(overlapping_road_corridor.GetCurrentLaneCorridor(pt), lc);
+    // the first lane corridor containing the point is returned, regardless
+    // of the lane corridor of the previous step
+    EXPECT_EQ(overlapping_road_corridor.GetCurrentLaneCorridor(pt, lc), lc);
+    EXPECT_EQ(
+        overlapping_road_corridor.GetCurrentLaneCorridor(pt, overlapping_lc),
+        lc);
+    EXPECT_EQ(
+        overlapping_road_corridor.GetNearestLaneCorridor(pt, overlapping_lc),
+        lc);
+  }
+}
+
+TEST(road_corridor_tests, match_points) {
+  using bark::commons::transformation::FrenetPosition;
+  using bark::geometry::Collide;
+  using bark::geometry::Point2d;
+  using bark::world::map::LaneCorridorMatchingResult;
+  using bark::world::map::MapInterface;
+  using bark::world::map::MapInterfacePtr;
+  using bark::world::map::RoadCorridorPtr;
+  using bark::world::opendrive::XodrDrivingDirection;
+  using bark::world::opendrive::XodrRoadId;
+
+  MapInterfacePtr map_interface = std::make_shared<MapInterface>();
+  map_interface->interface_from_opendrive(
+      bark::world::tests::MakeXodrMapEndingLaneInParallel());
+  std::vector<XodrRoadId> road_ids{100};
+  map_interface->GenerateRoadCorridor(road_ids, XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr road_corridor =
+      map_interface->GetRoadCorridor(road_ids, XodrDrivingDirection::FORWARD);
+  const auto lane_corridors = road_corridor->GetUniqueLaneCorridors();
+
+  const auto bounding_box = map_interface->BoundingBox();
+  std::vector<Point2d> points;
+  for (double x = bounding_box.first.get<0>() - 5.;
+       x < bounding_box.second.get<0>() + 5.; x += 1.) {
+    for (double y = bounding_box.first.get<1>() - 5.;
+         y < bounding_box.second.get<1>() + 5.; y += 1.) {
+      points.push_back(Point2d(x, y));
+    }
+  }
+  Eigen::MatrixXd point_matrix(points.size(), 2);
+  for (std::size_t i = 0; i < points.size(); ++i) {
+    point_matrix(i, 0) = points[i].get<0>();
+    point_matrix(i, 1) = points[i].get<1>();
+  }
+
+  const LaneCorridorMatchingResult result =
+      road_corridor->MatchPoints(point_matrix);
+  ASSERT_EQ(result.in_lane_corridors.rows(), points.size());
+  ASSERT_EQ(result.in_lane_corridors.cols(), lane_corridors.size());
+  for (std::size_t i = 0; i < points.size(); ++i) {
+    for (std::size_t j = 0; j < lane_corridors.size(); ++j) {
+      EXPECT_EQ(result.in_lane_corridors(i, j),
+                Collide(lane_corridors[j]->GetMergedPolygon(), points[i]));
+    }
+    // the Frenet position refers to a containing or else the nearest
+    // lane corridor
+    const int idx = result.lane_corridor_indices(i);
+    ASSERT_GE(idx, 0);
+    const auto current_lc = road_corridor->GetCurrentLaneCorridor(points[i]);
+    if (current_lc) {
+      EXPECT_TRUE(result.in_lane_corridors(i, idx));
+    } else {
+      EXPECT_EQ(lane_corridors[idx],
+                road_corridor->GetNearestLaneCorridor(points[i]));
+    }
+    FrenetPosition f(points[i], lane_corridors[idx]->GetCenterLine());
+    EXPECT_EQ(result.frenet_positions(i, 0), f.lon);
+    EXPECT_EQ(result.frenet_positions(i, 1), f.lat);
+  }
+
+  EXPECT_EQ(road_corridor->MatchPoints(Eigen::MatrixXd(0, 2))
+                .lane_corridor_indices.size(),
+            0);
+  EXPECT_THROW(road_corridor->MatchPoints(Eigen::MatrixXd::Zero(3, 3)),
+               std::invalid_argument);
+}
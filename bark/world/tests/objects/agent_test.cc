@@ -12,6 +12,7 @@
 #include "bark/models/behavior/constant_acceleration/constant_acceleration.hpp"
 #include "bark/models/dynamic/single_track.hpp"
 #include "bark/models/execution/interpolation/interpolate.hpp"
+#include "bark/world/tests/make_test_xodr_map.hpp"
 #include "bark/world/world.hpp"
 #include "gtest/gtest.h"
 
@@ -125,6 +126,92 @@ TEST(agent, PolygonFromState) {
       Equals(shape, poly_out2));  // we expect false as init_state2 is non-zero
 }
 
+TEST(agent, cached_footprint) {
+  auto params = std::make_shared<SetterParams>();
+  Polygon shape(
+      Pose(1.25, 1, 0),
+      std::vector<Point2d>{Point2d(0, 0), Point2d(0, 2), Point2d(4, 2),
+                           Point2d(4, 0), Point2d(0, 0)});
+
+  State state1(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+  state1 << 0.0, 0.0, 0.0, 0.0, 0.0;
+  AgentPtr agent1(new Agent(state1, nullptr, nullptr, nullptr, shape, params));
+  State state2(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+  state2 << 0.0, 10.0, 3.0, 0.0, 0.0;
+  AgentPtr agent2(new Agent(state2, nullptr, nullptr, nullptr, shape, params));
+  EXPECT_TRUE(agent1->HasConvexShape());
+  EXPECT_TRUE(Equals(agent2->GetCurrentPolygon(),
+                     *std::dynamic_pointer_cast<Polygon>(
+                         shape.Transform(Pose(10.0, 3.0, 0.0)))));
+  EXPECT_FALSE(CollideFootprints(*agent1, *agent2));
+
+  // the footprint follows the state
+  state2 << 0.0, 1.0, 0.5, 0.2, 0.0;
+  agent2->SetStateInputHistory(
+      StateActionHistory{StateActionPair(state2, Action(DiscreteAction(0)))});
+  const Polygon expected = *std::dynamic_pointer_cast<Polygon>(
+      shape.Transform(Pose(1.0, 0.5, 0.2)));
+  EXPECT_TRUE(Equals(agent2->GetCurrentPolygon(), expected));
+  EXPECT_TRUE(Equals(agent2->GetPolygonFromState(state1),
+                     agent1->GetCurrentPolygon()));
+  EXPECT_EQ(agent2->GetCurrentBoundingBox().first.get<0>(),
+            expected.BoundingBox().first.get<0>());
+  EXPECT_TRUE(CollideFootprints(*agent1, *agent2));
+}
+
+TEST(agent, lane_corridor) {
+  using bark::world::map::LaneCorridorPtr;
+  using bark::world::map::MapInterface;
+  using bark::world::map::MapInterfacePtr;
+  using bark::world::map::RoadCorridorPtr;
+  MapInterfacePtr map_interface = std::make_shared<MapInterface>();
+  map_interface->interface_from_opendrive(
+      bark::world::tests::MakeXodrMapEndingLaneInParallel());
+  std::vector<XodrRoadId> road_ids{100};
+  map_interface->GenerateRoadCorridor(road_ids, XodrDrivingDirection::FORWARD);
+  RoadCorridorPtr road_corridor =
+      map_interface->GetRoadCorridor(road_ids, XodrDrivingDirection::FORWARD);
+
+  Polygon shape(
+      Pose(1.25, 1, 0),
+      std::vector<Point2d>{Point2d(0, 0), Point2d(0, 2), Point2d(4, 2),
+                           Point2d(4, 0), Point2d(0, 0)});
+  State state(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+  state << 0.0, 0.0, 0.0, 0.0, 0.0;
+  AgentPtr agent(new Agent(state, nullptr, nullptr, nullptr, shape, nullptr));
+  EXPECT_FALSE(agent->GetLaneCorridor());
+  agent->SetRoadCorridor(road_corridor);
+
+  // the lane corridor follows the state of the agent
+  for (const auto& lc : road_corridor->GetUniqueLaneCorridors()) {
+    const Point2d pt = GetPointAtS(lc->GetCenterLine(), 0.5 * lc->GetLength());
+    state << 0.0, bg::get<0>(pt), bg::get<1>(pt), 0.0, 0.0;
+    agent->SetStateInputHistory(
+        StateActionHistory{StateActionPair(state, Action(DiscreteAction(0)))});
+    EXPECT_EQ(agent->GetLaneCorridor(),
+              road_corridor->GetNearestLaneCorridor(pt));
+    EXPECT_TRUE(Collide(agent->GetLaneCorridor()->GetMergedPolygon(), pt));
+  }
+
+  // clones keep the lane corridor until their own state changes
+  const LaneCorridorPtr lane_corridor = agent->GetLaneCorridor();
+  AgentPtr clone = std::dynamic_pointer_cast<Agent>(agent->Clone());
+  EXPECT_EQ(clone->GetLaneCorridor(), lane_corridor);
+  const LaneCorridorPtr first_lane_corridor =
+      road_corridor->GetUniqueLaneCorridors().front();
+  const Point2d first_pt = GetPointAtS(first_lane_corridor->GetCenterLine(),
+                                       0.5 * first_lane_corridor->GetLength());
+  state << 0.0, bg::get<0>(first_pt), bg::get<1>(first_pt), 0.0, 0.0;
+  clone->SetStateInputHistory(
+      StateActionHistory{StateActionPair(state, Action(DiscreteAction(0)))});
+  EXPECT_TRUE(
+      Collide(clone->GetLaneCorridor()->GetMergedPolygon(), first_pt));
+  EXPECT_EQ(agent->GetLaneCorridor(), lane_corridor);
+
+  agent->SetRoadCorridor(nullptr);
+  EXPECT_FALSE(agent->GetLaneCorridor());
+}
+
 TEST(agent, IsValidAtTime) {
   Polygon shape(
       Pose(1.25, 1, 0),
@@ -140,3 +227,49 @@ TEST(agent, IsValidAtTime) {
   EXPECT_EQ(agent1->IsValidAtTime(0.0), false);
   EXPECT_EQ(agent1->IsValidAtTime(0.1), true);
 }
+
+TEST(agent, state_action_buffer) {
+  StateActionBuffer history(3);
+  for (int i = 0; i < 5; ++i) {
+    State state(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+    state << i, i, 0.0, 0.0, 0.0;
+    history.PushBack(state, Action(static_cast<DiscreteAction>(i)));
+  }
+  // the oldest states have been overwritten
+  EXPECT_EQ(history.size(), 3u);
+  EXPECT_EQ(history.capacity(), 3u);
+  const auto states = history.GetStates();
+  EXPECT_EQ(states.rows(), 3);
+  EXPECT_EQ(states.cols(), 5);
+  for (int i = 0; i < 3; ++i) {
+    EXPECT_EQ(states(i, StateDefinition::TIME_POSITION), i + 2);
+    EXPECT_EQ(history.GetState(i)(StateDefinition::X_POSITION), i + 2);
+    EXPECT_EQ(boost::get<DiscreteAction>(history.GetAction(i)),
+              static_cast<DiscreteAction>(i + 2));
+  }
+  EXPECT_EQ(history.GetLastState()(StateDefinition::TIME_POSITION), 4.0);
+
+  const StateActionHistory copied_history = history.ToHistory();
+  EXPECT_EQ(copied_history.size(), 3u);
+  EXPECT_EQ(copied_history.front().first(StateDefinition::TIME_POSITION), 2.0);
+
+  // reducing the capacity keeps the newest states
+  history.SetCapacity(2);
+  EXPECT_EQ(history.size(), 2u);
+  EXPECT_EQ(history.GetState(0)(StateDefinition::TIME_POSITION), 3.0);
+
+  // the history of an agent is bounded by MaxHistoryLength
+  auto params = std::make_shared<SetterParams>();
+  params->SetInt("MaxHistoryLength", 4);
+  Polygon shape(
+      Pose(1.25, 1, 0),
+      std::vector<Point2d>{Point2d(0, 0), Point2d(0, 2), Point2d(4, 2),
+                           Point2d(4, 0), Point2d(0, 0)});
+  State init_state(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+  init_state << 0.0, 0.0, 0.0, 0.0, 0.0;
+  Agent agent(init_state, nullptr, nullptr, nullptr, shape, params);
+  agent.SetStateInputHistory(copied_history);
+  EXPECT_EQ(agent.GetHistory().capacity(), 4u);
+  EXPECT_EQ(agent.GetStateInputHistory().size(), 3u);
+  EXPECT_EQ(agent.GetCurrentState()(StateDefinition::TIME_POSITION), 4.0);
+}
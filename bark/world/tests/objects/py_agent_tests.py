@@ -62,6 +62,30 @@ class AgentTests(unittest.TestCase):
     agent2 = Agent(init_state2, behavior, dynamic, execution, shape2,
                     params.AddChild("agent"))
 
+  def test_history_states(self):
+    params = ParameterServer()
+    params["MaxHistoryLength"] = 3
+    behavior = BehaviorConstantAcceleration(params)
+    execution = ExecutionModelInterpolate(params)
+    dynamic = SingleTrackModel(params)
+    init_state = np.array([0, 3, 2, 1, 5])
+    agent = Agent(init_state, behavior, dynamic, execution, CarLimousine(),
+                  params)
+    history = [(np.array([t, 3, 2, 1, 5]), 0.) for t in range(0, 5)]
+    agent.SetStateInputHistory(history)
+
+    # the history is bounded by MaxHistoryLength
+    self.assertEqual(agent.max_history_length, 3)
+    self.assertEqual(len(agent.history), 3)
+    history_states = agent.history_states
+    self.assertEqual(history_states.shape, (3, 5))
+    np.testing.assert_array_equal(history_states[:, 0], [2, 3, 4])
+    np.testing.assert_array_equal(agent.state, history_states[-1])
+
+    # the states are copied and stay valid when the history changes
+    agent.SetStateInputHistory([(np.array([t, 3, 2, 1, 5]), 0.) for t in range(10, 12)])
+    np.testing.assert_array_equal(history_states[:, 0], [2, 3, 4])
+    np.testing.assert_array_equal(agent.history_states[:, 0], [10, 11])
 
 
 if __name__ == '__main__':
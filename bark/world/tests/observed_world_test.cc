@@ -344,3 +344,59 @@ TEST(observed_world, predict) {
   // + prediction time span
   EXPECT_NEAR(ego_pred_velocity, ego_velocity + 2 * 1.0, 0.05);
 }
+
+TEST(observed_world, predict_rollout) {
+  using bark::world::prediction::PredictionSettings;
+  using bark::world::tests::make_test_observed_world;
+  namespace mg = bark::geometry;
+
+  auto params = std::make_shared<SetterParams>();
+  params->SetReal("integration_time_delta", 0.01);
+  DynamicModelPtr dyn_model(new SingleTrackModel(params));
+  double ego_velocity = 5.0, rel_distance = 7.0, velocity_difference = 0.0;
+  auto observed_world = make_test_observed_world(1, rel_distance, ego_velocity,
+                                                 velocity_difference);
+  for (const auto& agent : observed_world.GetAgents()) {
+    agent.second->SetDynamicModel(dyn_model);
+  }
+  BehaviorModelPtr prediction_model(new BehaviorConstantAcceleration(params));
+  PredictionSettings prediction_settings(prediction_model, prediction_model);
+  observed_world.SetupPrediction(prediction_settings);
+
+  // the rollout visits t = 0 and every step and ends where Predict ends
+  std::vector<double> times;
+  Point2d last_ego_position;
+  observed_world.PredictRollout(
+      0.25, 4, [&](double t, const ObservedWorld& predicted_world) {
+        times.push_back(t);
+        last_ego_position = predicted_world.CurrentEgoPosition();
+        return true;
+      });
+  EXPECT_EQ(times, std::vector<double>({0., 0.25, 0.5, 0.75, 1.0}));
+  ObservedWorldPtr predicted_world = observed_world.Predict(1.0);
+  EXPECT_NEAR(
+      mg::Distance(last_ego_position, predicted_world->CurrentEgoPosition()),
+      0.0, 0.06);
+  // the original world is not modified
+  EXPECT_NEAR(mg::Distance(observed_world.CurrentEgoPosition(),
+                           predicted_world->CurrentEgoPosition()),
+              ego_velocity * 1.0, 0.06);
+
+  // the visitor stops the rollout
+  times.clear();
+  observed_world.PredictRollout(0.25, 4,
+                                [&](double t, const ObservedWorld&) {
+                                  times.push_back(t);
+                                  return t < 0.5;
+                                });
+  EXPECT_EQ(times.size(), 3);
+
+  auto agent_polygons = observed_world.PredictAgentPolygons(0.25, 4);
+  ASSERT_EQ(agent_polygons.size(), 5);
+  EXPECT_EQ(agent_polygons.front().size(), observed_world.GetAgents().size());
+  auto ego_id = observed_world.GetEgoAgentId();
+  EXPECT_NEAR(
+      mg::Distance(agent_polygons.back().at(ego_id).BoundingBox().first,
+                   agent_polygons.front().at(ego_id).BoundingBox().first),
+              ego_velocity * 1.0, 0.06);
+}
@@ -21,7 +21,7 @@ from bark.core.world.agent import Agent
 from bark.core.world.map import MapInterface, Roadgraph
 from bark.core.geometry.standard_shapes import CarLimousine, CarRectangle
 from bark.core.geometry import Point2d, Polygon2d
-from bark.core.world.evaluation import EvaluatorDrivableArea
+from bark.core.world.evaluation import EvaluatorDrivableArea, EvaluatorCollisionAgents
 from bark.core.world.opendrive import OpenDriveMap, XodrRoad, PlanView, \
     MakeXodrMapOneRoadTwoLanes, XodrLaneSection, XodrLane
 
@@ -75,6 +75,44 @@ class WorldTests(unittest.TestCase):
     def test_highway(self):
         world = MakeTestWorldHighway()
 
+    def test_copy_on_write_agents(self):
+        params = ParameterServer()
+        params["World"]["CopyOnWrite"] = True
+        shape = CarRectangle()
+        world = World(params)
+        for agent_idx in range(3):
+            agent = Agent(np.array([0, 10 * agent_idx, 0, 0, 5]),
+                          BehaviorConstantAcceleration(params),
+                          SingleTrackModel(params),
+                          ExecutionModelInterpolate(params), shape,
+                          params.AddChild("agent"))
+            world.AddAgent(agent)
+
+        # reading the agents of a clone does not copy them
+        cloned_world = world.Copy()
+        agent_id = list(world.agents.keys())[0]
+        self.assertEqual(cloned_world.agents[agent_id].first_valid_timestamp, 0.)
+        self.assertEqual(cloned_world.GetAgent(agent_id).id, agent_id)
+
+        # agents modified through a clone do not change the original world
+        for agent in cloned_world.GetMutableAgents().values():
+            agent.first_valid_timestamp = 10.
+        cloned_world.GetMutableAgent(agent_id).first_valid_timestamp = 20.
+        for agent_id, agent in world.agents.items():
+            self.assertEqual(agent.first_valid_timestamp, 0.)
+            self.assertNotEqual(cloned_world.GetAgent(agent_id).first_valid_timestamp, 0.)
+
+    def test_evaluator_collision_agents_args(self):
+        self.assertFalse(EvaluatorCollisionAgents().report_colliding_agents)
+        self.assertTrue(EvaluatorCollisionAgents(True).report_colliding_agents)
+        self.assertTrue(EvaluatorCollisionAgents(
+            report_colliding_agents=True).report_colliding_agents)
+        # agent ids, e.g. passed by the benchmark runner, are no flags
+        with self.assertRaises(TypeError):
+            EvaluatorCollisionAgents(5)
+        with self.assertRaises(TypeError):
+            EvaluatorCollisionAgents(1)
+
     def test_evaluator_drivable_area(self):
         # World Definition
         params = ParameterServer()
@@ -0,0 +1,140 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <vector>
+
+#include "benchmark/benchmark.h"
+
+#include "bark/commons/params/setter_params.hpp"
+#include "bark/world/evaluation/evaluator_collision_agents.hpp"
+#include "bark/world/observed_world.hpp"
+#include "bark/world/tests/make_test_world.hpp"
+#include "bark/world/world_batch.hpp"
+
+using bark::commons::SetterParams;
+using bark::world::evaluation::EvaluatorCollisionAgents;
+using bark::world::ObservedWorld;
+using bark::world::ObservedWorldPtr;
+using bark::world::WorldBatch;
+using bark::world::WorldPtr;
+using bark::world::tests::MakeTestWorldDenseHighway;
+
+// Arguments: number of agents, copy-on-write (0/1)
+static WorldPtr MakeBenchmarkWorld(const benchmark::State& state) {
+  auto params = std::make_shared<SetterParams>();
+  params->SetBool("World::CopyOnWrite", state.range(1) != 0);
+  return MakeTestWorldDenseHighway(state.range(0), params);
+}
+
+static void BM_WorldClone(benchmark::State& state) {
+  WorldPtr world = MakeBenchmarkWorld(state);
+  for (auto _ : state) {
+    WorldPtr cloned_world = world->Clone();
+    benchmark::DoNotOptimize(cloned_world);
+  }
+  state.SetItemsProcessed(state.iterations() * state.range(0));
+}
+BENCHMARK(BM_WorldClone)
+    ->ArgNames({"agents", "cow"})
+    ->ArgsProduct({{10, 50, 150}, {0, 1}});
+
+static void BM_WorldStep(benchmark::State& state) {
+  WorldPtr world = MakeBenchmarkWorld(state);
+  for (auto _ : state) {
+    state.PauseTiming();
+    WorldPtr step_world = world->Clone();
+    state.ResumeTiming();
+    step_world->Step(0.2);
+  }
+}
+BENCHMARK(BM_WorldStep)
+    ->ArgNames({"agents", "cow"})
+    ->ArgsProduct({{10, 50, 150}, {0, 1}});
+
+// Expands a prediction tree with a branching factor of three and a depth of
+// two from the observed world of the first agent; reports expanded nodes
+static void BM_PredictionTreeExpansion(benchmark::State& state) {
+  WorldPtr world = MakeBenchmarkWorld(state);
+  const unsigned int branching_factor = 3, depth = 2;
+  ObservedWorld root(world, world->GetAgents().begin()->first);
+  int64_t expanded_nodes = 0;
+  for (auto _ : state) {
+    std::vector<ObservedWorldPtr> layer{
+        std::make_shared<ObservedWorld>(root)};
+    for (unsigned int d = 0; d < depth; ++d) {
+      std::vector<ObservedWorldPtr> next_layer;
+      for (const auto& node : layer) {
+        for (unsigned int b = 0; b < branching_factor; ++b) {
+          next_layer.push_back(node->Predict(0.2));
+          ++expanded_nodes;
+        }
+      }
+      layer = next_layer;
+    }
+    benchmark::DoNotOptimize(layer);
+  }
+  state.SetItemsProcessed(expanded_nodes);
+}
+BENCHMARK(BM_PredictionTreeExpansion)
+    ->ArgNames({"agents", "cow"})
+    ->ArgsProduct({{10, 50}, {0, 1}});
+
+// Arguments: number of agents, lane occupancy index (0/1)
+static void BM_WorldStepLaneOccupancy(benchmark::State& state) {
+  auto params = std::make_shared<SetterParams>();
+  params->SetBool("World::UseLaneOccupancyIndex", state.range(1) != 0);
+  WorldPtr world = MakeTestWorldDenseHighway(state.range(0), params);
+  for (auto _ : state) {
+    state.PauseTiming();
+    // the clone starts with its own, empty lane occupancy index
+    WorldPtr step_world = world->Clone();
+    state.ResumeTiming();
+    step_world->Step(0.2);
+  }
+}
+BENCHMARK(BM_WorldStepLaneOccupancy)
+    ->ArgNames({"agents", "index"})
+    ->ArgsProduct({{10, 50, 150, 500}, {0, 1}});
+
+// Arguments: number of agents, spacing between agents on a lane
+static void BM_EvaluatorCollisionAgents(benchmark::State& state) {
+  auto params = std::make_shared<SetterParams>();
+  WorldPtr world = MakeTestWorldDenseHighway(state.range(0), params,
+                                             static_cast<double>(state.range(1)));
+  EvaluatorCollisionAgents evaluator;
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(evaluator.Evaluate(*world));
+  }
+  state.SetItemsProcessed(state.iterations() * state.range(0));
+}
+BENCHMARK(BM_EvaluatorCollisionAgents)
+    ->ArgNames({"agents", "spacing"})
+    ->ArgsProduct({{10, 50, 150, 500}, {10}});
+
+// Arguments: number of worlds, number of threads; items are world steps
+static void BM_WorldBatchStep(benchmark::State& state) {
+  auto params = std::make_shared<SetterParams>();
+  std::vector<WorldPtr> worlds;
+  std::vector<bark::world::objects::AgentId> ego_agent_ids;
+  for (int i = 0; i < state.range(0); ++i) {
+    worlds.push_back(MakeTestWorldDenseHighway(20, params));
+    ego_agent_ids.push_back(1);
+  }
+  WorldBatch world_batch(worlds, ego_agent_ids, {},
+                         static_cast<unsigned int>(state.range(1)));
+  for (auto _ : state) {
+    benchmark::DoNotOptimize(world_batch.Step({}, 0.2));
+  }
+  state.SetItemsProcessed(state.iterations() * state.range(0));
+}
+BENCHMARK(BM_WorldBatchStep)
+    ->ArgNames({"worlds", "threads"})
+    ->ArgsProduct({{1, 8, 64}, {1, 8}})
+    ->UseRealTime();
+
+BENCHMARK_MAIN();
@@ -10,11 +10,13 @@
 #include "bark/commons/params/setter_params.hpp"
 #include "bark/geometry/polygon.hpp"
 #include "bark/models/behavior/constant_acceleration/constant_acceleration.hpp"
+#include "bark/models/behavior/dynamic_model/dynamic_model.hpp"
 #include "bark/models/dynamic/single_track.hpp"
 #include "bark/models/execution/interpolation/interpolate.hpp"
 #include "bark/world/evaluation/evaluator_collision_agents.hpp"
 #include "bark/world/evaluation/evaluator_distance_to_goal.hpp"
 #include "bark/world/evaluation/evaluator_drivable_area.hpp"
+#include "bark/world/evaluation/evaluator_step_count.hpp"
 #ifdef RSS
 #include "bark/world/evaluation/rss/evaluator_rss.hpp"
 #endif
@@ -24,6 +26,8 @@
 #include "bark/world/objects/agent.hpp"
 #include "bark/world/opendrive/opendrive.hpp"
 #include "bark/world/tests/make_test_world.hpp"
+#include "bark/world/world_batch.hpp"
+#include "bark/world/world_episode.hpp"
 #include "gtest/gtest.h"
 
 using namespace bark::models::dynamic;
@@ -42,6 +46,7 @@ using namespace bark::world;
 using namespace bark::world::evaluation;
 using namespace bark::world::goal_definition;
 using bark::world::tests::make_test_world;
+using bark::world::tests::MakeTestWorldDenseHighway;
 using bark::geometry::standard_shapes::GenerateGoalRectangle;
 
 TEST(world, world_init) {
@@ -200,6 +205,61 @@ TEST(world, world_no_collision_agent) {
   ASSERT_TRUE(world->Evaluate()["collision_agents"].which());
 }
 
+TEST(world, world_collision_agent_pairs) {
+  using bark::world::evaluation::AgentIdPair;
+
+  auto params = std::make_shared<SetterParams>();
+  ExecutionModelPtr exec_model(new ExecutionModelInterpolate(params));
+  DynamicModelPtr dyn_model(new SingleTrackModel(params));
+  BehaviorModelPtr beh_model(new BehaviorConstantAcceleration(params));
+
+  Polygon polygon(
+      Pose(1.25, 1, 0),
+      std::vector<Point2d>{Point2d(0, 0), Point2d(0, 2), Point2d(4, 2),
+                           Point2d(4, 0), Point2d(0, 0)});
+
+  // agents 1 and 2 as well as agents 3 and 4 overlap
+  WorldPtr world(new World(params));
+  const std::vector<std::pair<double, double>> positions{
+      {0.0, 0.0}, {0.0, 1.0}, {30.0, 0.0}, {32.0, 0.5}, {60.0, 0.0}};
+  for (std::size_t i = 0; i < positions.size(); ++i) {
+    State init_state(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+    init_state << 0.0, positions[i].first, positions[i].second, 0.0, 5.0;
+    AgentPtr agent(new Agent(init_state, beh_model, dyn_model, exec_model,
+                             polygon, params));
+    agent->SetAgentId(i + 1);
+    world->AddAgent(agent);
+  }
+
+  auto col_checker = std::make_shared<EvaluatorCollisionAgents>(true);
+  EXPECT_TRUE(boost::get<bool>(col_checker->Evaluate(*world)));
+  std::vector<AgentIdPair> expected_pairs{{1, 2}, {3, 4}};
+  EXPECT_EQ(col_checker->GetCollidingAgents(), expected_pairs);
+
+  // without reporting, the evaluation stops at the first collision
+  auto col_checker_first = std::make_shared<EvaluatorCollisionAgents>();
+  EXPECT_TRUE(boost::get<bool>(col_checker_first->Evaluate(*world)));
+  EXPECT_EQ(col_checker_first->GetCollidingAgents().size(), 1u);
+
+  world->RemoveAgentById(2);
+  world->RemoveAgentById(4);
+  EXPECT_FALSE(boost::get<bool>(col_checker->Evaluate(*world)));
+  EXPECT_TRUE(col_checker->GetCollidingAgents().empty());
+
+  // states set between steps are not part of the agent r-tree of the world
+  State moved_state(static_cast<int>(StateDefinition::MIN_STATE_SIZE));
+  moved_state << 0.0, 0.5, 0.0, 0.0, 5.0;
+  world->GetMutableAgent(5)->SetStateInputHistory(
+      StateActionHistory{StateActionPair(moved_state, Action(0u))});
+  EXPECT_TRUE(boost::get<bool>(col_checker->Evaluate(*world)));
+  EXPECT_EQ(col_checker->GetCollidingAgents(),
+            std::vector<AgentIdPair>({{1, 5}}));
+
+  // as before, agents that are not valid at the world time do not collide
+  world->GetMutableAgent(5)->SetFirstValidTimestamp(1.0);
+  EXPECT_FALSE(boost::get<bool>(col_checker->Evaluate(*world)));
+}
+
 TEST(world, world_outside_drivable_area) {
   using bark::world::goal_definition::GoalDefinitionPolygon;
 
@@ -440,3 +500,320 @@ TEST(world, agents_intersection_polygon) {
   EXPECT_EQ(agents_intersect3[agent3->GetAgentId()]->GetCurrentState(),
             init_state3);
 }
+
+TEST(world, plan_agents_in_parallel) {
+  WorldPtr test_world = make_test_world(2, 5.0, 10.0, 2.0);
+
+  auto params_serial = std::make_shared<SetterParams>();
+  auto params_parallel = std::make_shared<SetterParams>();
+  params_parallel->SetBool("World::PlanAgentsInParallel", true);
+  params_parallel->SetInt("World::NumPlanningThreads", 3);
+
+  WorldPtr world_serial(new World(params_serial));
+  WorldPtr world_parallel(new World(params_parallel));
+  EXPECT_FALSE(world_serial->GetPlanAgentsInParallel());
+  EXPECT_TRUE(world_parallel->GetPlanAgentsInParallel());
+  for (const auto& world : {world_serial, world_parallel}) {
+    world->SetMap(test_world->GetMap());
+    for (const auto& agent : test_world->Clone()->GetAgents()) {
+      world->AddAgent(agent.second);
+    }
+  }
+
+  for (int i = 0; i < 20; ++i) {
+    world_serial->Step(0.2);
+    world_parallel->Step(0.2);
+    ASSERT_EQ(world_serial->GetAgents().size(),
+              world_parallel->GetAgents().size());
+    for (const auto& agent : world_serial->GetAgents()) {
+      const auto& agent_parallel = world_parallel->GetAgent(agent.first);
+      ASSERT_TRUE(agent_parallel);
+      EXPECT_EQ(agent.second->GetCurrentState(),
+                agent_parallel->GetCurrentState());
+      EXPECT_EQ(agent.second->GetExecutionTrajectory(),
+                agent_parallel->GetExecutionTrajectory());
+    }
+  }
+}
+
+TEST(world, copy_on_write_clone) {
+  auto params = std::make_shared<SetterParams>();
+  params->SetBool("World::CopyOnWrite", true);
+  WorldPtr world = MakeTestWorldDenseHighway(6, params);
+  ASSERT_TRUE(world->GetCopyOnWrite());
+
+  // agents are shared after cloning
+  WorldPtr cloned_world = world->Clone();
+  for (const auto& agent : world->GetAgents()) {
+    EXPECT_EQ(agent.second, cloned_world->GetAgent(agent.first));
+  }
+
+  // and copied once they are modified
+  const AgentId agent_id = world->GetAgents().begin()->first;
+  const State state_before = world->GetAgent(agent_id)->GetCurrentState();
+  cloned_world->Step(0.2);
+  EXPECT_NE(world->GetAgent(agent_id), cloned_world->GetAgent(agent_id));
+  EXPECT_EQ(world->GetAgent(agent_id)->GetCurrentState(), state_before);
+  EXPECT_NE(cloned_world->GetAgent(agent_id)->GetCurrentState(),
+            state_before);
+  EXPECT_NE(world->GetAgent(agent_id)->GetBehaviorModel(),
+            cloned_world->GetAgent(agent_id)->GetBehaviorModel());
+  EXPECT_EQ(world->GetAgent(agent_id)->GetDynamicModel(),
+            cloned_world->GetAgent(agent_id)->GetDynamicModel());
+
+  // mutable access detaches a shared agent
+  WorldPtr cloned_world2 = world->Clone();
+  AgentPtr mutable_agent = cloned_world2->GetMutableAgent(agent_id);
+  EXPECT_NE(mutable_agent, world->GetAgent(agent_id));
+  EXPECT_EQ(mutable_agent, cloned_world2->GetAgent(agent_id));
+
+  // as do the mutable agents, modifying them does not affect other worlds
+  WorldPtr cloned_world3 = world->Clone();
+  for (const auto& agent : cloned_world3->GetMutableAgents()) {
+    EXPECT_NE(agent.second, world->GetAgent(agent.first));
+    agent.second->SetFirstValidTimestamp(100.0);
+  }
+  for (const auto& agent : world->GetAgents()) {
+    EXPECT_TRUE(agent.second->IsValidAtTime(0.0));
+  }
+}
+
+TEST(world, copy_on_write_equals_deep_clone) {
+  auto params_deep = std::make_shared<SetterParams>();
+  auto params_cow = std::make_shared<SetterParams>();
+  params_cow->SetBool("World::CopyOnWrite", true);
+  WorldPtr world_deep = MakeTestWorldDenseHighway(10, params_deep);
+  WorldPtr world_cow = MakeTestWorldDenseHighway(10, params_cow);
+
+  for (int i = 0; i < 10; ++i) {
+    world_deep = world_deep->Clone();
+    world_cow = world_cow->Clone();
+    world_deep->Step(0.2);
+    world_cow->Step(0.2);
+    for (const auto& agent : world_deep->GetAgents()) {
+      EXPECT_EQ(agent.second->GetCurrentState(),
+                world_cow->GetAgent(agent.first)->GetCurrentState());
+    }
+  }
+}
+
+TEST(world, bulk_export) {
+  auto params = std::make_shared<SetterParams>();
+  WorldPtr world = MakeTestWorldDenseHighway(4, params);
+  world->Step(0.2);
+  world->Step(0.2);
+
+  const auto agent_ids = world->GetAgentIds();
+  ASSERT_EQ(agent_ids.size(), world->GetAgents().size());
+  const auto states = world->GetAgentStates();
+  const auto polygons = world->GetAgentPolygons();
+  ASSERT_EQ(states.rows(), agent_ids.size());
+  ASSERT_GT(agent_ids.size(), 0);
+  const auto num_points = polygons.rows() / agent_ids.size();
+  for (std::size_t i = 0; i < agent_ids.size(); ++i) {
+    const auto agent = world->GetAgent(agent_ids[i]);
+    const State state = agent->GetCurrentState();
+    EXPECT_EQ(State(states.row(i).transpose()), state);
+    const auto outer = agent->GetPolygonFromState(state).obj_.outer();
+    for (std::size_t j = 0; j < outer.size(); ++j) {
+      EXPECT_EQ(polygons(i * num_points + j, 0), boost::geometry::get<0>(outer[j]));
+      EXPECT_EQ(polygons(i * num_points + j, 1), boost::geometry::get<1>(outer[j]));
+    }
+  }
+
+  // selected agents keep the order of the ids, unknown ids are NaN
+  const AgentId unknown_id = 10000;
+  const auto selected_states =
+      world->GetAgentStates({agent_ids.back(), unknown_id});
+  ASSERT_EQ(selected_states.rows(), 2);
+  EXPECT_EQ(State(selected_states.row(0).transpose()),
+            world->GetAgent(agent_ids.back())->GetCurrentState());
+  EXPECT_TRUE(selected_states.row(1).array().isNaN().all());
+
+  // validity flags and last actions without detaching the agents
+  const auto validity = world->GetAgentValidity({agent_ids.back(), unknown_id});
+  EXPECT_EQ(validity, std::vector<bool>({true, false}));
+  world->GetAgent(agent_ids.back())->SetFirstValidTimestamp(1.0);
+  EXPECT_FALSE(world->GetAgentValidity({agent_ids.back()}).front());
+  const auto actions = world->GetAgentLastActions();
+  ASSERT_EQ(actions.size(), agent_ids.size());
+  for (std::size_t i = 0; i < agent_ids.size(); ++i) {
+    EXPECT_TRUE(actions[i] ==
+                world->GetAgent(agent_ids[i])->GetBehaviorModel()->GetLastAction());
+  }
+
+  // histories are padded at the front
+  const unsigned int window = 5;
+  const auto histories = world->GetAgentHistories(window, {agent_ids.front()});
+  const auto history =
+      world->GetAgent(agent_ids.front())->GetStateInputHistory();
+  ASSERT_EQ(histories.rows(), window);
+  ASSERT_LT(history.size(), window);
+  const std::size_t num_padded = window - history.size();
+  for (std::size_t j = 0; j < window; ++j) {
+    if (j < num_padded) {
+      EXPECT_TRUE(histories.row(j).array().isNaN().all());
+    } else {
+      EXPECT_EQ(State(histories.row(j).transpose()),
+                history[j - num_padded].first);
+    }
+  }
+}
+
+TEST(world, lane_occupancy_index) {
+  auto params = std::make_shared<SetterParams>();
+  WorldPtr world = MakeTestWorldDenseHighway(20, params, 10.0);
+  WorldPtr world_no_index = world->Clone();
+  world_no_index->SetUseLaneOccupancyIndex(false);
+  ASSERT_TRUE(world->GetUseLaneOccupancyIndex());
+
+  for (const auto& agent : world->GetAgents()) {
+    const auto lane_corridor =
+        agent.second->GetRoadCorridor()->GetCurrentLaneCorridor(
+            agent.second->GetCurrentPosition());
+    ASSERT_TRUE(lane_corridor);
+    const auto fr_agents =
+        world->GetAgentFrontRearForId(agent.first, lane_corridor);
+    const auto fr_agents_no_index =
+        world_no_index->GetAgentFrontRearForId(agent.first, lane_corridor);
+    for (const auto& pair :
+         {std::make_pair(fr_agents.front, fr_agents_no_index.front),
+          std::make_pair(fr_agents.rear, fr_agents_no_index.rear)}) {
+      ASSERT_EQ(static_cast<bool>(pair.first.first),
+                static_cast<bool>(pair.second.first));
+      if (pair.first.first) {
+        EXPECT_EQ(pair.first.first->GetAgentId(),
+                  pair.second.first->GetAgentId());
+      }
+      EXPECT_DOUBLE_EQ(pair.first.second.lon, pair.second.second.lon);
+      EXPECT_DOUBLE_EQ(pair.first.second.lat, pair.second.second.lat);
+    }
+
+    // the occupancy is shared by all queries on the same world state
+    EXPECT_EQ(world->GetLaneOccupancy(lane_corridor),
+              world->GetLaneOccupancy(lane_corridor));
+    const auto& lane_agents = world->GetLaneOccupancy(lane_corridor)->GetAgents();
+    ASSERT_EQ(lane_agents.size(), 10);
+
+    // agents on the lane have a spacing of 10m
+    const auto nearest_agents =
+        world->GetNearestAgentsInLane(agent.first, lane_corridor, 3);
+    ASSERT_EQ(nearest_agents.size(), 3);
+    for (std::size_t i = 1; i < nearest_agents.size(); ++i) {
+      EXPECT_LE(std::abs(nearest_agents[i - 1].second.lon),
+                std::abs(nearest_agents[i].second.lon));
+    }
+    EXPECT_NEAR(std::abs(nearest_agents[0].second.lon), 10.0, 0.1);
+    for (const auto& nearest_agent : nearest_agents) {
+      EXPECT_NE(nearest_agent.first->GetAgentId(), agent.first);
+    }
+  }
+
+  const auto lane_corridor =
+      world->GetAgent(1)->GetRoadCorridor()->GetCurrentLaneCorridor(
+          world->GetAgent(1)->GetCurrentPosition());
+  const auto lane_agents = world->GetLaneOccupancy(lane_corridor)->GetAgents();
+  const double lon_min = lane_agents[2].second.lon;
+  const double lon_max = lane_agents[5].second.lon;
+  const auto interval_agents =
+      world->GetAgentsInLaneInterval(lane_corridor, lon_min, lon_max);
+  ASSERT_EQ(interval_agents.size(), 4);
+  EXPECT_EQ(interval_agents.front().first, lane_agents[2].first);
+  EXPECT_EQ(interval_agents.back().first, lane_agents[5].first);
+
+  // clones have their own index, also if they share the agents
+  const auto lane_occupancy = world->GetLaneOccupancy(lane_corridor);
+  world->SetCopyOnWrite(true);
+  WorldPtr cloned_world = world->Clone();
+  EXPECT_NE(cloned_world->GetLaneOccupancy(lane_corridor), lane_occupancy);
+  EXPECT_EQ(world->GetLaneOccupancy(lane_corridor), lane_occupancy);
+
+  // stepping the world invalidates the occupancy
+  world->Step(0.2);
+  EXPECT_NE(world->GetLaneOccupancy(lane_corridor), lane_occupancy);
+}
+
+TEST(world_batch, step) {
+  auto params = std::make_shared<SetterParams>();
+  std::vector<WorldPtr> worlds;
+  for (int i = 0; i < 3; ++i) {
+    WorldPtr world = MakeTestWorldDenseHighway(4, params);
+    world->GetAgent(1)->SetBehaviorModel(
+        std::make_shared<BehaviorDynamicModel>(params));
+    world->AddEvaluator("collision",
+                        std::make_shared<EvaluatorCollisionAgents>());
+    worlds.push_back(world);
+  }
+  WorldBatch world_batch(worlds, {1, 1, 1}, {"collision"}, 2);
+  ASSERT_EQ(world_batch.GetEvaluatorNames(),
+            std::vector<std::string>{"collision"});
+
+  // accelerate, keep and decelerate
+  std::vector<Action> ego_actions;
+  for (double acc : {2.0, 0.0, -2.0}) {
+    Input input(2);
+    input << acc, 0.0;
+    ego_actions.push_back(input);
+  }
+  const double initial_velocity =
+      worlds[0]->GetAgent(1)->GetCurrentState()(StateDefinition::VEL_POSITION);
+  const auto result = world_batch.Step(ego_actions, 0.2);
+  ASSERT_EQ(result.observations.rows(), 3);
+  ASSERT_EQ(result.evaluations.rows(), 3);
+  ASSERT_EQ(result.evaluations.cols(), 1);
+  const auto vel = result.observations.col(StateDefinition::VEL_POSITION);
+  EXPECT_GT(vel(0), initial_velocity + 0.1);
+  EXPECT_NEAR(vel(1), initial_velocity, 1e-6);
+  EXPECT_LT(vel(2), initial_velocity - 0.1);
+  for (std::size_t idx = 0; idx < 3; ++idx) {
+    EXPECT_EQ(State(result.observations.row(idx).transpose()),
+              worlds[idx]->GetAgent(1)->GetCurrentState());
+    EXPECT_EQ(result.evaluations(idx, 0), 0.0);
+    EXPECT_FALSE(result.done(idx));
+  }
+
+  // worlds without ego agent are done and not stepped anymore
+  worlds[1]->RemoveAgentById(1);
+  const auto result_removed = world_batch.Step(ego_actions, 0.2);
+  EXPECT_TRUE(result_removed.done(1));
+  EXPECT_TRUE(result_removed.observations.row(1).array().isNaN().all());
+  const double world_time = worlds[1]->GetWorldTime();
+  world_batch.Step(ego_actions, 0.2);
+  EXPECT_EQ(worlds[1]->GetWorldTime(), world_time);
+  EXPECT_NEAR(worlds[0]->GetWorldTime(), 0.6, 1e-9);
+
+  world_batch.SetWorld(1, worlds[0]->Clone(), 1);
+  EXPECT_FALSE(world_batch.GetDone()(1));
+}
+
+TEST(world_episode, run_episode) {
+  auto params = std::make_shared<SetterParams>();
+  WorldPtr world = MakeTestWorldDenseHighway(4, params);
+  world->AddEvaluator("collision",
+                      std::make_shared<EvaluatorCollisionAgents>());
+  world->AddEvaluator("step_count", std::make_shared<EvaluatorStepCount>());
+  std::vector<TerminalCondition> conditions{
+      TerminalCondition("collision"),
+      TerminalCondition("step_count", GREATER, 2)};
+  auto result = RunEpisode(world, conditions, 0.2);
+  EXPECT_FALSE(result.exception_raised);
+  EXPECT_EQ(result.num_steps, 2);
+  EXPECT_EQ(result.terminal_reasons, std::vector<std::string>{"step_count"});
+  EXPECT_EQ(boost::get<int>(result.evaluation.at("step_count")), 3);
+  EXPECT_NEAR(world->GetWorldTime(), 0.4, 1e-9);
+
+  // episodes end after max_steps and if an evaluator is missing
+  result = RunEpisode(world, {TerminalCondition("collision")}, 0.2, 3);
+  EXPECT_EQ(result.num_steps, 3);
+  EXPECT_TRUE(result.terminal_reasons.empty());
+  result = RunEpisode(world, {TerminalCondition("unknown")}, 0.2);
+  EXPECT_TRUE(result.exception_raised);
+  EXPECT_TRUE(result.evaluation.empty());
+
+  // undecided and string results never terminate an episode
+  EXPECT_TRUE(TerminalCondition("x", IS_FALSE).IsTerminal(false));
+  EXPECT_FALSE(TerminalCondition("x").IsTerminal(std::optional<bool>()));
+  EXPECT_TRUE(TerminalCondition("x", LESS_EQUAL, 1.5).IsTerminal(1.5));
+  EXPECT_FALSE(
+      TerminalCondition("x", EQUAL, 1.0).IsTerminal(std::string("1")));
+}
@@ -6,7 +6,9 @@
 // This work is licensed under the terms of the MIT license.
 // For a copy, see <https://opensource.org/licenses/MIT>.
 
+#include <algorithm>
 #include <csignal>
+#include <limits>
 #include <string>
 
 #include "bark/commons/util/segfault_handler.hpp"
@@ -30,7 +32,27 @@ World::World(const commons::ParamsPtr& params)
           false)),
       frac_lateral_offset_(params->GetReal("World::FracLateralOffset",
           "Fraction of lateral offset for FrontRearAgent Calculation, should be larger than 0.",
-          0.5)) {
+          0.5)),
+      plan_agents_in_parallel_(params->GetBool(
+          "World::PlanAgentsInParallel",
+          "Whether the agents are planned in parallel; requires thread-safe "
+          "C++ behavior models.",
+          false)),
+      num_planning_threads_(params->GetInt(
+          "World::NumPlanningThreads",
+          "Number of threads used if the agents are planned in parallel.",
+          4)),
+      copy_on_write_(params->GetBool(
+          "World::CopyOnWrite",
+          "Whether cloned worlds share agents until these are modified.",
+          false)),
+      use_lane_occupancy_index_(params->GetBool(
+          "World::UseLaneOccupancyIndex",
+          "Whether the agents on a lane corridor are sorted once per world "
+          "state for front, rear and in-lane queries.",
+          true)),
+      lane_occupancy_index_(std::make_shared<LaneOccupancyIndex>()),
+      thread_pool_() {
   //! segfault handler
   std::signal(SIGSEGV, bark::commons::SegfaultHandler);
 }
@@ -44,11 +66,34 @@ World::World(const std::shared_ptr<World>& world)
       world_time_(world->GetWorldTime()),
       remove_agents_(world->GetRemoveAgents()),
       frac_lateral_offset_(world->GetFracLateralOffset()),
+      plan_agents_in_parallel_(world->plan_agents_in_parallel_),
+      num_planning_threads_(world->num_planning_threads_),
+      copy_on_write_(world->copy_on_write_),
+      use_lane_occupancy_index_(world->use_lane_occupancy_index_),
+      lane_occupancy_index_(world->lane_occupancy_index_),
+      thread_pool_(world->thread_pool_),
       rtree_agents_(world->rtree_agents_) {
   //! segfault handler
   std::signal(SIGSEGV, bark::commons::SegfaultHandler);
 }
 
+World::World(const World& world)
+    : commons::BaseType(world),
+      map_(world.map_),
+      agents_(world.agents_),
+      objects_(world.objects_),
+      evaluators_(world.evaluators_),
+      world_time_(world.world_time_),
+      rtree_agents_(world.rtree_agents_),
+      remove_agents_(world.remove_agents_),
+      frac_lateral_offset_(world.frac_lateral_offset_),
+      plan_agents_in_parallel_(world.plan_agents_in_parallel_),
+      num_planning_threads_(world.num_planning_threads_),
+      copy_on_write_(world.copy_on_write_),
+      use_lane_occupancy_index_(world.use_lane_occupancy_index_),
+      lane_occupancy_index_(std::make_shared<LaneOccupancyIndex>()),
+      thread_pool_(world.thread_pool_) {}
+
 void World::Step(const double& delta_time) {
   PlanAgents(delta_time);
   Execute(delta_time);
@@ -58,12 +103,33 @@ void World::PlanAgents(const double& delta_time) {
   UpdateAgentRTree();
   WorldPtr current_world(this->Clone());
   const double inc_world_time = world_time_ + delta_time;
-  for (auto agent : agents_) {
+
+  std::vector<AgentPtr> agents_to_plan;
+  agents_to_plan.reserve(agents_.size());
+  for (auto& agent : agents_) {
     if (agent.second->IsValidAtTime(world_time_)) {
-      ObservedWorld observed_world(current_world, agent.first);
-      agent.second->PlanBehavior(delta_time, observed_world);
-      if (agent.second->GetBehaviorStatus() == BehaviorStatus::VALID)
-        agent.second->PlanExecution(inc_world_time);
+      agents_to_plan.push_back(MakeAgentUnique(agent.second));
+    }
+  }
+
+  // every agent only reads the shared snapshot and writes its own models
+  auto plan_agent = [&](std::size_t idx) {
+    const AgentPtr& agent = agents_to_plan[idx];
+    ObservedWorld observed_world(current_world, agent->GetAgentId());
+    agent->PlanBehavior(delta_time, observed_world);
+    if (agent->GetBehaviorStatus() == BehaviorStatus::VALID)
+      agent->PlanExecution(inc_world_time);
+  };
+
+  if (plan_agents_in_parallel_ && agents_to_plan.size() > 1) {
+    if (!thread_pool_) {
+      thread_pool_ = std::make_shared<commons::ThreadPool>(
+          static_cast<unsigned int>(std::max(1, num_planning_threads_)));
+    }
+    thread_pool_->ParallelFor(agents_to_plan.size(), plan_agent);
+  } else {
+    for (std::size_t idx = 0; idx < agents_to_plan.size(); ++idx) {
+      plan_agent(idx);
     }
   }
 }
@@ -71,11 +137,11 @@ void World::PlanAgents(const double& delta_time) {
 void World::Execute(const double& delta_time) {
   const double inc_world_time = world_time_ + delta_time;
   using models::dynamic::StateDefinition::TIME_POSITION;
-  for (auto agent : agents_) {
+  for (auto& agent : agents_) {
     if (agent.second->IsValidAtTime(inc_world_time) &&
         agent.second->GetBehaviorStatus() == BehaviorStatus::VALID &&
         agent.second->GetExecutionStatus() == ExecutionStatus::VALID) {
-      agent.second->UpdateStateAction();
+      MakeAgentUnique(agent.second)->UpdateStateAction();
       // make sure all agents have the same world time
       // otherwise the simulation is not correct
       const auto& agent_state = agent.second->GetCurrentState();
@@ -83,20 +149,58 @@ void World::Execute(const double& delta_time) {
     }
   }
   RemoveInvalidAgents();
+  ResetLaneOccupancyIndex();
 
   world_time_ = inc_world_time;
 }
 
 WorldPtr World::GetWorldAtTime(const double& world_time) const {
   WorldPtr current_world_state(this->Clone());
-  for (auto agent : current_world_state->GetAgents()) {
-    if (agent.second->GetBehaviorStatus() == BehaviorStatus::VALID)
-      agent.second->PlanExecution(world_time);
-    agent.second->UpdateStateAction();
+  for (auto& agent : current_world_state->agents_) {
+    const AgentPtr& unique_agent =
+        current_world_state->MakeAgentUnique(agent.second);
+    if (unique_agent->GetBehaviorStatus() == BehaviorStatus::VALID)
+      unique_agent->PlanExecution(world_time);
+    unique_agent->UpdateStateAction();
   }
+  current_world_state->UpdateAgentRTree();
   return current_world_state;
 }
 
+AgentPtr World::GetMutableAgent(const AgentId& agent_id) {
+  auto agent_it = agents_.find(agent_id);
+  if (agent_it == agents_.end()) {
+    return AgentPtr(nullptr);
+  }
+  ResetLaneOccupancyIndex();
+  return MakeAgentUnique(agent_it->second);
+}
+
+AgentMap World::GetMutableAgents() {
+  ResetLaneOccupancyIndex();
+  for (auto& agent : agents_) {
+    MakeAgentUnique(agent.second);
+  }
+  return agents_;
+}
+
+AgentPtr& World::MakeAgentUnique(AgentPtr& agent) {
+  // the agent is shared with another world if further references exist
+  if (!copy_on_write_ || agent.use_count() == 1) {
+    return agent;
+  }
+  // dynamic models are not modified during the simulation and stay shared
+  AgentPtr unique_agent = std::make_shared<Agent>(*agent);
+  if (agent->behavior_model_) {
+    unique_agent->behavior_model_ = agent->behavior_model_->Clone();
+  }
+  if (agent->execution_model_) {
+    unique_agent->execution_model_ = agent->execution_model_->Clone();
+  }
+  agent = unique_agent;
+  return agent;
+}
+
 AgentMap World::GetValidAgents() const {
   AgentMap agents_valid(agents_);
   AgentMap::iterator it;
@@ -113,7 +217,16 @@ AgentMap World::GetValidAgents() const {
 }
 
 void World::AddAgent(const objects::AgentPtr& agent) {
+  const bool replaces_agent = agents_.count(agent->agent_id_) > 0;
   agents_[agent->agent_id_] = agent;
+  // keep the r-tree valid for agents added between steps
+  if (replaces_agent) {
+    UpdateAgentRTree();
+  } else {
+    rtree_agents_.insert(
+        std::make_pair(GetAgentBoundingBox(agent), agent->agent_id_));
+    ResetLaneOccupancyIndex();
+  }
 }
 
 void World::AddObject(const objects::ObjectPtr& object) {
@@ -149,16 +262,20 @@ std::vector<ObservedWorld> World::Observe(
   return observed_worlds;
 }
 
+rtree_agent_model World::GetAgentBoundingBox(const AgentPtr& agent) {
+  const auto& bounding_box = agent->GetCurrentBoundingBox();
+  return rtree_agent_model(bounding_box.first, bounding_box.second);
+}
+
 void World::UpdateAgentRTree() {
-  rtree_agents_.clear();
+  std::vector<rtree_agent_value> values;
+  values.reserve(agents_.size());
   for (auto& agent : agents_) {
-    auto obj =
-        agent.second->GetPolygonFromState(agent.second->GetCurrentState()).obj_;
-    rtree_agent_model box;
-    boost::geometry::envelope(obj, box);
-    boost::geometry::correct(box);
-    rtree_agents_.insert(std::make_pair(box, agent.first));
+    values.emplace_back(GetAgentBoundingBox(agent.second), agent.first);
   }
+  // packing construction of the r-tree
+  rtree_agents_ = AgentRTree(values.begin(), values.end());
+  ResetLaneOccupancyIndex();
 }
 
 void World::RemoveInvalidAgents() {
@@ -211,8 +328,7 @@ AgentMap World::GetAgentsIntersectingPolygon(
   AgentMap intersecting_agents;
   for (auto& result_pair : query_results) {
     auto agent = GetAgent(result_pair.second);
-    if (bark::geometry::Collide(
-            agent->GetPolygonFromState(agent->GetCurrentState()), polygon) &&
+    if (bark::geometry::Collide(agent->GetCurrentPolygon(), polygon) &&
         agent->GetBehaviorStatus() == BehaviorStatus::VALID &&
         agent->IsValidAtTime(world_time_)) {
       intersecting_agents[result_pair.second] = agent;
@@ -221,73 +337,188 @@ AgentMap World::GetAgentsIntersectingPolygon(
   return intersecting_agents;
 }
 
-FrontRearAgents World::GetAgentFrontRearForId(
-    const AgentId& agent_id, const LaneCorridorPtr& lane_corridor) const {
-  using bark::geometry::Line;
-  using bark::geometry::Polygon;
-
-  FrontRearAgents fr_agents;
-  Point2d ego_position = World::GetAgent(agent_id)->GetCurrentPosition();
-
-  const Polygon& corridor_polygon = lane_corridor->GetMergedPolygon();
-  const Line& center_line = lane_corridor->GetCenterLine();
-  AgentMap intersecting_agents = GetAgentsIntersectingPolygon(corridor_polygon);
-  if (intersecting_agents.size() == 0) {
-    fr_agents.front = std::make_pair(AgentPtr(nullptr), FrenetPosition(0, 0));
-    fr_agents.rear = fr_agents.front;
-    return fr_agents;
+std::vector<AgentId> World::GetAgentIds() const {
+  std::vector<AgentId> agent_ids;
+  agent_ids.reserve(agents_.size());
+  for (const auto& agent : agents_) {
+    agent_ids.push_back(agent.first);
+  }
+  return agent_ids;
+}
+
+namespace {
+std::vector<AgentPtr> SelectAgents(const AgentMap& agents,
+                                   const std::vector<AgentId>& agent_ids) {
+  std::vector<AgentPtr> selected_agents;
+  if (agent_ids.empty()) {
+    selected_agents.reserve(agents.size());
+    for (const auto& agent : agents) {
+      selected_agents.push_back(agent.second);
+    }
+    return selected_agents;
+  }
+  selected_agents.reserve(agent_ids.size());
+  for (const auto& agent_id : agent_ids) {
+    auto agent_it = agents.find(agent_id);
+    selected_agents.push_back(agent_it != agents.end() ? agent_it->second
+                                                       : AgentPtr(nullptr));
+  }
+  return selected_agents;
+}
+}  // namespace
+
+RowMajorMatrix World::GetAgentStates(
+    const std::vector<AgentId>& agent_ids) const {
+  const auto agents = SelectAgents(agents_, agent_ids);
+  Eigen::Index state_dim = 0;
+  for (const auto& agent : agents) {
+    if (agent && !agent->history_.empty()) {
+      state_dim = std::max(state_dim, agent->history_.GetStateDim());
+    }
   }
+  RowMajorMatrix states = RowMajorMatrix::Constant(
+      agents.size(), state_dim, std::numeric_limits<double>::quiet_NaN());
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    if (agents[i] && !agents[i]->history_.empty()) {
+      const auto state = agents[i]->history_.GetLastState();
+      states.row(i).head(state.size()) = state.transpose();
+    }
+  }
+  return states;
+}
 
-  FrenetPosition frenet_ego(ego_position, center_line);
-  const double numeric_max = std::numeric_limits<double>::max();
+RowMajorMatrix World::GetAgentPolygons(
+    const std::vector<AgentId>& agent_ids) const {
+  const auto agents = SelectAgents(agents_, agent_ids);
+  std::vector<bark::geometry::Polygon> polygons(agents.size());
+  Eigen::Index num_points = 0;
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    if (agents[i] && !agents[i]->history_.empty()) {
+      polygons[i] = agents[i]->GetCurrentPolygon();
+      num_points = std::max(
+          num_points,
+          static_cast<Eigen::Index>(polygons[i].obj_.outer().size()));
+    }
+  }
+  RowMajorMatrix points =
+      RowMajorMatrix::Constant(agents.size() * num_points, 2,
+                               std::numeric_limits<double>::quiet_NaN());
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    const auto& outer = polygons[i].obj_.outer();
+    for (Eigen::Index j = 0; j < num_points && !outer.empty(); ++j) {
+      const auto& point =
+          outer[std::min(static_cast<std::size_t>(j), outer.size() - 1)];
+      points(i * num_points + j, 0) = boost::geometry::get<0>(point);
+      points(i * num_points + j, 1) = boost::geometry::get<1>(point);
+    }
+  }
+  return points;
+}
 
-  double nearest_lon_front = numeric_max, nearest_lat_front = numeric_max,
-         nearest_lon_rear = numeric_max, nearest_lat_rear = numeric_max;
+RowMajorMatrix World::GetAgentHistories(
+    unsigned int window, const std::vector<AgentId>& agent_ids) const {
+  const auto agents = SelectAgents(agents_, agent_ids);
+  Eigen::Index state_dim = 0;
+  for (const auto& agent : agents) {
+    if (agent && !agent->history_.empty()) {
+      state_dim = std::max(state_dim, agent->history_.GetStateDim());
+    }
+  }
+  RowMajorMatrix histories =
+      RowMajorMatrix::Constant(agents.size() * window, state_dim,
+                               std::numeric_limits<double>::quiet_NaN());
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    if (!agents[i]) continue;
+    const auto& history = agents[i]->history_;
+    const std::size_t num_states =
+        std::min(history.size(), static_cast<std::size_t>(window));
+    const std::size_t first_row = i * window + window - num_states;
+    if (num_states == 0) continue;
+    histories.block(first_row, 0, num_states, history.GetStateDim()) =
+        history.GetStates().bottomRows(num_states);
+  }
+  return histories;
+}
 
-  AgentPtr nearest_agent_front(nullptr);
-  AgentPtr nearest_agent_rear(nullptr);
+std::vector<bool> World::GetAgentValidity(
+    const std::vector<AgentId>& agent_ids) const {
+  const auto agents = SelectAgents(agents_, agent_ids);
+  std::vector<bool> valid(agents.size(), false);
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    valid[i] = agents[i] && agents[i]->IsValidAtTime(world_time_);
+  }
+  return valid;
+}
 
-  for (auto it = intersecting_agents.begin(); it != intersecting_agents.end();
-       ++it) {
-    if (it->second->GetAgentId() == agent_id ||
-        it->second->GetBehaviorStatus() != BehaviorStatus::VALID ||
-        it->second->IsValidAtTime(world_time_) == false) {
-      continue;
+std::vector<models::behavior::Action> World::GetAgentLastActions(
+    const std::vector<AgentId>& agent_ids) const {
+  const auto agents = SelectAgents(agents_, agent_ids);
+  std::vector<models::behavior::Action> actions(agents.size());
+  for (std::size_t i = 0; i < agents.size(); ++i) {
+    if (agents[i] && agents[i]->GetBehaviorModel()) {
+      actions[i] = agents[i]->GetBehaviorModel()->GetLastAction();
     }
+  }
+  return actions;
+}
+
+FrontRearAgents World::GetAgentFrontRearForId(
+    const AgentId& agent_id, const LaneCorridorPtr& lane_corridor) const {
+  const Point2d ego_position = GetAgent(agent_id)->GetCurrentPosition();
+  const FrenetPosition frenet_ego(ego_position, lane_corridor->GetCenterLine());
+  return GetLaneOccupancy(lane_corridor)
+      ->GetFrontRearAgents(agent_id, frenet_ego);
+}
+
+std::vector<AgentFrenetPair> World::GetNearestAgentsInLane(
+    const AgentId& agent_id, const LaneCorridorPtr& lane_corridor,
+    const unsigned int& num_agents) const {
+  const Point2d ego_position = GetAgent(agent_id)->GetCurrentPosition();
+  const FrenetPosition frenet_ego(ego_position, lane_corridor->GetCenterLine());
+  return GetLaneOccupancy(lane_corridor)
+      ->GetNearestAgents(agent_id, frenet_ego, num_agents);
+}
 
-    FrenetPosition frenet_other(it->second->GetCurrentPosition(), center_line);
-    double width = lane_corridor->GetLaneWidth(it->second->GetCurrentPosition());
-    if (std::abs(frenet_other.lat) > frac_lateral_offset_ * width) {
+std::vector<AgentFrenetPair> World::GetAgentsInLaneInterval(
+    const LaneCorridorPtr& lane_corridor, const double& lon_min,
+    const double& lon_max) const {
+  return GetLaneOccupancy(lane_corridor)->GetAgentsInInterval(lon_min, lon_max);
+}
+
+LaneOccupancyPtr World::GetLaneOccupancy(
+    const LaneCorridorPtr& lane_corridor) const {
+  if (!use_lane_occupancy_index_) {
+    return MakeLaneOccupancy(lane_corridor);
+  }
+  return lane_occupancy_index_->GetLaneOccupancy(
+      lane_corridor, [&]() { return MakeLaneOccupancy(lane_corridor); });
+}
+
+LaneOccupancyPtr World::MakeLaneOccupancy(
+    const LaneCorridorPtr& lane_corridor) const {
+  const bark::geometry::Line& center_line = lane_corridor->GetCenterLine();
+  AgentMap intersecting_agents =
+      GetAgentsIntersectingPolygon(lane_corridor->GetMergedPolygon());
+
+  std::vector<AgentFrenetPair> agents;
+  agents.reserve(intersecting_agents.size());
+  for (const auto& agent : intersecting_agents) {
+    const Point2d position = agent.second->GetCurrentPosition();
+    FrenetPosition frenet(position, center_line);
+    double width = lane_corridor->GetLaneWidth(position);
+    if (std::abs(frenet.lat) > frac_lateral_offset_ * width) {
       // agent seems to be not really in same lane
       continue;
     }
-    double long_dist = frenet_other.lon - frenet_ego.lon;
-    double lat_dist = frenet_other.lat - frenet_ego.lat;
-
-    if (long_dist > 0.0 && long_dist < nearest_lon_front) {
-      nearest_lon_front = long_dist;
-      nearest_lat_front = lat_dist;
-      nearest_agent_front = it->second;
-    } else if (long_dist < 0.0 &&
-               std::abs(long_dist) < std::abs(nearest_lon_rear)) {
-      nearest_lon_rear = long_dist;
-      nearest_lat_rear = lat_dist;
-      nearest_agent_rear = it->second;
-    }
+    agents.emplace_back(agent.second, frenet);
   }
-
-  FrenetPosition frenet_front =
-      FrenetPosition(nearest_lon_front, nearest_lat_front);
-  fr_agents.front = std::make_pair(nearest_agent_front, frenet_front);
-  FrenetPosition frenet_rear =
-      FrenetPosition(nearest_lon_rear, nearest_lat_rear);
-  fr_agents.rear = std::make_pair(nearest_agent_rear, frenet_rear);
-
-  return fr_agents;
+  return std::make_shared<const LaneOccupancy>(agents,
+                                               !intersecting_agents.empty());
 }
 
 void World::RemoveAgentById(AgentId agent_id) {
   size_t erased_elems = agents_.erase(agent_id);
+  ResetLaneOccupancyIndex();
   LOG_IF(ERROR, erased_elems == 0)
       << "Could not remove non-existent agent with Id " << agent_id << " !";
 }
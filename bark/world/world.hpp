@@ -17,7 +17,9 @@
 
 #include <boost/geometry/index/rtree.hpp>
 #include "bark/commons/transformation/frenet.hpp"
+#include "bark/commons/util/thread_pool.hpp"
 #include "bark/world/evaluation/base_evaluator.hpp"
+#include "bark/world/lane_occupancy.hpp"
 #include "bark/world/map/roadgraph.hpp"
 #include "bark/world/objects/agent.hpp"
 #include "bark/world/objects/object.hpp"
@@ -43,6 +45,8 @@ typedef std::map<std::string, bark::world::evaluation::EvaluationReturn>
 typedef std::map<AgentId, models::dynamic::State> AgentStateMap;
 typedef std::unordered_map<AgentId, models::dynamic::Trajectory>
     AgentTrajectoryMap;
+typedef Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>
+    RowMajorMatrix;
 
 using rtree_agent_model = boost::geometry::model::box<bark::geometry::Point2d>;
 using rtree_agent_id = AgentId;
@@ -51,17 +55,13 @@ using AgentRTree =
     boost::geometry::index::rtree<rtree_agent_value,
                                   boost::geometry::index::linear<16, 4> >;
 
-typedef std::pair<AgentPtr, FrenetPosition> AgentFrenetPair;
-
-struct FrontRearAgents {
-  AgentFrenetPair front;
-  AgentFrenetPair rear;
-};
 
 class World : public commons::BaseType {
  public:
   explicit World(const commons::ParamsPtr& params);
   explicit World(const std::shared_ptr<World>& world);
+  //! the copy has its own lane occupancy index
+  World(const World& world);
   virtual ~World() {}
 
   /**
@@ -72,6 +72,7 @@ class World : public commons::BaseType {
 
   /**
    * @brief Calls the behavior and execution model of the agents
+   *        (in parallel if World::PlanAgentsInParallel is set)
    * @param  delta_time: minimum planning time
    */
   void PlanAgents(const double& delta_time);
@@ -111,6 +112,8 @@ class World : public commons::BaseType {
   double GetWorldTime() const { return world_time_; }
   void SetWorldTime(const double& world_time) { world_time_ = world_time; }
   world::map::MapInterfacePtr GetMap() const { return map_; }
+  //! read-only access; in copy-on-write mode the agents may be shared with
+  //! other worlds and have to be modified using GetMutableAgent(s)
   virtual AgentMap GetAgents() const { return agents_; }
   AgentMap GetValidAgents() const;
   AgentPtr GetAgent(AgentId id) const {
@@ -130,19 +133,105 @@ class World : public commons::BaseType {
 
   double GetFracLateralOffset() const { return frac_lateral_offset_; }
 
+  bool GetPlanAgentsInParallel() const { return plan_agents_in_parallel_; }
+
+  int GetNumPlanningThreads() const { return num_planning_threads_; }
+
+  bool GetCopyOnWrite() const { return copy_on_write_; }
+
+  bool GetUseLaneOccupancyIndex() const { return use_lane_occupancy_index_; }
+
+  /**
+   * @brief  Returns the agent for modification; in copy-on-write mode an
+   *         agent shared with other worlds is cloned before it is returned
+   */
+  AgentPtr GetMutableAgent(const AgentId& agent_id);
+  //! all agents for modification, see GetMutableAgent
+  AgentMap GetMutableAgents();
+
   void SetRemoveAgents(const bool& remove_agents) {
     remove_agents_ = remove_agents;
   }
 
+  void SetPlanAgentsInParallel(const bool& plan_agents_in_parallel) {
+    plan_agents_in_parallel_ = plan_agents_in_parallel;
+  }
+
+  void SetCopyOnWrite(const bool& copy_on_write) {
+    copy_on_write_ = copy_on_write;
+  }
+
+  void SetUseLaneOccupancyIndex(const bool& use_lane_occupancy_index) {
+    use_lane_occupancy_index_ = use_lane_occupancy_index;
+  }
+
+  /**
+   * @brief  R-tree of the agents' bounding boxes at their current states;
+   *         updated in every step and when agents are added
+   */
+  const AgentRTree& GetAgentRTree() const { return rtree_agents_; }
+
   AgentMap GetNearestAgents(const bark::geometry::Point2d& position,
                             const unsigned int& num_agents) const;
 
   AgentMap GetAgentsIntersectingPolygon(
       const bark::geometry::Polygon& polygon) const;
 
+  //! Bulk export; an empty list of agent ids selects all agents in the
+  //! order of GetAgentIds(), rows of unknown agent ids are NaN
+
+  std::vector<AgentId> GetAgentIds() const;
+
+  /**
+   * @brief  Current states of the agents as (num_agents x state_dim) matrix
+   */
+  RowMajorMatrix GetAgentStates(
+      const std::vector<AgentId>& agent_ids = std::vector<AgentId>()) const;
+
+  /**
+   * @brief  Outer points of the transformed agent polygons stacked as
+   *         (num_agents * max_num_points x 2) matrix; shorter polygons repeat
+   *         their last point
+   */
+  RowMajorMatrix GetAgentPolygons(
+      const std::vector<AgentId>& agent_ids = std::vector<AgentId>()) const;
+
+  /**
+   * @brief  Last window states of each agent stacked as
+   *         (num_agents * window x state_dim) matrix; shorter histories are
+   *         padded with NaN at the front
+   */
+  RowMajorMatrix GetAgentHistories(
+      unsigned int window,
+      const std::vector<AgentId>& agent_ids = std::vector<AgentId>()) const;
+
+  //! Whether the agents are valid at the world time, false for unknown ids
+  std::vector<bool> GetAgentValidity(
+      const std::vector<AgentId>& agent_ids = std::vector<AgentId>()) const;
+
+  //! Last actions of the behavior models of the agents, default actions for
+  //! unknown ids and agents without behavior model
+  std::vector<models::behavior::Action> GetAgentLastActions(
+      const std::vector<AgentId>& agent_ids = std::vector<AgentId>()) const;
+
   FrontRearAgents GetAgentFrontRearForId(
       const AgentId& agent_id, const LaneCorridorPtr& lane_corridor) const;
 
+  /**
+   * @brief  Valid agents on the lane corridor sorted by their Frenet position;
+   *         created once per world state and lane corridor and shared by all
+   *         observed worlds of the state
+   */
+  LaneOccupancyPtr GetLaneOccupancy(const LaneCorridorPtr& lane_corridor) const;
+
+  std::vector<AgentFrenetPair> GetNearestAgentsInLane(
+      const AgentId& agent_id, const LaneCorridorPtr& lane_corridor,
+      const unsigned int& num_agents) const;
+
+  std::vector<AgentFrenetPair> GetAgentsInLaneInterval(
+      const LaneCorridorPtr& lane_corridor, const double& lon_min,
+      const double& lon_max) const;
+
   //! Setter
   void SetMap(const world::map::MapInterfacePtr& map) { map_ = map; }
 
@@ -161,7 +250,10 @@ class World : public commons::BaseType {
 
   //! Functions
   void ClearEvaluators() { evaluators_.clear(); }
-  void ClearAgents() { agents_.clear(); }
+  void ClearAgents() {
+    agents_.clear();
+    ResetLaneOccupancyIndex();
+  }
   void ClearObjects() { objects_.clear(); }
   void ClearAll() {
     ClearAgents();
@@ -169,9 +261,25 @@ class World : public commons::BaseType {
     ClearEvaluators();
   }
 
+  /**
+   * @brief  Clones the world; in copy-on-write mode agents and objects are
+   *         shared with the clone until one of the worlds modifies them
+   */
   virtual std::shared_ptr<World> Clone() const;
 
  private:
+  AgentPtr& MakeAgentUnique(AgentPtr& agent);
+
+  static rtree_agent_model GetAgentBoundingBox(const AgentPtr& agent);
+
+  LaneOccupancyPtr MakeLaneOccupancy(
+      const LaneCorridorPtr& lane_corridor) const;
+
+  //! has to be called whenever agents are added, removed or moved
+  void ResetLaneOccupancyIndex() {
+    lane_occupancy_index_ = std::make_shared<LaneOccupancyIndex>();
+  }
+
   MapInterfacePtr map_;
   AgentMap agents_;
   ObjectMap objects_;
@@ -180,12 +288,21 @@ class World : public commons::BaseType {
   AgentRTree rtree_agents_;
   bool remove_agents_;
   double frac_lateral_offset_;
+  bool plan_agents_in_parallel_;
+  int num_planning_threads_;
+  bool copy_on_write_;
+  bool use_lane_occupancy_index_;
+  LaneOccupancyIndexPtr lane_occupancy_index_;
+  commons::ThreadPoolPtr thread_pool_;
 };
 
 typedef std::shared_ptr<world::World> WorldPtr;
 
 inline WorldPtr World::Clone() const {
   WorldPtr new_world = std::make_shared<World>(*this);
+  if (copy_on_write_) {
+    return new_world;
+  }
   new_world->ClearAll();
   for (auto agent = agents_.begin(); agent != agents_.end(); ++agent) {
     new_world->AddAgent(
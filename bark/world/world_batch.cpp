@@ -0,0 +1,117 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+#include "bark/world/world_batch.hpp"
+#include "bark/world/world_episode.hpp"
+
+namespace bark {
+namespace world {
+
+WorldBatch::WorldBatch(const std::vector<WorldPtr>& worlds,
+                       const std::vector<AgentId>& ego_agent_ids,
+                       const std::vector<std::string>& terminal_evaluators,
+                       unsigned int num_threads)
+    : worlds_(worlds),
+      ego_agent_ids_(ego_agent_ids),
+      terminal_evaluators_(terminal_evaluators),
+      evaluator_names_(),
+      done_(DoneFlags::Constant(worlds.size(), false)),
+      thread_pool_(std::make_shared<commons::ThreadPool>(num_threads)) {
+  BARK_EXPECT_TRUE(worlds_.size() == ego_agent_ids_.size());
+  if (!worlds_.empty()) {
+    for (const auto& evaluator : worlds_.front()->GetEvaluators()) {
+      evaluator_names_.push_back(evaluator.first);
+    }
+  }
+}
+
+WorldBatchResult WorldBatch::Step(const std::vector<Action>& ego_actions,
+                                  double delta_time) {
+  BARK_EXPECT_TRUE(ego_actions.empty() ||
+                   ego_actions.size() == worlds_.size());
+  thread_pool_->ParallelFor(worlds_.size(), [&](std::size_t idx) {
+    if (done_(idx)) return;
+    const WorldPtr& world = worlds_[idx];
+    if (!ego_actions.empty()) {
+      AgentPtr ego_agent = world->GetMutableAgent(ego_agent_ids_[idx]);
+      if (ego_agent) {
+        ego_agent->GetBehaviorModel()->ActionToBehavior(ego_actions[idx]);
+      }
+    }
+    world->Step(delta_time);
+  });
+  WorldBatchResult result = Observe();
+  done_ = result.done;
+  return result;
+}
+
+WorldBatchResult WorldBatch::Observe() const {
+  // evaluated serially, as cloned worlds share their evaluators
+  std::vector<models::dynamic::State> ego_states(worlds_.size());
+  std::vector<EvaluationMap> evaluations(worlds_.size());
+  for (std::size_t idx = 0; idx < worlds_.size(); ++idx) {
+    const AgentPtr ego_agent = worlds_[idx]->GetAgent(ego_agent_ids_[idx]);
+    if (ego_agent) {
+      ego_states[idx] = ego_agent->GetCurrentState();
+    }
+    evaluations[idx] = worlds_[idx]->Evaluate();
+  }
+
+  Eigen::Index state_dim = 0;
+  for (const auto& state : ego_states) {
+    state_dim = std::max(state_dim, state.size());
+  }
+
+  WorldBatchResult result;
+  result.evaluator_names = evaluator_names_;
+  result.observations =
+      RowMajorMatrix::Constant(worlds_.size(), state_dim,
+                               std::numeric_limits<double>::quiet_NaN());
+  result.evaluations =
+      RowMajorMatrix::Constant(worlds_.size(), evaluator_names_.size(),
+                               std::numeric_limits<double>::quiet_NaN());
+  result.done = done_;
+  for (std::size_t idx = 0; idx < worlds_.size(); ++idx) {
+    const auto& state = ego_states[idx];
+    result.observations.row(idx).head(state.size()) = state.transpose();
+    if (state.size() == 0) {
+      result.done(idx) = true;
+    }
+    for (std::size_t j = 0; j < evaluator_names_.size(); ++j) {
+      auto evaluation_it = evaluations[idx].find(evaluator_names_[j]);
+      if (evaluation_it != evaluations[idx].end()) {
+        result.evaluations(idx, j) = EvaluationToDouble(evaluation_it->second);
+      }
+    }
+    for (const auto& terminal_evaluator : terminal_evaluators_) {
+      auto evaluation_it = evaluations[idx].find(terminal_evaluator);
+      if (evaluation_it != evaluations[idx].end()) {
+        const double value = EvaluationToDouble(evaluation_it->second);
+        // undecided results (NaN) are not terminal
+        if (value != 0.0 && !std::isnan(value)) {
+          result.done(idx) = true;
+        }
+      }
+    }
+  }
+  return result;
+}
+
+void WorldBatch::SetWorld(std::size_t idx, const WorldPtr& world,
+                          const AgentId& ego_agent_id) {
+  worlds_.at(idx) = world;
+  ego_agent_ids_.at(idx) = ego_agent_id;
+  done_(idx) = false;
+}
+
+}  // namespace world
+}  // namespace bark
@@ -0,0 +1,91 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#ifndef BARK_WORLD_WORLD_BATCH_HPP_
+#define BARK_WORLD_WORLD_BATCH_HPP_
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "bark/commons/util/thread_pool.hpp"
+#include "bark/world/world.hpp"
+
+namespace bark {
+namespace world {
+
+using models::behavior::Action;
+
+typedef Eigen::Matrix<bool, Eigen::Dynamic, 1> DoneFlags;
+
+struct WorldBatchResult {
+  //! (num_worlds x state_dim) current states of the ego agents, NaN rows for
+  //! removed ego agents
+  RowMajorMatrix observations;
+  //! (num_worlds x num_evaluators) evaluation results in the order of the
+  //! evaluator names; booleans are 0/1, non-numeric results are NaN
+  RowMajorMatrix evaluations;
+  std::vector<std::string> evaluator_names;
+  //! a world is done if a terminal evaluator is true or the ego agent has
+  //! been removed
+  DoneFlags done;
+};
+
+/**
+ * @brief  Steps independent worlds in parallel, e.g. the environments of a
+ *         vectorized RL environment
+ *
+ * The worlds are stepped on a thread pool, thus, the behavior models have to
+ * be thread-safe as for World::PlanAgentsInParallel. The evaluator names are
+ * taken from the first world; done worlds are not stepped until they are
+ * replaced using SetWorld.
+ */
+class WorldBatch {
+ public:
+  WorldBatch(const std::vector<WorldPtr>& worlds,
+             const std::vector<AgentId>& ego_agent_ids,
+             const std::vector<std::string>& terminal_evaluators =
+                 std::vector<std::string>(),
+             unsigned int num_threads = 4);
+
+  /**
+   * @brief  Passes the actions to the behavior models of the ego agents,
+   *         steps all worlds that are not done and evaluates them
+   */
+  WorldBatchResult Step(const std::vector<Action>& ego_actions,
+                        double delta_time);
+
+  //! evaluates the worlds without stepping them
+  WorldBatchResult Observe() const;
+
+  void SetWorld(std::size_t idx, const WorldPtr& world,
+                const AgentId& ego_agent_id);
+
+  WorldPtr GetWorld(std::size_t idx) const { return worlds_.at(idx); }
+  std::size_t GetNumWorlds() const { return worlds_.size(); }
+  std::vector<AgentId> GetEgoAgentIds() const { return ego_agent_ids_; }
+  std::vector<std::string> GetEvaluatorNames() const {
+    return evaluator_names_;
+  }
+  DoneFlags GetDone() const { return done_; }
+
+ private:
+  std::vector<WorldPtr> worlds_;
+  std::vector<AgentId> ego_agent_ids_;
+  std::vector<std::string> terminal_evaluators_;
+  std::vector<std::string> evaluator_names_;
+  DoneFlags done_;
+  commons::ThreadPoolPtr thread_pool_;
+};
+
+typedef std::shared_ptr<WorldBatch> WorldBatchPtr;
+
+}  // namespace world
+}  // namespace bark
+
+#endif  // BARK_WORLD_WORLD_BATCH_HPP_
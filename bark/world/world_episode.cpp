@@ -0,0 +1,102 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#include <cmath>
+#include <exception>
+#include <limits>
+#include <optional>
+#include <stdexcept>
+
+#include "bark/world/world_episode.hpp"
+
+namespace bark {
+namespace world {
+
+namespace {
+struct EvaluationToDoubleVisitor : public boost::static_visitor<double> {
+  double operator()(double value) const { return value; }
+  double operator()(bool value) const { return value ? 1.0 : 0.0; }
+  double operator()(const std::optional<bool>& value) const {
+    return value ? (*value ? 1.0 : 0.0)
+                 : std::numeric_limits<double>::quiet_NaN();
+  }
+  double operator()(const std::string&) const {
+    return std::numeric_limits<double>::quiet_NaN();
+  }
+  double operator()(int value) const { return static_cast<double>(value); }
+};
+}  // namespace
+
+double EvaluationToDouble(const EvaluationReturn& evaluation) {
+  return boost::apply_visitor(EvaluationToDoubleVisitor(), evaluation);
+}
+
+bool TerminalCondition::IsTerminal(const EvaluationReturn& evaluation) const {
+  const double value = EvaluationToDouble(evaluation);
+  if (std::isnan(value)) return false;
+  switch (comparison) {
+    case IS_TRUE:
+      return value != 0.0;
+    case IS_FALSE:
+      return value == 0.0;
+    case GREATER:
+      return value > threshold;
+    case GREATER_EQUAL:
+      return value >= threshold;
+    case LESS:
+      return value < threshold;
+    case LESS_EQUAL:
+      return value <= threshold;
+    case EQUAL:
+      return value == threshold;
+  }
+  return false;
+}
+
+EpisodeResult RunEpisode(const WorldPtr& world,
+                         const std::vector<TerminalCondition>& conditions,
+                         double step_time, int max_steps) {
+  EpisodeResult result;
+  while (true) {
+    try {
+      result.evaluation = world->Evaluate();
+      for (const auto& condition : conditions) {
+        auto evaluation_it = result.evaluation.find(condition.evaluator_name);
+        if (evaluation_it == result.evaluation.end()) {
+          throw std::runtime_error("No evaluator " + condition.evaluator_name +
+                                   " for terminal condition.");
+        }
+        if (condition.IsTerminal(evaluation_it->second)) {
+          result.terminal_reasons.push_back(condition.evaluator_name);
+        }
+      }
+    } catch (const std::exception& e) {
+      result.evaluation.clear();
+      result.terminal_reasons.clear();
+      result.exception_raised = true;
+      result.exception_message = e.what();
+      return result;
+    }
+    if (!result.terminal_reasons.empty() ||
+        (max_steps > 0 && result.num_steps >= max_steps)) {
+      return result;
+    }
+    try {
+      world->PlanAgents(step_time);
+      world->Execute(step_time);
+    } catch (const std::exception& e) {
+      result.exception_raised = true;
+      result.exception_message = e.what();
+      return result;
+    }
+    ++result.num_steps;
+  }
+}
+
+}  // namespace world
+}  // namespace bark
@@ -0,0 +1,82 @@
+// Copyright (c) 2020 fortiss GmbH
+//
+// Authors: Julian Bernhard, Klemens Esterle, Patrick Hart and
+// Tobias Kessler
+//
+// This work is licensed under the terms of the MIT license.
+// For a copy, see <https://opensource.org/licenses/MIT>.
+
+#ifndef BARK_WORLD_WORLD_EPISODE_HPP_
+#define BARK_WORLD_WORLD_EPISODE_HPP_
+
+#include <string>
+#include <vector>
+
+#include "bark/world/world.hpp"
+
+namespace bark {
+namespace world {
+
+using evaluation::EvaluationReturn;
+
+enum TerminalComparison {
+  IS_TRUE = 0,
+  IS_FALSE = 1,
+  GREATER = 2,
+  GREATER_EQUAL = 3,
+  LESS = 4,
+  LESS_EQUAL = 5,
+  EQUAL = 6
+};
+
+/**
+ * @brief  Terminates an episode if the result of the named evaluator fulfills
+ *         the comparison with the threshold
+ *
+ * Booleans are compared as 0/1; undecided (empty optional) and string results
+ * never terminate an episode.
+ */
+struct TerminalCondition {
+  TerminalCondition(const std::string& evaluator_name,
+                    TerminalComparison comparison = IS_TRUE,
+                    double threshold = 0.0)
+      : evaluator_name(evaluator_name),
+        comparison(comparison),
+        threshold(threshold) {}
+
+  bool IsTerminal(const EvaluationReturn& evaluation) const;
+
+  std::string evaluator_name;
+  TerminalComparison comparison;
+  double threshold;
+};
+
+//! numeric value of an evaluation result, NaN if it has none
+double EvaluationToDouble(const EvaluationReturn& evaluation);
+
+struct EpisodeResult {
+  //! the last evaluation, empty if the evaluation raised an exception
+  EvaluationMap evaluation;
+  //! evaluators whose terminal conditions are fulfilled, in their order
+  std::vector<std::string> terminal_reasons;
+  int num_steps = 0;
+  bool exception_raised = false;
+  std::string exception_message;
+};
+
+/**
+ * @brief  Evaluates the world and steps it using PlanAgents and Execute until
+ *         a terminal condition is fulfilled
+ *
+ * Exceptions thrown while evaluating or stepping the world end the episode
+ * and are reported in the result. A max_steps > 0 ends the episode after
+ * max_steps steps without a terminal reason.
+ */
+EpisodeResult RunEpisode(const WorldPtr& world,
+                         const std::vector<TerminalCondition>& conditions,
+                         double step_time, int max_steps = 0);
+
+}  // namespace world
+}  // namespace bark
+
+#endif  // BARK_WORLD_WORLD_EPISODE_HPP_
@@ -41,6 +41,7 @@ setup(
       "sphinx>=2.3.1",
       "sphinx_rtd_theme>=0.4.3",
       "pandas>=0.24.2",
+      "pyarrow>=0.17.1",
       "autopep8>=1.4.4",
       "cpplint>=1.4.4",
       "pygame>=1.9.6",
@@ -23,6 +23,13 @@ def bark_dependencies():
     remote = "https://github.com/google/googletest"
     )
 
+    _maybe(
+    git_repository,
+    name = "com_github_google_benchmark",
+    tag = "v1.5.2",
+    remote = "https://github.com/google/benchmark"
+    )
+
     _maybe(
     http_archive,
     name = "pybind11",